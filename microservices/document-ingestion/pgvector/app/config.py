@@ -37,6 +37,9 @@ It generates embeddings for documents, stores them in PGVector, and saves the do
 
     BATCH_SIZE: int = ...
 
+    # Number of embedding batches requested in parallel during ingestion
+    EMBEDDING_CONCURRENCY: int = 4
+
     # MINIO Configuration
     DEFAULT_BUCKET: str = ...
     OBJECT_PREFIX: str = ...
@@ -46,6 +49,13 @@ It generates embeddings for documents, stores them in PGVector, and saves the do
     MINIO_ACCESS_KEY: str = ...
     MINIO_SECRET_KEY: str = ...
 
+    # URL fetching: concurrent downloads (in total and per host), request
+    # timeout in seconds and processes converting HTML to text
+    URL_FETCH_WORKERS: int = 16
+    URL_FETCH_PER_HOST: int = 4
+    URL_FETCH_TIMEOUT: int = 5
+    URL_PARSE_WORKERS: int = 2
+
     #Allowed host domains for url ingestion
     DOMAINS: str = Field("", alias="ALLOWED_HOSTS", description="Comma separated list of allowed host domains for URL ingestion")
 
@@ -5,11 +5,9 @@ import psycopg
 from fastapi import UploadFile, HTTPException
 from http import HTTPStatus
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from langchain_core.documents import Document
 from langchain.text_splitter import TokenTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_postgres.vectorstores import PGVector
 import pdfplumber
 from docx import Document as DocxDocument
 from docx.text.paragraph import Paragraph
@@ -17,6 +15,7 @@ from docx.table import Table
 from .logger import logger
 from .config import Settings
 from .db_config import pool_execution
+from .ingestion import PGVectorIngestor, get_embedder
 
 config = Settings()
 
@@ -103,21 +102,34 @@ def parse_table(table: Table):
 
     return table_string
 
-def ingest_to_pgvector(doc_path: Path, bucket: str):
+def ingest_to_pgvector(doc_path: Path, bucket: str, document_name: Optional[str] = None) -> List[str]:
     """
     Ingests a document into a PostgreSQL database with PGVector extension for vector embeddings.
     This function processes a document, splits it into chunks, generates embeddings for each chunk,
-    and uploads the embeddings to a PGVector collection in batches.
+    and uploads the embeddings to a PGVector collection in batches. It blocks, so async
+    callers should run it in a worker thread.
+
+    A document uploaded again under the same name in the same bucket replaces the previous
+    version: chunks whose text is unchanged keep their embeddings, only new or changed chunks
+    are embedded, and chunks that are no longer in the document are removed.
 
     Args:
         doc_path (Path): The file path to the document to be ingested.
         bucket (str): The name of the bucket associated with the document metadata.
+        document_name (str, optional): Name the document was uploaded with. Defaults to the
+            name of `doc_path`.
+
+    Returns:
+        List[str]: Stored file names of previous versions of the document, which no longer
+        have any embeddings.
 
     Raises:
         HTTPException: If no text is found in the document or if an error occurs during ingestion.
     """
 
 
+    document_name = document_name or doc_path.name
+
     try:
         chunks = []
         # Create one chunk per page or split the whole text
@@ -193,34 +205,22 @@ def ingest_to_pgvector(doc_path: Path, bucket: str):
         documents = [
             Document(
                 page_content=chunk.page_content,
-                metadata={"bucket": bucket, "filename": doc_path.name, **chunk.metadata},
+                metadata={"bucket": bucket, "filename": doc_path.name, "document": document_name, **chunk.metadata},
             )
             for chunk in chunks
         ]
 
-        embedder = OpenAIEmbeddings(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
-            model=config.EMBEDDING_MODEL_NAME,
-            tiktoken_enabled=False
+        stats = PGVectorIngestor(get_embedder()).sync_documents(
+            documents, scope={"bucket": bucket, "document": document_name}
+        )
+        logger.info(
+            f"Ingested {stats.chunks} chunks of {doc_path.name} in {stats.elapsed_seconds:.2f}s "
+            f"({stats.chunks_per_second:.1f} chunks/s, {stats.embedded} embedded, {stats.reused} reused, "
+            f"{stats.removed} removed)"
         )
 
-        # Batch upload documents to handle large files
-        batch_size = config.BATCH_SIZE
-        for i in range(0, len(documents), batch_size):
-            batch_documents = documents[i : i + batch_size]
-
-            _ = PGVector.from_documents(
-                documents=batch_documents,
-                embedding=embedder,
-                collection_name=config.INDEX_NAME,
-                connection=config.PG_CONNECTION_STRING,
-                use_jsonb=True
-            )
-
-            logger.info(
-                f"Processed batch {i // batch_size + 1}/{(len(documents) - 1) // batch_size + 1}"
-            )
+        previous_files = {metadata.get("filename") for metadata in stats.previous_metadata}
+        return sorted(name for name in previous_files if name and name != doc_path.name)
 
     except HTTPException as e:
         raise e
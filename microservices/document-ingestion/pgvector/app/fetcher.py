@@ -0,0 +1,306 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import multiprocessing
+import sqlite3
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import html2text
+import requests
+from requests.adapters import HTTPAdapter
+from .logger import logger
+from .config import Settings
+
+config = Settings()
+http_session = None
+parse_executor = None
+url_cache = None
+_singleton_lock = Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Retrieves a singleton HTTP session, so connections to the same hosts are
+    kept alive and shared across URL ingestion requests.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+
+    global http_session
+    with _singleton_lock:
+        if http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max(1, config.URL_FETCH_WORKERS))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            http_session = session
+    return http_session
+
+
+def get_parse_executor() -> Executor:
+    """
+    Retrieves a singleton process pool for converting HTML to text. The
+    conversion is CPU bound, so it runs outside the server process. Workers
+    are spawned rather than forked, as the server process runs threads.
+
+    Returns:
+        Executor: The parse worker pool.
+    """
+
+    global parse_executor
+    with _singleton_lock:
+        if parse_executor is None:
+            parse_executor = ProcessPoolExecutor(
+                max_workers=max(1, config.URL_PARSE_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return parse_executor
+
+
+def get_url_cache() -> Optional["URLCache"]:
+    """Retrieves the singleton URL cache stored under `LOCAL_STORE_PREFIX`, or None if it cannot be opened."""
+
+    global url_cache
+    with _singleton_lock:
+        if url_cache is None:
+            try:
+                url_cache = URLCache(Path(config.LOCAL_STORE_PREFIX) / "url_cache.db")
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"URL cache unavailable, fetching without conditional requests: {e}")
+                return None
+    return url_cache
+
+
+def html_to_text(html: str) -> str:
+    """Converts an HTML page to text, dropping links and images."""
+    converter = html2text.HTML2Text()
+    converter.ignore_links = True
+    converter.ignore_images = True
+    return converter.handle(html)
+
+
+def safe_fetch_url(validated_pinned_url: str, headers: dict, hostname: str, session: Optional[requests.Session] = None):
+    """
+    Securely fetches a URL while mitigating SSRF vulnerabilities.
+
+    This function uses the validated URL for the request and the provided hostname
+    to preserve the Host header for proper TLS and routing. Redirects are disabled
+    to prevent redirect-based SSRF attacks.
+
+    Args:
+        validated_url (str): The validated and pinned URL.
+        headers (dict): A dictionary of HTTP headers to include in the request.
+        hostname (str): The original hostname to use in the Host header.
+        session (requests.Session, optional): Session whose connections are reused.
+            Defaults to the shared session.
+
+    Returns:
+        Response: The HTTP response object from the `requests` library.
+
+    Raises:
+        ValueError: If the URL is invalid or DNS resolution fails.
+        requests.RequestException: For any issues during the HTTP request.
+    """
+
+    # Preserve Host header for TLS / correct routing
+    headers = {
+        **headers,
+        "Host": hostname
+    }
+
+    # Send the request to the validated URL to prevent SSRF
+    response = (session or get_http_session()).get(
+        validated_pinned_url,
+        headers=headers,
+        timeout=config.URL_FETCH_TIMEOUT,
+        allow_redirects=False  # prevent redirect SSRF
+    )
+
+    return response
+
+
+class URLCache:
+    """
+    Validators (ETag, Last-Modified) and converted text of fetched pages,
+    persisted in SQLite so unchanged pages are answered with 304 Not Modified
+    and not downloaded or parsed again.
+    """
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ( \
+            url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, text TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], str]]:
+        """Returns (etag, last_modified, text) of the cached page, if any."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, text FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], text: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, text, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, text, time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching and parsing one URL."""
+
+    url: str
+    status_code: Optional[int] = None
+    text: Optional[str] = None
+    not_modified: bool = False
+    error: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class URLFetcher:
+    """
+    Fetches and parses a list of URLs concurrently.
+
+    Every URL is downloaded once: the response both validates the URL and feeds
+    the HTML-to-text conversion, which runs in a worker pool while other pages
+    are still downloading. Requests share one HTTP session, are limited to
+    `per_host` at a time for each host, and are conditional when the page is in
+    the cache, so an unchanged page costs a 304 response and no parsing.
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        resolve: Callable[[str], Optional[str]],
+        cache: Optional[URLCache] = None,
+        session: Optional[requests.Session] = None,
+        parse_pool: Optional[Executor] = None,
+        workers: int = config.URL_FETCH_WORKERS,
+        per_host: int = config.URL_FETCH_PER_HOST,
+    ):
+        """
+        Args:
+            headers (dict): HTTP headers sent with every request.
+            resolve (Callable[[str], Optional[str]]): Validates a URL and returns the
+                (pinned) URL to connect to, or None to reject it.
+            cache (URLCache, optional): Cache for conditional requests.
+            session (requests.Session, optional): Defaults to the shared session.
+            parse_pool (Executor, optional): Defaults to the shared process pool.
+            workers (int): Maximum number of concurrent downloads.
+            per_host (int): Maximum number of concurrent downloads per host.
+        """
+
+        self.headers = headers
+        self.resolve = resolve
+        self.cache = cache
+        self.session = session or get_http_session()
+        self.parse_pool = parse_pool or get_parse_executor()
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self._host_slots: Dict[str, BoundedSemaphore] = {}
+        self._host_lock = Lock()
+
+    def _host_slot(self, hostname: str) -> BoundedSemaphore:
+        with self._host_lock:
+            slot = self._host_slots.get(hostname)
+            if slot is None:
+                slot = self._host_slots[hostname] = BoundedSemaphore(self.per_host)
+            return slot
+
+    def _download(self, result: FetchResult) -> Optional[str]:
+        """Fetches one URL and returns its HTML, or None if it is cached, invalid or failed."""
+
+        parsed = urlparse(result.url)
+        hostname = parsed.hostname
+        pinned_url = self.resolve(result.url)
+        if not pinned_url:
+            result.error = "Invalid URL"
+            logger.info(f"Invalid URL skipped: {result.url}")
+            return None
+
+        headers = dict(self.headers)
+        cached = self.cache.get(result.url) if self.cache is not None else None
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        host_header = hostname if parsed.port is None else f"{hostname}:{parsed.port}"
+        try:
+            with self._host_slot(hostname):
+                response = safe_fetch_url(pinned_url, headers, host_header, session=self.session)
+        except Exception as e:
+            result.error = str(e)
+            logger.error(f"Error fetching URL {result.url}: {e}")
+            return None
+
+        result.status_code = response.status_code
+        if response.status_code == HTTPStatus.NOT_MODIFIED and cached is not None:
+            result.text = cached[2]
+            result.not_modified = True
+            return None
+        if response.status_code != HTTPStatus.OK:
+            result.error = f"status code {response.status_code}"
+            logger.info(f"Failed to fetch URL: {result.url} with status code {response.status_code}")
+            return None
+
+        result.etag = response.headers.get("ETag")
+        result.last_modified = response.headers.get("Last-Modified")
+        return response.text
+
+    def fetch_all(self, urls: List[str]) -> List[FetchResult]:
+        """
+        Fetches and converts the pages, in parallel.
+
+        Args:
+            urls (List[str]): URLs to fetch.
+
+        Returns:
+            List[FetchResult]: One result per URL, in the given order. `text` holds the
+            page text, or is None if the URL was rejected, failed or could not be parsed.
+        """
+
+        results = [FetchResult(url) for url in urls]
+        parsing = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="url-fetch") as executor:
+            downloads = {executor.submit(self._download, result): result for result in results}
+            for future in as_completed(downloads):
+                result = downloads[future]
+                html = future.result()
+                if html is not None:
+                    parsing[self.parse_pool.submit(html_to_text, html)] = result
+
+        for future, result in parsing.items():
+            try:
+                result.text = future.result()
+            except Exception as e:
+                result.error = f"parse error: {e}"
+                logger.error(f"Error while parsing HTML content for URL - {result.url}: {e}")
+                continue
+            if self.cache is not None and (result.etag or result.last_modified):
+                self.cache.put(result.url, result.etag, result.last_modified, result.text)
+
+        not_modified = sum(result.not_modified for result in results)
+        logger.info(f"Fetched {len(results)} URL(s), {not_modified} not modified")
+        return results
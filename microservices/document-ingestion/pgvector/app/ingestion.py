@@ -0,0 +1,376 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+from .logger import logger
+from .config import Settings
+from .db_config import get_db_connection_pool
+
+config = Settings()
+embedder = None
+
+# Same advisory lock langchain_postgres takes while creating the extension, so
+# both code paths serialize schema creation against each other.
+SCHEMA_LOCK_ID = 1573678846307946496
+
+# Mirrors the tables langchain_postgres creates, so stores created by either
+# side stay interchangeable for the retriever and the listing/delete queries.
+SCHEMA_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS vector",
+    "CREATE TABLE IF NOT EXISTS langchain_pg_collection ( \
+    uuid UUID PRIMARY KEY, name VARCHAR NOT NULL UNIQUE, cmetadata JSON)",
+    "CREATE TABLE IF NOT EXISTS langchain_pg_embedding ( \
+    id VARCHAR PRIMARY KEY, \
+    collection_id UUID REFERENCES langchain_pg_collection (uuid) ON DELETE CASCADE, \
+    embedding VECTOR, document VARCHAR, cmetadata JSONB)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_langchain_pg_embedding_id ON langchain_pg_embedding (id)",
+    "CREATE INDEX IF NOT EXISTS ix_cmetadata_gin ON langchain_pg_embedding \
+    USING gin (cmetadata jsonb_path_ops)",
+]
+
+COPY_EMBEDDINGS = "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata) FROM STDIN"
+
+_collection_ids: Dict[str, uuid.UUID] = {}
+_collection_lock = Lock()
+
+
+def get_embedder() -> Embeddings:
+    """
+    Retrieves a singleton client for the TEI embedding endpoint, so its HTTP
+    connections are reused across ingestion requests.
+
+    Returns:
+        Embeddings: The embedding client.
+    """
+
+    global embedder
+    if embedder is None:
+        embedder = OpenAIEmbeddings(
+            openai_api_key="EMPTY",
+            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
+            model=config.EMBEDDING_MODEL_NAME,
+            tiktoken_enabled=False
+        )
+    return embedder
+
+
+def chunk_hash(text: str) -> str:
+    """SHA-256 of a chunk's text, stored as `content_hash` in its metadata."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def vector_literal(embedding: Sequence[float]) -> str:
+    """Formats an embedding in the text representation of the pgvector `vector` type."""
+    return "[" + ",".join(str(float(value)) for value in embedding) + "]"
+
+
+@dataclass
+class IngestionStats:
+    """Throughput figures of one ingestion run."""
+
+    chunks: int = 0
+    batches: int = 0
+    embedded: int = 0
+    reused: int = 0
+    removed: int = 0
+    embed_seconds: float = 0.0
+    insert_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    # Metadata of the rows stored for the same scope before a sync
+    previous_metadata: List[dict] = field(default_factory=list)
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class PGVectorIngestor:
+    """
+    Embeds chunks and writes them to the PGVector collection in a pipeline.
+
+    Chunks are embedded in batches of `batch_size` on up to `concurrency`
+    worker threads. The batches are written in order with `COPY` over a single
+    pooled connection while the following batches are still being embedded,
+    and the whole run is committed as one transaction, so a failed ingestion
+    leaves no partial document behind.
+
+    Every chunk is stored with the SHA-256 of its text as `content_hash` in its
+    metadata. `sync_texts` uses it to re-ingest a document or URL
+    incrementally: only new or changed chunks are embedded, and chunks that are
+    no longer part of it are deleted.
+    """
+
+    def __init__(
+        self,
+        embedder: Embeddings,
+        collection_name: str = config.INDEX_NAME,
+        pool: Optional[ConnectionPool] = None,
+        batch_size: int = config.BATCH_SIZE,
+        concurrency: int = config.EMBEDDING_CONCURRENCY,
+    ):
+        self.embedder = embedder
+        self.collection_name = collection_name
+        self.pool = pool
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+
+    def _get_pool(self) -> ConnectionPool:
+        pool = self.pool or get_db_connection_pool()
+        if pool is None:
+            raise RuntimeError("Database connection pool is not available.")
+        return pool
+
+    def get_collection_id(self) -> uuid.UUID:
+        """
+        Returns the uuid of the collection, creating the vector extension, the
+        tables and the collection on first use. The result is cached per process.
+
+        Returns:
+            uuid.UUID: The collection uuid.
+        """
+
+        with _collection_lock:
+            collection_id = _collection_ids.get(self.collection_name)
+            if collection_id is not None:
+                return collection_id
+
+            with self._get_pool().connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK_ID,))
+                    for statement in SCHEMA_STATEMENTS:
+                        cur.execute(statement)
+                    cur.execute(
+                        "INSERT INTO langchain_pg_collection (uuid, name) VALUES (%s, %s) \
+                        ON CONFLICT (name) DO NOTHING",
+                        (uuid.uuid4(), self.collection_name),
+                    )
+                    cur.execute(
+                        "SELECT uuid FROM langchain_pg_collection WHERE name = %s",
+                        (self.collection_name,),
+                    )
+                    collection_id = cur.fetchone()[0]
+
+            _collection_ids[self.collection_name] = collection_id
+            return collection_id
+
+    def _embed(self, texts: List[str]):
+        start = time.perf_counter()
+        embeddings = self.embedder.embed_documents(texts)
+        return embeddings, time.perf_counter() - start
+
+    @staticmethod
+    def _with_hashes(texts: List[str], metadatas: List[dict]) -> List[dict]:
+        return [{**(metadata or {}), "content_hash": chunk_hash(text)} for text, metadata in zip(texts, metadatas)]
+
+    def ingest_documents(
+        self,
+        documents: List[Document],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> IngestionStats:
+        """
+        Embeds and stores documents.
+
+        Args:
+            documents (List[Document]): Chunks to store; `metadata` is stored as `cmetadata`.
+            progress (Callable[[int, int], None], optional): Called with the number of
+                stored chunks and the total after every batch.
+
+        Returns:
+            IngestionStats: Number of chunks and batches and the time spent.
+        """
+
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        return self.ingest_texts(texts, metadatas, progress)
+
+    def ingest_texts(
+        self,
+        texts: List[str],
+        metadatas: List[dict],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> IngestionStats:
+        """
+        Embeds and stores texts with their metadata.
+
+        Args:
+            texts (List[str]): Chunk texts.
+            metadatas (List[dict]): Metadata for each chunk.
+            progress (Callable[[int, int], None], optional): Called with the number of
+                stored chunks and the total after every batch.
+
+        Returns:
+            IngestionStats: Number of chunks and batches and the time spent.
+        """
+
+        stats = IngestionStats(chunks=len(texts))
+        if not texts:
+            return stats
+
+        start_time = time.perf_counter()
+        collection_id = self.get_collection_id()
+        metadatas = self._with_hashes(texts, metadatas)
+        with self._get_pool().connection() as conn:
+            with conn.cursor() as cur:
+                self._write(cur, collection_id, texts, metadatas, stats, progress)
+
+        stats.elapsed_seconds = time.perf_counter() - start_time
+        return stats
+
+    def sync_documents(
+        self,
+        documents: List[Document],
+        scope: dict,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> IngestionStats:
+        """
+        Replaces the chunks stored for `scope` with `documents`, see `sync_texts`.
+        """
+
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        return self.sync_texts(texts, metadatas, scope, progress)
+
+    def sync_texts(
+        self,
+        texts: List[str],
+        metadatas: List[dict],
+        scope: dict,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> IngestionStats:
+        """
+        Replaces the chunks stored for `scope` with the given texts, embedding only
+        what changed.
+
+        Stored chunks whose metadata contains `scope` are matched to the new chunks
+        by content hash. Matched chunks keep their embedding (their metadata is
+        updated if it differs), new chunks are embedded and stored, and stored
+        chunks without a match are deleted. Syncs of the same scope are serialized.
+
+        Args:
+            texts (List[str]): Chunk texts of the new version.
+            metadatas (List[dict]): Metadata for each chunk; it must contain `scope`.
+            scope (dict): Metadata identifying the document, e.g. `{"url": url}`.
+            progress (Callable[[int, int], None], optional): Called with the number of
+                stored new chunks and the number of new chunks after every batch.
+
+        Returns:
+            IngestionStats: Number of embedded, reused and removed chunks, the time
+            spent and the metadata of the chunks stored before the sync.
+        """
+
+        stats = IngestionStats(chunks=len(texts))
+        start_time = time.perf_counter()
+        collection_id = self.get_collection_id()
+        metadatas = self._with_hashes(texts, metadatas)
+        scope_json = Jsonb(scope)
+
+        with self._get_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext(%s))",
+                    (f"{collection_id}:{json.dumps(scope, sort_keys=True)}",),
+                )
+                # Served by the jsonb_path_ops GIN index on cmetadata
+                cur.execute(
+                    "SELECT id, cmetadata FROM langchain_pg_embedding \
+                    WHERE collection_id = %s AND cmetadata @> %s",
+                    (collection_id, scope_json),
+                )
+                stored = cur.fetchall()
+                stats.previous_metadata = [row[1] or {} for row in stored]
+
+                stored_by_hash: Dict[str, List[Tuple[str, dict]]] = {}
+                for row_id, metadata in stored:
+                    content_hash = (metadata or {}).get("content_hash")
+                    stored_by_hash.setdefault(content_hash, []).append((row_id, metadata))
+
+                new_texts, new_metadatas, updates = [], [], []
+                for text, metadata in zip(texts, metadatas):
+                    candidates = stored_by_hash.get(metadata["content_hash"])
+                    if candidates:
+                        row_id, stored_metadata = candidates.pop()
+                        stats.reused += 1
+                        if stored_metadata != metadata:
+                            updates.append((Jsonb(metadata), row_id))
+                    else:
+                        new_texts.append(text)
+                        new_metadatas.append(metadata)
+
+                removed = [row_id for candidates in stored_by_hash.values() for row_id, _ in candidates]
+                if removed:
+                    cur.execute("DELETE FROM langchain_pg_embedding WHERE id = ANY(%s)", (removed,))
+                    stats.removed = len(removed)
+                if updates:
+                    cur.executemany("UPDATE langchain_pg_embedding SET cmetadata = %s WHERE id = %s", updates)
+                if new_texts:
+                    self._write(cur, collection_id, new_texts, new_metadatas, stats, progress)
+
+        stats.elapsed_seconds = time.perf_counter() - start_time
+        logger.info(
+            f"Synced {scope}: {stats.embedded} chunks embedded, {stats.reused} reused, {stats.removed} removed"
+        )
+        return stats
+
+    def _write(self, cur, collection_id, texts, metadatas, stats, progress):
+        """Embeds `texts` in parallel batches and COPYs each batch as soon as it is embedded, in order."""
+
+        total = len(texts)
+        starts = list(range(0, total, self.batch_size))
+        stats.batches += len(starts)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="embed") as executor:
+            in_flight = deque()
+            next_batch = 0
+
+            def submit_batches():
+                nonlocal next_batch
+                while next_batch < len(starts) and len(in_flight) < self.concurrency:
+                    begin = starts[next_batch]
+                    end = min(begin + self.batch_size, total)
+                    in_flight.append((begin, end, executor.submit(self._embed, texts[begin:end])))
+                    next_batch += 1
+
+            try:
+                submit_batches()
+                for batch_number in range(1, len(starts) + 1):
+                    begin, end, future = in_flight.popleft()
+                    embeddings, embed_seconds = future.result()
+                    stats.embed_seconds += embed_seconds
+                    # Keep the embedding endpoint busy while this batch is written
+                    submit_batches()
+
+                    insert_start = time.perf_counter()
+                    with cur.copy(COPY_EMBEDDINGS) as copy:
+                        for text, metadata, embedding in zip(
+                            texts[begin:end], metadatas[begin:end], embeddings
+                        ):
+                            copy.write_row((
+                                str(uuid.uuid4()),
+                                collection_id,
+                                vector_literal(embedding),
+                                text,
+                                Jsonb(metadata),
+                            ))
+                    stats.insert_seconds += time.perf_counter() - insert_start
+                    stats.embedded += end - begin
+
+                    logger.info(f"Processed batch {batch_number}/{len(starts)}")
+                    if progress is not None:
+                        progress(end, total)
+            except BaseException:
+                for _, _, future in in_flight:
+                    future.cancel()
+                raise
@@ -7,6 +7,7 @@ import uvicorn
 from http import HTTPStatus
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, File, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BeforeValidator
@@ -152,7 +153,10 @@ async def ingest_document(
                         file, bucket_name, uploaded_filename
                     )
                     logger.info(f"Temporary path of saved file: {temp_path}")
-                    ingest_to_pgvector(doc_path=temp_path, bucket=bucket_name)
+                    # Embedding and inserting blocks; keep the event loop serving other requests
+                    superseded_files = await run_in_threadpool(
+                        ingest_to_pgvector, doc_path=temp_path, bucket=bucket_name, document_name=fileName
+                    )
 
                 except Exception as e:
                     raise HTTPException(
@@ -166,6 +170,14 @@ async def ingest_document(
                         Path(temp_path).unlink()
                         logger.info("Temporary file cleaned up!")
 
+                # Previous versions of a re-uploaded document have no embeddings left
+                for superseded_file in superseded_files or []:
+                    try:
+                        DataStore.delete_document(bucket_name, superseded_file)
+                        logger.info(f"Removed previous version {superseded_file} of {fileName}")
+                    except Exception as ex:
+                        logger.error(f"Error removing previous version {superseded_file}: {ex}")
+
         result = {"status": 200, "message": "Data preparation succeeded"}
 
         return result
@@ -367,7 +379,7 @@ async def ingest_links(urls: list[str]) -> dict:
     """
     try:
         if urls:
-            ingest_url_to_pgvector(urls)
+            await run_in_threadpool(ingest_url_to_pgvector, urls)
 
         result = {"status": 200, "message": "Data preparation succeeded"}
         return result
@@ -1,7 +1,6 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import requests
 import psycopg
 import ipaddress
 import socket
@@ -11,12 +10,12 @@ from http import HTTPStatus
 from fastapi import HTTPException
 from typing import List, Optional
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_postgres.vectorstores import PGVector
 from .logger import logger
 from .config import Settings
 from .db_config import pool_execution
-from .utils import get_separators, parse_html
+from .ingestion import PGVectorIngestor, get_embedder
+from .utils import get_separators
+from .fetcher import URLFetcher, get_url_cache
 import idna
 
 config = Settings()
@@ -165,54 +164,20 @@ def validate_url(url: str) -> Optional[str]:
         logger.error(f"URL validation failed: {e}")
         return None
 
-def safe_fetch_url(validated_pinned_url: str, headers: dict, hostname: str):
-    """
-    Securely fetches a URL while mitigating SSRF vulnerabilities.
-
-    This function uses the validated URL for the request and the provided hostname
-    to preserve the Host header for proper TLS and routing. Redirects are disabled
-    to prevent redirect-based SSRF attacks.
-
-    Args:
-        validated_url (str): The validated and pinned URL.
-        headers (dict): A dictionary of HTTP headers to include in the request.
-        hostname (str): The original hostname to use in the Host header.
-
-    Returns:
-        Response: The HTTP response object from the `requests` library.
-
-    Raises:
-        ValueError: If the URL is invalid or DNS resolution fails.
-        requests.RequestException: For any issues during the HTTP request.
-    """
-
-    # Preserve Host header for TLS / correct routing
-    headers = {
-        **headers,
-        "Host": hostname
-    }
-
-    # Send the request to the validated URL to prevent SSRF
-    response = requests.get(
-        validated_pinned_url,
-        headers=headers,
-        timeout=5,
-        allow_redirects=False  # prevent redirect SSRF
-    )
-
-    return response
-
 def ingest_url_to_pgvector(url_list: List[str]) -> None:
     """
     Ingests a list of URLs into a PGVector database by fetching their content,
     splitting it into chunks, generating embeddings, and storing them.
+    The URLs are fetched and parsed concurrently, see `URLFetcher`.
+    A URL ingested again replaces its previous content; only new or changed
+    chunks are embedded.
 
     Args:
         url_list (List[str]): A list of URLs to be ingested.
 
     Raises:
-        HTTPException: If there are issues with SSL, HTTP response status,
-            HTML parsing, or any other errors during the ingestion process.
+        HTTPException: If a URL is invalid, cannot be fetched or parsed, or if
+            any other error occurs during the ingestion process.
     """
 
     default_user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36"
@@ -222,38 +187,16 @@ def ingest_url_to_pgvector(url_list: List[str]) -> None:
     }
 
     try:
-        invalid_urls = 0
-        for url in url_list:
-            # Extract hostname before validating the URL
-            hostname = urlparse(url).hostname
-
-            validated_pinned_url = validate_url(url)  # Validate and pin the URL
-            if not validated_pinned_url:
-                logger.info(f"Invalid URL skipped: {url}")
-                invalid_urls += 1
-                continue
-
-            try:
-                # Use the safe_fetch_url function to securely fetch the URL
-                response = safe_fetch_url(validated_pinned_url, headers, hostname)
-
-                if response.status_code != HTTPStatus.OK:
-                    logger.info(f"Failed to fetch URL: {url} with status code {response.status_code}")
-                    invalid_urls += 1
-            except Exception as e:
-                logger.error(f"Error fetching URL {url}: {e}")
-                invalid_urls += 1
-
-        if invalid_urls > 0:
+        # Each page is downloaded once; the response validates the URL and is parsed
+        fetcher = URLFetcher(headers, resolve=validate_url, cache=get_url_cache())
+        results = fetcher.fetch_all(list(dict.fromkeys(url_list)))
+
+        failed = [result for result in results if result.text is None]
+        if failed:
             raise Exception(
-                f"{invalid_urls} / {len(url_list)} URL(s) are invalid.Last failed status code: {response.status_code}"
+                f"{len(failed)} / {len(results)} URL(s) are invalid. Last failure: {failed[-1].error}"
             )
 
-    except requests.exceptions.SSLError as e:
-        raise HTTPException(
-            status_code=HTTPStatus.FORBIDDEN, detail=f"SSL Error: {str(e)}"
-        )
-
     except Exception as e:
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error during URL ingestion: {e}"
@@ -267,43 +210,19 @@ def ingest_url_to_pgvector(url_list: List[str]) -> None:
             separators=get_separators(),
         )
 
-        embedder = OpenAIEmbeddings(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
-            model=config.EMBEDDING_MODEL_NAME,
-            tiktoken_enabled=False
-        )
+        ingestor = PGVectorIngestor(get_embedder())
 
-        for url in url_list:
-            try:
-                content = parse_html(
-                    [url], chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP
-                )
-            except Exception as e:
-                logger.error(f"Error while parsing HTML content for URL - {url}: {e}")
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error while parsing URL")
-
-            logger.info(f"[ ingest url ] url: {url} content: {content} headers: {headers}")
-            metadata = [{"url": url}]
-
-            chunks = text_splitter.split_text(content)
-            batch_size = config.BATCH_SIZE
-
-            for i in range(0, len(chunks), batch_size):
-                batch_texts = chunks[i : i + batch_size]
-
-                _ = PGVector.from_texts(
-                    texts=batch_texts,
-                    embedding=embedder,
-                    metadatas=metadata,
-                    collection_name=config.INDEX_NAME,
-                    connection=config.PG_CONNECTION_STRING,
-                    use_jsonb=True
-                )
-
-                logger.info(
-                    f"Processed batch {i // batch_size + 1}/{(len(chunks) - 1) // batch_size + 1}"
-                )
+        for result in results:
+            url = result.url
+            logger.info(f"[ ingest url ] url: {url} not modified: {result.not_modified} headers: {headers}")
+
+            chunks = text_splitter.split_text(result.text)
+            # Unchanged chunks of a page ingested before are not embedded again
+            stats = ingestor.sync_texts(chunks, [{"url": url} for _ in chunks], scope={"url": url})
+            logger.info(
+                f"Ingested {stats.chunks} chunks of {url} in {stats.elapsed_seconds:.2f}s "
+                f"({stats.embedded} embedded, {stats.reused} reused, {stats.removed} removed)"
+            )
 
     except Exception as e:
         logger.error(f"Error during ingestion : {e}")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Ingestion throughput benchmark with a stub embedder.
+
+Stores synthetic chunks in a scratch collection of the PGVector database at
+PG_CONNECTION_STRING, once with the previous per-batch
+`PGVector.from_documents` path and once with the pooled ingestion engine, and
+prints chunks/s for each. The stub embedder returns random vectors after a
+fixed delay per request, standing in for the TEI endpoint. The scratch
+collection is dropped afterwards.
+
+Usage (with the service environment loaded, e.g. `source run.sh --nosetup`):
+python scripts/benchmark_ingestion.py
+python scripts/benchmark_ingestion.py --chunks 5000 --dim 1024 --latency-ms 40 --concurrency 8
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import Settings  # noqa: E402
+from app.db_config import pool_execution  # noqa: E402
+from app.ingestion import PGVectorIngestor  # noqa: E402
+
+config = Settings()
+
+
+class StubEmbeddings(Embeddings):
+    """Random vectors of `dim` floats, returned after `latency` seconds per request."""
+
+    def __init__(self, dim: int, latency: float):
+        self.dim = dim
+        self.latency = latency
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency)
+        rng = random.Random(len(texts))
+        return [[rng.uniform(-1, 1) for _ in range(self.dim)] for _ in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def make_documents(count: int, chunk_chars: int):
+    words = ["ingestion", "vector", "pipeline", "document", "chunk", "embedding", "batch", "search"]
+    rng = random.Random(7)
+    documents = []
+    for i in range(count):
+        text = " ".join(rng.choice(words) for _ in range(chunk_chars // 8))[:chunk_chars]
+        documents.append(Document(page_content=text, metadata={"source": "benchmark.txt", "chunk": i}))
+    return documents
+
+
+def run_from_documents(documents, embedder, collection_name, batch_size):
+    from langchain_postgres.vectorstores import PGVector
+
+    for i in range(0, len(documents), batch_size):
+        PGVector.from_documents(
+            documents=documents[i : i + batch_size],
+            embedding=embedder,
+            collection_name=collection_name,
+            connection=config.PG_CONNECTION_STRING,
+            use_jsonb=True
+        )
+
+
+def drop_collection(collection_name):
+    pool_execution(
+        "DELETE FROM langchain_pg_collection WHERE name = %(name)s", {"name": collection_name}
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PGVector ingestion with a stub embedder")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--chunk-chars", type=int, default=1500)
+    parser.add_argument("--dim", type=int, default=1024, help="Embedding dimension")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub embedding latency per request")
+    parser.add_argument("--batch-size", type=int, default=config.BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=config.EMBEDDING_CONCURRENCY)
+    parser.add_argument("--skip-baseline", action="store_true", help="Only run the ingestion engine")
+    args = parser.parse_args()
+
+    documents = make_documents(args.chunks, args.chunk_chars)
+    embedder = StubEmbeddings(args.dim, args.latency_ms / 1000)
+    collection_name = f"benchmark-ingestion-{int(time.time())}"
+
+    print(f"{args.chunks} chunks, dim {args.dim}, batch {args.batch_size}, stub latency {args.latency_ms} ms")
+    try:
+        if not args.skip_baseline:
+            start = time.perf_counter()
+            run_from_documents(documents, embedder, collection_name, args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"{'PGVector.from_documents':<26} {elapsed:8.2f} s {args.chunks / elapsed:10.1f} chunks/s")
+
+        ingestor = PGVectorIngestor(
+            embedder, collection_name, batch_size=args.batch_size, concurrency=args.concurrency
+        )
+        # Schema and collection set-up is a one-off per process; keep it out of the timing
+        ingestor.get_collection_id()
+        stats = ingestor.ingest_documents(documents)
+        print(
+            f"{'PGVectorIngestor':<26} {stats.elapsed_seconds:8.2f} s {stats.chunks_per_second:10.1f} chunks/s "
+            f"(embedding {stats.embed_seconds:.2f} s, COPY {stats.insert_seconds:.2f} s)"
+        )
+    finally:
+        drop_collection(collection_name)
+
+
+if __name__ == "__main__":
+    main()
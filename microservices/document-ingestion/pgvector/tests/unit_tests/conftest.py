@@ -1,6 +1,10 @@
 import pytest
 import sys
 import os
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 sys.path.append(os.getcwd())
 print(sys.path)
 from fastapi.testclient import TestClient
@@ -117,3 +121,71 @@ def mock_pool():
             return MockConnection()
 
     return MockPool()
+
+
+@pytest.fixture
+def http_server():
+    """
+    Local HTTP server serving HTML pages for URL fetching tests.
+    Pages are registered in `server.pages` as path -> {"body": str, "etag": str,
+    "status": int}. Requests answer 304 Not Modified when `If-None-Match` matches
+    the page's ETag, and sleep for `server.delay` seconds before responding.
+    Every request is recorded in `server.requests` as (path, headers), and the
+    highest number of requests in flight at once in `server.max_in_flight`.
+    Yields:
+        ThreadingHTTPServer: The running server; its base URL is `server.base_url`.
+    """
+
+    class PageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server = self.server
+            with server.lock:
+                server.requests.append((self.path, dict(self.headers)))
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            try:
+                time.sleep(server.delay)
+                page = server.pages.get(self.path)
+                if page is None:
+                    self.send_response(HTTPStatus.NOT_FOUND)
+                    self.end_headers()
+                    return
+
+                etag = page.get("etag")
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                body = page["body"].encode("utf-8")
+                self.send_response(page.get("status", HTTPStatus.OK))
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with server.lock:
+                    server.in_flight -= 1
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    server.daemon_threads = True
+    server.pages = {}
+    server.requests = []
+    server.delay = 0.0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.lock = threading.Lock()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+
+    server.shutdown()
+    server.server_close()
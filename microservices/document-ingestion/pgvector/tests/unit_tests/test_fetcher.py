@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+from app.fetcher import URLCache, URLFetcher, html_to_text
+
+
+def allow_all(url):
+    """Resolver accepting every URL as is, so the local test server can be fetched."""
+    return url
+
+
+@pytest.fixture
+def parse_pool():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def make_fetcher(tmp_path, parse_pool, **kwargs):
+    return URLFetcher(
+        {"User-Agent": "test"},
+        resolve=kwargs.pop("resolve", allow_all),
+        cache=URLCache(tmp_path / "url_cache.db"),
+        session=requests.Session(),
+        parse_pool=parse_pool,
+        **kwargs,
+    )
+
+
+def test_fetch_all_downloads_each_url_once(http_server, tmp_path, parse_pool):
+    """
+    Every URL is requested exactly once, the converted text is returned in the
+    order of the input and concurrent requests stay within the per-host limit.
+    """
+
+    http_server.delay = 0.05
+    for i in range(8):
+        http_server.pages[f"/page{i}"] = {"body": f"<html><body><h1>Page {i}</h1><p>Text {i}</p></body></html>"}
+    urls = [f"{http_server.base_url}/page{i}" for i in range(8)]
+
+    results = make_fetcher(tmp_path, parse_pool, workers=8, per_host=3).fetch_all(urls)
+
+    assert [result.url for result in results] == urls
+    assert all(result.status_code == 200 and result.error is None for result in results)
+    assert "Page 5" in results[5].text and "Text 5" in results[5].text
+    assert sorted(path for path, _ in http_server.requests) == sorted(f"/page{i}" for i in range(8))
+    assert 1 < http_server.max_in_flight <= 3
+
+
+def test_fetch_all_uses_conditional_requests(http_server, tmp_path, parse_pool):
+    """An unchanged page is answered with 304 and its cached text is returned."""
+
+    http_server.pages["/article"] = {"body": "<p>Cached article</p>", "etag": '"v1"'}
+    url = f"{http_server.base_url}/article"
+
+    first = make_fetcher(tmp_path, parse_pool).fetch_all([url])[0]
+    second = make_fetcher(tmp_path, parse_pool).fetch_all([url])[0]
+
+    assert not first.not_modified
+    assert second.not_modified and second.status_code == 304
+    assert second.text == first.text
+    assert http_server.requests[1][1].get("If-None-Match") == '"v1"'
+
+    # A changed page is downloaded and parsed again
+    http_server.pages["/article"] = {"body": "<p>Updated article</p>", "etag": '"v2"'}
+    third = make_fetcher(tmp_path, parse_pool).fetch_all([url])[0]
+
+    assert not third.not_modified
+    assert "Updated article" in third.text
+
+
+def test_fetch_all_reports_failures(http_server, tmp_path, parse_pool):
+    """Rejected URLs are not requested; error responses leave the result without text."""
+
+    http_server.pages["/ok"] = {"body": "<p>ok</p>"}
+    blocked = f"{http_server.base_url}/blocked"
+    urls = [f"{http_server.base_url}/ok", f"{http_server.base_url}/missing", blocked]
+
+    fetcher = make_fetcher(tmp_path, parse_pool, resolve=lambda url: None if url == blocked else url)
+    ok, missing, rejected = fetcher.fetch_all(urls)
+
+    assert ok.text is not None
+    assert missing.text is None and missing.status_code == 404
+    assert rejected.text is None and rejected.error == "Invalid URL"
+    assert "/blocked" not in [path for path, _ in http_server.requests]
+
+
+def test_html_to_text():
+    """Links and images are dropped from the converted text."""
+
+    text = html_to_text('<h2>Title</h2><p>See <a href="https://example.com">docs</a><img src="x.png"></p>')
+
+    assert "Title" in text and "docs" in text
+    assert "example.com" not in text and "x.png" not in text
@@ -0,0 +1,207 @@
+import threading
+import time
+import uuid
+import pytest
+from langchain_core.documents import Document
+from app import ingestion
+from app.ingestion import PGVectorIngestor, chunk_hash, vector_literal
+
+
+class StubEmbedder:
+    """Returns a deterministic vector per text and records the batches it receives."""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        time.sleep(self.delay)
+        if self.fail_on is not None and self.fail_on in texts:
+            raise RuntimeError("embedding endpoint unavailable")
+        with self.lock:
+            self.batches.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+@pytest.fixture
+def copy_pool():
+    """
+    Mock connection pool whose cursors record the rows written with COPY and
+    whose connections record whether the transaction was committed.
+    """
+
+    class MockCopy:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def write_row(self, row):
+            self.rows.append(row)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            pass
+
+    class MockCursor:
+        def __init__(self, pool):
+            self.pool = pool
+
+        def execute(self, query, params=None):
+            self.pool.queries.append((query, params))
+
+        def executemany(self, query, params_seq):
+            self.pool.queries.extend((query, params) for params in params_seq)
+
+        def fetchone(self):
+            return (self.pool.collection_id,)
+
+        def fetchall(self):
+            return self.pool.stored
+
+        def copy(self, statement):
+            self.pool.copies.append(statement)
+            return MockCopy(self.pool.rows)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            pass
+
+    class MockConnection:
+        def __init__(self, pool):
+            self.pool = pool
+
+        def cursor(self):
+            return MockCursor(self.pool)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            self.pool.commits.append(exc_type is None)
+
+    class MockPool:
+        def __init__(self):
+            self.collection_id = uuid.uuid4()
+            self.queries = []
+            self.copies = []
+            self.rows = []
+            self.commits = []
+            # (id, cmetadata) rows returned for the stored chunks of a scope
+            self.stored = []
+
+        def connection(self):
+            return MockConnection(self)
+
+    ingestion._collection_ids.clear()
+    yield MockPool()
+    ingestion._collection_ids.clear()
+
+
+def test_ingest_documents_copies_all_batches_in_order(copy_pool):
+    """
+    Chunks are embedded in batches and every chunk is written with COPY in its
+    original order, with its metadata and the collection id.
+    """
+
+    embedder = StubEmbedder(delay=0.01)
+    documents = [Document(page_content=f"chunk {i}", metadata={"source": "doc.txt", "index": i}) for i in range(10)]
+    progress = []
+
+    ingestor = PGVectorIngestor(embedder, "test-index", pool=copy_pool, batch_size=3, concurrency=2)
+    stats = ingestor.ingest_documents(documents, progress=lambda done, total: progress.append((done, total)))
+
+    assert stats.chunks == 10
+    assert stats.batches == 4
+    assert sorted(len(batch) for batch in embedder.batches) == [1, 3, 3, 3]
+    assert len(copy_pool.copies) == 4
+    assert [row[3] for row in copy_pool.rows] == [doc.page_content for doc in documents]
+    assert all(row[1] == copy_pool.collection_id for row in copy_pool.rows)
+    assert copy_pool.rows[4][2] == vector_literal([7.0, 0.5])
+    assert copy_pool.rows[4][4].obj == {"source": "doc.txt", "index": 4, "content_hash": chunk_hash("chunk 4")}
+    assert len({row[0] for row in copy_pool.rows}) == 10
+    assert progress == [(3, 10), (6, 10), (9, 10), (10, 10)]
+    # One transaction for the schema/collection set-up and one for the chunks
+    assert copy_pool.commits == [True, True]
+
+
+def test_ingest_reuses_collection_id(copy_pool):
+    """The schema set-up runs once per collection; later runs only open the insert transaction."""
+
+    ingestor = PGVectorIngestor(StubEmbedder(), "test-index", pool=copy_pool, batch_size=2)
+    ingestor.ingest_texts(["a", "b"], [{}, {}])
+    setup_queries = len(copy_pool.queries)
+    ingestor.ingest_texts(["c"], [{"url": "https://example.com"}])
+
+    assert len(copy_pool.queries) == setup_queries
+    assert copy_pool.commits == [True, True, True]
+
+
+def test_ingest_failure_rolls_back(copy_pool):
+    """An embedding error aborts the run and the insert transaction is not committed."""
+
+    ingestor = PGVectorIngestor(StubEmbedder(fail_on="c"), "test-index", pool=copy_pool, batch_size=2, concurrency=1)
+
+    with pytest.raises(RuntimeError):
+        ingestor.ingest_texts(["a", "b", "c", "d", "e"], [{}] * 5)
+
+    assert copy_pool.commits[-1] is False
+
+
+def test_ingest_without_chunks(copy_pool):
+    """Nothing is embedded or written when there are no chunks."""
+
+    stats = PGVectorIngestor(StubEmbedder(), "test-index", pool=copy_pool).ingest_texts([], [])
+
+    assert stats.chunks == 0
+    assert copy_pool.commits == []
+
+
+def test_sync_embeds_only_changed_chunks(copy_pool):
+    """
+    On re-ingest, unchanged chunks keep their rows (metadata updated if needed),
+    new chunks are embedded and chunks missing from the new version are deleted.
+    """
+
+    scope = {"bucket": "bucket1", "document": "doc.pdf"}
+    copy_pool.stored = [
+        ("id-1", {**scope, "filename": "v1.pdf", "content_hash": chunk_hash("intro")}),
+        ("id-2", {**scope, "filename": "v2.pdf", "content_hash": chunk_hash("body")}),
+        ("id-3", {**scope, "filename": "v2.pdf", "content_hash": chunk_hash("old ending")}),
+    ]
+    embedder = StubEmbedder()
+    ingestor = PGVectorIngestor(embedder, "test-index", pool=copy_pool, batch_size=2)
+
+    texts = ["intro", "body", "new ending"]
+    metadatas = [{**scope, "filename": "v2.pdf"} for _ in texts]
+    stats = ingestor.sync_texts(texts, metadatas, scope)
+
+    assert embedder.batches == [["new ending"]]
+    assert (stats.embedded, stats.reused, stats.removed) == (1, 2, 1)
+    assert [row[3] for row in copy_pool.rows] == ["new ending"]
+    assert ("DELETE FROM langchain_pg_embedding WHERE id = ANY(%s)", (["id-3"],)) in copy_pool.queries
+    updated = [params[1] for query, params in copy_pool.queries if query.startswith("UPDATE")]
+    assert updated == ["id-1"]
+    assert {metadata["filename"] for metadata in stats.previous_metadata} == {"v1.pdf", "v2.pdf"}
+
+
+def test_sync_unchanged_content_makes_no_embedding_calls(copy_pool):
+    """Re-ingesting unchanged content neither embeds nor writes anything."""
+
+    url = "https://example.com/page"
+    copy_pool.stored = [
+        (f"id-{i}", {"url": url, "content_hash": chunk_hash(text)}) for i, text in enumerate(["a", "b", "a"])
+    ]
+    embedder = StubEmbedder()
+    ingestor = PGVectorIngestor(embedder, "test-index", pool=copy_pool)
+
+    stats = ingestor.sync_texts(["a", "b", "a"], [{"url": url}] * 3, scope={"url": url})
+
+    assert embedder.batches == []
+    assert (stats.embedded, stats.reused, stats.removed) == (0, 3, 0)
+    assert copy_pool.copies == []
+    assert not [query for query, _ in copy_pool.queries if query.startswith(("UPDATE", "DELETE"))]
@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Load-test and latency benchmark for Multimodal Embedding Serving
+
+Drives either a running server (``--mode server``, HTTP ``/embeddings``) or the
+SDK in-process (``--mode sdk``) with a reproducible workload and writes a JSON
+report, so that changes to batching, encodings, decoding or model placement can
+be compared run over run.
+
+Workload knobs:
+- ``--concurrency``: number of requests in flight
+- ``--mix``: modality mix, e.g. ``text=0.5,image=0.3,video=0.2``
+- ``--batch-sizes``: texts per request, frames per image batch (sent as
+  ``video_frames``) and frames sampled per video
+- ``--image-sizes``: edge length of the synthetic images/video frames, which
+  controls the request payload size
+
+All inputs are synthetic and generated locally (JPEG images and an MP4 clip in a
+temporary directory). Image and video URLs are served from a loopback HTTP server
+started by the benchmark, so no external network access is needed.
+
+Report contents (per scenario and per modality):
+- throughput (requests/s and embedded items/s)
+- latency p50/p95/p99/mean/max in milliseconds
+- per-stage times in milliseconds. The SDK mode measures download, decode,
+  preprocess, infer and serialize directly. The server mode measures client-side
+  request serialization and response decoding, and reads the ``Server-Timing``
+  header (``infer`` covers download, decode, preprocess and inference on the
+  server; ``serialize`` covers response encoding).
+- memory high-water mark of the benchmark process, and of the server when
+  ``--server-pid`` is given (``VmHWM`` from ``/proc``)
+
+Usage:
+    # Against a running server
+    python examples/benchmark.py --mode server --url http://localhost:8000 \\
+        --concurrency 8 --requests 200 --mix text=0.6,image=0.4 --batch-sizes 1,8
+
+    # In-process SDK run with compact base64/int8 responses
+    python examples/benchmark.py --mode sdk --model CLIP/clip-vit-b-16 \\
+        --encoding-format base64 --embedding-dtype int8 --output report.json
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+MODALITIES = ("text", "image", "video")
+SAMPLE_WORDS = (
+    "a photo of a red car parked near the river at sunset while people walk by "
+    "the old bridge and a dog chases a ball across the green park"
+).split()
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+class SyntheticAssets:
+    """
+    Generates and caches synthetic images and videos on local disk.
+
+    Images are gradients with seeded noise so that JPEG sizes are realistic
+    (pure noise compresses badly, flat colours compress too well).
+    """
+
+    def __init__(self, root: str, seed: int = 0, video_fps: int = 15, video_seconds: int = 4):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.rng = np.random.default_rng(seed)
+        self.video_fps = video_fps
+        self.video_seconds = video_seconds
+        self._images: Dict[int, str] = {}
+        self._videos: Dict[int, str] = {}
+        self._base64: Dict[str, str] = {}
+
+    def _frame(self, size: int, phase: float = 0.0) -> np.ndarray:
+        y, x = np.mgrid[0:size, 0:size].astype(np.float32) / max(size - 1, 1)
+        rgb = np.stack([x, y, (x + y + phase) % 1.0], axis=-1) * 200
+        rgb += self.rng.normal(0, 20, rgb.shape)
+        return np.clip(rgb, 0, 255).astype(np.uint8)
+
+    def image_path(self, size: int) -> str:
+        if size not in self._images:
+            path = self.root / f"image_{size}.jpg"
+            Image.fromarray(self._frame(size)).save(path, format="JPEG", quality=90)
+            self._images[size] = str(path)
+        return self._images[size]
+
+    def video_path(self, size: int) -> str:
+        if size not in self._videos:
+            import cv2
+
+            path = self.root / f"video_{size}.mp4"
+            writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), self.video_fps, (size, size))
+            try:
+                total = self.video_fps * self.video_seconds
+                for i in range(total):
+                    writer.write(cv2.cvtColor(self._frame(size, i / total), cv2.COLOR_RGB2BGR))
+            finally:
+                writer.release()
+            self._videos[size] = str(path)
+        return self._videos[size]
+
+    def base64_of(self, path: str) -> str:
+        if path not in self._base64:
+            with open(path, "rb") as f:
+                self._base64[path] = base64.b64encode(f.read()).decode("ascii")
+        return self._base64[path]
+
+    def texts(self, count: int, words: int) -> List[str]:
+        return [
+            " ".join(random.choice(SAMPLE_WORDS) for _ in range(words)) + f" #{i}"
+            for i in range(count)
+        ]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 - signature from base class
+        pass
+
+
+class LocalAssetServer:
+    """Loopback HTTP server exposing the synthetic assets as URLs."""
+
+    def __init__(self, root: str, host: str = "127.0.0.1"):
+        handler = partial(_QuietHandler, directory=root)
+        self.server = ThreadingHTTPServer((host, 0), handler)
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{os.path.basename(path)}"
+
+    def __enter__(self) -> "LocalAssetServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Sample:
+    """Outcome of one benchmark request."""
+
+    modality: str
+    latency: float
+    items: int = 0
+    ok: bool = True
+    error: Optional[str] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    stages: Dict[str, float] = field(default_factory=dict)
+
+
+def _percentiles_ms(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    arr = np.asarray(values, dtype=np.float64) * 1000
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "mean": round(float(arr.mean()), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def summarize(samples: List[Sample], wall_seconds: float) -> Dict[str, Any]:
+    """Aggregate samples into throughput, latency and per-stage statistics."""
+    ok = [s for s in samples if s.ok]
+    stage_names = sorted({name for s in ok for name in s.stages})
+    errors: Dict[str, int] = {}
+    for s in samples:
+        if not s.ok:
+            errors[s.error or "unknown"] = errors.get(s.error or "unknown", 0) + 1
+    return {
+        "requests": len(samples),
+        "succeeded": len(ok),
+        "failed": len(samples) - len(ok),
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(len(ok) / wall_seconds, 3) if wall_seconds else 0.0,
+        "items_per_second": round(sum(s.items for s in ok) / wall_seconds, 3) if wall_seconds else 0.0,
+        "latency_ms": _percentiles_ms([s.latency for s in ok]),
+        "stages_ms": {
+            name: _percentiles_ms([s.stages[name] for s in ok if name in s.stages])
+            for name in stage_names
+        },
+        "request_bytes_mean": round(float(np.mean([s.request_bytes for s in ok])), 1) if ok else 0,
+        "response_bytes_mean": round(float(np.mean([s.response_bytes for s in ok])), 1) if ok else 0,
+    }
+
+
+def peak_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Memory high-water mark of this process, or of ``pid`` via /proc."""
+    if pid is None:
+        # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024), 1)
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``text=0.5,image=0.5`` into normalized modality weights."""
+    weights: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in MODALITIES:
+            raise ValueError(f"Unknown modality '{name}'. Supported: {', '.join(MODALITIES)}")
+        weights[name] = float(value or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Modality mix must have a positive total weight")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def build_plan(mix: Dict[str, float], count: int, rng: random.Random) -> List[str]:
+    """Return a shuffled list of modalities whose proportions follow ``mix``."""
+    plan: List[str] = []
+    for name, weight in mix.items():
+        plan.extend([name] * round(weight * count))
+    while len(plan) < count:
+        plan.append(max(mix, key=mix.get))
+    plan = plan[:count]
+    rng.shuffle(plan)
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Server driver
+# ---------------------------------------------------------------------------
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """Parse ``name;dur=12.3, other;dur=4`` into seconds per stage."""
+    stages: Dict[str, float] = {}
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                try:
+                    stages[f"server_{name}"] = float(value) / 1000
+                except ValueError:
+                    pass
+    return stages
+
+
+class ServerDriver:
+    """Sends requests to a running ``/embeddings`` endpoint."""
+
+    def __init__(self, args: argparse.Namespace, assets: SyntheticAssets, asset_server: LocalAssetServer):
+        self.args = args
+        self.assets = assets
+        self.asset_server = asset_server
+
+    def build_input(self, modality: str, batch: int, size: int) -> Dict[str, Any]:
+        if modality == "text":
+            texts = self.assets.texts(batch, self.args.text_words)
+            return {"type": "text", "text": texts if batch > 1 else texts[0]}
+        if modality == "image":
+            path = self.assets.image_path(size)
+            if self.args.image_source == "url":
+                image = {"type": "image_url", "image_url": self.asset_server.url(path)}
+            else:
+                image = {"type": "image_base64", "image_base64": self.assets.base64_of(path)}
+            if batch == 1:
+                return image
+            return {"type": "video_frames", "video_frames": [image] * batch}
+        path = self.assets.video_path(size)
+        segment_config = {"startOffsetSec": 0, "clip_duration": -1, "num_frames": batch}
+        if self.args.video_source == "url":
+            return {"type": "video_url", "video_url": self.asset_server.url(path), "segment_config": segment_config}
+        return {"type": "video_base64", "video_base64": self.assets.base64_of(path), "segment_config": segment_config}
+
+    async def run_one(self, client, modality: str, batch: int, size: int) -> Sample:
+        start = time.perf_counter()
+        body = json.dumps({
+            "model": self.args.model,
+            "input": self.build_input(modality, batch, size),
+            "encoding_format": self.args.encoding_format,
+            "embedding_dtype": self.args.embedding_dtype,
+        }).encode("utf-8")
+        serialized = time.perf_counter()
+        try:
+            response = await client.post(
+                "/embeddings", content=body, headers={"Content-Type": "application/json"}
+            )
+        except Exception as e:
+            return Sample(modality, time.perf_counter() - start, ok=False, error=type(e).__name__)
+        received = time.perf_counter()
+        if response.status_code != 200:
+            return Sample(modality, received - start, ok=False, error=f"HTTP {response.status_code}")
+        items = self._count_items(response)
+        done = time.perf_counter()
+        stages = {"client_serialize": serialized - start, "client_decode": done - received}
+        stages.update(parse_server_timing(response.headers.get("server-timing")))
+        return Sample(
+            modality,
+            done - start,
+            items=items,
+            request_bytes=len(body),
+            response_bytes=len(response.content),
+            stages=stages,
+        )
+
+    def _count_items(self, response) -> int:
+        if self.args.encoding_format == "binary":
+            # Header layout: magic, version, dtype, ndim, then ndim uint32 dims
+            data = response.content
+            ndim = int.from_bytes(data[6:8], "little")
+            return int.from_bytes(data[8:12], "little") if ndim == 2 else 1
+        payload = response.json()
+        if self.args.encoding_format == "base64":
+            shape = payload.get("shape") or [1]
+            return shape[0] if len(shape) == 2 else 1
+        embedding = payload.get("embedding") or []
+        return len(embedding) if embedding and isinstance(embedding[0], list) else 1
+
+    async def run_scenario(self, plan: List[str], batch: int, size: int) -> List[Sample]:
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.args.concurrency, max_keepalive_connections=self.args.concurrency)
+        timeout = httpx.Timeout(self.args.timeout)
+        async with httpx.AsyncClient(base_url=self.args.url, limits=limits, timeout=timeout) as client:
+            for modality in sorted(set(plan)):
+                for _ in range(self.args.warmup):
+                    await self.run_one(client, modality, batch, size)
+            semaphore = asyncio.Semaphore(self.args.concurrency)
+
+            async def bounded(modality: str) -> Sample:
+                async with semaphore:
+                    return await self.run_one(client, modality, batch, size)
+
+            return list(await asyncio.gather(*(bounded(m) for m in plan)))
+
+    def describe(self) -> Dict[str, Any]:
+        info: Dict[str, Any] = {"url": self.args.url}
+        try:
+            with urllib.request.urlopen(f"{self.args.url}/models", timeout=10) as resp:
+                info["models"] = json.loads(resp.read())
+        except Exception as e:
+            info["models_error"] = str(e)
+        return info
+
+
+# ---------------------------------------------------------------------------
+# SDK driver
+# ---------------------------------------------------------------------------
+
+def _import_sdk():
+    """Import the SDK from the installed wheel, falling back to the source tree."""
+    try:
+        from multimodal_embedding_serving.src.models import get_model_handler
+        from multimodal_embedding_serving.src.wrapper import EmbeddingModel
+        from multimodal_embedding_serving.src.utils import encoding, utils
+    except ImportError:
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from src.models import get_model_handler
+        from src.wrapper import EmbeddingModel
+        from src.utils import encoding, utils
+    return get_model_handler, EmbeddingModel, encoding, utils
+
+
+class SdkDriver:
+    """Runs the same workload in-process and times each pipeline stage."""
+
+    def __init__(self, args: argparse.Namespace, assets: SyntheticAssets, asset_server: LocalAssetServer):
+        get_model_handler, EmbeddingModel, self.encoding, self.utils = _import_sdk()
+        self.args = args
+        self.assets = assets
+        self.asset_server = asset_server
+        start = time.perf_counter()
+        self.handler = get_model_handler(args.model, device=args.device, use_openvino=args.use_openvino)
+        self.handler.load_model()
+        self.model = EmbeddingModel(self.handler)
+        self.load_seconds = time.perf_counter() - start
+        self.executor = ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="bench")
+
+    def _serialize(self, embedding: Any) -> int:
+        if self.args.encoding_format == "binary":
+            return len(self.encoding.pack_embeddings(embedding, self.args.embedding_dtype))
+        body = self.encoding.encode_embedding_response(
+            embedding, self.args.encoding_format, self.args.embedding_dtype
+        )
+        return len(json.dumps(body))
+
+    def _encode_frames(self, frames: List[Image.Image], stages: Dict[str, float]) -> Any:
+        """Preprocess and encode frames, timing the two stages separately when possible."""
+        import torch
+
+        t0 = time.perf_counter()
+        try:
+            batch = torch.stack([self.handler.preprocess_image(frame) for frame in frames])
+        except Exception:
+            # Handlers without a standalone preprocess step: time both stages as inference
+            batch = frames
+        t1 = time.perf_counter()
+        with torch.no_grad():
+            embeddings = self.handler.encode_image(batch)
+        stages["preprocess"] = t1 - t0
+        stages["infer"] = time.perf_counter() - t1
+        return embeddings
+
+    def run_one(self, modality: str, batch: int, size: int) -> Sample:
+        stages: Dict[str, float] = {}
+        start = time.perf_counter()
+        try:
+            if modality == "text":
+                texts = self.assets.texts(batch, self.args.text_words)
+                t0 = time.perf_counter()
+                embedding = self.model.embed_documents(texts)
+                stages["infer"] = time.perf_counter() - t0
+                request_bytes = sum(len(t) for t in texts)
+            elif modality == "image":
+                path = self.assets.image_path(size)
+                t0 = time.perf_counter()
+                if self.args.image_source == "url":
+                    with urllib.request.urlopen(self.asset_server.url(path), timeout=self.args.timeout) as resp:
+                        raw = resp.read()
+                    stages["download"] = time.perf_counter() - t0
+                    t0 = time.perf_counter()
+                    frames = [Image.open(io.BytesIO(raw)).convert("RGB") for _ in range(batch)]
+                else:
+                    encoded = self.assets.base64_of(path)
+                    raw = encoded.encode("ascii")
+                    frames = [self.utils.decode_base64_image(encoded) for _ in range(batch)]
+                stages["decode"] = time.perf_counter() - t0
+                request_bytes = len(raw) * batch
+                embedding = self._encode_frames(frames, stages)
+            else:
+                path = self.assets.video_path(size)
+                request_bytes = os.path.getsize(path)
+                t0 = time.perf_counter()
+                with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
+                    if self.args.video_source == "url":
+                        with urllib.request.urlopen(self.asset_server.url(path), timeout=self.args.timeout) as resp:
+                            shutil.copyfileobj(resp, tmp)
+                    else:
+                        tmp.write(base64.b64decode(self.assets.base64_of(path)))
+                stages["download"] = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                try:
+                    frames = self.utils.extract_video_frames(
+                        tmp.name, {"startOffsetSec": 0, "clip_duration": -1, "num_frames": batch}
+                    )
+                finally:
+                    os.remove(tmp.name)
+                stages["decode"] = time.perf_counter() - t0
+                embedding = self._encode_frames(frames, stages)
+            t0 = time.perf_counter()
+            response_bytes = self._serialize(embedding)
+            stages["serialize"] = time.perf_counter() - t0
+        except Exception as e:
+            return Sample(modality, time.perf_counter() - start, ok=False, error=f"{type(e).__name__}: {e}")
+        return Sample(
+            modality,
+            time.perf_counter() - start,
+            items=len(embedding),
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            stages=stages,
+        )
+
+    async def run_scenario(self, plan: List[str], batch: int, size: int) -> List[Sample]:
+        loop = asyncio.get_running_loop()
+        for modality in sorted(set(plan)):
+            for _ in range(self.args.warmup):
+                await loop.run_in_executor(self.executor, self.run_one, modality, batch, size)
+        futures = [loop.run_in_executor(self.executor, self.run_one, m, batch, size) for m in plan]
+        return list(await asyncio.gather(*futures))
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "model": self.args.model,
+            "device": self.model.device,
+            "use_openvino": self.model.use_openvino,
+            "load_seconds": round(self.load_seconds, 3),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the multimodal embedding service")
+    parser.add_argument("--mode", choices=("server", "sdk"), default="server")
+    parser.add_argument("--url", default=os.getenv("EMBEDDING_SERVER_URL", "http://localhost:8000"))
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL_NAME", "CLIP/clip-vit-b-16"))
+    parser.add_argument("--device", default=None, help="SDK mode only (defaults to EMBEDDING_DEVICE)")
+    parser.add_argument("--use-openvino", action="store_true", default=None, help="SDK mode only")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="Warm-up requests per modality and scenario")
+    parser.add_argument("--mix", default="text=0.5,image=0.3,video=0.2")
+    parser.add_argument("--batch-sizes", type=_int_list, default=[1, 8])
+    parser.add_argument("--image-sizes", type=_int_list, default=[224, 640])
+    parser.add_argument("--text-words", type=int, default=16)
+    parser.add_argument("--image-source", choices=("base64", "url"), default="base64")
+    parser.add_argument("--video-source", choices=("base64", "url"), default="base64")
+    parser.add_argument("--encoding-format", choices=("float", "base64", "binary"), default="float")
+    parser.add_argument("--embedding-dtype", choices=("float32", "float16", "int8"), default="float32")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--server-pid", type=int, default=None, help="Report the server's memory high-water mark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file (default: stdout)")
+    args = parser.parse_args(argv)
+    args.url = args.url.rstrip("/")
+    if args.concurrency < 1 or args.requests < 1:
+        parser.error("--concurrency and --requests must be positive")
+    return args
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    workdir = tempfile.mkdtemp(prefix="embedding-bench-")
+    try:
+        assets = SyntheticAssets(workdir, seed=args.seed)
+        for size in args.image_sizes:
+            if "image" in mix:
+                assets.image_path(size)
+            if "video" in mix:
+                assets.video_path(size)
+        with LocalAssetServer(workdir) as asset_server:
+            driver_cls = SdkDriver if args.mode == "sdk" else ServerDriver
+            driver = driver_cls(args, assets, asset_server)
+            scenarios = []
+            for batch in args.batch_sizes:
+                for size in args.image_sizes:
+                    plan = build_plan(mix, args.requests, rng)
+                    started = time.perf_counter()
+                    samples = await driver.run_scenario(plan, batch, size)
+                    wall = time.perf_counter() - started
+                    scenarios.append({
+                        "batch_size": batch,
+                        "image_size": size,
+                        "overall": summarize(samples, wall),
+                        "by_modality": {
+                            m: summarize([s for s in samples if s.modality == m], wall)
+                            for m in sorted(set(plan))
+                        },
+                    })
+                    print(
+                        f"batch={batch} size={size}: "
+                        f"{scenarios[-1]['overall']['throughput_rps']} req/s, "
+                        f"p95={scenarios[-1]['overall']['latency_ms'].get('p95')} ms",
+                        file=sys.stderr,
+                    )
+            target = driver.describe()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "mode": args.mode,
+        "target": target,
+        "config": {
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "mix": mix,
+            "batch_sizes": args.batch_sizes,
+            "image_sizes": args.image_sizes,
+            "image_source": args.image_source,
+            "video_source": args.video_source,
+            "encoding_format": args.encoding_format,
+            "embedding_dtype": args.embedding_dtype,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "scenarios": scenarios,
+        "memory": {
+            "client_peak_rss_mb": peak_rss_mb(),
+            "server_peak_rss_mb": peak_rss_mb(args.server_pid) if args.server_pid else None,
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,16 +19,34 @@ Key endpoints:
 - /embeddings: Generate embeddings from input data
 
 The application follows a factory pattern for model instantiation and provides
-comprehensive error handling and logging.
+comprehensive error handling and logging. Several models can stay resident in
+one process (see ``model_manager``); requests are routed by their ``model``.
 """
 
+import asyncio
+import time
+import numpy as np
 from typing import List, Union, Optional
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel, Field, validator
-from .utils import ErrorMessages, logger, settings, decode_base64_image, download_image
-from .models import ModelFactory, get_model_handler, list_available_models
-from .wrapper import EmbeddingModel
+from .utils import (
+    EMBEDDING_BINARY_MEDIA_TYPE,
+    SUPPORTED_EMBEDDING_DTYPES,
+    SUPPORTED_ENCODING_FORMATS,
+    ErrorMessages,
+    decode_base64_image,
+    delete_file,
+    download_image,
+    download_video,
+    encode_embedding_response,
+    logger,
+    pack_embeddings,
+    settings,
+)
+from .models import ModelFactory, list_available_models
+from .model_manager import ModelManager
 
 app = FastAPI(title=settings.APP_DISPLAY_NAME, description=settings.APP_DESC)
 
@@ -42,7 +60,9 @@ app.add_middleware(
 
 # Initialize the model once
 embedding_model = None
+model_manager: Optional[ModelManager] = None
 health_status = False
+_idle_reaper_task = None
 
 
 @app.on_event("startup")
@@ -51,12 +71,13 @@ async def startup_event():
     Application startup event handler.
     
     Initializes the embedding model based on configuration settings.
-    Validates model support, loads the model handler, and performs health checks.
+    Validates model support, loads the default and pinned model handlers,
+    and performs health checks. Extra models are loaded on first request.
     
     Raises:
         RuntimeError: If model is not supported or fails to initialize
     """
-    global embedding_model, health_status
+    global embedding_model, model_manager, health_status, _idle_reaper_task
     logger.info(f"Starting application with model: {settings.EMBEDDING_MODEL_NAME}")
     
     # Check if the model is supported
@@ -66,24 +87,38 @@ async def startup_event():
         logger.error(f"Available models: {available_models}")
         raise RuntimeError(f"Unsupported model: {settings.EMBEDDING_MODEL_NAME}")
     
-    # Create model using the factory pattern
+    # Create models using the factory pattern
     try:
-        model_handler = get_model_handler(settings.EMBEDDING_MODEL_NAME)
-        model_handler.load_model()
-        
+        model_manager = ModelManager.from_settings()
+
         # Note: OpenVINO conversion is handled within load_model() if use_openvino=True
         # No need to call convert_to_openvino() separately
-        
-        # Wrap with application-level functionality
-        embedding_model = EmbeddingModel(model_handler)
-        
+        resident = await model_manager.load(model_manager.default_model)
+        embedding_model = resident.embedding_model
+        for model_id in model_manager.served_models():
+            if model_id != model_manager.default_model and model_manager.options_for(model_id).pinned:
+                await model_manager.load(model_id)
+
         # Check model health
         health_status = embedding_model.check_health()
-        logger.info(f"Model {settings.EMBEDDING_MODEL_NAME} loaded successfully")
+        logger.info(f"Model {settings.EMBEDDING_MODEL_NAME} loaded successfully; "
+                    f"serving {model_manager.served_models()}")
     except Exception as e:
         logger.error(f"Failed to load model {settings.EMBEDDING_MODEL_NAME}: {e}")
         raise RuntimeError(f"Failed to initialize model: {e}")
 
+    if model_manager.idle_timeout_sec:
+        _idle_reaper_task = asyncio.create_task(model_manager.run_idle_reaper())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the idle reaper and release all resident models."""
+    if _idle_reaper_task is not None:
+        _idle_reaper_task.cancel()
+    if model_manager is not None:
+        model_manager.shutdown()
+
 
 class TextInput(BaseModel):
     """
@@ -194,6 +229,10 @@ class FrameInfo(BaseModel):
     detection_confidence: Optional[float] = Field(None, ge=0.0, le=1.0, description="Detection confidence score")
     crop_bbox: Optional[List[int]] = Field(None, description="Bounding box coordinates [x1, y1, x2, y2]")
     crop_index: Optional[int] = Field(None, ge=0, description="Crop index for the frame")
+
+    # Optional fields for memory-mapped tensor store manifests
+    tensor_index: Optional[int] = Field(None, ge=0, description="Index into tensor_store.entries")
+    tensor_bbox: Optional[List[int]] = Field(None, description="Region [x1, y1, x2, y2] of the referenced tensor")
     
     @validator('crop_bbox')
     def validate_bbox(cls, v):
@@ -219,6 +258,9 @@ class FramesManifest(BaseModel):
     # Optional metadata
     video_metadata: Optional[dict] = Field(None, description="Original video metadata")
     processing_metadata: Optional[dict] = Field(None, description="Processing configuration metadata")
+    tensor_store: Optional[dict] = Field(
+        None, description="Packed uint8 frame tensor file (path, dtype, layout, entries offsets table)"
+    )
     
     @validator('frames')
     def validate_frames_not_empty(cls, v):
@@ -234,7 +276,9 @@ class EmbeddingRequest(BaseModel):
     Attributes:
         model: Name of the model to use for embedding generation
         input: Input data (text, image, or video in various formats)
-        encoding_format: Format for the returned embeddings
+        encoding_format: Format for the returned embeddings ("float", "base64" or "binary")
+        embedding_dtype: Payload dtype for the base64/binary formats
+            ("float32", "float16" or "int8" with per-vector scale factors)
     """
     model: str
     input: Union[
@@ -247,7 +291,24 @@ class EmbeddingRequest(BaseModel):
         VideoFileInput,
         FramesBatchInput,
     ]
-    encoding_format: str
+    encoding_format: str = "float"
+    embedding_dtype: str = "float32"
+
+    @validator("encoding_format")
+    def validate_encoding_format(cls, v):
+        if v not in SUPPORTED_ENCODING_FORMATS:
+            raise ValueError(
+                f"encoding_format must be one of {', '.join(SUPPORTED_ENCODING_FORMATS)}"
+            )
+        return v
+
+    @validator("embedding_dtype")
+    def validate_embedding_dtype(cls, v):
+        if v not in SUPPORTED_EMBEDDING_DTYPES:
+            raise ValueError(
+                f"embedding_dtype must be one of {', '.join(SUPPORTED_EMBEDDING_DTYPES)}"
+            )
+        return v
 
 
 @app.get("/health")
@@ -280,11 +341,15 @@ async def list_models() -> dict:
         available_models = list_available_models()
         current_model = settings.EMBEDDING_MODEL_NAME
         
-        return {
+        response = {
             "current_model": current_model,
             "available_models": available_models,
             "total_models": sum(len(models) for models in available_models.values())
         }
+        if model_manager is not None:
+            response["served_models"] = model_manager.served_models()
+            response["loaded_models"] = model_manager.stats()
+        return response
     except Exception as e:
         logger.error(f"Error listing models: {e}")
         raise HTTPException(status_code=500, detail=f"Error listing models: {e}")
@@ -319,89 +384,154 @@ async def get_model_capabilities() -> dict:
     }
 
 
+def _server_timing(infer_start: float, serialize_start: float) -> str:
+    """Format a Server-Timing header value (milliseconds) for one request."""
+    infer_ms = (serialize_start - infer_start) * 1000
+    serialize_ms = (time.perf_counter() - serialize_start) * 1000
+    return f"infer;dur={infer_ms:.2f}, serialize;dur={serialize_ms:.2f}"
+
+
+async def _dispatch_embedding(resident, input_data):
+    """
+    Run the embedding call for one request on the resident model's worker pool.
+
+    Downloads stay on the event loop; decoding, frame extraction and inference
+    run on the worker pool, with at most ``max_batch_size`` inputs per model call.
+
+    Args:
+        resident: ResidentModel selected for the request
+        input_data: Parsed request input
+
+    Returns:
+        float32 numpy array with the embedding vector(s)
+    """
+    model = resident.embedding_model
+    max_batch_size = resident.options.max_batch_size
+    if input_data.type == "text":
+        if isinstance(input_data.text, list):
+            if max_batch_size and len(input_data.text) > max_batch_size:
+                chunks = []
+                for start in range(0, len(input_data.text), max_batch_size):
+                    chunks.append(await resident.run(
+                        model.embed_documents, input_data.text[start:start + max_batch_size]
+                    ))
+                return np.concatenate(chunks)
+            return await resident.run(model.embed_documents, input_data.text)
+        return await resident.run(model.embed_query, input_data.text)
+    elif input_data.type == "image_url":
+        if not model.supports_image():
+            raise HTTPException(status_code=400, detail="Image inputs are not supported by the active model")
+        image = await download_image(input_data.image_url)
+        return await resident.run(model.get_image_embedding, image)
+    elif input_data.type == "image_base64":
+        if not model.supports_image():
+            raise HTTPException(status_code=400, detail="Image inputs are not supported by the active model")
+        return await resident.run(model.get_image_embedding_from_base64, input_data.image_base64)
+    elif input_data.type == "video_frames":
+        if not model.supports_video():
+            raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
+        frames = []
+        for frame in input_data.video_frames:
+            if frame.type == "image_url":
+                frames.append(await download_image(frame.image_url))
+            elif frame.type == "image_base64":
+                frames.append(decode_base64_image(frame.image_base64))
+        return await resident.run(model.get_video_embeddings, [frames], max_batch_size)
+    elif input_data.type == "video_url":
+        if not model.supports_video():
+            raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
+        video_path = await download_video(input_data.video_url)
+        try:
+            return await resident.run(
+                model.get_video_embedding_from_file, video_path, input_data.segment_config, max_batch_size
+            )
+        finally:
+            delete_file(video_path)
+    elif input_data.type == "video_base64":
+        if not model.supports_video():
+            raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
+        return await resident.run(
+            model.get_video_embedding_from_base64, input_data.video_base64, input_data.segment_config,
+            max_batch_size,
+        )
+    elif input_data.type == "video_file":
+        if not model.supports_video():
+            raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
+        return await resident.run(
+            model.get_video_embedding_from_file, input_data.video_path, input_data.segment_config,
+            max_batch_size,
+        )
+    elif input_data.type == "frames_batch":
+        if not model.supports_video():
+            raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
+        return await resident.run(
+            model.get_video_embedding_from_frames_manifest, input_data.frames_manifest_path, max_batch_size
+        )
+    raise HTTPException(status_code=400, detail="Invalid input type")
+
+
 @app.post("/embeddings")
-async def create_embedding(request: EmbeddingRequest) -> dict:
+async def create_embedding(
+    request: EmbeddingRequest,
+    response: Response,
+    accept: Optional[str] = Header(default=None),
+) -> dict:
     """
     Creates an embedding based on the input data.
 
+    The response encoding is negotiated from ``encoding_format`` and the
+    ``Accept`` header: ``application/octet-stream`` (or ``encoding_format``
+    "binary") returns raw little-endian bytes with a shape header, otherwise a
+    JSON body with float lists ("float") or packed base64 ("base64") is returned.
+
     Args:
         request (EmbeddingRequest): Request object containing model and input data.
+        response (Response): Response used to report a ``Server-Timing`` header
+            with the time spent in inference and in response serialization.
+        accept (str, optional): Accept header used for content negotiation.
 
     Returns:
-        dict: Dictionary containing the embedding.
+        dict: Dictionary containing the embedding, or a binary Response.
 
     Raises:
         HTTPException: If there is an error during the embedding process.
     """
     try:
-        # Check if requested model matches the currently loaded model
-        if request.model != settings.EMBEDDING_MODEL_NAME:
-            logger.warning(f"Model mismatch: requested '{request.model}', but server is running '{settings.EMBEDDING_MODEL_NAME}'")
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Model mismatch: requested model '{request.model}' does not match the currently loaded model '{settings.EMBEDDING_MODEL_NAME}'. Please use the correct model name or restart the server with the desired model."
-            )
-        if embedding_model is None:
+        if model_manager is None or embedding_model is None:
             raise HTTPException(status_code=503, detail="Model is not initialized")
 
-        # logger.debug(f"Creating embedding for request: {request}")
-        input_data = request.input
-        if input_data.type == "text":
-            if isinstance(input_data.text, list):
-                embedding = embedding_model.embed_documents(input_data.text)
-            else:
-                embedding = embedding_model.embed_query(input_data.text)
-        elif input_data.type == "image_url":
-            if not embedding_model.supports_image():
-                raise HTTPException(status_code=400, detail="Image inputs are not supported by the active model")
-            embedding = await embedding_model.get_image_embedding_from_url(
-                input_data.image_url
-            )
-        elif input_data.type == "image_base64":
-            if not embedding_model.supports_image():
-                raise HTTPException(status_code=400, detail="Image inputs are not supported by the active model")
-            embedding = embedding_model.get_image_embedding_from_base64(
-                input_data.image_base64
-            )
-        elif input_data.type == "video_frames":
-            if not embedding_model.supports_video():
-                raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
-            frames = []
-            for frame in input_data.video_frames:
-                if frame.type == "image_url":
-                    frames.append(await download_image(frame.image_url))
-                elif frame.type == "image_base64":
-                    frames.append(decode_base64_image(frame.image_base64))
-            embedding = embedding_model.get_video_embeddings([frames])
-        elif input_data.type == "video_url":
-            if not embedding_model.supports_video():
-                raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
-            embedding = await embedding_model.get_video_embedding_from_url(
-                input_data.video_url, input_data.segment_config
-            )
-        elif input_data.type == "video_base64":
-            if not embedding_model.supports_video():
-                raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
-            embedding = embedding_model.get_video_embedding_from_base64(
-                input_data.video_base64, input_data.segment_config
-            )
-        elif input_data.type == "video_file":
-            if not embedding_model.supports_video():
-                raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
-            embedding = await embedding_model.get_video_embedding_from_file(
-                input_data.video_path, input_data.segment_config
-            )
-        elif input_data.type == "frames_batch":
-            if not embedding_model.supports_video():
-                raise HTTPException(status_code=400, detail="Video inputs are not supported by the active model")
-            embedding = await embedding_model.get_video_embedding_from_frames_manifest(
-                input_data.frames_manifest_path
+        # Route the request to a resident (or lazily loaded) model
+        model_id = model_manager.resolve(request.model)
+        if model_id is None:
+            logger.warning(f"Model not served: requested '{request.model}', serving {model_manager.served_models()}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Model '{request.model}' is not served by this instance. Served models: {', '.join(model_manager.served_models())}. Add it to EMBEDDING_EXTRA_MODELS to serve it alongside the default model."
             )
-        else:
-            raise HTTPException(status_code=400, detail="Invalid input type")
+
+        infer_start = time.perf_counter()
+        async with model_manager.acquire(model_id) as resident:
+            embedding = await _dispatch_embedding(resident, request.input)
+        serialize_start = time.perf_counter()
 
         logger.info("Embedding created successfully")
-        return {"embedding": embedding}
+        if request.encoding_format == "binary" or (
+            accept and EMBEDDING_BINARY_MEDIA_TYPE in accept
+        ):
+            payload = pack_embeddings(embedding, request.embedding_dtype)
+            return Response(
+                content=payload,
+                media_type=EMBEDDING_BINARY_MEDIA_TYPE,
+                headers={
+                    "X-Embedding-Dtype": request.embedding_dtype,
+                    "Server-Timing": _server_timing(infer_start, serialize_start),
+                },
+            )
+        body = encode_embedding_response(
+            embedding, request.encoding_format, request.embedding_dtype
+        )
+        response.headers["Server-Timing"] = _server_timing(infer_start, serialize_start)
+        return body
     except HTTPException as e:
         logger.error(f"HTTP error creating embedding: {e.detail}")
         raise e
@@ -0,0 +1,293 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Resident multi-model serving for the embedding application.
+
+The server used to load exactly one handler (``EMBEDDING_MODEL_NAME``) and reject
+every request for another model, so running CLIP-family and Qwen embeddings side
+by side required one container per model. ``ModelManager`` keeps several
+handlers from ``MODEL_CONFIGS`` resident in one process:
+
+- Requests are routed by their ``model`` field; allowed models are the default
+  model plus ``EMBEDDING_EXTRA_MODELS``.
+- Extra models are loaded lazily on first use and unloaded after
+  ``EMBEDDING_MODEL_IDLE_TIMEOUT_SEC`` of inactivity (pinned models stay loaded).
+- Each resident model has its own device placement, worker pool (one
+  ``ThreadPoolExecutor`` per model, so inference never blocks the event loop or
+  another model) and batch limit.
+- When ``EMBEDDING_MEMORY_BUDGET_MB`` is set, least recently used idle models are
+  evicted before a new model is loaded and whenever the budget is exceeded.
+"""
+
+import asyncio
+import gc
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .models import ModelFactory, get_model_handler, resolve_model_id
+from .utils import logger, settings
+from .wrapper import EmbeddingModel
+
+
+@dataclass
+class ModelOptions:
+    """Per-model placement and concurrency options."""
+
+    device: Optional[str] = None
+    use_openvino: Optional[bool] = None
+    workers: int = 1
+    max_batch_size: int = 0
+    pinned: bool = False
+    memory_mb: Optional[int] = None  # Optional size hint used before the first load
+
+
+@dataclass
+class ResidentModel:
+    """A loaded model together with its worker pool and usage bookkeeping."""
+
+    model_id: str
+    options: ModelOptions
+    embedding_model: EmbeddingModel
+    executor: ThreadPoolExecutor
+    memory_bytes: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    requests: int = 0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a synchronous inference call on this model's worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ModelManager:
+    """
+    Registry of resident embedding models with lazy loading and eviction.
+
+    All bookkeeping happens on the event loop; only model loading and inference
+    run on worker threads.
+    """
+
+    def __init__(
+        self,
+        default_model: str,
+        extra_models: Optional[List[str]] = None,
+        model_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        default_workers: int = 1,
+        default_max_batch_size: int = 0,
+        idle_timeout_sec: int = 0,
+        memory_budget_mb: int = 0,
+    ):
+        self.default_model = resolve_model_id(default_model)
+        self.allow_any = bool(extra_models) and "*" in extra_models
+        self.allowed_models = {self.default_model}
+        for model_id in extra_models or []:
+            if model_id != "*":
+                self.allowed_models.add(resolve_model_id(model_id))
+        self.idle_timeout_sec = idle_timeout_sec
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self.default_workers = max(1, default_workers)
+        self.default_max_batch_size = max(0, default_max_batch_size)
+        self._raw_options = {
+            resolve_model_id(model_id): opts for model_id, opts in (model_options or {}).items()
+        }
+        self._models: Dict[str, ResidentModel] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._known_sizes: Dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls) -> "ModelManager":
+        """Build a manager from the application settings."""
+        extra = [m.strip() for m in settings.EMBEDDING_EXTRA_MODELS.split(",") if m.strip()]
+        options = json.loads(settings.EMBEDDING_MODEL_OPTIONS) if settings.EMBEDDING_MODEL_OPTIONS else {}
+        return cls(
+            default_model=settings.EMBEDDING_MODEL_NAME,
+            extra_models=extra,
+            model_options=options,
+            default_workers=settings.EMBEDDING_MODEL_WORKERS,
+            default_max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+            idle_timeout_sec=settings.EMBEDDING_MODEL_IDLE_TIMEOUT_SEC,
+            memory_budget_mb=settings.EMBEDDING_MEMORY_BUDGET_MB,
+        )
+
+    def resolve(self, model_id: str) -> Optional[str]:
+        """Return the canonical id if the model may be served here, else None."""
+        try:
+            canonical = resolve_model_id(model_id)
+        except ValueError:
+            return None
+        if canonical in self.allowed_models or (self.allow_any and ModelFactory.is_model_supported(canonical)):
+            return canonical
+        return None
+
+    def served_models(self) -> List[str]:
+        """Models this server accepts requests for."""
+        return sorted(self.allowed_models)
+
+    def options_for(self, model_id: str) -> ModelOptions:
+        raw = self._raw_options.get(model_id, {})
+        return ModelOptions(
+            device=raw.get("device"),
+            use_openvino=raw.get("use_openvino"),
+            workers=max(1, int(raw.get("workers", self.default_workers))),
+            max_batch_size=max(0, int(raw.get("max_batch_size", self.default_max_batch_size))),
+            pinned=bool(raw.get("pinned", model_id == self.default_model)),
+            memory_mb=raw.get("memory_mb"),
+        )
+
+    def get_loaded(self, model_id: str) -> Optional[ResidentModel]:
+        return self._models.get(model_id)
+
+    async def load(self, model_id: str) -> ResidentModel:
+        """Load a model if needed (at most one concurrent load per model)."""
+        resident = self._models.get(model_id)
+        if resident is not None:
+            return resident
+        lock = self._locks.setdefault(model_id, asyncio.Lock())
+        async with lock:
+            resident = self._models.get(model_id)
+            if resident is not None:
+                return resident
+            options = self.options_for(model_id)
+            estimate = self._known_sizes.get(model_id) or (options.memory_mb or 0) * 1024 * 1024
+            self._evict_for(estimate, exclude=model_id)
+            loop = asyncio.get_running_loop()
+            resident = await loop.run_in_executor(None, self._load_sync, model_id, options)
+            self._models[model_id] = resident
+            self._known_sizes[model_id] = resident.memory_bytes
+            self._evict_for(0, exclude=model_id)
+            return resident
+
+    def _load_sync(self, model_id: str, options: ModelOptions) -> ResidentModel:
+        logger.info(f"Loading model {model_id} (device={options.device or settings.EMBEDDING_DEVICE}, "
+                    f"workers={options.workers}, max_batch_size={options.max_batch_size or 'unlimited'})")
+        rss_before = _current_rss_bytes()
+        handler = get_model_handler(model_id, device=options.device, use_openvino=options.use_openvino)
+        handler.load_model()
+        embedding_model = EmbeddingModel(handler)
+        memory_bytes = max(0, _current_rss_bytes() - rss_before)
+        executor = ThreadPoolExecutor(
+            max_workers=options.workers, thread_name_prefix=f"embed-{model_id.replace('/', '-')}"
+        )
+        logger.info(f"Model {model_id} loaded (~{memory_bytes / (1024 * 1024):.0f} MB resident)")
+        return ResidentModel(
+            model_id=model_id,
+            options=options,
+            embedding_model=embedding_model,
+            executor=executor,
+            memory_bytes=memory_bytes,
+        )
+
+    @asynccontextmanager
+    async def acquire(self, model_id: str) -> AsyncIterator[ResidentModel]:
+        """Load (if needed) and mark a model busy for the duration of a request."""
+        resident = await self.load(model_id)
+        resident.in_flight += 1
+        resident.requests += 1
+        resident.last_used = time.monotonic()
+        try:
+            yield resident
+        finally:
+            resident.in_flight -= 1
+            resident.last_used = time.monotonic()
+
+    def resident_bytes(self) -> int:
+        return sum(r.memory_bytes for r in self._models.values())
+
+    def _evict_for(self, required_bytes: int, exclude: Optional[str] = None) -> None:
+        """Evict LRU idle, non-pinned models until ``required_bytes`` fits the budget."""
+        if not self.memory_budget_bytes:
+            return
+        candidates = sorted(
+            (r for r in self._models.values()
+             if r.model_id != exclude and not r.options.pinned and r.in_flight == 0),
+            key=lambda r: r.last_used,
+        )
+        for resident in candidates:
+            if self.resident_bytes() + required_bytes <= self.memory_budget_bytes:
+                break
+            logger.info(f"Evicting model {resident.model_id} to stay within memory budget")
+            self.unload(resident.model_id)
+        if self.resident_bytes() + required_bytes > self.memory_budget_bytes:
+            logger.warning(
+                f"Resident models use {self.resident_bytes() / (1024 * 1024):.0f} MB, above the "
+                f"{self.memory_budget_bytes / (1024 * 1024):.0f} MB budget; no idle model left to evict"
+            )
+
+    def unload(self, model_id: str) -> bool:
+        """Unload a resident model and release its worker pool."""
+        resident = self._models.pop(model_id, None)
+        if resident is None:
+            return False
+        resident.executor.shutdown(wait=False)
+        cleanup = getattr(resident.embedding_model.handler, "cleanup", None)
+        if callable(cleanup):
+            try:
+                cleanup()
+            except Exception as e:
+                logger.warning(f"Cleanup of model {model_id} failed: {e}")
+        del resident
+        gc.collect()
+        logger.info(f"Model {model_id} unloaded")
+        return True
+
+    def unload_idle(self) -> List[str]:
+        """Unload non-pinned models that have been idle longer than the timeout."""
+        if not self.idle_timeout_sec:
+            return []
+        now = time.monotonic()
+        idle = [
+            r.model_id for r in self._models.values()
+            if not r.options.pinned and r.in_flight == 0 and now - r.last_used >= self.idle_timeout_sec
+        ]
+        for model_id in idle:
+            logger.info(f"Unloading model {model_id} after {self.idle_timeout_sec}s idle")
+            self.unload(model_id)
+        return idle
+
+    async def run_idle_reaper(self) -> None:
+        """Background task that periodically unloads idle models."""
+        interval = max(1, min(60, self.idle_timeout_sec // 2 or 1))
+        while True:
+            await asyncio.sleep(interval)
+            self.unload_idle()
+
+    def shutdown(self) -> None:
+        for model_id in list(self._models):
+            self.unload(model_id)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Describe resident models for the /models endpoint."""
+        now = time.monotonic()
+        return [
+            {
+                "model": r.model_id,
+                "device": r.embedding_model.device,
+                "use_openvino": r.embedding_model.use_openvino,
+                "workers": r.options.workers,
+                "max_batch_size": r.options.max_batch_size,
+                "pinned": r.options.pinned,
+                "in_flight": r.in_flight,
+                "requests": r.requests,
+                "idle_seconds": round(now - r.last_used, 1),
+                "memory_mb": round(r.memory_bytes / (1024 * 1024), 1),
+            }
+            for r in self._models.values()
+        ]
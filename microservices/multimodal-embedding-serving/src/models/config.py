@@ -262,6 +262,30 @@ def get_model_config(model_id: str, device=None, ov_models_dir=None, use_openvin
     return config
 
 
+def resolve_model_id(model_id: str) -> str:
+    """
+    Normalize a model identifier to its canonical "type/name" form.
+    
+    Args:
+        model_id (str): Model identifier in format "type/name" or just "name"
+        
+    Returns:
+        str: Canonical "type/name" identifier
+        
+    Raises:
+        ValueError: If model is not found
+    """
+    if "/" in model_id:
+        model_type, model_name = model_id.split("/", 1)
+        if model_type in MODEL_CONFIGS and model_name in MODEL_CONFIGS[model_type]:
+            return model_id
+        raise ValueError(f"Model {model_id} not found")
+    for model_type, models in MODEL_CONFIGS.items():
+        if model_id in models:
+            return f"{model_type}/{model_id}"
+    raise ValueError(f"Model {model_id} not found in any model type")
+
+
 def list_available_models() -> dict:
     """
     List all available models grouped by type.
@@ -14,6 +14,8 @@ Key components:
 - File download and format conversion functions
 - Logging and error message definitions
 - Base64 encoding/decoding utilities
+- Compact embedding response encodings (base64, binary, int8)
+- Memory-mapped frame tensor store for frames_batch manifests
 
 The utilities support various input formats including URLs, base64 encoded data,
 and local files, enabling flexible data input for embedding generation.
@@ -29,6 +31,17 @@ from .utils import (
     decode_base64_video,
     extract_video_frames,
 )
+from .encoding import (
+    EMBEDDING_BINARY_MEDIA_TYPE,
+    SUPPORTED_ENCODING_FORMATS,
+    SUPPORTED_EMBEDDING_DTYPES,
+    encode_embedding_response,
+    pack_embeddings,
+    unpack_embeddings,
+    decode_base64_embeddings,
+    to_embedding_array,
+)
+from .frame_store import FrameTensorStore
 
 __all__ = [
     "Settings",
@@ -42,4 +55,13 @@ __all__ = [
     "download_video",
     "decode_base64_video",
     "extract_video_frames",
+    "EMBEDDING_BINARY_MEDIA_TYPE",
+    "SUPPORTED_ENCODING_FORMATS",
+    "SUPPORTED_EMBEDDING_DTYPES",
+    "encode_embedding_response",
+    "pack_embeddings",
+    "unpack_embeddings",
+    "decode_base64_embeddings",
+    "to_embedding_array",
+    "FrameTensorStore",
 ]
\ No newline at end of file
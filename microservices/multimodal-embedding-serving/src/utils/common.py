@@ -71,6 +71,14 @@ class Settings(BaseSettings):
         DEFAULT_START_OFFSET_SEC: Default video start offset
         DEFAULT_CLIP_DURATION: Default video clip duration  
         DEFAULT_NUM_FRAMES: Default number of frames to extract
+        EMBEDDING_EXTRA_MODELS: Comma-separated models served next to the default
+            model and loaded on first use ("*" allows any supported model)
+        EMBEDDING_MODEL_OPTIONS: JSON object with per-model overrides
+            (device, use_openvino, workers, max_batch_size, pinned)
+        EMBEDDING_MODEL_WORKERS: Default number of concurrent inference workers per model
+        EMBEDDING_MAX_BATCH_SIZE: Default maximum items per inference call (0 = unlimited)
+        EMBEDDING_MODEL_IDLE_TIMEOUT_SEC: Unload non-pinned models idle this long (0 = never)
+        EMBEDDING_MEMORY_BUDGET_MB: Host memory budget for resident models (0 = unlimited)
     """
 
     APP_NAME: str = "Multimodal-Embedding-Serving"
@@ -96,6 +104,14 @@ class Settings(BaseSettings):
     DEFAULT_CLIP_DURATION: int = Field(default=-1, env="DEFAULT_CLIP_DURATION")
     DEFAULT_NUM_FRAMES: int = Field(default=64, env="DEFAULT_NUM_FRAMES")
 
+    # Multi-model resident serving
+    EMBEDDING_EXTRA_MODELS: str = Field(default="", env="EMBEDDING_EXTRA_MODELS")
+    EMBEDDING_MODEL_OPTIONS: str = Field(default="", env="EMBEDDING_MODEL_OPTIONS")
+    EMBEDDING_MODEL_WORKERS: int = Field(default=1, env="EMBEDDING_MODEL_WORKERS")
+    EMBEDDING_MAX_BATCH_SIZE: int = Field(default=0, env="EMBEDDING_MAX_BATCH_SIZE")
+    EMBEDDING_MODEL_IDLE_TIMEOUT_SEC: int = Field(default=0, env="EMBEDDING_MODEL_IDLE_TIMEOUT_SEC")
+    EMBEDDING_MEMORY_BUDGET_MB: int = Field(default=0, env="EMBEDDING_MEMORY_BUDGET_MB")
+
     @field_validator("EMBEDDING_USE_OV", mode="before")
     @classmethod
     def validate_embedding_use_ov(cls, v):
@@ -122,6 +138,20 @@ class Settings(BaseSettings):
             return 64
         return int(v)
 
+    @field_validator(
+        "EMBEDDING_MODEL_WORKERS",
+        "EMBEDDING_MAX_BATCH_SIZE",
+        "EMBEDDING_MODEL_IDLE_TIMEOUT_SEC",
+        "EMBEDDING_MEMORY_BUDGET_MB",
+        mode="before",
+    )
+    @classmethod
+    def validate_model_pool_ints(cls, v, info):
+        """Handle empty strings for the multi-model serving limits"""
+        if v == "" or v is None:
+            return cls.model_fields[info.field_name].default
+        return int(v)
+
     @field_validator("http_proxy", "https_proxy", mode="before")
     @classmethod
     def validate_proxy_url(cls, v):
@@ -0,0 +1,246 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Response encodings for embedding vectors.
+
+The `/embeddings` endpoint returns plain JSON float lists by default. For large
+requests (for example frame manifests with thousands of frames) serializing and
+parsing those lists dominates the end-to-end latency, so this module provides
+compact alternatives:
+
+- ``base64``: OpenAI-compatible base64 string of the little-endian array bytes,
+  returned inside the usual JSON envelope together with its shape and dtype.
+- ``binary``: raw little-endian array bytes prefixed with a small header that
+  describes dtype and shape (also selected with ``Accept: application/octet-stream``).
+
+Both compact formats support ``float32``, ``float16`` and ``int8`` payloads. The
+``int8`` variant is symmetrically quantized per vector; the float32 scale
+factors travel with the payload so clients can dequantize with a single multiply.
+
+Binary layout (all little-endian)::
+
+    magic   4 bytes   b"MMEB"
+    version uint8     1
+    dtype   uint8     0 = float32, 1 = float16, 2 = int8
+    ndim    uint16    1 or 2
+    shape   ndim x uint32
+    scales  rows x float32   (int8 only, rows = 1 for 1-D payloads)
+    data    prod(shape) x dtype
+"""
+
+import base64
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+EMBEDDING_BINARY_MEDIA_TYPE = "application/octet-stream"
+SUPPORTED_ENCODING_FORMATS = ("float", "base64", "binary")
+SUPPORTED_EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+_BINARY_MAGIC = b"MMEB"
+_BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sBBH")
+_DTYPE_CODES = {"float32": 0, "float16": 1, "int8": 2}
+_CODE_DTYPES = {code: name for name, code in _DTYPE_CODES.items()}
+_NUMPY_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float16": np.dtype("<f2"),
+    "int8": np.dtype("i1"),
+}
+_SCALE_DTYPE = np.dtype("<f4")
+
+
+def to_embedding_array(embedding: Any) -> np.ndarray:
+    """
+    Convert an embedding result into a contiguous float32 array.
+
+    Contiguous float32 arrays, as returned by the model wrapper, are passed
+    through without a copy.
+
+    Args:
+        embedding: A single vector, a list of vectors, a numpy array or a torch tensor
+
+    Returns:
+        1-D or 2-D float32 numpy array
+
+    Raises:
+        ValueError: If the embedding is not one or two dimensional
+    """
+    if hasattr(embedding, "detach"):
+        embedding = embedding.detach().cpu().numpy()
+    array = np.ascontiguousarray(np.asarray(embedding, dtype=np.float32))
+    if array.ndim not in (1, 2):
+        raise ValueError(f"Embeddings must be 1-D or 2-D, got shape {array.shape}")
+    return array
+
+
+def quantize_int8(array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetrically quantize embeddings to int8 with one scale per vector.
+
+    Args:
+        array: 1-D or 2-D float array
+
+    Returns:
+        Tuple of (int8 array with the input shape, float32 scales with one entry per row)
+    """
+    rows = np.atleast_2d(array).astype(np.float32, copy=False)
+    max_abs = np.abs(rows).max(axis=1) if rows.size else np.zeros(rows.shape[0], np.float32)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    quantized = np.clip(np.rint(rows / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized.reshape(array.shape), scales
+
+
+def dequantize_int8(quantized: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """
+    Reverse :func:`quantize_int8`.
+
+    Args:
+        quantized: int8 array (1-D or 2-D)
+        scales: float32 scale factors, one per row
+
+    Returns:
+        float32 array with the same shape as ``quantized``
+    """
+    rows = np.atleast_2d(quantized).astype(np.float32)
+    return (rows * np.asarray(scales, dtype=np.float32)[:, None]).reshape(quantized.shape)
+
+
+def _cast(array: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    if dtype not in _NUMPY_DTYPES:
+        raise ValueError(
+            f"Unsupported embedding dtype '{dtype}'. Supported: {', '.join(SUPPORTED_EMBEDDING_DTYPES)}"
+        )
+    if dtype == "int8":
+        return quantize_int8(array)
+    return array.astype(_NUMPY_DTYPES[dtype], copy=False), None
+
+
+def pack_embeddings(embedding: Any, dtype: str = "float32") -> bytes:
+    """
+    Serialize embeddings into the binary wire format described in the module docstring.
+
+    Args:
+        embedding: Embedding vector(s) to serialize
+        dtype: Payload dtype (float32, float16 or int8)
+
+    Returns:
+        Header-prefixed little-endian bytes
+    """
+    array = to_embedding_array(embedding)
+    payload, scales = _cast(array, dtype)
+    parts = [
+        _HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, _DTYPE_CODES[dtype], array.ndim),
+        struct.pack(f"<{array.ndim}I", *array.shape),
+    ]
+    if scales is not None:
+        parts.append(scales.astype(_SCALE_DTYPE, copy=False).tobytes())
+    parts.append(payload.tobytes())
+    return b"".join(parts)
+
+
+def unpack_embeddings(data: bytes, dequantize: bool = True) -> np.ndarray:
+    """
+    Deserialize a payload produced by :func:`pack_embeddings`.
+
+    Args:
+        data: Binary response body
+        dequantize: When True, int8 payloads are converted back to float32
+
+    Returns:
+        numpy array view (or dequantized copy) of the embeddings
+
+    Raises:
+        ValueError: If the payload header is malformed
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Embedding payload is too short")
+    magic, version, dtype_code, ndim = _HEADER.unpack_from(data, 0)
+    if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+        raise ValueError("Unrecognized embedding payload header")
+    if dtype_code not in _CODE_DTYPES or ndim not in (1, 2):
+        raise ValueError("Invalid dtype or shape in embedding payload header")
+    offset = _HEADER.size
+    shape = struct.unpack_from(f"<{ndim}I", data, offset)
+    offset += 4 * ndim
+    dtype = _CODE_DTYPES[dtype_code]
+    scales = None
+    if dtype == "int8":
+        rows = shape[0] if ndim == 2 else 1
+        scales = np.frombuffer(data, dtype=_SCALE_DTYPE, count=rows, offset=offset)
+        offset += rows * _SCALE_DTYPE.itemsize
+    count = int(np.prod(shape))
+    array = np.frombuffer(data, dtype=_NUMPY_DTYPES[dtype], count=count, offset=offset).reshape(shape)
+    if scales is not None and dequantize:
+        return dequantize_int8(array, scales)
+    return array
+
+
+def encode_embedding_response(
+    embedding: Any, encoding_format: str = "float", dtype: str = "float32"
+) -> Dict[str, Any]:
+    """
+    Build the JSON response body for the requested encoding.
+
+    Args:
+        embedding: Embedding vector(s) produced by the model wrapper
+        encoding_format: "float" for JSON lists or "base64" for packed bytes
+        dtype: Payload dtype for the base64 format
+
+    Returns:
+        Response dictionary. The base64 format additionally carries ``shape``,
+        ``dtype`` and, for int8, base64 encoded float32 ``scales``.
+
+    Raises:
+        ValueError: If the format or dtype is not supported
+    """
+    if encoding_format == "float":
+        # Only the float format needs Python lists; the compact formats pack the array as is
+        if isinstance(embedding, (list, tuple)):
+            return {"embedding": embedding}
+        return {"embedding": to_embedding_array(embedding).tolist()}
+    if encoding_format != "base64":
+        raise ValueError(
+            f"Unsupported encoding_format '{encoding_format}' for JSON responses"
+        )
+
+    array = to_embedding_array(embedding)
+    payload, scales = _cast(array, dtype)
+    response: Dict[str, Any] = {
+        "embedding": base64.b64encode(payload.tobytes()).decode("ascii"),
+        "shape": list(array.shape),
+        "dtype": dtype,
+    }
+    if scales is not None:
+        response["scales"] = base64.b64encode(scales.tobytes()).decode("ascii")
+    return response
+
+
+def decode_base64_embeddings(
+    embedding: str,
+    shape: Union[List[int], Tuple[int, ...]],
+    dtype: str = "float32",
+    scales: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Decode the ``embedding`` field of a base64 JSON response.
+
+    Args:
+        embedding: Base64 string from the response
+        shape: ``shape`` field from the response
+        dtype: ``dtype`` field from the response
+        scales: ``scales`` field from the response (int8 only)
+
+    Returns:
+        float32 numpy array (int8 payloads are dequantized)
+    """
+    if dtype not in _NUMPY_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype '{dtype}'")
+    array = np.frombuffer(base64.b64decode(embedding), dtype=_NUMPY_DTYPES[dtype]).reshape(shape)
+    if dtype == "int8":
+        if scales is None:
+            raise ValueError("int8 embeddings require scale factors")
+        return dequantize_int8(array, np.frombuffer(base64.b64decode(scales), dtype=_SCALE_DTYPE))
+    return array.astype(np.float32)
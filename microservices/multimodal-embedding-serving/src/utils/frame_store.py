@@ -0,0 +1,108 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Memory-mapped frame tensor store for ``frames_batch`` manifests.
+
+Instead of writing one JPEG per frame/crop to shared temp storage, producers
+(VDMS DataPrep, see its ``FrameTensorWriter``) can pack decoded RGB frames into
+a single uint8 file and describe it in the manifest. The embedding server maps
+that file read-only and builds its batches directly from views into the
+mapping, so there is no per-image ``open``/``verify``/JPEG decode on the
+serving side. Placing the file
+on a tmpfs such as ``/dev/shm`` keeps the hand-off entirely in shared memory.
+
+Manifest section::
+
+    "tensor_store": {
+        "path": "/dev/shm/dataprep/<id>/frames.u8",
+        "dtype": "uint8",
+        "layout": "HWC",
+        "entries": [[offset, height, width, channels], ...]
+    }
+
+Each manifest frame then carries ``tensor_index`` (an index into ``entries``)
+and, for detected crops, an optional ``tensor_bbox`` ``[x1, y1, x2, y2]`` that
+selects a region of the referenced frame. Crops therefore do not need to be
+packed separately; they are zero-copy slices of their parent frame.
+"""
+
+import os
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+TENSOR_STORE_DTYPE = "uint8"
+TENSOR_STORE_LAYOUT = "HWC"
+
+
+class FrameTensorStore:
+    """
+    Read-only memory mapping over a packed frame tensor file.
+
+    Frames are returned as numpy views into the mapping; nothing is copied or
+    decoded until the model preprocessing touches the pixels.
+    """
+
+    def __init__(self, section: Dict[str, Any]):
+        path = section.get("path")
+        if not path:
+            raise ValueError("tensor_store.path is required")
+        if section.get("dtype", TENSOR_STORE_DTYPE) != TENSOR_STORE_DTYPE:
+            raise ValueError(f"Unsupported tensor_store dtype: {section.get('dtype')}")
+        if section.get("layout", TENSOR_STORE_LAYOUT) != TENSOR_STORE_LAYOUT:
+            raise ValueError(f"Unsupported tensor_store layout: {section.get('layout')}")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Frame tensor store not found: {path}")
+        self.path = path
+        self.entries = section.get("entries") or []
+        self._mmap = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.empty(0, np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, index: int, bbox: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Return a HxWxC view of one packed frame, optionally cropped.
+
+        Args:
+            index: Index into the offsets table
+            bbox: Optional ``[x1, y1, x2, y2]`` region of the frame
+
+        Raises:
+            ValueError: If the index or bounding box is out of range
+        """
+        if not 0 <= index < len(self.entries):
+            raise ValueError(f"tensor_index {index} out of range (0..{len(self.entries) - 1})")
+        offset, height, width, channels = (int(v) for v in self.entries[index])
+        size = height * width * channels
+        if offset < 0 or offset + size > self._mmap.shape[0]:
+            raise ValueError(f"tensor_index {index} exceeds tensor store size")
+        frame = self._mmap[offset:offset + size].reshape(height, width, channels)
+        if bbox is not None:
+            x1, y1, x2, y2 = (int(v) for v in bbox)
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(width, x2), min(height, y2)
+            if x1 >= x2 or y1 >= y2:
+                raise ValueError(f"Empty tensor_bbox {list(bbox)} for tensor_index {index}")
+            frame = frame[y1:y2, x1:x2]
+        if channels == 1:
+            frame = frame[:, :, 0]
+        return frame
+
+    def close(self) -> None:
+        """Release the mapping."""
+        mmap_obj = getattr(self._mmap, "_mmap", None)
+        self._mmap = np.empty(0, np.uint8)
+        if mmap_obj is not None:
+            try:
+                mmap_obj.close()
+            except BufferError:
+                # Views are still referenced; the mapping is released when they are collected.
+                pass
+
+    def __enter__(self) -> "FrameTensorStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -17,6 +17,7 @@ from pydantic import ValidationError
 
 from .models.base import BaseEmbeddingModel
 from .utils import (
+    FrameTensorStore,
     decode_base64_image,
     decode_base64_video,
     delete_file,
@@ -24,6 +25,7 @@ from .utils import (
     download_video,
     extract_video_frames,
     logger,
+    to_embedding_array,
 )
 
 
@@ -46,7 +48,7 @@ class EmbeddingModel:
         self.use_openvino = model_handler.model_config.get("use_openvino", False)
         self.supported_modalities = set(model_handler.supported_modalities)
     
-    def embed_query(self, text: str) -> List[float]:
+    def embed_query(self, text: str) -> np.ndarray:
         """
         Embed a single text query.
         
@@ -54,13 +56,13 @@ class EmbeddingModel:
             text: Text string to embed
             
         Returns:
-            List of embedding values
+            1-D float32 embedding array
         """
         prepared_text = self.handler.prepare_query(text)
         embeddings = self.handler.encode_text([prepared_text])
-        return embeddings[0].tolist()
+        return to_embedding_array(embeddings[0])
     
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
         """
         Embed multiple text documents.
         
@@ -68,17 +70,17 @@ class EmbeddingModel:
             texts: List of text strings to embed
             
         Returns:
-            List of embedding lists
+            2-D float32 array with one embedding per text
         """
         prepared_texts = self.handler.prepare_documents(texts)
         embeddings = self.handler.encode_text(prepared_texts)
-        return embeddings.tolist()
+        return to_embedding_array(embeddings)
     
     def get_embedding_length(self) -> int:
         """Get the length of the embedding vector."""
         return self.handler.get_embedding_dim()
     
-    async def get_image_embedding_from_url(self, image_url: str) -> List[float]:
+    async def get_image_embedding_from_url(self, image_url: str) -> np.ndarray:
         """
         Get image embedding from a URL.
         
@@ -86,24 +88,42 @@ class EmbeddingModel:
             image_url: URL of the image
             
         Returns:
-            List of embedding values
+            1-D float32 embedding array
         """
         if not self.handler.supports_image():
             raise RuntimeError("Image embeddings are not supported by the active model")
         try:
             logger.debug(f"Getting image embedding from URL: {image_url}")
             image_data = await download_image(image_url)
-            # Convert numpy array to PIL Image if necessary
-            if isinstance(image_data, np.ndarray):
-                image_data = Image.fromarray(image_data)
-            embeddings = self.handler.encode_image([image_data])
+            embedding = self.get_image_embedding(image_data)
             logger.info("Image embedding extracted successfully from URL")
-            return embeddings[0].tolist()
+            return embedding
         except Exception as e:
             logger.error(f"Error getting image embedding from URL: {e}")
             raise RuntimeError(f"Failed to get image embedding from URL: {e}")
     
-    def get_image_embedding_from_base64(self, image_base64: str) -> List[float]:
+    def get_image_embedding(self, image: Union[Image.Image, np.ndarray]) -> np.ndarray:
+        """
+        Get the embedding of an already downloaded or decoded image.
+
+        The server downloads images on the event loop and runs this method on
+        the model's worker pool.
+
+        Args:
+            image: PIL image or HxWxC uint8 array
+
+        Returns:
+            1-D float32 embedding array
+        """
+        if not self.handler.supports_image():
+            raise RuntimeError("Image embeddings are not supported by the active model")
+        # Convert numpy array to PIL Image if necessary
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        embeddings = self.handler.encode_image([image])
+        return to_embedding_array(embeddings[0])
+
+    def get_image_embedding_from_base64(self, image_base64: str) -> np.ndarray:
         """
         Get image embedding from base64 encoded image.
         
@@ -111,7 +131,7 @@ class EmbeddingModel:
             image_base64: Base64 encoded image string
             
         Returns:
-            List of embedding values
+            1-D float32 embedding array
         """
         if not self.handler.supports_image():
             raise RuntimeError("Image embeddings are not supported by the active model")
@@ -120,20 +140,44 @@ class EmbeddingModel:
             image_data = decode_base64_image(image_base64)
             embeddings = self.handler.encode_image([image_data])
             logger.info("Image embedding extracted successfully from base64")
-            return embeddings[0].tolist()
+            return to_embedding_array(embeddings[0])
         except Exception as e:
             logger.error(f"Error getting image embedding from base64: {e}")
             raise RuntimeError(f"Failed to get image embedding from base64: {e}")
     
-    def get_video_embeddings(self, frames_batch: List[List[Union[Image.Image, np.ndarray]]]) -> List[List[float]]:
+    def _encode_images(self, images: List[Image.Image], max_batch_size: int = 0) -> np.ndarray:
+        """
+        Encode and normalize images, passing at most ``max_batch_size`` to each model call.
+
+        Args:
+            images: Images to encode
+            max_batch_size: Maximum images per model call (0 for a single call)
+
+        Returns:
+            2-D float32 array with one normalized embedding per image
+        """
+        step = max_batch_size or len(images) or 1
+        chunks = []
+        for start in range(0, len(images), step):
+            embeddings = self.handler.encode_image(images[start:start + step])
+            embeddings = embeddings / embeddings.norm(dim=-1, keepdim=True)
+            chunks.append(to_embedding_array(embeddings))
+        if not chunks:
+            return np.empty((0, self.get_embedding_length()), np.float32)
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    def get_video_embeddings(
+        self, frames_batch: List[List[Union[Image.Image, np.ndarray]]], max_batch_size: int = 0
+    ) -> np.ndarray:
         """
         Get video embeddings from frame batches.
         
         Args:
             frames_batch: List of list of frames in videos
+            max_batch_size: Maximum frames per model call (0 for one call per video)
             
         Returns:
-            List of frame embedding lists (each frame's embedding as a separate list)
+            2-D float32 array with one normalized embedding per frame
         """
         if not self.handler.supports_video():
             raise RuntimeError("Video embeddings are not supported by the active model")
@@ -149,23 +193,17 @@ class EmbeddingModel:
                         frame = Image.fromarray(frame)
                     processed_frames.append(frame)
                 
-                # Get embeddings for all frames
-                frame_embeddings = self.handler.encode_image(processed_frames)
-                
-                # Normalize each frame embedding
-                frame_embeddings = frame_embeddings / frame_embeddings.norm(dim=-1, keepdim=True)
-                
-                # Convert to list of lists (one list per frame)
-                frame_embs_list = frame_embeddings.tolist()
-                vid_embs.extend(frame_embs_list)
+                # Get normalized embeddings for all frames
+                vid_embs.append(self._encode_images(processed_frames, max_batch_size))
             
+            vid_embs = np.concatenate(vid_embs) if vid_embs else np.empty((0, self.get_embedding_length()), np.float32)
             logger.info(f"Video embeddings extracted successfully - {len(vid_embs)} frame embeddings")
             return vid_embs
         except Exception as e:
             logger.error(f"Error getting video embeddings: {e}")
             raise RuntimeError(f"Failed to get video embeddings: {e}")
     
-    async def get_video_embedding_from_url(self, video_url: str, segment_config: dict = None) -> List[List[float]]:
+    async def get_video_embedding_from_url(self, video_url: str, segment_config: dict = None) -> np.ndarray:
         """
         Get video embedding from a URL.
         
@@ -174,31 +212,36 @@ class EmbeddingModel:
             segment_config: Configuration for video segmentation
             
         Returns:
-            List of frame embedding lists
+            2-D float32 array with one embedding per frame
         """
         if not self.handler.supports_video():
             raise RuntimeError("Video embeddings are not supported by the active model")
         try:
             logger.debug(f"Getting video embedding from URL: {video_url}")
             video_path = await download_video(video_url)
-            clip_images = extract_video_frames(video_path, segment_config)
-            delete_file(video_path)
+            try:
+                clip_images = extract_video_frames(video_path, segment_config)
+            finally:
+                delete_file(video_path)
             logger.info("Video embedding extracted successfully from URL")
             return self.get_video_embeddings([clip_images])
         except Exception as e:
             logger.error(f"Error getting video embedding from URL: {e}")
             raise RuntimeError(f"Failed to get video embedding from URL: {e}")
     
-    def get_video_embedding_from_base64(self, video_base64: str, segment_config: dict = None) -> List[List[float]]:
+    def get_video_embedding_from_base64(
+        self, video_base64: str, segment_config: dict = None, max_batch_size: int = 0
+    ) -> np.ndarray:
         """
         Get video embedding from base64 encoded video.
         
         Args:
             video_base64: Base64 encoded video string
             segment_config: Configuration for video segmentation
+            max_batch_size: Maximum frames per model call (0 for a single call)
             
         Returns:
-            List of frame embedding lists
+            2-D float32 array with one embedding per frame
         """
         if not self.handler.supports_video():
             raise RuntimeError("Video embeddings are not supported by the active model")
@@ -208,49 +251,54 @@ class EmbeddingModel:
             clip_images = extract_video_frames(video_path, segment_config)
             delete_file(video_path)
             logger.info("Video embedding extracted successfully from base64")
-            return self.get_video_embeddings([clip_images])
+            return self.get_video_embeddings([clip_images], max_batch_size)
         except Exception as e:
             logger.error(f"Error getting video embedding from base64: {e}")
             raise RuntimeError(f"Failed to get video embedding from base64: {e}")
     
-    async def get_video_embedding_from_file(self, video_path: str, segment_config: dict = None) -> List[List[float]]:
+    def get_video_embedding_from_file(
+        self, video_path: str, segment_config: dict = None, max_batch_size: int = 0
+    ) -> np.ndarray:
         """
         Get video embedding from a local file.
         
         Args:
             video_path: Path to the video file
             segment_config: Configuration for video segmentation
+            max_batch_size: Maximum frames per model call (0 for a single call)
             
         Returns:
-            List of frame embedding lists
+            2-D float32 array with one embedding per frame
         """
         if not self.handler.supports_video():
             raise RuntimeError("Video embeddings are not supported by the active model")
         try:
             logger.debug(f"Getting video embedding from file: {video_path}")
-            import os
             if not os.path.exists(video_path):
                 raise FileNotFoundError(f"Video file not found: {video_path}")
             clip_images = extract_video_frames(video_path, segment_config)
             logger.info("Video embedding extracted successfully from file")
-            return self.get_video_embeddings([clip_images])
+            return self.get_video_embeddings([clip_images], max_batch_size)
         except Exception as e:
             logger.error(f"Error getting video embedding from file: {e}")
             raise RuntimeError(f"Failed to get video embedding from file: {e}")
     
-    async def get_video_embedding_from_frames_manifest(self, manifest_path: str) -> List[List[float]]:
+    def get_video_embedding_from_frames_manifest(self, manifest_path: str, max_batch_size: int = 0) -> np.ndarray:
         """
         Get video embedding from frames manifest file.
         
-        Supports two modes:
+        Supports three modes:
         1. Individual frame images: Traditional mode where each frame is a separate image file
         2. Video-based processing: New mode where manifest specifies frames to extract from a video file
+        3. Tensor store: Frames and crops are read from a memory-mapped uint8 tensor file
+           described by the manifest's ``tensor_store`` section (no per-image file I/O)
         
         Args:
             manifest_path: Path to the frames manifest JSON file
+            max_batch_size: Maximum frames/crops per model call (0 for a single call)
             
         Returns:
-            List of frame embedding lists (one per frame/crop)
+            2-D float32 array with one embedding per frame/crop
             
         Raises:
             FileNotFoundError: If manifest file doesn't exist (404)
@@ -291,6 +339,10 @@ class EmbeddingModel:
             video_path = manifest_data.get("video_path")
             frames_list = manifest.frames if hasattr(manifest, 'frames') else manifest_data["frames"]
             
+            if manifest_data.get("tensor_store"):
+                # TENSOR STORE PROCESSING: Build batches directly from the memory-mapped frames
+                return self._get_embeddings_from_tensor_store(manifest_data, max_batch_size)
+
             if video_path and os.path.exists(video_path):
                 # VIDEO-BASED PROCESSING: Extract specific frames from video file
                 logger.info(f"Processing video-based manifest with {len(frames_list)} frames from: {video_path}")
@@ -389,15 +441,9 @@ class EmbeddingModel:
                     if not images:
                         raise ValueError("No valid images found in optimized manifest")
                     
-                    # Batch encode all images at once (most efficient approach)
+                    # Batch encode and normalize all images
                     logger.info(f"Generating embeddings for {len(images)} images using batch processing...")
-                    embeddings = self.handler.encode_image(images)
-                    
-                    # Normalize embeddings
-                    embeddings = embeddings / embeddings.norm(dim=-1, keepdim=True)
-                    
-                    # Convert to list of lists
-                    embeddings_list = embeddings.tolist()
+                    embeddings_list = self._encode_images(images, max_batch_size)
                     
                     # Count frame types for logging
                     frame_count = sum(1 for entry in valid_entries if entry.get("type") == "full_frame")
@@ -408,7 +454,7 @@ class EmbeddingModel:
                     return embeddings_list
                 else:
                     # Legacy behavior: direct mapping
-                    embeddings_list = self.get_video_embeddings([extracted_frames])
+                    embeddings_list = self.get_video_embeddings([extracted_frames], max_batch_size)
                     logger.info(f"Video-based manifest processing complete - {len(embeddings_list)} frame embeddings")
                     return embeddings_list
                 
@@ -455,14 +501,8 @@ class EmbeddingModel:
                 if not images:
                     raise ValueError("No valid frame images found in manifest")
                 
-                # Batch encode all images at once (more efficient)
-                embeddings = self.handler.encode_image(images)
-                
-                # Normalize embeddings
-                embeddings = embeddings / embeddings.norm(dim=-1, keepdim=True)
-                
-                # Convert to list of lists
-                embeddings_list = embeddings.tolist()
+                # Batch encode and normalize all images
+                embeddings_list = self._encode_images(images, max_batch_size)
                 
                 logger.info(f"Image-based manifest processing complete - {len(embeddings_list)} frame embeddings")
                 return embeddings_list
@@ -477,6 +517,41 @@ class EmbeddingModel:
             logger.error(f"Error getting video embedding from frames manifest: {e}")
             raise RuntimeError(f"Failed to get video embedding from frames manifest: {e}")
     
+    def _get_embeddings_from_tensor_store(self, manifest_data: Dict[str, Any], max_batch_size: int = 0) -> np.ndarray:
+        """
+        Embed every manifest entry from a memory-mapped frame tensor store.
+
+        Entries are taken from ``all_frame_metadata`` when present (frames and crops)
+        and from ``frames`` otherwise. Each entry references a packed frame through
+        ``tensor_index`` and may select a crop region with ``tensor_bbox``.
+
+        Args:
+            manifest_data: Parsed manifest containing a ``tensor_store`` section
+            max_batch_size: Maximum entries per model call (0 for a single call)
+
+        Returns:
+            2-D float32 array with one normalized embedding per entry
+        """
+        entries = manifest_data.get("all_frame_metadata") or manifest_data["frames"]
+        with FrameTensorStore(manifest_data["tensor_store"]) as store:
+            logger.info(f"Processing tensor-store manifest with {len(entries)} entries "
+                        f"from {len(store)} packed frames: {store.path}")
+            images = []
+            for i, entry in enumerate(entries):
+                tensor_index = entry.get("tensor_index")
+                if tensor_index is None:
+                    raise ValueError(f"Manifest entry {i} has no tensor_index")
+                images.append(Image.fromarray(store.get(tensor_index, entry.get("tensor_bbox"))))
+
+            if not images:
+                raise ValueError("No frames found in tensor-store manifest")
+
+            embeddings_list = self._encode_images(images, max_batch_size)
+            del images
+
+        logger.info(f"Tensor-store manifest processing complete - {len(embeddings_list)} embeddings")
+        return embeddings_list
+
     def check_health(self) -> bool:
         """
         Check the health of the model.
@@ -14,16 +14,19 @@ from PIL import Image
 from detector import Detector
 from utils import generate_unique_id, encode_image_to_base64
 from milvus_client import MilvusClientWrapper
+from ingestion_journal import file_hash, get_ingestion_journal, params_hash
 
 
 DEVICE = os.getenv("DEVICE", "CPU")
 EMBEDDING_BASE_URL = os.getenv("EMBEDDING_BASE_URL", None)
 EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "openai/clip-vit-base-patch32")
+# Sampled frames whose entities are upserted and journaled together
+INGEST_JOURNAL_RANGE_FRAMES = int(os.getenv("INGEST_JOURNAL_RANGE_FRAMES", 16))
 
 
-def create_milvus_data(embedding, meta=None):
+def create_milvus_data(embedding, meta=None, node_id=None):
     data = {}
-    data["id"] = generate_unique_id()
+    data["id"] = generate_unique_id() if node_id is None else node_id
     data["meta"] = meta
     data["vector"] = embedding
     return data
@@ -43,6 +46,7 @@ class Indexer:
         self.db_inited = False
         self.client = MilvusClientWrapper()
         self.collection_name = collection_name
+        self.journal = get_ingestion_journal()
 
         if self.client.load_collection(collection_name=self.collection_name) == 3:  # loaded
             print(f"Collection '{self.collection_name}' already exist.")
@@ -108,8 +112,9 @@ class Indexer:
         return res, ids
         
     
-    def delete_by_file_path(self, file_path):
+    def _drop_file_entities(self, file_path):
         ids = []
+        res = None
         if file_path in self.id_map:
             ids = self.id_map[file_path]
             res = self.client.delete(
@@ -120,6 +125,12 @@ class Indexer:
         else:
             print(f"File {file_path} not found in db.")
         return res, ids
+
+    def delete_by_file_path(self, file_path):
+        res, ids = self._drop_file_entities(file_path)
+        if self.journal is not None:
+            self.journal.reset(file_path)
+        return res, ids
     
     def delete_all(self):
         if not self.id_map:
@@ -132,6 +143,8 @@ class Indexer:
             ids=ids,
         )
         self.id_map.clear()
+        if self.journal is not None:
+            self.journal.reset()
 
         return res, ids
     
@@ -153,6 +166,22 @@ class Indexer:
         embedding = data["embedding"]
         return embedding
         
+    def process_frame(self, image, meta_data, do_detect_and_crop=True, progress=None, frame_number=0):
+        # crops first, then the full image, as the entities have always been ordered
+        images = list(self.detector.get_cropped_images(image)) if do_detect_and_crop else []
+        images.append(image)
+        entities = []
+        for index, item in enumerate(images):
+            embedding = self.get_image_embedding(item)
+            if not self.db_inited:
+                self.init_db_client(len(embedding))
+            node_id = progress.entity_id(frame_number, index) if progress is not None else None
+            node = create_milvus_data(embedding, meta_data, node_id)
+            entities.append(node)
+            if progress is None:
+                self.update_id_map(meta_data["file_path"], node["id"])
+        return entities
+
     def process_video(self, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
         entities = []
         video = VideoFileClip(video_path)
@@ -166,47 +195,110 @@ class Indexer:
                 seconds = frame_counter / fps
                 meta_data = copy.deepcopy(meta)
                 meta_data["video_pin_second"] = seconds
-                if do_detect_and_crop:
-                    crops = self.detector.get_cropped_images(image)
-                    for crop in crops:
-                        embedding = self.get_image_embedding(crop)
-                        if not self.db_inited:
-                            self.init_db_client(len(embedding))
-                        node = create_milvus_data(embedding, meta_data)
-                        entities.append(node)
-                        self.update_id_map(meta_data["file_path"], node["id"])
-
-                embedding = self.get_image_embedding(image)
-                if not self.db_inited:
-                    self.init_db_client(len(embedding))
-                node = create_milvus_data(embedding, meta_data)
-                entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
+                entities.extend(self.process_frame(image, meta_data, do_detect_and_crop))
             frame_counter += 1
             
         return entities
 
     def process_image(self, image_path, meta, do_detect_and_crop=True):
-        entities = []
         image = Image.open(image_path).convert('RGB')
         meta_data = copy.deepcopy(meta)
-        if do_detect_and_crop:
-            crops = self.detector.get_cropped_images(image)
-            for crop in crops:
-                embedding = self.get_image_embedding(crop)
-                if not self.db_inited:
-                    self.init_db_client(len(embedding))
-                node = create_milvus_data(embedding, meta_data)
-                entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
-        
-        embedding = self.get_image_embedding(image)
-        if not self.db_inited:
-            self.init_db_client(len(embedding))
-        node = create_milvus_data(embedding, meta_data)
-        entities.append(node)
-        self.update_id_map(meta_data["file_path"], node["id"])
-        return entities
+        return self.process_frame(image, meta_data, do_detect_and_crop)
+
+    def _store_range(self, progress, file_path, start_frame, end_frame, entities):
+        # upsert: entities of a range an interrupted run already wrote are replaced, not duplicated
+        self.client.upsert(
+            collection_name=self.collection_name,
+            data=entities,
+        )
+        ids = [node["id"] for node in entities]
+        progress.commit_range(start_frame, end_frame, ids)
+        known = set(self.id_map.get(file_path, []))
+        for node_id in ids:
+            if node_id not in known:
+                self.update_id_map(file_path, node_id)
+        return ids
+
+    def process_video_resumable(self, video_path, meta, progress, frame_interval=15, do_detect_and_crop=True):
+        """
+        Embed a video range by range, storing and journaling each range as soon as it is done.
+
+        Sampled frames inside ranges committed by an earlier run are not embedded again.
+        """
+        video = VideoFileClip(video_path)
+        frame_interval = int(frame_interval)
+        ids = []
+        entities = []
+        range_start = None
+        range_frames = 0
+        last_frame = 0
+        try:
+            fps = video.fps
+            for frame_counter, frame in enumerate(video.iter_frames()):
+                if frame_counter % frame_interval != 0 or progress.is_committed(frame_counter):
+                    continue
+                meta_data = copy.deepcopy(meta)
+                meta_data["video_pin_second"] = frame_counter / fps
+                entities.extend(self.process_frame(Image.fromarray(frame), meta_data, do_detect_and_crop, progress, frame_counter))
+                if range_start is None:
+                    range_start = frame_counter
+                range_frames += 1
+                last_frame = frame_counter
+                if range_frames >= INGEST_JOURNAL_RANGE_FRAMES:
+                    ids.extend(self._store_range(progress, meta["file_path"], range_start, last_frame, entities))
+                    entities = []
+                    range_start = None
+                    range_frames = 0
+            if range_start is not None:
+                ids.extend(self._store_range(progress, meta["file_path"], range_start, last_frame, entities))
+        finally:
+            video.close()
+        progress.finish()
+        return ids
+
+    def process_image_resumable(self, image_path, meta, progress, do_detect_and_crop=True):
+        image = Image.open(image_path).convert('RGB')
+        entities = self.process_frame(image, copy.deepcopy(meta), do_detect_and_crop, progress)
+        ids = self._store_range(progress, meta["file_path"], 0, 0, entities)
+        progress.finish()
+        return ids
+
+    def _begin_journal(self, file, meta, frame_interval, do_detect_and_crop):
+        """
+        Look up a file in the ingestion journal.
+
+        Returns the file's progress, or None when the file must be skipped.
+        """
+        file_path = meta["file_path"]
+        params = {
+            "frame_interval": int(frame_interval),
+            "do_detect_and_crop": bool(do_detect_and_crop),
+            "model": self.model_name,
+            "collection": self.collection_name,
+            "meta": meta,
+        }
+        content_digest = file_hash(file)
+        params_digest = params_hash(params)
+        progress = self.journal.begin(file_path, content_digest, params_digest)
+
+        if progress.status == "complete":
+            if file_path in self.id_map:
+                print(f"File {file} unchanged since its last ingestion, skipping.")
+                return None
+            # entities were removed from the collection behind the journal's back
+            self.journal.reset(file_path)
+            progress = self.journal.begin(file_path, content_digest, params_digest)
+        elif progress.status == "changed" and file_path in self.id_map:
+            print(f"File {file} changed since its last ingestion, replacing its entities.")
+            self._drop_file_entities(file_path)
+        elif progress.status == "new" and file_path in self.id_map:
+            # ingested without a journal entry (journal disabled or lost at the time)
+            print(f"File {file} already processed, skipping.")
+            self.journal.reset(file_path)
+            return None
+        elif progress.status == "resume":
+            print(f"Resuming ingestion of {file} after {len(progress.committed)} committed range(s).")
+        return progress
 
     def add_embedding(self, files, metas, **kwargs):
         if len(files) != len(metas):
@@ -216,19 +308,34 @@ class Indexer:
         minimal_duration = kwargs.get("minimal_duration", 1)
         do_detect_and_crop = kwargs.get("do_detect_and_crop", True)
         entities = []
+        stored_ids = []
         for file, meta in zip(files, metas):
             # print("processing file: ", file)
-            if meta["file_path"] in self.id_map:
+            if self.journal is None and meta["file_path"] in self.id_map:
                 print(f"File {file} already processed, skipping.")
                 continue
             if file.lower().endswith(('.mp4')):
                 meta["type"] = "local_video"
-                entities.extend(self.process_video(file, meta, frame_interval, minimal_duration, do_detect_and_crop))
             elif file.lower().endswith(('.jpg', '.png', '.jpeg')):
                 meta["type"] = "local_image"
-                entities.extend(self.process_image(file, meta, do_detect_and_crop))
             else:
                 print(f"Unsupported file type: {file}. Supported types are: jpg, png, mp4")
+                continue
+
+            if self.journal is None:
+                if meta["type"] == "local_video":
+                    entities.extend(self.process_video(file, meta, frame_interval, minimal_duration, do_detect_and_crop))
+                else:
+                    entities.extend(self.process_image(file, meta, do_detect_and_crop))
+                continue
+
+            progress = self._begin_journal(file, meta, frame_interval, do_detect_and_crop)
+            if progress is None:
+                continue
+            if meta["type"] == "local_video":
+                stored_ids.extend(self.process_video_resumable(file, meta, progress, frame_interval, do_detect_and_crop))
+            else:
+                stored_ids.extend(self.process_image_resumable(file, meta, progress, do_detect_and_crop))
 
         res = {}
         if entities:
@@ -236,6 +343,8 @@ class Indexer:
                 collection_name=self.collection_name,
                 data=entities,
             )
+        elif stored_ids:
+            res = {"upsert_count": len(stored_ids), "ids": stored_ids}
         return res
 
 
@@ -0,0 +1,202 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETE = "complete"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    entity_count INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frame_ranges (
+    file_key TEXT NOT NULL,
+    start_frame INTEGER NOT NULL,
+    end_frame INTEGER NOT NULL,
+    entity_ids TEXT NOT NULL,
+    committed_at REAL NOT NULL,
+    PRIMARY KEY (file_key, start_frame)
+);
+"""
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 of a file, reading it in chunks.
+
+    Args:
+        path: Path of the file.
+        chunk_size: Bytes read per chunk.
+
+    Returns:
+        Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def params_hash(params):
+    """Stable hash of the parameters that determine which entities a file produces."""
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class IngestionJournal:
+    """
+    SQLite (WAL) record of per-file ingestion progress.
+
+    For every file the journal keeps the content hash, a hash of the ingestion
+    parameters and the frame ranges whose entities are already in Milvus. A
+    retried ingestion skips the committed ranges, and an unchanged file that
+    was fully ingested is not processed again.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def begin(self, file_key, content_digest, params_digest):
+        """
+        Start (or resume) the ingestion of a file.
+
+        Returns:
+            FileProgress whose status is "complete", "resume", "changed" (journaled
+            with other content or parameters, now started over) or "new".
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT content_hash, params_hash, status FROM files WHERE file_key = ?", (file_key,)
+                ).fetchone()
+                if row is not None and row[0] == content_digest and row[1] == params_digest:
+                    status = "complete" if row[2] == STATUS_COMPLETE else "resume"
+                else:
+                    status = "new" if row is None else "changed"
+                    self._conn.execute("DELETE FROM frame_ranges WHERE file_key = ?", (file_key,))
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO files (file_key, content_hash, params_hash, status, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (file_key, content_digest, params_digest, STATUS_IN_PROGRESS, time.time()),
+                    )
+                ranges = self._conn.execute(
+                    "SELECT start_frame, end_frame, entity_ids FROM frame_ranges WHERE file_key = ? ORDER BY start_frame",
+                    (file_key,),
+                ).fetchall()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        committed = [(start, end, json.loads(ids)) for start, end, ids in ranges]
+        return FileProgress(self, file_key, content_digest, params_digest, status, committed)
+
+    def commit_range(self, file_key, start_frame, end_frame, entity_ids):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO frame_ranges (file_key, start_frame, end_frame, entity_ids, committed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file_key, start_frame, end_frame, json.dumps(list(entity_ids)), time.time()),
+            )
+
+    def complete(self, file_key, entity_count):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET status = ?, entity_count = ?, updated_at = ? WHERE file_key = ?",
+                (STATUS_COMPLETE, entity_count, time.time(), file_key),
+            )
+
+    def reset(self, file_key=None):
+        """Forget one file, or every file when file_key is None."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            if file_key is None:
+                self._conn.execute("DELETE FROM frame_ranges")
+                self._conn.execute("DELETE FROM files")
+            else:
+                self._conn.execute("DELETE FROM frame_ranges WHERE file_key = ?", (file_key,))
+                self._conn.execute("DELETE FROM files WHERE file_key = ?", (file_key,))
+            self._conn.execute("COMMIT")
+
+
+class FileProgress:
+    """Ingestion progress of one file: committed frame ranges and deterministic entity IDs."""
+
+    def __init__(self, journal, file_key, content_digest, params_digest, status, committed):
+        self.journal = journal
+        self.file_key = file_key
+        self.content_hash = content_digest
+        self.params_hash = params_digest
+        self.status = status
+        self.committed = committed
+        self._starts = [start for start, _, _ in committed]
+        self.ranges_committed = 0
+
+    def is_committed(self, frame_number):
+        index = bisect.bisect_right(self._starts, frame_number) - 1
+        return index >= 0 and self.committed[index][0] <= frame_number <= self.committed[index][1]
+
+    def entity_id(self, frame_number, item_index):
+        """
+        Deterministic Milvus INT64 primary key of one entity.
+
+        Re-ingesting a frame after a failure yields the same keys, so upserting
+        replaces entities an interrupted run may already have written.
+        """
+        name = f"{self.file_key}|{self.content_hash}|{self.params_hash}|{int(frame_number)}|{int(item_index)}"
+        return int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:8], "big") & 0x7FFFFFFFFFFFFFFF
+
+    def commit_range(self, start_frame, end_frame, entity_ids):
+        self.journal.commit_range(self.file_key, start_frame, end_frame, entity_ids)
+        position = bisect.bisect_left(self._starts, start_frame)
+        self._starts.insert(position, start_frame)
+        self.committed.insert(position, (start_frame, end_frame, list(entity_ids)))
+        self.ranges_committed += 1
+
+    def committed_ids(self):
+        return [entity_id for _, _, ids in self.committed for entity_id in ids]
+
+    def finish(self):
+        self.journal.complete(self.file_key, len(self.committed_ids()))
+        self.status = "complete"
+
+
+_journal = None
+
+
+def get_ingestion_journal():
+    """Return the process-wide journal, or None when INGEST_JOURNAL_ENABLED is false."""
+    global _journal
+    if os.getenv("INGEST_JOURNAL_ENABLED", "true").lower() != "true":
+        return None
+    if _journal is None:
+        path = os.getenv("INGEST_JOURNAL_PATH", "/tmp/dataprep/ingestion_journal.db")
+        try:
+            _journal = IngestionJournal(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Ingestion journal unavailable ({e}); ingestion will not be resumable.")
+            return None
+    return _journal
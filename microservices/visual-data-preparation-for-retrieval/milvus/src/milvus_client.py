@@ -66,6 +66,14 @@ class MilvusClientWrapper:
         
         return res
     
+    def upsert(self, data: list, collection_name: str):
+        res = self.client.upsert(
+                collection_name=collection_name,
+                data=data,
+            )
+
+        return res
+    
     def delete(self, ids: list, collection_name: str):
         res = self.client.delete(
                 collection_name=collection_name,
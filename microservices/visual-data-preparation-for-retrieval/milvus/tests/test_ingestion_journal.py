@@ -0,0 +1,140 @@
+import hashlib
+import pytest
+import numpy as np
+from unittest import mock
+from ingestion_journal import IngestionJournal, file_hash
+from indexer import Indexer
+
+
+class FakeVideo:
+    """Stand-in for VideoFileClip with a fixed number of blank frames."""
+
+    def __init__(self, num_frames, fps=10.0):
+        self.fps = fps
+        self.num_frames = num_frames
+        self.closed = False
+
+    def iter_frames(self):
+        for _ in range(self.num_frames):
+            yield np.zeros((8, 8, 3), dtype=np.uint8)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = IngestionJournal(tmp_path / "journal.db")
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def indexer(journal):
+    with mock.patch("indexer.Detector"), \
+            mock.patch("indexer.MilvusClientWrapper"), \
+            mock.patch("indexer.get_ingestion_journal", return_value=journal), \
+            mock.patch("indexer.INGEST_JOURNAL_RANGE_FRAMES", 2), \
+            mock.patch.object(Indexer, "get_image_embedding", return_value=[0.0, 0.0, 0.0, 0.0]):
+        indexer = Indexer(collection_name="test")
+        indexer.db_inited = True
+        yield indexer
+
+
+def ingest(indexer, video_file, video):
+    meta = {"file_path": str(video_file)}
+    with mock.patch("indexer.VideoFileClip", return_value=video):
+        return indexer.add_embedding([str(video_file)], [meta], frame_interval=1, do_detect_and_crop=False)
+
+
+def test_file_hash(tmp_path):
+    """
+    Test that the chunked file hash matches the SHA-256 of the whole content.
+    """
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"frame" * 1000)
+
+    assert file_hash(path, chunk_size=7) == hashlib.sha256(b"frame" * 1000).hexdigest()
+
+
+def test_journal_resume_and_change(journal):
+    """
+    Test that committed ranges are resumed for unchanged content and dropped for changed content.
+    """
+    progress = journal.begin("a.mp4", "content-1", "params")
+    assert progress.status == "new"
+    progress.commit_range(0, 4, [1, 2])
+
+    progress = journal.begin("a.mp4", "content-1", "params")
+    assert progress.status == "resume"
+    assert progress.is_committed(3)
+    assert not progress.is_committed(5)
+    assert progress.committed_ids() == [1, 2]
+
+    progress.finish()
+    assert journal.begin("a.mp4", "content-1", "params").status == "complete"
+
+    progress = journal.begin("a.mp4", "content-2", "params")
+    assert progress.status == "changed"
+    assert progress.committed == []
+
+
+def test_entity_ids_are_deterministic(journal):
+    """
+    Test that entity IDs depend only on the file, its content, the parameters and the frame.
+    """
+    first = journal.begin("a.mp4", "content-1", "params")
+    second = journal.begin("a.mp4", "content-1", "params")
+    changed = journal.begin("a.mp4", "content-2", "params")
+
+    assert first.entity_id(15, 0) == second.entity_id(15, 0)
+    assert first.entity_id(15, 0) != first.entity_id(15, 1)
+    assert first.entity_id(15, 0) != changed.entity_id(15, 0)
+    assert 0 <= first.entity_id(15, 0) < 2**63
+
+
+def test_process_video_resumes_after_partial_commit(indexer, tmp_path):
+    """
+    Test that a retried ingestion embeds only the frames after the committed ranges.
+    """
+    video_file = tmp_path / "video.mp4"
+    video_file.write_bytes(b"video")
+    indexer.client.upsert.side_effect = [None, None, RuntimeError("milvus unavailable")]
+
+    video = FakeVideo(10)
+    with pytest.raises(RuntimeError):
+        ingest(indexer, video_file, video)
+    assert video.closed
+    assert len(indexer.id_map[str(video_file)]) == 4
+
+    indexer.client.upsert.side_effect = None
+    indexer.get_image_embedding.reset_mock()
+    video = FakeVideo(10)
+    res = ingest(indexer, video_file, video)
+
+    assert video.closed
+    assert indexer.get_image_embedding.call_count == 6
+    assert res["upsert_count"] == 6
+    assert len(set(indexer.id_map[str(video_file)])) == 10
+
+    indexer.get_image_embedding.reset_mock()
+    assert ingest(indexer, video_file, FakeVideo(10)) == {}
+    assert indexer.get_image_embedding.call_count == 0
+
+
+def test_changed_file_replaces_its_entities(indexer, tmp_path):
+    """
+    Test that re-ingesting a file with new content deletes the entities of the old content.
+    """
+    video_file = tmp_path / "video.mp4"
+    video_file.write_bytes(b"first version")
+    ingest(indexer, video_file, FakeVideo(4))
+    old_ids = list(indexer.id_map[str(video_file)])
+
+    video_file.write_bytes(b"second version")
+    ingest(indexer, video_file, FakeVideo(4))
+
+    indexer.client.delete.assert_called_once_with(collection_name="test", ids=old_ids)
+    new_ids = indexer.id_map[str(video_file)]
+    assert len(new_ids) == 4
+    assert not set(new_ids) & set(old_ids)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Descriptor ingest benchmark for VDMS DataPrep
+
+Compares the per-batch storage path (``VDMS.add_from`` once per embedding batch,
+followed by the property-list refresh) against the pipelined bulk writer
+(``VDMSBulkWriter``) and reports descriptors/s for each.
+
+By default the benchmark starts an in-process fake VDMS server that speaks the
+VDMS wire protocol (length-prefixed protobuf messages) and acknowledges
+descriptor inserts, so it runs without a database. ``--rtt-ms`` adds a delay
+per request and ``--per-descriptor-us`` a per-descriptor cost to emulate a
+remote server. Pass ``--host``/``--port`` to measure a real VDMS container
+instead (a throwaway collection is used).
+
+Usage:
+    # In-process fake server, 1 ms round trip
+    python examples/ingest_benchmark.py --descriptors 20000 --rtt-ms 1
+
+    # Local VDMS container
+    docker run -d -p 55555:55555 intellabs/vdms:latest
+    python examples/ingest_benchmark.py --host localhost --port 55555 --output report.json
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import struct
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from langchain_vdms.vectorstores import VDMS, VDMS_Client  # noqa: E402
+from vdms import queryMessage_pb2  # noqa: E402
+
+from src.core.embedding.simple_client import DummyEmbedding  # noqa: E402
+from src.core.embedding.vdms_bulk import VDMSBulkWriter  # noqa: E402
+
+_HEADER = struct.Struct("@I")
+
+
+class _FakeVDMSHandler(socketserver.BaseRequestHandler):
+    """Serve one client connection with just enough of VDMS for descriptor ingestion."""
+
+    def _recv_exact(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data.extend(chunk)
+        return bytes(data)
+
+    def handle(self):
+        server = self.server
+        while True:
+            header = self._recv_exact(_HEADER.size)
+            if header is None:
+                return
+            message = queryMessage_pb2.queryMessage()
+            message.ParseFromString(self._recv_exact(_HEADER.unpack(header)[0]))
+            queries = json.loads(message.json)
+            blobs = list(message.blobs)
+
+            responses, out_blobs, descriptors = [], [], 0
+            for query in queries:
+                (command, body), = query.items()
+                if command == "AddDescriptor":
+                    count = len(body.get("batch_properties") or [body.get("properties")])
+                    vector_bytes = len(blobs.pop(0)) if blobs else 0
+                    ok = vector_bytes == count * server.dimensions * 4
+                    descriptors += count if ok else 0
+                    responses.append({command: {"status": 0 if ok else -1}})
+                elif command == "FindEntity":
+                    if server.properties is not None and "_deletion" not in body.get("constraints", {}):
+                        responses.append({command: {"status": 0, "returned": 1, "entities": [{}]}})
+                        out_blobs.append(server.properties)
+                    else:
+                        responses.append({command: {"status": 0, "returned": 0}})
+                elif command == "AddEntity":
+                    server.properties = blobs.pop(0) if blobs else b""
+                    responses.append({command: {"status": 0}})
+                else:
+                    responses.append({command: {"status": 0, "returned": 0}})
+
+            with server.lock:
+                server.descriptors += descriptors
+            delay = server.rtt + descriptors * server.per_descriptor
+            if delay:
+                time.sleep(delay)
+
+            reply = queryMessage_pb2.queryMessage()
+            reply.json = json.dumps(responses)
+            reply.blobs.extend(out_blobs)
+            data = reply.SerializeToString()
+            self.request.sendall(_HEADER.pack(len(data)) + data)
+
+
+class FakeVDMSServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, dimensions, rtt_ms=0.0, per_descriptor_us=0.0):
+        super().__init__(("127.0.0.1", 0), _FakeVDMSHandler)
+        self.dimensions = dimensions
+        self.rtt = rtt_ms / 1000.0
+        self.per_descriptor = per_descriptor_us / 1e6
+        self.properties = None
+        self.descriptors = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def _frame_records(count, dimensions, seed=0):
+    """Synthetic embeddings and flattened frame metadata shaped like the dataprep output."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dimensions), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    texts, metadatas = [], []
+    for index in range(count):
+        frame_number = index * 15
+        metadatas.append(
+            {
+                "frame_id": f"bench_{frame_number}",
+                "frame_number": frame_number,
+                "timestamp": frame_number / 30.0,
+                "frame_type": "full_frame",
+                "video_id": "bench",
+                "filename": "bench.mp4",
+                "bucket_name": "bench-bucket",
+                "tags": "benchmark,synthetic",
+                "video_url": "http://localhost:8000/v1/dataprep/videos/download?video_id=bench",
+                "video_rel_url": "/v1/dataprep/videos/download?video_id=bench",
+                "total_frames": count * 15,
+                "fps": 30.0,
+                "video_duration_seconds": count * 0.5,
+            }
+        )
+        texts.append(f"frame_{frame_number}_bench")
+    return vectors, texts, metadatas
+
+
+def _per_batch(store, vectors, texts, metadatas, batch_size):
+    """Current path: one store call per embedding batch, each doing ``add_from``."""
+    for start in range(0, len(texts), batch_size):
+        end = start + batch_size
+        ids = [str(uuid.uuid4()) for _ in texts[start:end]]
+        inserted = store.add_from(
+            texts=texts[start:end],
+            embeddings=vectors[start:end].tolist(),
+            metadatas=metadatas[start:end],
+            ids=ids,
+            batch_size=200,
+        )
+        if len(inserted) != len(ids):
+            raise RuntimeError(f"add_from stored {len(inserted)} of {len(ids)} descriptors")
+        store.check_and_update_properties()
+
+
+def _bulk(writer, vectors, texts, metadatas):
+    result = writer.add(vectors, texts, metadatas)
+    if result["failed_ids"]:
+        raise RuntimeError(f"bulk insert failed for {len(result['failed_ids'])} descriptors")
+    return result
+
+
+def run(args):
+    vectors, texts, metadatas = _frame_records(args.descriptors, args.dimensions)
+    collection = args.collection or f"ingest-bench-{uuid.uuid4().hex[:8]}"
+    report = {
+        "descriptors": args.descriptors,
+        "dimensions": args.dimensions,
+        "collection": collection,
+        "target": f"{args.host}:{args.port}" if args.host else f"fake (rtt={args.rtt_ms}ms, per_descriptor={args.per_descriptor_us}us)",
+        "results": {},
+    }
+
+    def _measure(host, port):
+        client = VDMS_Client(host=host, port=port)
+        store = VDMS(
+            client=client,
+            embedding=DummyEmbedding(args.dimensions),
+            collection_name=collection,
+            engine="FaissFlat",
+            distance_strategy="IP",
+            embedding_dimensions=args.dimensions,
+        )
+
+        start = time.perf_counter()
+        _per_batch(store, vectors, texts, metadatas, args.batch_size)
+        elapsed = time.perf_counter() - start
+        report["results"]["per_batch"] = {
+            "batch_size": args.batch_size,
+            "seconds": round(elapsed, 4),
+            "descriptors_per_s": round(args.descriptors / elapsed, 1),
+        }
+
+        writer = VDMSBulkWriter(
+            store,
+            host,
+            port,
+            transaction_size=args.transaction_size,
+            pipeline_depth=args.pipeline_depth,
+        )
+        start = time.perf_counter()
+        result = _bulk(writer, vectors, texts, metadatas)
+        elapsed = time.perf_counter() - start
+        writer.close()
+        report["results"]["bulk"] = {
+            "transaction_size": writer.transaction_size,
+            "pipeline_depth": writer.pipeline_depth,
+            "transactions": result["transactions"],
+            "seconds": round(elapsed, 4),
+            "descriptors_per_s": round(args.descriptors / elapsed, 1),
+        }
+
+    if args.host:
+        _measure(args.host, args.port)
+    else:
+        with FakeVDMSServer(args.dimensions, args.rtt_ms, args.per_descriptor_us) as server:
+            _measure(*server.server_address)
+            report["server_descriptors"] = server.descriptors
+
+    per_batch = report["results"]["per_batch"]["descriptors_per_s"]
+    report["speedup"] = round(report["results"]["bulk"]["descriptors_per_s"] / per_batch, 2) if per_batch else None
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--descriptors", type=int, default=10000, help="Descriptors inserted per path")
+    parser.add_argument("--dimensions", type=int, default=512, help="Embedding dimensions")
+    parser.add_argument("--batch-size", type=int, default=32, help="Embedding batch size of the per-batch path")
+    parser.add_argument("--transaction-size", type=int, default=None, help="Bulk transaction size (default from settings)")
+    parser.add_argument("--pipeline-depth", type=int, default=None, help="Bulk transactions in flight (default from settings)")
+    parser.add_argument("--host", default=os.getenv("VDMS_VDB_HOST", ""), help="Real VDMS host (fake server when empty)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("VDMS_VDB_PORT") or 55555))
+    parser.add_argument("--collection", default="", help="Collection name (random when empty)")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Fake server: delay per request")
+    parser.add_argument("--per-descriptor-us", type=float, default=0.0, help="Fake server: delay per descriptor")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
+
+
+if __name__ == "__main__":
+    main()
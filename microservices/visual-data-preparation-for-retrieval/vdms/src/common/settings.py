@@ -36,12 +36,21 @@ class Settings(BaseSettings):
     MINIO_ACCESS_KEY: str = ""
     MINIO_SECRET_KEY: str = ""
     MINIO_SECURE: bool = False  # Whether to use HTTPS
+    MINIO_MAX_CONNECTIONS: int = 16  # Size of the bounded MinIO connection pool
+    MINIO_TRANSFER_PART_SIZE_MB: int = 16  # Part size of parallel ranged downloads and multipart uploads (min 5)
+    MINIO_TRANSFER_WORKERS: int = 8  # Parts transferred concurrently across all requests
 
     # VDMS and embedding settings
     VDMS_VDB_HOST: str = ""
     VDMS_VDB_PORT: str = ""
     MULTIMODAL_EMBEDDING_MODEL_NAME: str = ""  # Model name for both SDK and API modes - must be explicitly set
     MULTIMODAL_EMBEDDING_ENDPOINT: str = ""  # 0 means auto-detect from API
+
+    # Bulk descriptor ingestion (see src/core/embedding/vdms_bulk.py)
+    VDMS_BULK_INSERT: bool = True  # Store embeddings with the pipelined bulk writer instead of add_from batches
+    VDMS_BULK_TRANSACTION_SIZE: int = 2000  # Descriptors per VDMS transaction (halved automatically on rejection)
+    VDMS_BULK_PIPELINE_DEPTH: int = 4  # Transactions in flight on the bulk connection
+    VDMS_BULK_MAX_RETRIES: int = 3  # Retries per failed descriptor and reconnect attempts
     
     # Embedding processing mode: "api" or "sdk"
     # api: Use HTTP API calls to multimodal embedding service (current default)
@@ -64,6 +73,26 @@ class Settings(BaseSettings):
     DETECTION_CONFIDENCE: float = 0.85
     DETECTION_MODEL_DIR: str = "/app/models/yolox"  # Directory for object detection models
     FRAMES_TEMP_DIR: str = "/tmp/dataprep"  # Must match Docker volume mount for shared access
+    # Pack extracted frames into one memory-mapped uint8 tensor file instead of per-frame JPEGs.
+    # FRAMES_TEMP_DIR must be shared with the embedding service (a tmpfs mount keeps it in memory).
+    FRAMES_TENSOR_STORE: bool = False
+    FRAME_WRITE_WORKERS: int = 4  # Threads encoding and writing frame/crop JPEGs in batches (0 writes inline)
+    # SDK mode streams frames through bounded decode -> detect -> crop -> embed -> store stages.
+    # The per-stage queue depth caps how many frames are in flight, independent of video length.
+    PIPELINE_QUEUE_DEPTH: int = 16
+    PIPELINE_DECODE_CHUNK_SIZE: int = 8  # Sampled frames decoded per decord batch call
+    # SDK mode runs object detection through a shared engine that batches frames from all
+    # in-flight videos onto an OpenVINO async infer-request pool (see object_detection/batch_engine.py).
+    DETECTION_BATCH_ENGINE: bool = True
+    DETECTION_BATCH_SIZE: int = 8  # Frames per detection inference batch
+    DETECTION_BATCH_WAIT_MS: int = 10  # Time a partial batch waits for more frames
+    DETECTION_INFER_REQUESTS: int = 0  # Async infer requests (0 uses the device's optimal number)
+    DETECTION_SKIP_SIMILAR_FRAMES: bool = False  # Reuse detections for near-duplicate consecutive frames
+    DETECTION_FRAME_DIFF_THRESHOLD: float = 3.0  # Mean abs. thumbnail difference (0-255) counted as near-duplicate
+    # SQLite journal of per-video, per-frame-range ingestion progress (see core/embedding/ingestion_journal.py).
+    # Retried requests resume after the last committed range; unchanged videos are not re-ingested.
+    INGEST_JOURNAL_ENABLED: bool = True
+    INGEST_JOURNAL_PATH: str = ""  # Defaults to <FRAMES_TEMP_DIR>/ingestion_journal.db
 
     # Allow environment override for bucket name (useful for different deployments)
     # If PM_MINIO_BUCKET is set (from sample app), use that; otherwise use DEFAULT_BUCKET_NAME
@@ -0,0 +1,330 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Local ingestion journal for resumable, idempotent video ingestion.
+
+The journal is a small SQLite database (WAL mode) that records, per video:
+
+- the content hash of the video bytes and a hash of the ingestion parameters
+  (frame interval, detection settings, embedding model, collection, metadata);
+- every frame range whose descriptors have all been stored, with their IDs;
+- whether the whole video has been ingested.
+
+Descriptor IDs are derived from the video key, both hashes, the frame number
+and the crop index, so re-storing a frame after a failure produces the same
+IDs and can be checked against VDMS instead of creating duplicates.
+
+A retried request therefore skips committed ranges (they are not even
+decoded), and re-ingesting an unchanged, fully ingested video only costs the
+content hash and a journal lookup.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.common import logger, settings
+
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETE = "complete"
+
+# Namespace of the deterministic descriptor IDs
+_DESCRIPTOR_NAMESPACE = uuid.UUID("6f1c1a52-3c55-4c2e-9a51-0d3f4f0b7e21")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    descriptor_count INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frame_ranges (
+    video_key TEXT NOT NULL,
+    start_frame INTEGER NOT NULL,
+    end_frame INTEGER NOT NULL,
+    descriptor_ids TEXT NOT NULL,
+    committed_at REAL NOT NULL,
+    PRIMARY KEY (video_key, start_frame)
+);
+"""
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of the video bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_content_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a video file, read in chunks; equal to ``content_hash`` of its bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """Stable hash of the parameters that determine which descriptors a video produces."""
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class IngestionJournal:
+    """
+    SQLite-backed record of per-video ingestion progress.
+
+    Args:
+        path: Database file; its parent directory is created if needed
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def begin(self, video_key: str, content_digest: str, params_digest: str) -> "VideoProgress":
+        """
+        Start (or resume) the ingestion of a video.
+
+        A journal entry recorded for different content or parameters is discarded
+        and the video starts from scratch.
+
+        Returns:
+            ``VideoProgress`` whose ``status`` is ``complete``, ``resume`` or ``new``
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT content_hash, params_hash, status FROM videos WHERE video_key = ?", (video_key,)
+                ).fetchone()
+                if row is not None and row[0] == content_digest and row[1] == params_digest:
+                    status = "complete" if row[2] == STATUS_COMPLETE else "resume"
+                else:
+                    if row is not None:
+                        logger.info(f"Ingestion journal: {video_key} changed since its last ingestion; starting over")
+                    self._conn.execute("DELETE FROM frame_ranges WHERE video_key = ?", (video_key,))
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO videos (video_key, content_hash, params_hash, status, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (video_key, content_digest, params_digest, STATUS_IN_PROGRESS, now),
+                    )
+                    status = "new"
+                ranges = self._conn.execute(
+                    "SELECT start_frame, end_frame, descriptor_ids FROM frame_ranges WHERE video_key = ? "
+                    "ORDER BY start_frame",
+                    (video_key,),
+                ).fetchall()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        committed = [(start, end, json.loads(ids)) for start, end, ids in ranges]
+        return VideoProgress(self, video_key, content_digest, params_digest, status, committed)
+
+    def commit_range(self, video_key: str, start_frame: int, end_frame: int, descriptor_ids: Sequence[str]) -> None:
+        """Record that every descriptor of frames ``start_frame..end_frame`` is stored."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO frame_ranges (video_key, start_frame, end_frame, descriptor_ids, committed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (video_key, start_frame, end_frame, json.dumps(list(descriptor_ids)), time.time()),
+            )
+
+    def complete(self, video_key: str, descriptor_count: int) -> None:
+        """Mark a video as fully ingested."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE videos SET status = ?, descriptor_count = ?, updated_at = ? WHERE video_key = ?",
+                (STATUS_COMPLETE, descriptor_count, time.time(), video_key),
+            )
+
+    def reset(self, video_key: str) -> None:
+        """Forget a video (for example when its descriptors are no longer in the database)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM frame_ranges WHERE video_key = ?", (video_key,))
+            self._conn.execute("DELETE FROM videos WHERE video_key = ?", (video_key,))
+            self._conn.execute("COMMIT")
+
+
+class VideoProgress:
+    """
+    Ingestion progress of one video.
+
+    Frames are grouped into ranges (``plan``). The pipeline reports how many
+    descriptors each frame expands into (``frame_expanded``) and which
+    descriptors were stored (``items_stored``); a range is committed to the
+    journal as soon as all descriptors of all its frames are stored.
+    """
+
+    def __init__(
+        self,
+        journal: IngestionJournal,
+        video_key: str,
+        content_digest: str,
+        params_digest: str,
+        status: str,
+        committed: List[Tuple[int, int, List[str]]],
+    ):
+        self.journal = journal
+        self.video_key = video_key
+        self.content_hash = content_digest
+        self.params_hash = params_digest
+        self.status = status
+        # Ranges committed by earlier runs (sorted by start frame) and by this run
+        self._previous = committed
+        self._previous_starts = [start for start, _, _ in committed]
+        self._committed: List[Tuple[int, int, List[str]]] = []
+        self._lock = threading.Lock()
+        self._range_of: Dict[int, int] = {}
+        self._ranges: List[Dict[str, Any]] = []
+
+    @property
+    def resumed(self) -> bool:
+        """Whether an earlier, interrupted ingestion of the same content may have stored descriptors."""
+        return self.status == "resume"
+
+    @property
+    def ranges_committed(self) -> int:
+        """Number of ranges committed by this run."""
+        with self._lock:
+            return len(self._committed)
+
+    def committed_ids(self) -> List[str]:
+        """Descriptor IDs of all committed ranges, in frame order."""
+        with self._lock:
+            ranges = sorted(self._previous + self._committed)
+        return [descriptor_id for _, _, ids in ranges for descriptor_id in ids]
+
+    def is_committed(self, frame_number: int) -> bool:
+        """Whether ``frame_number`` lies in a range committed by an earlier run."""
+        index = bisect.bisect_right(self._previous_starts, frame_number) - 1
+        return index >= 0 and self._previous[index][0] <= frame_number <= self._previous[index][1]
+
+    def descriptor_id(self, frame_number: int, crop_index: Optional[int] = None) -> str:
+        """Deterministic descriptor ID of a full frame (``crop_index=None``) or one of its crops."""
+        crop = -1 if crop_index is None else int(crop_index)
+        name = f"{self.video_key}|{self.content_hash}|{self.params_hash}|{int(frame_number)}|{crop}"
+        return str(uuid.uuid5(_DESCRIPTOR_NAMESPACE, name))
+
+    def plan(self, frame_ranges: Iterable[Sequence[int]]) -> List[int]:
+        """
+        Register the frame ranges of this run, skipping committed ones.
+
+        Returns:
+            Frame numbers that still have to be processed, in order
+        """
+        pending: List[int] = []
+        with self._lock:
+            for frames in frame_ranges:
+                frames = list(frames)
+                if not frames or all(self.is_committed(frame) for frame in frames):
+                    continue
+                index = len(self._ranges)
+                self._ranges.append(
+                    {
+                        "start": frames[0],
+                        "end": frames[-1],
+                        "waiting": set(frames),
+                        "expected": 0,
+                        "ids": {},
+                        "committed": False,
+                    }
+                )
+                for frame in frames:
+                    self._range_of[frame] = index
+                pending.extend(frames)
+        return pending
+
+    def frame_expanded(self, frame_number: int, descriptor_count: int) -> None:
+        """Report how many descriptors (full frame plus crops) a frame produces."""
+        index = self._range_of.get(frame_number)
+        if index is None:
+            return
+        with self._lock:
+            entry = self._ranges[index]
+            entry["waiting"].discard(frame_number)
+            entry["expected"] += descriptor_count
+            ready = self._take_if_ready(entry)
+        if ready is not None:
+            self.journal.commit_range(self.video_key, *ready)
+
+    def items_stored(self, metadatas: Sequence[Dict[str, Any]], ids: Sequence[str]) -> None:
+        """Report stored descriptors by their frame metadata."""
+        ready_ranges = []
+        with self._lock:
+            touched = set()
+            for metadata, descriptor_id in zip(metadatas, ids):
+                frame_number = metadata.get("frame_number")
+                index = self._range_of.get(frame_number)
+                if index is None:
+                    continue
+                crop_index = metadata.get("crop_index")
+                self._ranges[index]["ids"][(frame_number, -1 if crop_index is None else crop_index)] = descriptor_id
+                touched.add(index)
+            for index in touched:
+                ready = self._take_if_ready(self._ranges[index])
+                if ready is not None:
+                    ready_ranges.append(ready)
+        for ready in ready_ranges:
+            self.journal.commit_range(self.video_key, *ready)
+
+    def _take_if_ready(self, entry: Dict[str, Any]) -> Optional[Tuple[int, int, List[str]]]:
+        """Mark a fully stored range as committed and return it (caller holds the lock)."""
+        if entry["committed"] or entry["waiting"] or len(entry["ids"]) < entry["expected"]:
+            return None
+        entry["committed"] = True
+        committed = (entry["start"], entry["end"], [entry["ids"][key] for key in sorted(entry["ids"])])
+        self._committed.append(committed)
+        return committed
+
+    def finish(self) -> bool:
+        """Mark the video complete if every planned range was committed; returns the outcome."""
+        with self._lock:
+            done = all(entry["committed"] for entry in self._ranges)
+            count = sum(len(ids) for _, _, ids in self._previous + self._committed)
+        if done:
+            self.journal.complete(self.video_key, count)
+            self.status = "complete"
+        return done
+
+
+_journal: Optional[IngestionJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_ingestion_journal() -> Optional[IngestionJournal]:
+    """Return the process-wide journal, or None when ``INGEST_JOURNAL_ENABLED`` is off."""
+    global _journal
+    if not settings.INGEST_JOURNAL_ENABLED:
+        return None
+    with _journal_lock:
+        if _journal is None:
+            path = settings.INGEST_JOURNAL_PATH or os.path.join(settings.FRAMES_TEMP_DIR, "ingestion_journal.db")
+            try:
+                _journal = IngestionJournal(path)
+                logger.info(f"Ingestion journal at {path}")
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Ingestion journal unavailable ({e}); videos will not be resumable")
+                return None
+    return _journal
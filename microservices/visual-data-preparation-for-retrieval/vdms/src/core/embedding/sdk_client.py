@@ -6,7 +6,6 @@
 import threading
 import time
 import traceback
-import uuid
 from collections.abc import Iterable
 from typing import Any, Dict, List, Optional
 
@@ -17,6 +16,7 @@ from langchain_vdms.vectorstores import VDMS, VDMS_Client
 from multimodal_embedding_serving import EmbeddingModel, get_model_handler
 
 from src.common import Strings, logger, settings
+from src.core.embedding.vdms_bulk import VDMSBulkStoreMixin, VDMSBulkWriter
 
 
 class DummyEmbedding(Embeddings):
@@ -37,7 +37,7 @@ class DummyEmbedding(Embeddings):
         raise NotImplementedError("Use pre-computed embeddings instead")
 
 
-class SDKVDMSClient:
+class SDKVDMSClient(VDMSBulkStoreMixin):
     """
     Optimized VDMS Client using SDK-based embedding generation with langchain-vdms persistence.
 
@@ -266,6 +266,14 @@ class SDKVDMSClient:
                 embedding_dimensions=self.embedding_dimensions
             )
             
+            # Dedicated persistent connection for bulk inserts; property updates share _vdms_lock
+            self.bulk_writer = VDMSBulkWriter(
+                self.video_db,
+                self.vdms_host,
+                int(self.vdms_port),
+                store_lock=self._vdms_lock,
+            )
+
             logger.info("VDMS initialized - Collection: %s", self.collection_name)
             logger.info("Collection configured with %dD embeddings", self.embedding_dimensions)
             logger.warning(
@@ -318,16 +326,24 @@ class SDKVDMSClient:
         
         return cleaned
 
-    def store_frame_embeddings(self, embeddings: List[List[float]], frame_metadatas: List[dict]) -> List[str]:
+    def store_frame_embeddings(
+        self,
+        embeddings: List[List[float]],
+        frame_metadatas: List[dict],
+        ids: Optional[List[str]] = None,
+        skip_existing: bool = False,
+    ) -> List[str]:
         """
         Store frame embeddings using optimized langchain-vdms batching.
 
         Args:
             embeddings: Pre-computed embeddings from SDK
             frame_metadatas: Metadata for each frame
+            ids: Optional descriptor IDs (generated when omitted)
+            skip_existing: Look ``ids`` up first and only store the missing descriptors
 
         Returns:
-            List of IDs for stored embeddings
+            List of IDs for stored embeddings (including the ones that already existed)
         """
         try:
             start_time = time.time()
@@ -370,7 +386,20 @@ class SDKVDMSClient:
                 list(cleaned_metadatas[0].keys()) if cleaned_metadatas else []
             )
             
-            ids = self._store_embeddings(embeddings, frame_texts, cleaned_metadatas)
+            if skip_existing and ids:
+                existing = self.bulk_writer.existing_ids(ids)
+                if existing:
+                    logger.info("Skipping %d of %d descriptors already stored", len(existing), len(ids))
+                    missing = [i for i, descriptor_id in enumerate(ids) if descriptor_id not in existing]
+                    self._store_embeddings(
+                        [embeddings[i] for i in missing],
+                        [frame_texts[i] for i in missing],
+                        [cleaned_metadatas[i] for i in missing],
+                        ids=[ids[i] for i in missing],
+                    )
+                    return list(ids)
+
+            ids = self._store_embeddings(embeddings, frame_texts, cleaned_metadatas, ids=ids)
             total_time = time.time() - start_time
             logger.info("Stored %d embeddings in %.3fs", len(ids), total_time)
             return ids
@@ -382,61 +411,6 @@ class SDKVDMSClient:
             logger.error("Error type: %s", type(ex).__name__)
             raise Exception(Strings.embedding_error)
     
-    def _store_embeddings(
-        self,
-        embeddings: List[List[float]],
-        texts: List[str],
-        metadatas: List[dict],
-    ) -> List[str]:
-        """Persist embeddings using the langchain-vdms vector store."""
-
-        if not embeddings:
-            return []
-
-        logger.info("Storing %d embeddings via langchain-vdms", len(embeddings))
-        batch_size = 200
-        generated_ids: List[str] = []
-
-        with self._vdms_lock:
-            for start_idx in range(0, len(embeddings), batch_size):
-                end_idx = min(start_idx + batch_size, len(embeddings))
-
-                batch_embeddings = embeddings[start_idx:end_idx]
-                batch_texts = texts[start_idx:end_idx]
-                batch_metadatas = metadatas[start_idx:end_idx]
-                batch_ids = [str(uuid.uuid4()) for _ in batch_embeddings]
-
-                try:
-                    inserted_ids = self.video_db.add_from(
-                        texts=batch_texts,
-                        embeddings=batch_embeddings,
-                        metadatas=batch_metadatas,
-                        ids=batch_ids,
-                        batch_size=batch_size,
-                    )
-                except Exception as exc:
-                    logger.error(
-                        "VDMS add_from failed for batch %d-%d: %s",
-                        start_idx,
-                        end_idx - 1,
-                        exc,
-                    )
-                    raise
-
-                if not inserted_ids or len(inserted_ids) != len(batch_ids):
-                    raise ValueError(
-                        "VDMS add_from returned unexpected result size. "
-                        f"Expected {len(batch_ids)}, received {len(inserted_ids) if inserted_ids else 0}."
-                    )
-
-                generated_ids.extend(inserted_ids)
-
-        self.video_db.check_and_update_properties()
-        logger.info("Stored %d embeddings in VDMS", len(generated_ids))
-        return generated_ids
-    
-
-    
     def generate_embedding_for_image(self, image_input: Any) -> Optional[List[float]]:
         """
         Generate embedding for a single image using SDK.
@@ -8,33 +8,41 @@ This module provides optimized video processing using the multimodal embedding s
 as an SDK for direct function calls. Final implementation strategy:
 
 1. **SDK-based Embedding Generation**: Direct function calls instead of HTTP API
-2. **Parallel Processing**: Process embeddings in parallel using ThreadPoolExecutor
-3. **Bulk Vector DB Storage**: Store all embeddings in VDMS in single bulk operation
-4. **Memory-based Video Processing**: Process video directly from memory using decord
+2. **Streaming Pipeline**: Decode, detection, cropping, embedding and storage run as
+   concurrent stages connected by bounded queues (see ``streaming_pipeline``)
+3. **Batched Vector DB Storage**: Store embeddings in VDMS one embedding batch at a time
+4. **Memory-based Video Processing**: Decode video directly from memory using decord
 
 Performance Benefits:
 - Eliminates network latency for embedding generation
-- Parallel embedding generation for better CPU utilization
-- Bulk storage reduces VDMS operation overhead
+- Decoding overlaps inference, keeping the device busy
+- Back-pressure keeps peak memory constant regardless of video length
 - Memory-only processing avoids disk I/O
 """
 
+import functools
 import io
-import tempfile
 import pathlib
 import time
 import os
 import multiprocessing
 import threading
-from typing import Dict, Any, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 import cv2
 import numpy as np
 from PIL import Image
 import decord
 
 from src.common import logger, settings
+from src.core.embedding.ingestion_journal import (
+    VideoProgress,
+    content_hash,
+    file_content_hash,
+    get_ingestion_journal,
+    params_hash,
+)
 from src.core.embedding.sdk_client import SDKVDMSClient
+from src.core.embedding.streaming_pipeline import PipelineStage, StreamingPipeline
 
 # Global SDK client instance (initialized once per worker process)
 _sdk_client: Optional[SDKVDMSClient] = None
@@ -42,6 +50,9 @@ _sdk_client: Optional[SDKVDMSClient] = None
 # Global object detector instance (initialized once per worker process)
 _global_detector = None
 
+# Global batched detection engine shared by all in-flight videos
+_global_detection_engine = None
+
 
 def _get_decord_context(device: Optional[str] = None):
     """Return the decord context used for frame extraction."""
@@ -118,7 +129,9 @@ def get_pipeline_config():
         'pipeline_count': max_workers,
         'batch_size': 32,  # Optimal batch size for embedding generation
         'enable_pipelines': enable_pipelines,
-        'use_openvino': use_openvino
+        'use_openvino': use_openvino,
+        'queue_depth': max(1, settings.PIPELINE_QUEUE_DEPTH),
+        'decode_chunk_size': max(1, settings.PIPELINE_DECODE_CHUNK_SIZE),
     }
 
     if performance_mode:
@@ -221,6 +234,49 @@ def get_global_detector(enable_object_detection: bool = True, detection_confiden
     return _global_detector
 
 
+def get_global_detection_engine(enable_object_detection: bool = True, detection_confidence: float = 0.85):
+    """
+    Get or create the singleton batched detection engine.
+
+    The engine wraps the global detector's model; frames submitted by every
+    pipeline (and every concurrently processed video) are batched together.
+
+    Args:
+        enable_object_detection: Whether to enable object detection
+        detection_confidence: Confidence threshold for detection
+
+    Returns:
+        BatchDetectionEngine instance or None if disabled/failed
+    """
+    global _global_detection_engine
+
+    if not enable_object_detection or not settings.DETECTION_BATCH_ENGINE:
+        return None
+
+    if _global_detection_engine is None:
+        detector = get_global_detector(enable_object_detection, detection_confidence)
+        if detector is None:
+            return None
+
+        logger.info("Initializing global batched detection engine...")
+        try:
+            from src.core.object_detection import BatchDetectionEngine
+
+            _global_detection_engine = BatchDetectionEngine(
+                detector,
+                batch_size=settings.DETECTION_BATCH_SIZE,
+                max_wait=settings.DETECTION_BATCH_WAIT_MS / 1000.0,
+                num_requests=settings.DETECTION_INFER_REQUESTS,
+                skip_similar_frames=settings.DETECTION_SKIP_SIMILAR_FRAMES,
+                frame_diff_threshold=settings.DETECTION_FRAME_DIFF_THRESHOLD,
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize batched detection engine, using per-frame detection: {e}")
+            _global_detection_engine = None
+
+    return _global_detection_engine
+
+
 def preload_object_detector(enable_object_detection: bool = True, detection_confidence: float = 0.85) -> bool:
     """
     Preload the object detection model and perform warmup.
@@ -258,6 +314,9 @@ def preload_object_detector(enable_object_detection: bool = True, detection_conf
             try:
                 test_detections = detector.detect(test_image)
                 logger.info(f"Object detection model preloaded successfully! Model cached and ready (warmup found {len(test_detections) if test_detections else 0} test objects)")
+                engine = get_global_detection_engine(enable_object_detection, detection_confidence)
+                if engine is not None:
+                    engine.detect(test_image)
                 return True
             except Exception as e:
                 logger.warning(f"Object detector initialized but test detection failed: {e}")
@@ -363,6 +422,7 @@ class SimplePipelineManager:
         self.enable_object_detection = enable_object_detection
         self.detection_confidence = detection_confidence
         self.detector = None
+        self.detection_engine = None
         
         # Initialize object detector if needed
         if self.enable_object_detection:
@@ -383,27 +443,6 @@ class SimplePipelineManager:
         else:
             logger.info("PyTorch mode: Using shared model instance across all threads (thread-safe)")
     
-    @staticmethod
-    def _summarize_stage_times(samples: List[float]) -> Dict[str, float]:
-        """Compute aggregate statistics for a collection of stage timings."""
-        if not samples:
-            return {
-                "total": 0.0,
-                "avg": 0.0,
-                "max": 0.0,
-                "min": 0.0,
-                "count": 0,
-            }
-
-        total = float(sum(samples))
-        return {
-            "total": total,
-            "avg": total / len(samples),
-            "max": max(samples),
-            "min": min(samples),
-            "count": len(samples),
-        }
-
     def _initialize_object_detector(self):
         """Initialize object detector for frame processing."""
         logger.info("Using global object detector for SDK mode...")
@@ -419,467 +458,323 @@ class SimplePipelineManager:
             self.enable_object_detection = False
         else:
             logger.info(f"Using global object detector with confidence threshold: {self.detection_confidence}")
+            self.detection_engine = get_global_detection_engine(
+                enable_object_detection=self.enable_object_detection,
+                detection_confidence=self.detection_confidence
+            )
         
     
-    def _process_frame_with_detection(self, frame_numpy: np.ndarray, frame_metadata: Dict[str, Any]) -> List[Tuple[Image.Image, Dict[str, Any]]]:
+    def _detect_objects(self, frame_numpy: np.ndarray, frame_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Process a single frame and optionally detect objects to create crops.
-        
+        Run object detection on a single frame.
+
         Args:
             frame_numpy: Frame as numpy array (H, W, C)
             frame_metadata: Metadata for the frame
-            
+
+        Returns:
+            Detection metadata dictionaries (empty when detection is disabled or fails)
+        """
+        if not self.enable_object_detection or self.detector is None:
+            return []
+
+        try:
+            detections = self.detector.detect(frame_numpy, return_metadata=True) or []
+        except Exception as e:
+            logger.warning(
+                "Object detection failed for frame %s: %s",
+                frame_metadata.get("frame_id", "unknown"),
+                e,
+            )
+            return []
+
+        if detections:
+            logger.debug(
+                "Detected %d objects in frame %s",
+                len(detections),
+                frame_metadata.get("frame_id", "unknown"),
+            )
+        return detections
+
+    @staticmethod
+    def _crop_detections(
+        frame_numpy: np.ndarray,
+        frame_metadata: Dict[str, Any],
+        detections: List[Dict[str, Any]],
+    ) -> List[Tuple[Image.Image, Dict[str, Any]]]:
+        """
+        Build the images to embed for a frame: the full frame followed by one crop per detection.
+
+        Args:
+            frame_numpy: Frame as numpy array (H, W, C)
+            frame_metadata: Metadata for the frame
+            detections: Detection metadata returned by ``_detect_objects``
+
         Returns:
             List of (image, metadata) tuples for processing
         """
-        results = []
-        
         # Always include the full frame
-        frame_pil = Image.fromarray(frame_numpy)
-        results.append((frame_pil, frame_metadata))
-        
-        # If object detection is enabled, detect objects and create crops
-        if self.enable_object_detection and self.detector is not None:
+        results = [(Image.fromarray(frame_numpy), frame_metadata)]
+
+        for crop_idx, det_meta in enumerate(detections):
             try:
-                detections = self.detector.detect(frame_numpy, return_metadata=True)
-
-                if detections:
-                    logger.debug(
-                        "Detected %d objects in frame %s",
-                        len(detections),
-                        frame_metadata.get("frame_id", "unknown"),
-                    )
-
-                    for crop_idx, det_meta in enumerate(detections):
-                        try:
-                            box = det_meta.get("bbox")
-                            score = det_meta.get("confidence")
-                            class_id = det_meta.get("class_id")
-                            class_name = det_meta.get("class_name")
-
-                            if not box or score is None or class_id is None:
-                                logger.debug("Skipping detection %d due to incomplete metadata", crop_idx)
-                                continue
-
-                            x1, y1, x2, y2 = box
-
-                            h, w = frame_numpy.shape[:2]
-                            x1 = max(0, min(int(x1), w - 1))
-                            y1 = max(0, min(int(y1), h - 1))
-                            x2 = max(x1 + 1, min(int(x2), w))
-                            y2 = max(y1 + 1, min(int(y2), h))
-
-                            if (x2 - x1) < 10 or (y2 - y1) < 10:
-                                continue
-
-                            crop = frame_numpy[y1:y2, x1:x2]
-                            crop_pil = Image.fromarray(crop)
-
-                            crop_metadata = frame_metadata.copy()
-                            crop_metadata.update(
-                                {
-                                    "frame_type": "detected_crop",
-                                    "is_detected_crop": True,
-                                    "crop_index": crop_idx,
-                                    "detection_confidence": float(score),
-                                    "crop_bbox": [int(x1), int(y1), int(x2), int(y2)],
-                                    "detected_class_id": int(class_id),
-                                    "detected_label": class_name,
-                                    "frame_id": f"{frame_metadata.get('frame_id', 'unknown')}_crop_{crop_idx}",
-                                }
-                            )
-
-                            results.append((crop_pil, crop_metadata))
-
-                        except Exception as e:
-                            logger.warning(
-                                "Failed to create crop %d from frame %s: %s",
-                                crop_idx,
-                                frame_metadata.get("frame_id", "unknown"),
-                                e,
-                            )
-                            continue
+                box = det_meta.get("bbox")
+                score = det_meta.get("confidence")
+                class_id = det_meta.get("class_id")
+                class_name = det_meta.get("class_name")
+
+                if not box or score is None or class_id is None:
+                    logger.debug("Skipping detection %d due to incomplete metadata", crop_idx)
+                    continue
+
+                x1, y1, x2, y2 = box
+
+                h, w = frame_numpy.shape[:2]
+                x1 = max(0, min(int(x1), w - 1))
+                y1 = max(0, min(int(y1), h - 1))
+                x2 = max(x1 + 1, min(int(x2), w))
+                y2 = max(y1 + 1, min(int(y2), h))
+
+                if (x2 - x1) < 10 or (y2 - y1) < 10:
+                    continue
+
+                crop = frame_numpy[y1:y2, x1:x2]
+                crop_pil = Image.fromarray(crop)
+
+                crop_metadata = frame_metadata.copy()
+                crop_metadata.update(
+                    {
+                        "frame_type": "detected_crop",
+                        "is_detected_crop": True,
+                        "crop_index": crop_idx,
+                        "detection_confidence": float(score),
+                        "crop_bbox": [int(x1), int(y1), int(x2), int(y2)],
+                        "detected_class_id": int(class_id),
+                        "detected_label": class_name,
+                        "frame_id": f"{frame_metadata.get('frame_id', 'unknown')}_crop_{crop_idx}",
+                    }
+                )
+
+                results.append((crop_pil, crop_metadata))
 
             except Exception as e:
                 logger.warning(
-                    "Object detection failed for frame %s: %s",
+                    "Failed to create crop %d from frame %s: %s",
+                    crop_idx,
                     frame_metadata.get("frame_id", "unknown"),
                     e,
                 )
-        
+                continue
+
         return results
-    
-    def _process_frames_with_parallel_detection(self, all_frames: List[np.ndarray], all_metadata: List[Dict[str, Any]]) -> Tuple[List[Image.Image], List[Dict[str, Any]]]:
+
+    def _process_frame_with_detection(self, frame_numpy: np.ndarray, frame_metadata: Dict[str, Any]) -> List[Tuple[Image.Image, Dict[str, Any]]]:
         """
-        Process frames with parallel object detection.
+        Process a single frame and optionally detect objects to create crops.
         
         Args:
-            all_frames: List of frame numpy arrays
-            all_metadata: List of frame metadata
+            frame_numpy: Frame as numpy array (H, W, C)
+            frame_metadata: Metadata for the frame
             
         Returns:
-            Tuple of (images_list, metadata_list) including original frames and detected crops
+            List of (image, metadata) tuples for processing
         """
-        logger.info(f"Starting parallel object detection on {len(all_frames)} frames")
-        
-        # Create batches for parallel detection processing
-        detection_batch_size = max(1, len(all_frames) // self.config['pipeline_count'])
-        detection_batches = []
-        
-        for i in range(0, len(all_frames), detection_batch_size):
-            batch_frames = all_frames[i:i + detection_batch_size]
-            batch_metadata = all_metadata[i:i + detection_batch_size]
-            detection_batches.append((batch_frames, batch_metadata))
-        
-        logger.info(f"Created {len(detection_batches)} detection batches (batch_size={detection_batch_size})")
-        
-        # Process detection batches in parallel
-        all_images_for_embedding = []
-        all_metadata_for_embedding = []
-        
-        with ThreadPoolExecutor(max_workers=self.config['pipeline_count']) as executor:
-            detection_futures = [
-                executor.submit(self._process_detection_batch, batch_frames, batch_metadata)
-                for batch_frames, batch_metadata in detection_batches
-            ]
-            
-            # Process completed futures as they finish (true parallel processing)
-            for future in as_completed(detection_futures):
-                batch_images, batch_metadata = future.result()
-                all_images_for_embedding.extend(batch_images)
-                all_metadata_for_embedding.extend(batch_metadata)
-        
-        logger.info(f"Parallel object detection completed: {len(all_frames)} frames -> {len(all_images_for_embedding)} items")
-        return all_images_for_embedding, all_metadata_for_embedding
-    
-    def _process_detection_batch(self, batch_frames: List[np.ndarray], batch_metadata: List[Dict[str, Any]]) -> Tuple[List[Image.Image], List[Dict[str, Any]]]:
+        detections = self._detect_objects(frame_numpy, frame_metadata)
+        return self._crop_detections(frame_numpy, frame_metadata, detections)
+
+    def _detect_stage(self, item: Tuple[np.ndarray, Dict[str, Any]]) -> List[tuple]:
+        """Pipeline stage: attach detections to a decoded frame."""
+        frame_numpy, frame_metadata = item
+        return [(frame_numpy, frame_metadata, self._detect_objects(frame_numpy, frame_metadata))]
+
+    def _detect_batch_stage(self, batch: List[Tuple[np.ndarray, Dict[str, Any]]], stream: Any) -> List[tuple]:
+        """Pipeline stage: attach detections to a batch of decoded frames using the shared engine."""
+        try:
+            detections = self.detection_engine.detect_many([frame_numpy for frame_numpy, _ in batch], stream=stream)
+        except Exception as e:
+            logger.warning("Batched object detection failed for %d frames: %s", len(batch), e)
+            detections = [[] for _ in batch]
+        return [
+            (frame_numpy, frame_metadata, frame_detections)
+            for (frame_numpy, frame_metadata), frame_detections in zip(batch, detections)
+        ]
+
+    def _crop_stage(self, item: tuple, progress: Optional[VideoProgress] = None) -> List[Tuple[Image.Image, Dict[str, Any]]]:
+        """Pipeline stage: expand a frame (and its detections, if any) into images to embed."""
+        frame_numpy, frame_metadata, *rest = item
+        results = self._crop_detections(frame_numpy, frame_metadata, rest[0] if rest else [])
+        if progress is not None:
+            progress.frame_expanded(frame_metadata['frame_number'], len(results))
+        return results
+
+    def _embed_stage(self, batch: List[Tuple[Image.Image, Dict[str, Any]]]) -> List[tuple]:
+        """Pipeline stage: embed a batch of images, dropping the ones that failed."""
+        embeddings = self.master_sdk_client.generate_embeddings_for_images([image for image, _ in batch])
+
+        valid_embeddings = []
+        valid_metadatas = []
+        for (_, metadata), embedding in zip(batch, embeddings):
+            if embedding is not None:
+                valid_embeddings.append(embedding)
+                valid_metadatas.append(metadata)
+            else:
+                logger.warning(f"Failed to generate embedding for image {metadata['frame_id']}")
+
+        if not valid_embeddings:
+            return []
+        return [(valid_embeddings, valid_metadatas)]
+
+    def _store_stage(
+        self,
+        batch: List[Tuple[List[List[float]], List[Dict[str, Any]]]],
+        progress: Optional[VideoProgress] = None,
+    ) -> List[str]:
+        """Pipeline stage: store the embedding batches queued so far in one bulk insert."""
+        embeddings = [embedding for batch_embeddings, _ in batch for embedding in batch_embeddings]
+        metadatas = [metadata for _, batch_metadatas in batch for metadata in batch_metadatas]
+        if progress is None:
+            return self.master_sdk_client.store_frame_embeddings(embeddings, metadatas)
+
+        # Deterministic IDs make a retried frame map onto the descriptors an interrupted run may have stored
+        ids = [progress.descriptor_id(metadata['frame_number'], metadata.get('crop_index')) for metadata in metadatas]
+        stored_ids = self.master_sdk_client.store_frame_embeddings(
+            embeddings, metadatas, ids=ids, skip_existing=progress.resumed
+        )
+        progress.items_stored(metadatas, stored_ids)
+        return stored_ids
+
+    def process_frame_stream(
+        self,
+        frames: Iterable[Tuple[np.ndarray, Dict[str, Any]]],
+        progress: Optional[VideoProgress] = None,
+    ) -> Dict[str, Any]:
         """
-        Process a batch of frames for object detection.
-        
+        Stream frames through the decode -> detect -> crop -> embed -> store pipeline.
+
+        Stages run concurrently and are connected by bounded queues, so frames are
+        detected, embedded and stored while later frames are still being decoded,
+        and at most a fixed number of frames is held in memory at any time.
+
         Args:
-            batch_frames: Batch of frame numpy arrays
-            batch_metadata: Batch of frame metadata
-            
+            frames: Iterator of (frame_numpy, frame_metadata) tuples; consumed lazily
+                by the pipeline's decode stage
+            progress: Ingestion journal progress of the video; frame ranges are
+                committed to the journal as their descriptors are stored
+
         Returns:
-            Tuple of (images_list, metadata_list) for this batch
+            Dictionary with stored IDs, timings and per-stage counters
         """
-        batch_images = []
-        batch_metadata_results = []
-        
-        for frame_numpy, frame_metadata in zip(batch_frames, batch_metadata):
-            # Process frame with detection (returns full frame + detected crops)
-            frame_results = self._process_frame_with_detection(frame_numpy, frame_metadata)
-            
-            for image_pil, metadata in frame_results:
-                batch_images.append(image_pil)
-                batch_metadata_results.append(metadata)
-        
-        logger.debug(f"Detection batch processed: {len(batch_frames)} frames -> {len(batch_images)} items")
-        return batch_images, batch_metadata_results
-    
-    def process_frames_parallel(self, all_frames: List[np.ndarray], all_metadata: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Process frames in parallel for embedding generation with optional object detection and per-batch storage."""
-        logger.info(f"Processing {len(all_frames)} frames with {self.config['pipeline_count']} maximum parallel workers")
-        
-        if self.enable_object_detection:
-            logger.info(f"Object detection enabled with confidence threshold: {self.detection_confidence}")
-        
-        try:
-            # Create batches of frames for parallel processing
-            logger.info(f"About to create batches from {len(all_frames)} frames with batch_size={self.config['batch_size']}")
-            batches = self.create_frame_batches(all_frames, all_metadata)
-            detection_status = "with object detection" if self.enable_object_detection else "without object detection"
-            logger.info(f"Created {len(batches)} batches for parallel processing ({detection_status})")
-            
-            # Process batches in parallel - each batch will do optional object detection + embedding generation + immediate storage
-            total_embeddings_stored = 0
-            all_stored_ids = []
-            batch_processing_times: List[float] = []
-            detection_times: List[float] = []
-            embedding_times: List[float] = []
-            storage_times: List[float] = []
-            total_items_after_detection = 0
-            
-            logger.info(f"Starting parallel execution of {len(batches)} batches with {self.config['pipeline_count']} maximum workers")
-            
-            parallel_start_time = time.time()
-            with ThreadPoolExecutor(max_workers=self.config['pipeline_count']) as executor:
-                total_batches = len(batches)
-                future_to_index: Dict[Any, int] = {}
-                batch_futures = []
-                for batch_index, (batch_frames, batch_metadata) in enumerate(batches, start=1):
-                    future = executor.submit(
-                        self._process_single_batch,
-                        batch_frames,
-                        batch_metadata,
-                        batch_index,
-                        total_batches,
-                    )
-                    batch_futures.append(future)
-                    future_to_index[future] = batch_index
-                
-                logger.info(f"Submitted {len(batch_futures)} batch jobs to thread pool")
-                logger.info(f"True parallel processing enabled - batches will complete in any order as they finish")
-                
-                # Process completed batches as they finish (true parallel processing)
-                batch_counter = 0
-                timeout_per_batch = 300  # 5 minutes per batch maximum
-                for future in as_completed(batch_futures, timeout=timeout_per_batch * len(batch_futures)):
-                    batch_counter += 1
-                    try:
-                        batch_result = future.result()
-                        embeddings_count = batch_result['embeddings_count']
-                        stored_ids = batch_result['stored_ids']
-                        processing_time = batch_result['processing_time']
-                        batch_index = future_to_index.get(future, batch_counter)
-                        batch_detection_time = batch_result.get('detection_time', 0.0)
-                        batch_embedding_time = batch_result.get('embedding_time', 0.0)
-                        batch_storage_time = batch_result.get('storage_time', 0.0)
-                        batch_items_after_detection = batch_result.get('items_after_detection', 0)
-                        
-                        total_embeddings_stored += embeddings_count
-                        all_stored_ids.extend(stored_ids)
-                        batch_processing_times.append(processing_time)
-                        detection_times.append(batch_detection_time)
-                        embedding_times.append(batch_embedding_time)
-                        storage_times.append(batch_storage_time)
-                        total_items_after_detection += batch_items_after_detection
-                        
-                        logger.info(
-                            f"Batch {batch_index}/{len(batch_futures)} completed: {embeddings_count} embeddings stored"
-                        )
-                    except Exception as e:
-                        failed_index = future_to_index.get(future, batch_counter)
-                        logger.error(f"Batch {failed_index} failed: {e}")
-                        # Continue processing other batches
-            
-            parallel_time = time.time() - parallel_start_time
-            logger.info(f"Parallel processing completed: {total_embeddings_stored} embeddings generated and stored")
-            
-            detection_stats = self._summarize_stage_times(detection_times)
-            embedding_stats = self._summarize_stage_times(embedding_times)
-            storage_stats = self._summarize_stage_times(storage_times)
-            batch_time_stats = self._summarize_stage_times(batch_processing_times)
-
-            avg_batch_time = batch_time_stats.get("avg", 0.0)
-            max_batch_time = batch_time_stats.get("max", 0.0)
-
-            def _build_stage_summary(stats: Dict[str, float]) -> Dict[str, float]:
-                avg_time = stats.get("avg", 0.0)
-                return {
-                    "avg_s": avg_time,
-                    "max_s": stats.get("max", 0.0),
-                    "avg_pct_of_batch": (avg_time / avg_batch_time * 100.0) if avg_batch_time else 0.0,
-                }
-
-            stage_breakdown = {
-                "detection": _build_stage_summary(detection_stats),
-                "embedding": _build_stage_summary(embedding_stats),
-                "storage": _build_stage_summary(storage_stats),
-            }
-            logger.info(
-                "Performance: total parallel time %.3fs, avg batch time %.3fs, max batch time %.3fs",
-                parallel_time,
-                avg_batch_time,
-                max_batch_time,
-            )
-            
-            return {
-                'total_embeddings': total_embeddings_stored,
-                'stored_ids': all_stored_ids,
-                'processing_time': parallel_time,
-                'batches_processed': len(batches),
-                'avg_batch_time': avg_batch_time,
-                'max_batch_time': max_batch_time,
-                'stage_breakdown': stage_breakdown,
-                'batch_stats': {
-                    'avg_s': avg_batch_time,
-                    'max_s': max_batch_time,
-                    'count': batch_time_stats.get('count', 0),
-                },
-                'post_detection_items': total_items_after_detection,
-                'input_frames': len(all_frames)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in parallel processing: {e}")
-            return {
-                'total_embeddings': 0,
-                'stored_ids': [],
-                'processing_time': 0,
-                'batches_processed': 0,
-                'avg_batch_time': 0.0,
-                'max_batch_time': 0.0,
-                'stage_breakdown': {
-                    'detection': {'avg_s': 0.0, 'max_s': 0.0, 'avg_pct_of_batch': 0.0},
-                    'embedding': {'avg_s': 0.0, 'max_s': 0.0, 'avg_pct_of_batch': 0.0},
-                    'storage': {'avg_s': 0.0, 'max_s': 0.0, 'avg_pct_of_batch': 0.0},
-                },
-                'batch_stats': {'avg_s': 0.0, 'max_s': 0.0, 'count': 0},
-                'post_detection_items': 0,
-                'input_frames': len(all_frames)
-            }
-    
-    def create_frame_batches(self, frames: List[np.ndarray], metadata: List[Dict[str, Any]]) -> List[tuple]:
-        """Create batches of frames for parallel processing (including object detection)."""
+        workers = self.config['pipeline_count'] if self.config['enable_pipelines'] else 1
+        queue_depth = self.config['queue_depth']
         batch_size = self.config['batch_size']
-        total_frames = len(frames)
-        
-        logger.info(f"Creating frame batches: {total_frames} frames, batch_size={batch_size}")
-        
-        batches = []
-        
-        for i in range(0, total_frames, batch_size):
-            batch_frames = frames[i:i + batch_size]
-            batch_metadata = metadata[i:i + batch_size]
-            batch_num = len(batches) + 1
-            
-            logger.debug(f"Batch {batch_num}: frames {i} to {min(i + batch_size - 1, total_frames - 1)} ({len(batch_frames)} frames)")
-            batches.append((batch_frames, batch_metadata))
-        
-        logger.info(f"Created {len(batches)} batches from {total_frames} frames (avg {total_frames/len(batches):.1f} frames/batch)")
-        return batches
-    
-    def _process_single_batch(
-        self,
-        batch_frames: List[np.ndarray],
-        batch_metadata: List[Dict],
-        batch_index: int,
-        total_batches: int,
-    ) -> Dict[str, Any]:
-        """Process a single batch of frames: object detection + embedding generation + immediate storage."""
-        batch_start_time = time.time()
-        try:
-            logger.info(
-                f"[Batch {batch_index}/{total_batches}] Processing {len(batch_frames)} frames "
-                f"(object detection: {self.enable_object_detection})"
-            )
 
-            if not self.supports_image_embeddings:
-                logger.info(
-                    "Embedding model %s does not support image/video embeddings; skipping batch %d",
-                    self.master_sdk_client.model_id,
-                    batch_index,
+        stages = []
+        # Near-duplicate frames are only compared within this video
+        stream = object()
+        if self.enable_object_detection and self.detection_engine is not None:
+            logger.info(f"Object detection enabled with confidence threshold: {self.detection_confidence} (batched engine)")
+            engine_batch = self.detection_engine.batch_size
+            # Each worker hands the engine a full batch; the engine merges them with other videos' frames
+            stages.append(
+                PipelineStage(
+                    "detect",
+                    functools.partial(self._detect_batch_stage, stream=stream),
+                    workers=workers,
+                    queue_depth=max(queue_depth, engine_batch * workers),
+                    batch_size=engine_batch,
+                    batch_wait=self.detection_engine.max_wait,
                 )
-                return {
-                    'status': 'skipped_no_image_support',
-                    'embeddings_count': 0,
-                    'stored_ids': [],
-                    'processing_time': time.time() - batch_start_time,
-                    'detection_time': 0.0,
-                    'embedding_time': 0.0,
-                    'storage_time': 0.0,
-                    'items_after_detection': 0,
-                    'input_frames': len(batch_frames)
-                }
-            
-            # Step 1: Process frames with object detection to expand the batch
-            logger.debug(f"Step 1: Starting object detection for {len(batch_frames)} frames")
-            all_images_for_embedding = []
-            all_metadata_for_embedding = []
-            
-            detection_start = time.time()
-            for i, (frame_numpy, frame_metadata) in enumerate(zip(batch_frames, batch_metadata)):
-                logger.debug(f"Processing frame {i+1}/{len(batch_frames)} for object detection")
-                # Process frame with detection (returns full frame + detected crops)
-                frame_results = self._process_frame_with_detection(frame_numpy, frame_metadata)
-                
-                for image_pil, metadata in frame_results:
-                    all_images_for_embedding.append(image_pil)
-                    all_metadata_for_embedding.append(metadata)
-            detection_time = time.time() - detection_start
-            
-            expansion_info = f"(including crops)" if self.enable_object_detection else "(frames only)"
-            logger.info(
-                f"[Batch {batch_index}/{total_batches}] Expanded from {len(batch_frames)} frames "
-                f"to {len(all_images_for_embedding)} items {expansion_info} in {detection_time:.3f}s"
-            )
-            items_after_detection = len(all_images_for_embedding)
-            # Step 2: Generate embeddings for all images in the expanded batch
-            logger.debug(f"Step 2: Starting embedding generation for {len(all_images_for_embedding)} images")
-            thread_sdk_client = self.master_sdk_client
-            
-            # Use parallel-safe embedding generation
-            # The multimodal embedding service now uses thread-safe infer_new_request
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Using parallel mode - no locking needed with infer_new_request"
-            )
-            embedding_start = time.time()
-            embeddings = thread_sdk_client.generate_embeddings_for_images(all_images_for_embedding)
-            embedding_time = time.time() - embedding_start
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Step 2 completed: Generated {len(embeddings)} "
-                f"embeddings in {embedding_time:.3f}s"
-            )
-            
-            # Step 3: Prepare valid embeddings and metadata for storage
-            logger.debug(f"Step 3: Validating embeddings")
-            valid_embeddings = []
-            valid_metadatas = []
-            for i, (image, metadata, embedding) in enumerate(zip(all_images_for_embedding, all_metadata_for_embedding, embeddings)):
-                if embedding is not None:
-                    valid_embeddings.append(embedding)
-                    valid_metadatas.append(metadata)
-                else:
-                    if self.supports_image_embeddings:
-                        logger.warning(f"Failed to generate embedding for image {metadata['frame_id']}")
-                    else:
-                        logger.debug(
-                            "Skipping embedding for %s because model does not support image modality", 
-                            metadata['frame_id']
-                        )
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Step 3 completed: {len(valid_embeddings)} valid "
-                f"embeddings out of {len(embeddings)}"
             )
-            
-            # Step 4: Store embeddings immediately for this batch (prevents OutOfJournalSpace)
-            logger.debug(f"Step 4: Starting storage for {len(valid_embeddings)} embeddings")
-            storage_start = time.time()
-            stored_ids = []
-            if valid_embeddings:
-                logger.debug(
-                    f"[Batch {batch_index}/{total_batches}] Storing {len(valid_embeddings)} embeddings immediately"
-                )
-                stored_ids = thread_sdk_client.store_frame_embeddings(valid_embeddings, valid_metadatas)
-                logger.debug(
-                    f"[Batch {batch_index}/{total_batches}] Successfully stored {len(stored_ids)} embeddings"
-                )
-            storage_time = time.time() - storage_start
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Step 4 completed: Storage took {storage_time:.3f}s"
-            )
-            
-            batch_time = time.time() - batch_start_time
+        elif self.enable_object_detection:
+            logger.info(f"Object detection enabled with confidence threshold: {self.detection_confidence}")
+            stages.append(PipelineStage("detect", self._detect_stage, workers=workers, queue_depth=queue_depth))
+        stages.extend(
+            [
+                PipelineStage("crop", functools.partial(self._crop_stage, progress=progress), queue_depth=queue_depth),
+                # Detection can fan a frame out into many crops, so the embed queue holds a full batch per worker
+                PipelineStage(
+                    "embed",
+                    self._embed_stage,
+                    workers=workers,
+                    queue_depth=max(queue_depth, batch_size * workers),
+                    batch_size=batch_size,
+                ),
+                # Coalesce embedding batches into bulk VDMS transactions
+                PipelineStage(
+                    "store",
+                    functools.partial(self._store_stage, progress=progress),
+                    queue_depth=queue_depth,
+                    batch_size=max(1, settings.VDMS_BULK_TRANSACTION_SIZE // batch_size),
+                    batch_wait=0.5,
+                ),
+            ]
+        )
+        pipeline = StreamingPipeline("decode", stages)
+        logger.info(
+            "Starting streaming pipeline: stages=%s, workers=%d, queue_depth=%d, batch_size=%d",
+            " -> ".join(["decode"] + [stage.name for stage in stages]),
+            workers,
+            queue_depth,
+            batch_size,
+        )
+
+        start_time = time.time()
+        try:
+            stored_ids = pipeline.run(frames)
+        finally:
+            if self.detection_engine is not None:
+                self.detection_engine.end_stream(stream)
+        processing_time = time.time() - start_time
+
+        stage_stats = pipeline.stats()
+        for name, stats in stage_stats.items():
             logger.info(
-                f"[Batch {batch_index}/{total_batches}] Completed: {len(valid_embeddings)} embeddings "
-                f"(detection: {detection_time:.3f}s, embedding: {embedding_time:.3f}s, "
-                f"storage: {storage_time:.3f}s, total: {batch_time:.3f}s)"
+                "Stage %s: in=%d out=%d errors=%d, %.1f items/s, busy=%.3fs, blocked=%.3fs, queue depth max=%d avg=%.1f (capacity %d)",
+                name,
+                stats['items_in'],
+                stats['items_out'],
+                stats['errors'],
+                stats['items_per_s'],
+                stats['busy_s'],
+                stats['blocked_s'],
+                stats['max_queue_depth'],
+                stats['avg_queue_depth'],
+                stats['queue_capacity'],
             )
-            
-            return {
-                'embeddings_count': len(valid_embeddings),
-                'stored_ids': stored_ids,
-                'processing_time': batch_time,
-                'detection_time': detection_time,
-                'embedding_time': embedding_time,
-                'storage_time': storage_time,
-                'items_after_detection': items_after_detection,
-                'input_frames': len(batch_frames)
-            }
-            
-        except Exception as e:
-            logger.error(f"[Batch {batch_index}/{total_batches}] Error processing batch: {e}")
+
+        def _build_stage_summary(name: str) -> Dict[str, float]:
+            stats = stage_stats.get(name)
+            if not stats:
+                return {"avg_s": 0.0, "max_s": 0.0, "items_per_s": 0.0}
             return {
-                'embeddings_count': 0,
-                'stored_ids': [],
-                'processing_time': time.time() - batch_start_time,
-                'detection_time': detection_time if 'detection_time' in locals() else 0.0,
-                'embedding_time': embedding_time if 'embedding_time' in locals() else 0.0,
-                'storage_time': storage_time if 'storage_time' in locals() else 0.0,
-                'items_after_detection': len(all_images_for_embedding) if 'all_images_for_embedding' in locals() else 0,
-                'input_frames': len(batch_frames)
+                "avg_s": stats["avg_call_s"],
+                "max_s": stats["max_call_s"],
+                "items_per_s": stats["items_per_s"],
             }
+
+        embed_stats = stage_stats["embed"]
+        return {
+            'total_embeddings': len(stored_ids),
+            'stored_ids': stored_ids,
+            'processing_time': processing_time,
+            'batches_processed': embed_stats['calls'],
+            'stage_breakdown': {
+                'decode': _build_stage_summary('decode'),
+                'detection': _build_stage_summary('detect'),
+                'embedding': _build_stage_summary('embed'),
+                'storage': _build_stage_summary('store'),
+            },
+            'batch_stats': {
+                'avg_s': embed_stats['avg_call_s'],
+                'max_s': embed_stats['max_call_s'],
+                'count': embed_stats['calls'],
+            },
+            'stages': stage_stats,
+            'post_detection_items': stage_stats['crop']['items_out'],
+            'input_frames': stage_stats['decode']['items_out'],
+            # Cumulative counters of the shared engine (all videos processed by this worker)
+            'detection_engine': self.detection_engine.stats() if self.detection_engine is not None else None,
+        }
     
     def _process_sequential_fallback(self, frames: List[np.ndarray], metadata: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Fallback to sequential processing with object detection support."""
@@ -916,25 +811,29 @@ class SimplePipelineManager:
 
 
 def generate_video_embedding_sdk(
-    video_content: bytes,
-    metadata_dict: Dict[str, Any],
+    video_content: Optional[bytes] = None,
+    metadata_dict: Dict[str, Any] = None,
     frame_interval: int = 15,
     enable_object_detection: bool = False,
-    detection_confidence: float = 0.85
+    detection_confidence: float = 0.85,
+    video_path: Optional[Union[str, pathlib.Path]] = None,
 ) -> Dict[str, Any]:
     """
     Generate video embeddings using SDK approach with parallel processing.
     
     Args:
-        video_content: Video content as bytes
+        video_content: Video content as bytes (ignored when ``video_path`` is given)
         metadata_dict: Video metadata dictionary
         frame_interval: Number of frames between extractions
         enable_object_detection: Whether to enable object detection (currently not implemented)
         detection_confidence: Confidence threshold (currently not used)
+        video_path: Video file to decode in place; the file is never read into memory
         
     Returns:
         Dictionary containing processing results and timing information
     """
+    if video_path is None and video_content is None:
+        raise ValueError("Either video_content or video_path is required")
     total_start_time = time.time()
     logger.info(f"Starting SDK video processing with frame_interval={frame_interval}")
     
@@ -967,12 +866,12 @@ def generate_video_embedding_sdk(
                     'post_detection_items': 0,
                     'stored_embeddings': 0,
                 },
-                'processing_mode': 'sdk_simple_pipeline_with_batch_storage',
+                'processing_mode': 'sdk_streaming_pipeline',
             }
         
         # Process video using simple pipeline approach
-        result = _process_video_from_memory_simple_pipeline(
-            video_content=video_content,
+        result = _process_video_simple_pipeline(
+            video_source=video_path if video_path is not None else video_content,
             sdk_client=sdk_client,
             metadata_dict=metadata_dict,
             frame_interval=frame_interval,
@@ -992,8 +891,109 @@ def generate_video_embedding_sdk(
         raise
 
 
-def _process_video_from_memory_simple_pipeline(
-    video_content: bytes,
+def _iter_sampled_frames(
+    vr: "decord.VideoReader",
+    frame_indices: List[int],
+    frame_metadata_base: Dict[str, Any],
+    fps: float,
+    chunk_size: int,
+) -> Iterator[Tuple[np.ndarray, Dict[str, Any]]]:
+    """
+    Lazily decode the sampled frames of a video, a small chunk at a time.
+
+    Only ``chunk_size`` decoded frames exist at once on the decode side; the
+    pipeline pulls the next chunk when downstream queues have room.
+    """
+    video_id = frame_metadata_base.get('video_id', 'unknown')
+    for chunk_start in range(0, len(frame_indices), chunk_size):
+        chunk_indices = frame_indices[chunk_start:chunk_start + chunk_size]
+        try:
+            chunk = vr.get_batch(chunk_indices).asnumpy()
+        except Exception as e:
+            logger.error(f"Error extracting frames {chunk_indices[0]}-{chunk_indices[-1]}: {e}")
+            continue
+
+        if chunk.ndim != 4 or chunk.shape[-1] != 3:
+            logger.error(f"Unexpected frame shape for frames starting at {chunk_indices[0]}: {chunk.shape}")
+            continue
+        if chunk.dtype != np.uint8:
+            chunk = chunk.astype(np.uint8)
+
+        for frame_idx, frame_numpy in zip(chunk_indices, chunk):
+            # Create frame metadata with frame_id for tracking (including video URLs for search-ms compatibility)
+            frame_metadata = dict(frame_metadata_base)
+            frame_metadata.update(
+                {
+                    'frame_id': f"{video_id}_{frame_idx}",
+                    'frame_number': frame_idx,
+                    'timestamp': frame_idx / fps if fps else 0.0,
+                }
+            )
+            yield frame_numpy, frame_metadata
+
+
+def _descriptors_present(sdk_client: SDKVDMSClient, ids: List[str], sample_size: int = 8) -> bool:
+    """Spot-check that journaled descriptors still exist in VDMS (e.g. after a database reset)."""
+    if not ids:
+        return True
+    step = max(1, len(ids) // sample_size)
+    sample = set(ids[::step][:sample_size])
+    sample.add(ids[-1])
+    try:
+        found = sdk_client.bulk_writer.existing_ids(sorted(sample))
+    except Exception as e:
+        logger.warning(f"Could not verify journaled descriptors in VDMS: {e}")
+        return True
+    return len(found) == len(sample)
+
+
+def _begin_ingestion_journal(
+    video_source: Union[bytes, str, pathlib.Path],
+    sdk_client: SDKVDMSClient,
+    metadata_dict: Dict[str, Any],
+    frame_interval: int,
+    enable_object_detection: bool,
+    detection_confidence: float,
+) -> Optional[VideoProgress]:
+    """Look the video up in the ingestion journal; returns None when journaling is unavailable."""
+    journal = get_ingestion_journal()
+    if journal is None:
+        return None
+
+    video_key = "/".join(
+        str(metadata_dict.get(key, 'unknown')) for key in ('bucket_name', 'video_id', 'filename')
+    )
+    # Anything that changes the stored descriptors or their metadata
+    params = {
+        'frame_interval': frame_interval,
+        'enable_object_detection': bool(enable_object_detection),
+        'detection_confidence': detection_confidence if enable_object_detection else None,
+        'model': sdk_client.model_id,
+        'collection': settings.DB_COLLECTION,
+        'tags': metadata_dict.get('tags', []),
+        'video_url': metadata_dict.get('video_url', ''),
+        'video_rel_url': metadata_dict.get('video_rel_url', ''),
+    }
+    if isinstance(video_source, bytes):
+        digest = content_hash(video_source)
+    else:
+        digest = file_content_hash(video_source)
+    try:
+        progress = journal.begin(video_key, digest, params_hash(params))
+        if progress.status == "complete" and not _descriptors_present(sdk_client, progress.committed_ids()):
+            logger.warning(f"Journaled descriptors of {video_key} are missing from VDMS; re-ingesting")
+            journal.reset(video_key)
+            progress = journal.begin(video_key, digest, params_hash(params))
+    except Exception as e:
+        logger.warning(f"Ingestion journal lookup failed for {video_key}: {e}")
+        return None
+
+    logger.info(f"Ingestion journal: {video_key} is {progress.status}")
+    return progress
+
+
+def _process_video_simple_pipeline(
+    video_source: Union[bytes, str, pathlib.Path],
     sdk_client: SDKVDMSClient,
     metadata_dict: Dict[str, Any],
     frame_interval: int,
@@ -1001,137 +1001,82 @@ def _process_video_from_memory_simple_pipeline(
     detection_confidence: float
 ) -> Dict[str, Any]:
     """
-    Process video from memory using simple parallel pipeline approach.
-    
-    This is the main implementation that extracts frames from video in memory,
-    generates embeddings in parallel, and stores them in bulk.
+    Process a video file, or video bytes, using the streaming staged pipeline.
+
+    Frames are decoded a chunk at a time and streamed through bounded detect,
+    crop, embed and store stages, so decoding overlaps inference. decord copies
+    file-like inputs in full, so a file path is decoded in place: only then does
+    peak memory not grow with the video length.
     """
     method_start_time = time.time()
-    logger.info("Processing video using simple parallel pipeline")
+    logger.info("Processing video using streaming pipeline")
     
     try:
-        # Step 1: Extract frames from video in memory
-        frame_extraction_start = time.time()
-        
-        # Create temporary file for decord processing
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-            temp_file.write(video_content)
-            temp_video_path = temp_file.name
-        
-        try:
-            # Use decord to process video with appropriate device context (use SDK device)
-            decord_ctx = _get_decord_context(sdk_client.device)
-            vr = decord.VideoReader(temp_video_path, ctx=decord_ctx)
-            fps = vr.get_avg_fps()
-            total_frames = len(vr)
-            video_duration_seconds = None
-            if fps and fps > 0:
-                try:
-                    video_duration_seconds = float(total_frames) / float(fps)
-                except ZeroDivisionError:
-                    video_duration_seconds = None
-            
-            logger.info(f"Video info: {total_frames} total frames, {fps:.2f} fps")
-            
-            # Extract frames at specified interval
-            frame_indices = list(range(0, total_frames, frame_interval))
-            logger.info(f"Extracting {len(frame_indices)} frames with interval {frame_interval}")
-            
-            frames = []
-            frames_metadata = []
-            
-            for i, frame_idx in enumerate(frame_indices):
-                try:
-                    # Get frame using decord
-                    frame_tensor = vr[frame_idx]
-                    
-                    # Convert to numpy array with robust tensor handling
-                    try:
-                        # Handle different tensor types from decord VideoReader
-                        if hasattr(frame_tensor, 'asnumpy'):
-                            # It's a decord NDArray - convert to numpy first
-                            frame_numpy = frame_tensor.asnumpy()
-                        elif hasattr(frame_tensor, 'numpy'):
-                            # It's a PyTorch tensor - convert to numpy first
-                            frame_numpy = frame_tensor.numpy()
-                        elif hasattr(frame_tensor, 'detach'):
-                            # It's a PyTorch tensor with gradients - detach first
-                            frame_numpy = frame_tensor.detach().numpy()
-                        elif isinstance(frame_tensor, np.ndarray):
-                            # It's already a numpy array
-                            frame_numpy = frame_tensor
-                        else:
-                            # Try generic conversion for any array-like object
-                            try:
-                                frame_numpy = np.array(frame_tensor)
-                            except Exception as conv_error:
-                                logger.error(f"Failed to convert tensor to numpy for frame {frame_idx}: {conv_error}")
-                                logger.error(f"Frame tensor type: {type(frame_tensor)}, available methods: {dir(frame_tensor)}")
-                                continue
-                        
-                        # Ensure the array is in the correct format (H, W, C) and convert to PIL
-                        if len(frame_numpy.shape) == 3 and frame_numpy.shape[-1] == 3:
-                            # Format is correct (H, W, C), convert directly to numpy array for batching
-                            # Ensure uint8 format for consistent processing
-                            frame_numpy = frame_numpy.astype(np.uint8)
-                            frames.append(frame_numpy)  # Store as numpy array for batch processing
-                        else:
-                            logger.error(f"Unexpected frame shape for frame {frame_idx}: {frame_numpy.shape}")
-                            continue
-                            
-                    except Exception as tensor_error:
-                        logger.error(f"Failed to convert frame tensor for frame {frame_idx}: {tensor_error}")
-                        logger.error(f"Frame tensor type: {type(frame_tensor)}, shape: {getattr(frame_tensor, 'shape', 'unknown')}")
-                        continue
-                    
-                    # Create frame metadata with frame_id for tracking (including video URLs for search-ms compatibility)
-                    timestamp = frame_idx / fps
-                    frame_metadata = {
-                        'frame_id': f"{metadata_dict.get('video_id', 'unknown')}_{frame_idx}",
-                        'frame_number': frame_idx,
-                        'timestamp': timestamp,
-                        'frame_type': 'full_frame',
-                        'video_id': metadata_dict.get('video_id', 'unknown'),
-                        'filename': metadata_dict.get('filename', 'unknown'),
-                        'bucket_name': metadata_dict.get('bucket_name', 'unknown'),
-                        'tags': metadata_dict.get('tags', []),
-                        'video_url': metadata_dict.get('video_url', ''),
-                        'video_rel_url': metadata_dict.get('video_rel_url', '')
-                    }
+        progress = _begin_ingestion_journal(
+            video_source, sdk_client, metadata_dict, frame_interval, enable_object_detection, detection_confidence
+        )
+        if progress is not None and progress.status == "complete":
+            # Unchanged video that was fully ingested before: nothing to decode or store
+            stored_ids = progress.committed_ids()
+            method_time = time.time() - method_start_time
+            logger.info(f"Video unchanged since its last ingestion; reusing {len(stored_ids)} stored descriptors")
+            return {
+                'status': 'success',
+                'stored_ids': stored_ids,
+                'total_embeddings': len(stored_ids),
+                'total_frames_processed': 0,
+                'frame_interval': frame_interval,
+                'timing': {
+                    'frame_extraction_time': 0.0,
+                    'parallel_stage_time': 0.0,
+                    'pipeline_wall_time': method_time,
+                    'avg_batch_time': 0.0,
+                    'max_batch_time': 0.0,
+                    'stage_breakdown': {},
+                },
+                'frame_counts': {
+                    'extracted_frames': 0,
+                    'post_detection_items': 0,
+                    'stored_embeddings': len(stored_ids),
+                },
+                'journal': {'status': 'unchanged', 'skipped_frames': None, 'ranges_committed': 0, 'complete': True},
+                'processing_mode': 'sdk_streaming_pipeline',
+            }
 
-                    # Attach video-level metadata needed by search aggregation
-                    if total_frames is not None:
-                        frame_metadata['total_frames'] = int(total_frames)
-                    if fps:
-                        frame_metadata['fps'] = float(fps)
-                    if video_duration_seconds is not None:
-                        frame_metadata['video_duration'] = video_duration_seconds
-                        frame_metadata['video_duration_seconds'] = video_duration_seconds
-                    frames_metadata.append(frame_metadata)
-                    
-                    # DEBUG: Print first frame metadata to verify video URLs are included
-                    if frame_idx == 0:
-                        logger.info(f"DEBUG: First frame metadata sample: {frame_metadata}")
-                        logger.info(f"DEBUG: Source metadata_dict video_url: '{metadata_dict.get('video_url', 'NOT_FOUND')}'")
-                        logger.info(f"DEBUG: Source metadata_dict video_rel_url: '{metadata_dict.get('video_rel_url', 'NOT_FOUND')}'") 
-                    
-                except Exception as e:
-                    logger.error(f"Error extracting frame {frame_idx}: {e}")
-                    continue
-            
-            frame_extraction_time = time.time() - frame_extraction_start
-            logger.info(f"Frame extraction completed in {frame_extraction_time:.3f}s: {len(frames)} frames")
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_video_path)
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp file: {e}")
+        decord_ctx = _get_decord_context(sdk_client.device)
+        if isinstance(video_source, bytes):
+            vr = decord.VideoReader(io.BytesIO(video_source), ctx=decord_ctx)
+        else:
+            vr = decord.VideoReader(str(video_source), ctx=decord_ctx)
+        fps = vr.get_avg_fps()
+        total_frames = len(vr)
+        video_duration_seconds = None
+        if fps and fps > 0:
+            video_duration_seconds = float(total_frames) / float(fps)
         
-        # Step 2: Generate embeddings in parallel with immediate per-batch storage
-        embedding_start_time = time.time()
+        logger.info(f"Video info: {total_frames} total frames, {fps:.2f} fps")
         
+        frame_indices = list(range(0, total_frames, frame_interval))
+        logger.info(f"Streaming {len(frame_indices)} frames with interval {frame_interval}")
+
+        # Video-level metadata shared by every frame (including video URLs for search-ms compatibility)
+        frame_metadata_base = {
+            'frame_type': 'full_frame',
+            'video_id': metadata_dict.get('video_id', 'unknown'),
+            'filename': metadata_dict.get('filename', 'unknown'),
+            'bucket_name': metadata_dict.get('bucket_name', 'unknown'),
+            'tags': metadata_dict.get('tags', []),
+            'video_url': metadata_dict.get('video_url', ''),
+            'video_rel_url': metadata_dict.get('video_rel_url', ''),
+            # Attach video-level metadata needed by search aggregation
+            'total_frames': int(total_frames),
+        }
+        if fps:
+            frame_metadata_base['fps'] = float(fps)
+        if video_duration_seconds is not None:
+            frame_metadata_base['video_duration'] = video_duration_seconds
+            frame_metadata_base['video_duration_seconds'] = video_duration_seconds
+
         # Log device consistency across all components
         logger.info(f"Device consistency: SDK={sdk_client.device}, Decord={sdk_client.device}, Object Detection will use={sdk_client.device}")
         
@@ -1140,39 +1085,61 @@ def _process_video_from_memory_simple_pipeline(
             enable_object_detection=enable_object_detection, 
             detection_confidence=detection_confidence
         )
-        processing_result = pipeline_manager.process_frames_parallel(frames, frames_metadata)
+        decode_chunk_size = pipeline_manager.config['decode_chunk_size']
+        pending_indices = frame_indices
+        if progress is not None:
+            # Journal ranges follow the decode chunks; committed ones are neither decoded nor stored again
+            pending_indices = progress.plan(
+                frame_indices[start:start + decode_chunk_size]
+                for start in range(0, len(frame_indices), decode_chunk_size)
+            )
+            if len(pending_indices) < len(frame_indices):
+                logger.info(
+                    "Resuming ingestion: %d of %d frames already committed",
+                    len(frame_indices) - len(pending_indices),
+                    len(frame_indices),
+                )
+        frames = _iter_sampled_frames(
+            vr,
+            pending_indices,
+            frame_metadata_base,
+            fps,
+            decode_chunk_size,
+        )
+        try:
+            processing_result = pipeline_manager.process_frame_stream(frames, progress=progress)
+        finally:
+            del vr
         
-        parallel_stage_time = time.time() - embedding_start_time
-        total_embeddings = processing_result.get('total_embeddings', 0)
         stored_ids = processing_result.get('stored_ids', [])
-        batches_processed = processing_result.get('batches_processed', 0)
-
+        journal_summary = None
+        if progress is not None:
+            journal_status = progress.status
+            complete = progress.finish()
+            # Report every descriptor of the video, including the ones stored by earlier runs
+            stored_ids = list(dict.fromkeys(progress.committed_ids() + stored_ids))
+            journal_summary = {
+                'status': journal_status,
+                'skipped_frames': len(frame_indices) - len(pending_indices),
+                'ranges_committed': progress.ranges_committed,
+                'complete': complete,
+            }
         stage_breakdown = processing_result.get('stage_breakdown', {}) or {}
-        detection_stats = stage_breakdown.get('detection', {})
-        embedding_stats = stage_breakdown.get('embedding', {})
-        storage_stats = stage_breakdown.get('storage', {})
+        stage_stats = processing_result.get('stages', {}) or {}
         batch_stats = processing_result.get('batch_stats', {}) or {}
-        post_detection_items = (
-            processing_result.get('post_detection_items')
-            or total_embeddings
-            or len(frames)
-        )
+        extracted_frames = processing_result.get('input_frames', 0)
+        post_detection_items = processing_result.get('post_detection_items', 0)
+        parallel_stage_time = processing_result.get('processing_time', 0.0)
+        # Decoding overlaps the other stages; report the time spent decoding
+        frame_extraction_time = stage_stats.get('decode', {}).get('busy_s', 0.0)
         
-        logger.info(
-            "Embedding generation pipeline completed in %.3fs: %d embeddings across %d batches",
-            parallel_stage_time,
-            total_embeddings,
-            batches_processed,
-        )
-        
-        # Step 3: Return results (storage already completed per-batch)
         method_time = time.time() - method_start_time
         
         result = {
             'status': 'success',
             'stored_ids': stored_ids,
             'total_embeddings': len(stored_ids),
-            'total_frames_processed': len(frames),
+            'total_frames_processed': extracted_frames,
             'frame_interval': frame_interval,
             'timing': {
                 'frame_extraction_time': frame_extraction_time,
@@ -1183,17 +1150,20 @@ def _process_video_from_memory_simple_pipeline(
                 'stage_breakdown': stage_breakdown,
             },
             'frame_counts': {
-                'extracted_frames': len(frames),
+                'extracted_frames': extracted_frames,
                 'post_detection_items': post_detection_items,
                 'stored_embeddings': len(stored_ids)
             },
-            'processing_mode': 'sdk_simple_pipeline_with_batch_storage'
+            'pipeline_stages': stage_stats,
+            'detection_engine': processing_result.get('detection_engine'),
+            'journal': journal_summary,
+            'processing_mode': 'sdk_streaming_pipeline'
         }
         
-        logger.info("Simple pipeline processing completed successfully")
+        logger.info("Streaming pipeline processing completed successfully")
         logger.info(
             "Frame flow summary: extracted=%d -> after_detection=%d -> stored=%d",
-            len(frames),
+            extracted_frames,
             post_detection_items,
             len(stored_ids),
         )
@@ -1201,15 +1171,15 @@ def _process_video_from_memory_simple_pipeline(
         def _format_stage(label: str, stats: Dict[str, float]) -> str:
             avg_time = stats.get('avg_s', 0.0)
             max_time = stats.get('max_s', 0.0)
-            pct = stats.get('avg_pct_of_batch', 0.0)
-            return f"{label}(avg={avg_time:.3f}s, max={max_time:.3f}s, ~{pct:.1f}% of batch)"
+            rate = stats.get('items_per_s', 0.0)
+            return f"{label}(avg={avg_time:.3f}s, max={max_time:.3f}s, {rate:.1f} items/s)"
 
         logger.info(
-            "Stage timing snapshot: extraction=%.3fs | %s | %s | %s | parallel_batch_time_after_extraction=%.3fs | total_time=%.3fs",
-            frame_extraction_time,
-            _format_stage("detection", detection_stats),
-            _format_stage("embedding", embedding_stats),
-            _format_stage("storage", storage_stats),
+            "Stage timing snapshot: %s | %s | %s | %s | pipeline_time=%.3fs | total_time=%.3fs",
+            _format_stage("decode", stage_breakdown.get('decode', {})),
+            _format_stage("detection", stage_breakdown.get('detection', {})),
+            _format_stage("embedding", stage_breakdown.get('embedding', {})),
+            _format_stage("storage", stage_breakdown.get('storage', {})),
             parallel_stage_time,
             method_time,
         )
@@ -1225,7 +1195,5 @@ def _process_video_from_memory_simple_pipeline(
         
     except Exception as e:
         method_time = time.time() - method_start_time
-        logger.error(f"Simple pipeline processing failed after {method_time:.3f}s: {e}")
+        logger.error(f"Streaming pipeline processing failed after {method_time:.3f}s: {e}")
         raise
-
-
@@ -3,6 +3,7 @@
 
 import json
 import pathlib
+import threading
 import time
 import uuid
 from typing import Any, List
@@ -13,6 +14,7 @@ from langchain_vdms.vectorstores import VDMS, VDMS_Client
 from langchain_core.embeddings import Embeddings
 
 from src.common import Strings, logger
+from src.core.embedding.vdms_bulk import VDMSBulkStoreMixin, VDMSBulkWriter
 from src.core.utils.config_utils import read_config
 
 
@@ -34,7 +36,7 @@ class DummyEmbedding(Embeddings):
         raise NotImplementedError("Use add_from() method instead")
 
 
-class SimpleVDMSClient:
+class SimpleVDMSClient(VDMSBulkStoreMixin):
     """
     Dramatically simplified VDMS client that doesn't need any embedding service.
     
@@ -63,6 +65,8 @@ class SimpleVDMSClient:
         self.collection_name = collection_name
         self.multimodal_api_url = multimodal_api_url
         self.model_name = model_name
+        # Guards video_db's connection, shared with the bulk writer's property updates
+        self._vdms_lock = threading.RLock()
         
         # Auto-detect embedding dimensions if not provided
         if embedding_dimensions is None:
@@ -151,6 +155,10 @@ class SimpleVDMSClient:
                 # distance_strategy="L2",
                 embedding_dimensions=self.embedding_dimensions
             )
+            # Dedicated persistent connection for bulk inserts
+            self.bulk_writer = VDMSBulkWriter(
+                self.video_db, self.host, self.port, store_lock=self._vdms_lock
+            )
             logger.info("VDMS initialized successfully with dummy embedding (won't be used)")
 
         except Exception as ex:
@@ -197,58 +205,6 @@ class SimpleVDMSClient:
         
         return cleaned
 
-    def _store_embeddings(
-        self,
-        embeddings: List[List[float]],
-        texts: List[str],
-        metadatas: List[dict],
-    ) -> List[str]:
-        """Store embeddings using the langchain-vdms vector store APIs."""
-
-        if not embeddings:
-            return []
-
-        logger.info("Starting VDMS storage for %d embeddings", len(embeddings))
-        batch_size = 200
-        generated_ids: List[str] = []
-
-        for start_idx in range(0, len(embeddings), batch_size):
-            end_idx = min(start_idx + batch_size, len(embeddings))
-
-            batch_embeddings = embeddings[start_idx:end_idx]
-            batch_texts = texts[start_idx:end_idx]
-            batch_metadatas = metadatas[start_idx:end_idx]
-            batch_ids = [str(uuid.uuid4()) for _ in batch_embeddings]
-
-            try:
-                inserted_ids = self.video_db.add_from(
-                    texts=batch_texts,
-                    embeddings=batch_embeddings,
-                    metadatas=batch_metadatas,
-                    ids=batch_ids,
-                    batch_size=batch_size,
-                )
-            except Exception as exc:
-                logger.error(
-                    "VDMS add_from failed for batch %d-%d: %s",
-                    start_idx,
-                    end_idx - 1,
-                    exc,
-                )
-                raise
-
-            if not inserted_ids or len(inserted_ids) != len(batch_ids):
-                raise ValueError(
-                    "VDMS add_from returned unexpected result size. "
-                    f"Expected {len(batch_ids)}, received {len(inserted_ids) if inserted_ids else 0}."
-                )
-
-            generated_ids.extend(inserted_ids)
-
-        self.video_db.check_and_update_properties()
-        logger.info("Stored %d embeddings in VDMS", len(generated_ids))
-        return generated_ids
-
     def store_frame_embeddings(self, embeddings: List[List[float]], frame_metadatas: List[dict]) -> List[str]:
         """
         Store frame embeddings using optimized approach similar to SDK mode.
@@ -511,8 +467,6 @@ class SimpleVDMSClient:
                 time.time() - request_start,
             )
 
-            import uuid
-
             text_id = str(uuid.uuid4())
             ids = self.video_db.add_from(
                 texts=[text],
@@ -544,8 +498,6 @@ class SimpleVDMSClient:
             if not embedding_vector:
                 raise ValueError("Embedding vector cannot be empty")
 
-            import uuid
-
             text_id = str(uuid.uuid4())
             ids = self.video_db.add_from(
                 texts=[text],
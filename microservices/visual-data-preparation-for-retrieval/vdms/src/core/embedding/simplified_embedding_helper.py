@@ -1,6 +1,7 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import os
 import pathlib
 import time
 from typing import List
@@ -309,16 +310,11 @@ async def _generate_video_embedding_sdk_mode(
     """
     SDK-based video embedding generation (optimized approach).
     
-    This function uses the SDK approach but still reads from the temp file.
-    For maximum optimization, use generate_video_embedding_from_content().
+    The downloaded temp file is decoded and hashed in place, so the video is
+    never held in memory as a whole.
     """
     logger.info("Processing video using SDK mode (direct calls)")
-    
-    # Read video content from temp file
-    with open(temp_video_path, 'rb') as f:
-        video_content = f.read()
-    
-    logger.info(f"Loaded video content: {len(video_content)} bytes")
+    logger.info(f"Processing video file {temp_video_path}: {os.path.getsize(temp_video_path)} bytes")
     
     # Create video URL paths for search-ms compatibility
     video_rel_url = (
@@ -346,11 +342,11 @@ async def _generate_video_embedding_sdk_mode(
     
     # Process video using SDK mode
     results = generate_video_embedding_sdk(
-        video_content=video_content,
         metadata_dict=metadata_dict,
         frame_interval=frame_interval,
         enable_object_detection=enable_object_detection,
-        detection_confidence=detection_confidence
+        detection_confidence=detection_confidence,
+        video_path=temp_video_path,
     )
     
     logger.info(f"SDK processing completed: {results['total_frames_processed']} frames processed")
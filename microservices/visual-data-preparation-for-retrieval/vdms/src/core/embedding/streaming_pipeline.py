@@ -0,0 +1,319 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Bounded, back-pressured stage pipeline used for streaming video ingestion.
+
+Each stage owns a bounded input queue and a small pool of worker threads. A
+producer blocks as soon as the next stage's queue is full, so at most
+``queue_depth + workers * batch_size`` items are in flight per stage no matter
+how long the source is, while all stages run concurrently (decode overlaps
+detection, detection overlaps embedding, and so on).
+
+Every stage keeps its own counters (queue depth, items in/out, busy and
+back-pressure time, throughput), exposed by ``StreamingPipeline.stats`` for
+logging and processing results.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.common import logger
+
+# Marks the end of the stream on a stage queue
+_END = object()
+
+# How often blocked producers/consumers re-check the abort flag (seconds)
+_POLL_INTERVAL = 0.1
+
+
+class StageCounters:
+    """Thread-safe queue-depth and throughput counters for one pipeline stage."""
+
+    def __init__(self, name: str, workers: int, queue_capacity: int):
+        self.name = name
+        self.workers = workers
+        self.queue_capacity = queue_capacity
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.calls = 0
+        self.busy_time = 0.0
+        self.blocked_time = 0.0
+        self.max_call_time = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._first_start: Optional[float] = None
+        self._last_end: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record_depth(self, depth: int) -> None:
+        """Record the input queue depth observed when an item is dequeued."""
+        with self._lock:
+            self._depth_total += depth
+            self._depth_samples += 1
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+
+    def record_call(
+        self,
+        start: float,
+        end: float,
+        items_in: int,
+        items_out: int,
+        failed: bool = False,
+        blocked: float = 0.0,
+    ) -> None:
+        """Record one handler invocation and the time spent waiting on the next stage's queue."""
+        elapsed = end - start
+        with self._lock:
+            self.calls += 1
+            self.blocked_time += blocked
+            self.items_in += items_in
+            self.items_out += items_out
+            self.busy_time += elapsed
+            if failed:
+                self.errors += items_in
+            if elapsed > self.max_call_time:
+                self.max_call_time = elapsed
+            if self._first_start is None or start < self._first_start:
+                self._first_start = start
+            if self._last_end is None or end + blocked > self._last_end:
+                self._last_end = end + blocked
+
+    def snapshot(self, current_depth: int = 0) -> Dict[str, Any]:
+        """Return a JSON-serializable view of the counters."""
+        with self._lock:
+            wall_time = (
+                self._last_end - self._first_start
+                if self._first_start is not None and self._last_end is not None
+                else 0.0
+            )
+            return {
+                "workers": self.workers,
+                "queue_capacity": self.queue_capacity,
+                "queue_depth": current_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "avg_queue_depth": self._depth_total / self._depth_samples if self._depth_samples else 0.0,
+                "items_in": self.items_in,
+                "items_out": self.items_out,
+                "errors": self.errors,
+                "calls": self.calls,
+                "busy_s": self.busy_time,
+                # Time spent blocked on a full downstream queue (back-pressure)
+                "blocked_s": self.blocked_time,
+                "wall_s": wall_time,
+                "avg_call_s": self.busy_time / self.calls if self.calls else 0.0,
+                "max_call_s": self.max_call_time,
+                "items_per_s": self.items_in / wall_time if wall_time > 0 else 0.0,
+                # Fraction of the stage's wall time its workers were busy (1.0 per fully busy worker)
+                "utilization": self.busy_time / wall_time if wall_time > 0 else 0.0,
+            }
+
+
+class PipelineStage:
+    """
+    A processing stage of a ``StreamingPipeline``.
+
+    Args:
+        name: Stage name used in logs and counters
+        handler: Callable invoked with one item (or a list of up to ``batch_size``
+            items when ``batch_size > 1``); returns an iterable of items for the
+            next stage (or ``None``)
+        workers: Number of worker threads running the handler
+        queue_depth: Capacity of the stage's input queue
+        batch_size: Maximum items handed to the handler per call
+        batch_wait: Seconds to wait for a batch to fill once its first item arrived
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Optional[Iterable[Any]]],
+        workers: int = 1,
+        queue_depth: int = 8,
+        batch_size: int = 1,
+        batch_wait: float = 0.05,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.batch_wait = batch_wait
+        self.inbox: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(queue_depth)))
+        self.counters = StageCounters(name, self.workers, self.inbox.maxsize)
+        self._active_workers = self.workers
+        self._lock = threading.Lock()
+
+    def worker_finished(self) -> bool:
+        """Mark one worker as finished; returns True for the last one."""
+        with self._lock:
+            self._active_workers -= 1
+            return self._active_workers == 0
+
+
+class StreamingPipeline:
+    """
+    Run a source iterator through a chain of bounded stages.
+
+    Args:
+        source_name: Name of the source stage in the counters (for example ``decode``)
+        stages: Ordered processing stages; outputs of the last stage are collected
+    """
+
+    def __init__(self, source_name: str, stages: List[PipelineStage]):
+        if not stages:
+            raise ValueError("StreamingPipeline requires at least one stage")
+        self.source_name = source_name
+        self.stages = stages
+        self.source_counters = StageCounters(source_name, 1, 0)
+        self._abort = threading.Event()
+        self._results: List[Any] = []
+        self._results_lock = threading.Lock()
+        self._source_error: Optional[BaseException] = None
+
+    def _put(self, target: "queue.Queue[Any]", item: Any) -> bool:
+        """Blocking put that gives up once the pipeline is aborted."""
+        while not self._abort.is_set():
+            try:
+                target.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: "queue.Queue[Any]", timeout: Optional[float] = None) -> Any:
+        """Blocking get that returns ``_END`` once the pipeline is aborted."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._abort.is_set():
+            wait = _POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    raise queue.Empty
+            try:
+                return source.get(timeout=wait)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _emit(self, index: int, outputs: List[Any]) -> int:
+        """Forward handler outputs to the next stage (or the result list); returns the count."""
+        if index + 1 == len(self.stages):
+            with self._results_lock:
+                self._results.extend(outputs)
+            return len(outputs)
+        count = 0
+        next_inbox = self.stages[index + 1].inbox
+        for output in outputs:
+            if not self._put(next_inbox, output):
+                break
+            count += 1
+        return count
+
+    def _run_source(self, items: Iterator[Any]) -> None:
+        first_inbox = self.stages[0].inbox
+        counters = self.source_counters
+        try:
+            while not self._abort.is_set():
+                start = time.perf_counter()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    break
+                end = time.perf_counter()
+                if not self._put(first_inbox, item):
+                    break
+                counters.record_call(start, end, 1, 1, blocked=time.perf_counter() - end)
+        except BaseException as e:
+            logger.error(f"Pipeline source '{self.source_name}' failed: {e}")
+            self._source_error = e
+            self._abort.set()
+        finally:
+            self._put(first_inbox, _END)
+
+    def _run_worker(self, index: int) -> None:
+        stage = self.stages[index]
+        counters = stage.counters
+        ended = False
+        while not ended:
+            item = self._get(stage.inbox)
+            if item is _END:
+                break
+            counters.record_depth(stage.inbox.qsize() + 1)
+
+            batch = [item]
+            if stage.batch_size > 1:
+                deadline = time.monotonic() + stage.batch_wait
+                while len(batch) < stage.batch_size:
+                    try:
+                        next_item = self._get(stage.inbox, timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if next_item is _END:
+                        ended = True
+                        break
+                    batch.append(next_item)
+
+            start = time.perf_counter()
+            failed = False
+            outputs: List[Any] = []
+            try:
+                outputs = list(stage.handler(batch if stage.batch_size > 1 else item) or ())
+            except Exception as e:
+                failed = True
+                logger.error(f"Pipeline stage '{stage.name}' failed on {len(batch)} item(s): {e}")
+            end = time.perf_counter()
+            produced = self._emit(index, outputs)
+            counters.record_call(
+                start, end, len(batch), produced, failed=failed, blocked=time.perf_counter() - end
+            )
+
+        # Let sibling workers see the end of the stream, then forward it once all are done
+        self._put(stage.inbox, _END)
+        if stage.worker_finished() and index + 1 < len(self.stages):
+            self._put(self.stages[index + 1].inbox, _END)
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Stream ``items`` through all stages and wait for completion.
+
+        Returns:
+            Outputs of the last stage (in completion order)
+
+        Raises:
+            The source iterator's exception, after the pipeline has been shut down
+        """
+        threads = [
+            threading.Thread(target=self._run_source, args=(iter(items),), name=f"pipeline-{self.source_name}", daemon=True)
+        ]
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                threads.append(
+                    threading.Thread(
+                        target=self._run_worker, args=(index,), name=f"pipeline-{stage.name}-{worker}", daemon=True
+                    )
+                )
+
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            self._abort.set()
+            raise
+
+        if self._source_error is not None:
+            raise self._source_error
+        return self._results
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage counters keyed by stage name, in pipeline order."""
+        stats = {self.source_name: self.source_counters.snapshot()}
+        for stage in self.stages:
+            stats[stage.name] = stage.counters.snapshot(stage.inbox.qsize())
+        return stats
@@ -0,0 +1,498 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Bulk descriptor ingestion for VDMS.
+
+``VDMS.add_from`` sends one ``AddDescriptor`` transaction per small batch and
+then re-reads (and possibly rewrites) the collection's property list, so every
+batch costs several synchronous round trips. ``VDMSBulkWriter`` instead:
+
+1. Packs all vectors into one float32 array and slices it into large
+   transactions (``VDMS_BULK_TRANSACTION_SIZE`` descriptors each)
+2. Pipelines the transactions over a dedicated persistent connection, keeping
+   up to ``VDMS_BULK_PIPELINE_DEPTH`` requests in flight while the next one is
+   serialized (VDMS answers requests on a connection in order)
+3. Retries failures individually: a rejected transaction is split in half until
+   the offending descriptors are isolated, and transactions that were in flight
+   when the connection dropped are checked for existing IDs before being resent
+4. Pushes the collection property list once per call instead of once per batch
+
+``VDMSBulkStoreMixin`` gives the SDK and API-mode clients the same storage
+entry points on top of the writer.
+"""
+
+import json
+import socket
+import struct
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from google.protobuf.message import DecodeError
+from langchain_vdms.vectorstores import LANGCHAIN_ID_PROPERTY, TEXT_PROPERTY, VDMS
+from vdms import queryMessage_pb2
+
+from src.common import logger, settings
+
+# VDMS frames each protobuf message with its length as a native unsigned int
+_HEADER = struct.Struct("@I")
+
+# Errors that leave the connection in an unknown state
+_CONNECTION_ERRORS = (OSError, ValueError, DecodeError)
+
+# (start, end, attempts) slice of the descriptors being ingested
+_Batch = Tuple[int, int, int]
+
+
+class VDMSBulkWriter:
+    """
+    Pipelined, transaction-batched descriptor writer for one VDMS collection.
+
+    Args:
+        vector_store: langchain-vdms store of the collection (used for the property list)
+        host: VDMS host
+        port: VDMS port
+        transaction_size: Descriptors per transaction
+        pipeline_depth: Transactions in flight on the connection
+        max_retries: Attempts per descriptor (and reconnects) before giving up
+        store_lock: Lock guarding other users of ``vector_store``'s connection
+        timeout: Socket timeout in seconds
+    """
+
+    def __init__(
+        self,
+        vector_store: VDMS,
+        host: str,
+        port: int,
+        transaction_size: Optional[int] = None,
+        pipeline_depth: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        store_lock: Optional[threading.RLock] = None,
+        timeout: float = 120.0,
+    ):
+        self.vector_store = vector_store
+        self.collection_name = vector_store.collection_name
+        self.host = host
+        self.port = int(port)
+        self.transaction_size = max(1, transaction_size or settings.VDMS_BULK_TRANSACTION_SIZE)
+        self.pipeline_depth = max(1, pipeline_depth or settings.VDMS_BULK_PIPELINE_DEPTH)
+        self.max_retries = max(0, settings.VDMS_BULK_MAX_RETRIES if max_retries is None else max_retries)
+        self.timeout = timeout
+        self._store_lock = store_lock or threading.RLock()
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+
+    # Connection handling
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock = sock
+        return self._sock
+
+    def close(self) -> None:
+        """Close the persistent connection (reopened on next use)."""
+        with self._lock:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    @staticmethod
+    def _encode(queries: List[Dict[str, Any]], blobs: Sequence[bytes] = ()) -> bytes:
+        message = queryMessage_pb2.queryMessage()
+        message.json = json.dumps(queries)
+        message.blobs.extend(blobs)
+        data = message.SerializeToString()
+        return _HEADER.pack(len(data)) + data
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = sock.recv_into(view[received:], size - received)
+            if count == 0:
+                raise ConnectionError("VDMS closed the connection")
+            received += count
+        return bytes(buffer)
+
+    def _receive(self, sock: socket.socket) -> Any:
+        (size,) = _HEADER.unpack(self._recv_exact(sock, _HEADER.size))
+        message = queryMessage_pb2.queryMessage()
+        message.ParseFromString(self._recv_exact(sock, size))
+        return json.loads(message.json)
+
+    # Transactions
+
+    def _add_query(self, props: List[Dict[str, Any]]) -> Dict[str, Any]:
+        entity: Dict[str, Any] = {"set": self.collection_name}
+        if len(props) == 1:
+            entity["properties"] = props[0]
+        else:
+            entity["batch_properties"] = props
+        return {"AddDescriptor": entity}
+
+    @staticmethod
+    def _succeeded(response: Any) -> bool:
+        try:
+            return response[0]["AddDescriptor"]["status"] == 0
+        except (KeyError, IndexError, TypeError):
+            return False
+
+    def _send_pipelined(
+        self,
+        batches: List[_Batch],
+        vectors: np.ndarray,
+        props: List[Dict[str, Any]],
+    ) -> Tuple[List[_Batch], List[_Batch], List[_Batch], List[_Batch]]:
+        """
+        Send transactions with up to ``pipeline_depth`` in flight.
+
+        Returns:
+            (committed, rejected, in_doubt, unsent) batches. ``in_doubt`` batches were
+            sent but not acknowledged before the connection failed.
+        """
+        committed: List[_Batch] = []
+        rejected: List[_Batch] = []
+        in_flight: Deque[_Batch] = deque()
+        next_index = 0
+
+        def _collect(sock: socket.socket) -> None:
+            response = self._receive(sock)
+            batch = in_flight.popleft()
+            if self._succeeded(response):
+                committed.append(batch)
+            else:
+                logger.warning(
+                    "VDMS rejected descriptors %d-%d: %s",
+                    batch[0],
+                    batch[1] - 1,
+                    json.dumps(response)[:500],
+                )
+                rejected.append(batch)
+
+        try:
+            sock = self._connect()
+            for next_index, batch in enumerate(batches):
+                start, end, _ = batch
+                payload = self._encode([self._add_query(props[start:end])], [vectors[start:end].tobytes()])
+                in_flight.append(batch)
+                sock.sendall(payload)
+                if len(in_flight) >= self.pipeline_depth:
+                    _collect(sock)
+            next_index = len(batches)
+            while in_flight:
+                _collect(sock)
+        except _CONNECTION_ERRORS as exc:
+            logger.warning("VDMS bulk connection failed (%s); reconnecting", exc)
+            self._disconnect()
+            sent = next_index + 1 if in_flight else next_index
+            return committed, rejected, list(in_flight), batches[sent:]
+
+        return committed, rejected, [], []
+
+    def _backoff(self, failures: int) -> int:
+        """Wait before reconnecting; raise once ``max_retries`` reconnects have failed."""
+        failures += 1
+        if failures > self.max_retries:
+            self._disconnect()
+            raise ConnectionError(f"VDMS at {self.host}:{self.port} unreachable after {self.max_retries} reconnects")
+        time.sleep(min(5.0, 0.2 * 2 ** (failures - 1)))
+        return failures
+
+    def _existing_ids(self, ids: List[str]) -> set:
+        """Return which of ``ids`` are already stored (one transaction of lookups)."""
+        queries = [
+            {
+                "FindDescriptor": {
+                    "set": self.collection_name,
+                    "constraints": {LANGCHAIN_ID_PROPERTY: ["==", descriptor_id]},
+                    "results": {"list": [LANGCHAIN_ID_PROPERTY]},
+                }
+            }
+            for descriptor_id in ids
+        ]
+        sock = self._connect()
+        sock.sendall(self._encode(queries))
+        response = self._receive(sock)
+        found = set()
+        for item in response if isinstance(response, list) else []:
+            for entity in item.get("FindDescriptor", {}).get("entities", []) or []:
+                found.add(entity.get(LANGCHAIN_ID_PROPERTY))
+        return found
+
+    def _existing_ids_batched(self, ids: Sequence[str]) -> set:
+        """Return which of ``ids`` are already stored, looked up ``transaction_size`` IDs at a time."""
+        found = set()
+        for start in range(0, len(ids), self.transaction_size):
+            found |= self._existing_ids(list(ids[start:start + self.transaction_size]))
+        return found
+
+    def existing_ids(self, ids: Sequence[str]) -> set:
+        """Return which of ``ids`` are already stored, looked up ``transaction_size`` IDs at a time."""
+        with self._lock:
+            try:
+                return self._existing_ids_batched(ids)
+            except _CONNECTION_ERRORS:
+                self._disconnect()
+                raise
+
+    def _update_properties(self, props: List[Dict[str, Any]]) -> None:
+        """Register any new property names with the collection in a single update."""
+        keys = set()
+        for prop in props:
+            keys.update(prop)
+        with self._store_lock:
+            known = self.vector_store.collection_properties
+            missing = keys.difference(known)
+            if missing:
+                known.extend(sorted(missing))
+                known.sort()
+            self.vector_store.push_update_properties(self.collection_name)
+            self.vector_store.check_and_update_properties()
+
+    def add(
+        self,
+        embeddings: Any,
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        ids: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Insert descriptors in bulk.
+
+        Args:
+            embeddings: Vectors as a 2-D array or a list of lists
+            texts: Text stored as each descriptor's ``content`` property
+            metadatas: VDMS-compatible (flat) properties per descriptor
+            ids: Descriptor IDs (UUIDs are generated when omitted)
+
+        Returns:
+            Dictionary with ``ids`` (stored IDs, input order), ``failed_ids``,
+            ``transactions`` and ``retries``
+
+        Raises:
+            ValueError: If the input sizes or vector dimensions do not match
+            ConnectionError: If VDMS stays unreachable after ``max_retries`` reconnects
+        """
+        vectors = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        count = len(texts)
+        if vectors.ndim != 2 or vectors.shape[0] != count or len(metadatas) != count:
+            raise ValueError(
+                f"Mismatch: {vectors.shape[0] if vectors.ndim else 0} embeddings, "
+                f"{count} texts, {len(metadatas)} metadata entries"
+            )
+        if count == 0:
+            return {"ids": [], "failed_ids": [], "transactions": 0, "retries": 0}
+        expected_dims = getattr(self.vector_store, "embedding_dimension", None)
+        if expected_dims and vectors.shape[1] != expected_dims:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match collection ({expected_dims})")
+
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in range(count)]
+        props = []
+        for descriptor_id, text, metadata in zip(ids, texts, metadatas):
+            prop = {LANGCHAIN_ID_PROPERTY: descriptor_id}
+            prop.update(metadata)
+            if text:
+                prop[TEXT_PROPERTY] = text
+            props.append(prop)
+
+        stored = np.zeros(count, dtype=bool)
+        pending: List[_Batch] = [
+            (start, min(start + self.transaction_size, count), 0)
+            for start in range(0, count, self.transaction_size)
+        ]
+        # Sent but unacknowledged when the connection failed; may or may not be stored
+        in_doubt: List[_Batch] = []
+        transactions = 0
+        retries = 0
+        connection_failures = 0
+
+        with self._lock:
+            while pending or in_doubt:
+                if in_doubt:
+                    try:
+                        existing = self._existing_ids_batched(
+                            [ids[i] for start, end, _ in in_doubt for i in range(start, end)]
+                        )
+                    except _CONNECTION_ERRORS as exc:
+                        logger.warning("Could not verify in-flight descriptors: %s", exc)
+                        self._disconnect()
+                        connection_failures = self._backoff(connection_failures)
+                        continue
+                    for start, end, attempts in in_doubt:
+                        if all(ids[i] in existing for i in range(start, end)):
+                            stored[start:end] = True
+                        elif attempts < self.max_retries:
+                            pending.append((start, end, attempts + 1))
+                    in_doubt = []
+                    pending.sort()
+                    if not pending:
+                        break
+
+                transactions += len(pending)
+                committed, rejected, in_doubt, unsent = self._send_pipelined(pending, vectors, props)
+                for start, end, _ in committed:
+                    stored[start:end] = True
+
+                pending = list(unsent)
+                for start, end, attempts in rejected:
+                    if end - start > 1:
+                        # Bisect to isolate the descriptors VDMS refuses
+                        middle = (start + end) // 2
+                        pending.extend([(start, middle, attempts), (middle, end, attempts)])
+                    elif attempts < self.max_retries:
+                        pending.append((start, end, attempts + 1))
+
+                if in_doubt or unsent:
+                    connection_failures = self._backoff(connection_failures)
+                else:
+                    connection_failures = 0
+                retries += len(pending) + len(in_doubt)
+                pending.sort()
+
+        stored_ids = [ids[i] for i in np.flatnonzero(stored)]
+        failed_ids = [ids[i] for i in np.flatnonzero(~stored)]
+        if failed_ids:
+            logger.error("VDMS bulk insert: %d of %d descriptors failed", len(failed_ids), count)
+        if stored_ids:
+            self._update_properties([props[i] for i in np.flatnonzero(stored)])
+
+        return {
+            "ids": stored_ids,
+            "failed_ids": failed_ids,
+            "transactions": transactions,
+            "retries": retries,
+        }
+
+
+class VDMSBulkStoreMixin:
+    """
+    Descriptor storage shared by the VDMS clients.
+
+    Uses the client's ``video_db`` (langchain-vdms store), ``bulk_writer``
+    (:class:`VDMSBulkWriter`) and ``_vdms_lock`` (guards ``video_db``'s connection).
+    """
+
+    def bulk_store_embeddings(
+        self,
+        embeddings: Any,
+        texts: List[str],
+        metadatas: List[dict],
+        ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store descriptors in a few large, pipelined VDMS transactions.
+
+        Failed transactions are split and retried so that only the descriptors VDMS
+        keeps rejecting are reported in ``failed_ids``.
+
+        Args:
+            embeddings: Vectors as a 2-D array or a list of lists
+            texts: Text stored with each descriptor
+            metadatas: VDMS-compatible metadata per descriptor
+            ids: Optional descriptor IDs (generated when omitted)
+
+        Returns:
+            Dictionary with ``ids``, ``failed_ids``, ``transactions`` and ``retries``
+        """
+        start_time = time.time()
+        result = self.bulk_writer.add(embeddings, texts, metadatas, ids=ids)
+        elapsed = time.time() - start_time
+        logger.info(
+            "Bulk stored %d descriptors in %d transactions (%d retried, %d failed) in %.3fs",
+            len(result["ids"]),
+            result["transactions"],
+            result["retries"],
+            len(result["failed_ids"]),
+            elapsed,
+        )
+        return result
+
+    def _store_embeddings(
+        self,
+        embeddings: List[List[float]],
+        texts: List[str],
+        metadatas: List[dict],
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Persist embeddings, raising if any of them could not be stored."""
+
+        if not embeddings:
+            return []
+
+        if not settings.VDMS_BULK_INSERT:
+            return self._store_embeddings_per_batch(embeddings, texts, metadatas, ids=ids)
+
+        result = self.bulk_store_embeddings(embeddings, texts, metadatas, ids=ids)
+        if result["failed_ids"]:
+            raise ValueError(
+                f"VDMS bulk insert failed for {len(result['failed_ids'])} of {len(embeddings)} embeddings"
+            )
+        return result["ids"]
+
+    def _store_embeddings_per_batch(
+        self,
+        embeddings: List[List[float]],
+        texts: List[str],
+        metadatas: List[dict],
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Persist embeddings with ``VDMS.add_from`` in fixed-size batches (used when bulk insert is disabled)."""
+
+        if not embeddings:
+            return []
+
+        logger.info("Storing %d embeddings via langchain-vdms", len(embeddings))
+        batch_size = 200
+        generated_ids: List[str] = []
+
+        with self._vdms_lock:
+            for start_idx in range(0, len(embeddings), batch_size):
+                end_idx = min(start_idx + batch_size, len(embeddings))
+
+                batch_embeddings = embeddings[start_idx:end_idx]
+                batch_texts = texts[start_idx:end_idx]
+                batch_metadatas = metadatas[start_idx:end_idx]
+                batch_ids = ids[start_idx:end_idx] if ids else [str(uuid.uuid4()) for _ in batch_embeddings]
+
+                try:
+                    inserted_ids = self.video_db.add_from(
+                        texts=batch_texts,
+                        embeddings=batch_embeddings,
+                        metadatas=batch_metadatas,
+                        ids=batch_ids,
+                        batch_size=batch_size,
+                    )
+                except Exception as exc:
+                    logger.error(
+                        "VDMS add_from failed for batch %d-%d: %s",
+                        start_idx,
+                        end_idx - 1,
+                        exc,
+                    )
+                    raise
+
+                if not inserted_ids or len(inserted_ids) != len(batch_ids):
+                    raise ValueError(
+                        "VDMS add_from returned unexpected result size. "
+                        f"Expected {len(batch_ids)}, received {len(inserted_ids) if inserted_ids else 0}."
+                    )
+
+                generated_ids.extend(inserted_ids)
+
+        self.video_db.check_and_update_properties()
+        logger.info("Stored %d embeddings in VDMS", len(generated_ids))
+        return generated_ids
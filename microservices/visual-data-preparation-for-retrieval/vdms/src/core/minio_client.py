@@ -9,7 +9,8 @@ from typing import List, Optional, Tuple
 from minio import Minio
 from minio.error import S3Error
 
-from src.common import DataPrepException, Strings, logger
+from src.common import DataPrepException, Strings, logger, settings
+from src.core.minio_transfer import MinioTransferEngine, create_http_client
 
 
 class MinioClient:
@@ -23,6 +24,7 @@ class MinioClient:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.client = None
+            cls._instance.transfer = None
         return cls._instance
 
     def __init__(self, endpoint: str, access_key: str, secret_key: str, secure: bool = False):
@@ -37,7 +39,16 @@ class MinioClient:
         if not self.client:
             try:
                 self.client = Minio(
-                    endpoint, access_key=access_key, secret_key=secret_key, secure=secure
+                    endpoint,
+                    access_key=access_key,
+                    secret_key=secret_key,
+                    secure=secure,
+                    http_client=create_http_client(settings.MINIO_MAX_CONNECTIONS),
+                )
+                self.transfer = MinioTransferEngine(
+                    self.client,
+                    part_size=settings.MINIO_TRANSFER_PART_SIZE_MB * 1024 * 1024,
+                    max_workers=settings.MINIO_TRANSFER_WORKERS,
                 )
                 logger.info(f"Minio client initialized with endpoint: {endpoint}")
             except Exception as ex:
@@ -210,6 +221,26 @@ class MinioClient:
             logger.error(f"Error downloading video {object_name} from bucket {bucket_name}: {ex}")
             raise Exception(f"Error downloading video: {ex}")
 
+    def download_to_file(self, bucket_name: str, object_name: str, file_path: pathlib.Path) -> int:
+        """Download an object straight into a local file with parallel ranged reads.
+
+        Args:
+            bucket_name (str): The bucket containing the object
+            object_name (str): The object name (path) of the object
+            file_path (pathlib.Path): Destination file, created or overwritten
+
+        Returns:
+            int: Size of the downloaded object in bytes
+
+        Raises:
+            Exception: If getting the object fails
+        """
+        try:
+            return self.transfer.download_to_file(bucket_name, object_name, file_path)
+        except (S3Error, IOError) as ex:
+            logger.error(f"Error downloading {object_name} from bucket {bucket_name}: {ex}")
+            raise Exception(f"Error downloading object: {ex}")
+
     def get_object_size(self, bucket_name: str, object_name: str) -> int:
         """Get the size of an object in bytes.
 
@@ -380,14 +411,18 @@ class MinioClient:
             # Check if the bucket exists
             self.ensure_bucket_exists(bucket_name)
 
-            # Upload the file
-            self.client.put_object(
-                bucket_name=bucket_name,
-                object_name=object_name,
-                data=data,
-                length=file_size,
-                content_type="video/mp4",
-            )
+            # Upload the file; parts of a known-size file are uploaded in parallel
+            if file_size is not None:
+                self.transfer.upload(bucket_name, object_name, data, file_size, "video/mp4")
+            else:
+                self.client.put_object(
+                    bucket_name=bucket_name,
+                    object_name=object_name,
+                    data=data,
+                    length=-1,
+                    content_type="video/mp4",
+                    part_size=self.transfer.part_size,
+                )
 
             logger.info(f"Video uploaded successfully as {object_name} in bucket {bucket_name}")
         except S3Error as ex:
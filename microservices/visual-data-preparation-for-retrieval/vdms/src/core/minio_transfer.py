@@ -0,0 +1,165 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Parallel object transfers for MinIO.
+
+``MinioTransferEngine`` moves large objects in fixed-size parts over a shared,
+bounded pool of workers (and the client's bounded connection pool):
+
+- Downloads issue concurrent ranged GETs and write every part at its offset in
+  the destination file, so the object is never buffered whole in memory and
+  the decoder reads it straight from disk. All parts are pinned to the ETag
+  seen at the start, so an object replaced mid-transfer fails the download
+  instead of producing a mix of both versions.
+- Uploads of known length go through multipart upload with the same part
+  size and parallelism.
+"""
+
+import os
+import pathlib
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import BinaryIO, List, Tuple
+
+import certifi
+import urllib3
+from minio import Minio
+
+from src.common import logger
+
+# Minimum S3 multipart part size
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+# Bytes requested per read of a part's response body
+_STREAM_CHUNK = 256 * 1024
+
+
+def create_http_client(max_connections: int, timeout: float = 300.0) -> urllib3.PoolManager:
+    """
+    Connection pool for the MinIO client, configured like the client's default one.
+
+    ``block=True`` makes callers wait for a free connection once
+    ``max_connections`` are in use instead of opening (and then discarding)
+    extra ones.
+    """
+    return urllib3.PoolManager(
+        maxsize=max(1, int(max_connections)),
+        block=True,
+        timeout=urllib3.Timeout(connect=timeout, read=timeout),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+
+
+def split_parts(size: int, part_size: int) -> List[Tuple[int, int]]:
+    """Split ``size`` bytes into ``(offset, length)`` parts of at most ``part_size`` bytes."""
+    return [(offset, min(part_size, size - offset)) for offset in range(0, size, part_size)]
+
+
+class MinioTransferEngine:
+    """
+    Parallel part-wise downloads and uploads over one MinIO client.
+
+    Args:
+        client: MinIO client; size its connection pool (``create_http_client``)
+            to at least ``max_workers``
+        part_size: Bytes per part (at least 5 MiB, the S3 multipart minimum)
+        max_workers: Parts transferred concurrently, across all callers
+    """
+
+    def __init__(self, client: Minio, part_size: int = 16 * 1024 * 1024, max_workers: int = 8):
+        self.client = client
+        self.part_size = max(MIN_PART_SIZE, int(part_size))
+        self.max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="minio-transfer")
+        self._lock = threading.Lock()
+        self._counters = {"downloads": 0, "uploads": 0, "parts": 0, "bytes_downloaded": 0, "bytes_uploaded": 0}
+
+    def _fetch_part(self, fd: int, bucket_name: str, object_name: str, etag: str, offset: int, length: int) -> None:
+        response = self.client.get_object(
+            bucket_name,
+            object_name,
+            offset=offset,
+            length=length,
+            request_headers={"If-Match": f'"{etag}"'} if etag else None,
+        )
+        position = offset
+        try:
+            for chunk in response.stream(_STREAM_CHUNK):
+                os.pwrite(fd, chunk, position)
+                position += len(chunk)
+        finally:
+            response.close()
+            response.release_conn()
+        if position != offset + length:
+            raise IOError(f"Short read for {object_name} at offset {offset}: {position - offset} of {length} bytes")
+
+    def download_to_file(self, bucket_name: str, object_name: str, path: str | pathlib.Path) -> int:
+        """
+        Download an object into ``path`` with concurrent ranged GETs.
+
+        Returns:
+            Size of the object in bytes
+
+        Raises:
+            S3Error, IOError: If any part fails; the partial file is removed
+        """
+        stat = self.client.stat_object(bucket_name, object_name)
+        size = stat.size
+        parts = split_parts(size, self.part_size)
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            if len(parts) <= 1:
+                for offset, length in parts:
+                    self._fetch_part(fd, bucket_name, object_name, stat.etag, offset, length)
+            else:
+                futures = [
+                    self._executor.submit(self._fetch_part, fd, bucket_name, object_name, stat.etag, offset, length)
+                    for offset, length in parts
+                ]
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in pending:
+                    future.cancel()
+                # Let running parts finish before closing the descriptor they write to
+                wait(pending)
+                for future in done:
+                    future.result()
+        except BaseException:
+            os.close(fd)
+            pathlib.Path(path).unlink(missing_ok=True)
+            raise
+        os.close(fd)
+
+        with self._lock:
+            self._counters["downloads"] += 1
+            self._counters["parts"] += len(parts)
+            self._counters["bytes_downloaded"] += size
+        logger.debug(f"Downloaded {bucket_name}/{object_name} ({size} bytes) in {len(parts)} part(s)")
+        return size
+
+    def upload(self, bucket_name: str, object_name: str, data: BinaryIO, length: int, content_type: str) -> None:
+        """Upload a stream of known length as a parallel multipart upload."""
+        self.client.put_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            data=data,
+            length=length,
+            content_type=content_type,
+            part_size=self.part_size,
+            num_parallel_uploads=self.max_workers,
+        )
+        with self._lock:
+            self._counters["uploads"] += 1
+            self._counters["bytes_uploaded"] += length
+
+    def stats(self) -> dict:
+        """Counters of completed transfers."""
+        with self._lock:
+            return dict(self._counters)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -9,6 +9,7 @@ It supports both SDK mode (direct integration) and API mode (HTTP-based) process
 
 Main Components:
 - YOLOXDetector: Main detector class for object detection
+- BatchDetectionEngine: Shared engine batching frames from concurrent callers onto async infer requests
 - YOLOX utilities: Preprocessing and postprocessing functions
 - Model configurations: Detection model settings and parameters
 
@@ -23,10 +24,12 @@ Usage:
 """
 
 from .detector import YOLOXDetector, create_detector
+from .batch_engine import BatchDetectionEngine
 from . import yolox_utils
 
 __all__ = [
     'YOLOXDetector',
+    'BatchDetectionEngine',
     'create_detector', 
     'yolox_utils'
 ]
\ No newline at end of file
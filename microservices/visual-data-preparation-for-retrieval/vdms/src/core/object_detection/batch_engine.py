@@ -0,0 +1,301 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Batched, asynchronous YOLOX detection engine.
+
+``YOLOXDetector`` runs one synchronous inference per frame, so every pipeline
+worker contends for the same compiled model. ``BatchDetectionEngine`` shares one
+model between all callers instead:
+
+- Frames submitted from any thread (and any in-flight video) are gathered into
+  fixed-size batches by a single dispatcher thread.
+- Batches run on an OpenVINO ``AsyncInferQueue`` sized to the device's
+  ``OPTIMAL_NUMBER_OF_INFER_REQUESTS``, compiled with the THROUGHPUT hint.
+- Letterboxing writes the whole batch into one uint8 NHWC array; layout and
+  float conversion run inside the compiled model. Decoding and class-agnostic
+  NMS are vectorized over the batch (``yolox_utils.postprocess_batch``).
+- Optionally, a frame whose downscaled grayscale thumbnail barely differs from
+  the last inferred frame of the same stream reuses that frame's detections
+  instead of being inferred.
+
+If the model cannot be reshaped to the batch size (for example because of a
+batch dimension baked into a Reshape node), each frame of a batch is submitted
+as its own asynchronous request; batching and NMS stay vectorized.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .detector import OPENVINO_AVAILABLE, YOLOXDetector
+from .yolox_utils import postprocess_batch, preproc_batch
+
+logger = logging.getLogger(__name__)
+
+if OPENVINO_AVAILABLE:
+    import openvino as ov
+    from openvino.preprocess import PrePostProcessor
+
+# Thumbnail used for the near-duplicate frame score (width, height)
+THUMBNAIL_SIZE = (32, 32)
+
+# Marks the end of the submission queue
+_STOP = object()
+
+
+def frame_thumbnail(image: np.ndarray) -> np.ndarray:
+    """Return a small float32 grayscale thumbnail of ``image`` for frame-difference scoring."""
+    # Subsample before resizing so the cost stays flat for high-resolution frames
+    step = max(1, min(image.shape[0], image.shape[1]) // (THUMBNAIL_SIZE[1] * 4))
+    small = cv2.resize(image[::step, ::step], THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = small.mean(axis=2)
+    return small.astype(np.float32)
+
+
+def frame_difference(thumbnail: np.ndarray, reference: np.ndarray) -> float:
+    """Mean absolute difference between two thumbnails, on the 0-255 pixel scale."""
+    return float(np.abs(thumbnail - reference).mean())
+
+
+class BatchDetectionEngine:
+    """
+    Shared detection engine that batches frames from all callers.
+
+    Args:
+        detector: Loaded ``YOLOXDetector`` providing the model, thresholds and labels
+        batch_size: Frames per inference batch
+        max_wait: Seconds the dispatcher waits for a batch to fill once its first frame arrived
+        num_requests: Infer requests in the async pool (0 uses the device's optimal number)
+        skip_similar_frames: Reuse detections for near-duplicate frames of the same stream
+        frame_diff_threshold: Thumbnail mean absolute difference below which a frame
+            counts as a near-duplicate of its stream's last inferred frame
+    """
+
+    def __init__(
+        self,
+        detector: YOLOXDetector,
+        batch_size: int = 8,
+        max_wait: float = 0.01,
+        num_requests: int = 0,
+        skip_similar_frames: bool = False,
+        frame_diff_threshold: float = 3.0,
+    ):
+        if not OPENVINO_AVAILABLE:
+            raise ImportError("OpenVINO is required for object detection. Please install openvino.")
+
+        self.detector = detector
+        self.batch_size = max(1, int(batch_size))
+        self.max_wait = max_wait
+        self.skip_similar_frames = skip_similar_frames
+        self.frame_diff_threshold = frame_diff_threshold
+        self.input_size = (detector.h, detector.w)
+
+        self._compile(num_requests)
+
+        # Per-stream (thumbnail, future) of the last inferred frame
+        self._references: Dict[Hashable, Tuple[np.ndarray, Future]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"frames": 0, "inferred": 0, "skipped": 0, "batches": 0, "requests": 0}
+
+        self._staging = np.empty((self.request_batch, *self.input_size, 3), dtype=np.uint8)
+        self._pending: "queue.Queue[Any]" = queue.Queue()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="detection-batcher", daemon=True)
+        self._dispatcher.start()
+
+        logger.info(
+            "Batch detection engine ready: device=%s, batch_size=%d, request_batch=%d, infer_requests=%d, skip_similar_frames=%s",
+            detector.device,
+            self.batch_size,
+            self.request_batch,
+            self.num_requests,
+            skip_similar_frames,
+        )
+
+    def _compile(self, num_requests: int) -> None:
+        """Compile a batched copy of the detector's model and create the async request pool."""
+        core = self.detector.core
+        model = core.read_model(model=self.detector.model_file)
+        input_name = model.inputs[0].get_any_name()
+
+        self.request_batch = 1
+        if self.batch_size > 1:
+            try:
+                model.reshape({input_name: [self.batch_size, 3, *self.input_size]})
+                self.request_batch = self.batch_size
+            except Exception as e:
+                logger.warning(
+                    "Detection model cannot be reshaped to batch %d (%s); submitting one infer request per frame",
+                    self.batch_size,
+                    e,
+                )
+                model = core.read_model(model=self.detector.model_file)
+
+        # Accept the letterboxed uint8 NHWC batch directly; the compiled model converts it
+        ppp = PrePostProcessor(model)
+        ppp.input().tensor().set_element_type(ov.Type.u8).set_layout(ov.Layout("NHWC"))
+        ppp.input().model().set_layout(ov.Layout("NCHW"))
+        ppp.input().preprocess().convert_element_type(ov.Type.f32)
+        model = ppp.build()
+
+        self.compiled_model = core.compile_model(model, self.detector.device, {"PERFORMANCE_HINT": "THROUGHPUT"})
+        self.num_requests = int(num_requests) or int(self.compiled_model.get_property("OPTIMAL_NUMBER_OF_INFER_REQUESTS"))
+        self._infer_queue = ov.AsyncInferQueue(self.compiled_model, self.num_requests)
+        self._infer_queue.set_callback(self._on_complete)
+
+    @staticmethod
+    def _as_bgr(image: Union[np.ndarray, Image.Image]) -> np.ndarray:
+        """Convert inputs the same way ``YOLOXDetector.detect_objects`` does."""
+        if isinstance(image, Image.Image):
+            return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+
+    def submit(self, image: Union[np.ndarray, Image.Image], stream: Optional[Hashable] = None) -> Future:
+        """
+        Queue one frame for detection.
+
+        Args:
+            image: Frame as a numpy array (H, W, C) or PIL Image
+            stream: Key of the video the frame belongs to; enables near-duplicate
+                skipping against the stream's last inferred frame
+
+        Returns:
+            Future resolving to the detection metadata dictionaries of the frame
+        """
+        image = self._as_bgr(image)
+        future: Future = Future()
+        reference_future = None
+
+        with self._lock:
+            self._counters["frames"] += 1
+            if self.skip_similar_frames and stream is not None:
+                thumbnail = frame_thumbnail(image)
+                reference = self._references.get(stream)
+                if reference is not None and frame_difference(thumbnail, reference[0]) < self.frame_diff_threshold:
+                    self._counters["skipped"] += 1
+                    reference_future = reference[1]
+                else:
+                    self._references[stream] = (thumbnail, future)
+
+        if reference_future is not None:
+            reference_future.add_done_callback(lambda done: self._copy_result(done, future))
+        else:
+            self._pending.put((image, future))
+        return future
+
+    def detect_many(
+        self,
+        images: Sequence[Union[np.ndarray, Image.Image]],
+        stream: Optional[Hashable] = None,
+        timeout: Optional[float] = None,
+    ) -> List[List[dict]]:
+        """Submit several frames and wait for their detection metadata, in input order."""
+        futures = [self.submit(image, stream) for image in images]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def detect(self, image: Union[np.ndarray, Image.Image], stream: Optional[Hashable] = None) -> List[dict]:
+        """Detect objects in one frame (batched with concurrent callers)."""
+        return self.submit(image, stream).result()
+
+    def end_stream(self, stream: Hashable) -> None:
+        """Forget the near-duplicate reference frame kept for ``stream``."""
+        with self._lock:
+            self._references.pop(stream, None)
+
+    @staticmethod
+    def _copy_result(done: Future, future: Future) -> None:
+        error = done.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result([dict(detection) for detection in done.result()])
+
+    def _dispatch_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._pending.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._pending.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[np.ndarray, Future]]) -> None:
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["inferred"] += len(batch)
+
+        for start in range(0, len(batch), self.request_batch):
+            chunk = batch[start:start + self.request_batch]
+            futures = [future for _, future in chunk]
+            with self._lock:
+                self._counters["requests"] += 1
+            try:
+                _, ratios = preproc_batch([image for image, _ in chunk], self.input_size, out=self._staging)
+                # Blocks until a request of the pool is idle; the input is copied into it
+                self._infer_queue.start_async({0: self._staging}, (futures, ratios))
+            except Exception as e:
+                logger.error(f"Failed to start detection batch of {len(chunk)} frame(s): {e}")
+                for future in futures:
+                    future.set_exception(e)
+
+    def _on_complete(self, request: Any, userdata: Tuple[List[Future], np.ndarray]) -> None:
+        futures, ratios = userdata
+        try:
+            output = request.get_output_tensor(0).data[: len(futures)].copy()
+            results = postprocess_batch(
+                output,
+                ratios,
+                self.input_size,
+                nms_thr=self.detector.nms_threshold,
+                score_thr=self.detector.confidence_threshold,
+            )
+            for future, dets in zip(futures, results):
+                future.set_result(self._to_metadata(dets))
+        except Exception as e:
+            logger.error(f"Detection batch post-processing failed: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _to_metadata(self, dets: Optional[np.ndarray]) -> List[dict]:
+        if dets is None:
+            return []
+        return self.detector.detections_to_metadata(
+            np.round(dets[:, :4]).astype(int), dets[:, 4], dets[:, 5].astype(int)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of submitted, inferred and skipped frames and of the batches run."""
+        with self._lock:
+            counters = dict(self._counters)
+        counters["batch_size"] = self.batch_size
+        counters["request_batch"] = self.request_batch
+        counters["infer_requests"] = self.num_requests
+        counters["avg_batch_fill"] = counters["inferred"] / counters["batches"] if counters["batches"] else 0.0
+        return counters
+
+    def close(self) -> None:
+        """Finish queued frames and wait for in-flight requests."""
+        self._pending.put(_STOP)
+        self._dispatcher.join()
+        self._infer_queue.wait_all()
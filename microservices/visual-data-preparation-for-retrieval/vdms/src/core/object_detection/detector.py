@@ -279,6 +279,10 @@ class YOLOXDetector:
         if not return_metadata:
             return boxes, scores, class_ids
 
+        return self.detections_to_metadata(boxes, scores, class_ids)
+
+    def detections_to_metadata(self, boxes, scores, class_ids) -> List[dict]:
+        """Convert raw ``(boxes, scores, class_ids)`` results into detection metadata dictionaries."""
         metadata: List[dict] = []
         for i, (box, score, class_id) in enumerate(zip(boxes, scores, class_ids)):
             metadata.append(
@@ -150,3 +150,96 @@ def demo_postprocess(outputs, img_size, p6=False):
     outputs[..., 2:4] = np.exp(outputs[..., 2:4]) * expanded_strides
 
     return outputs
+
+
+def preproc_batch(imgs, input_size, out=None):
+    """
+    Letterbox a batch of images into one uint8 NHWC array.
+
+    Each image is resized with the same scaling as :func:`preproc` and written
+    into its slot of a single array padded with 114, so layout and dtype
+    conversion can be applied to the whole batch at once (by numpy or by the
+    compiled model's preprocessing).
+
+    Args:
+        imgs: Sequence of HxWx3 uint8 images (sizes may differ)
+        input_size: Target input size (height, width)
+        out: Optional preallocated (N, height, width, 3) uint8 array, N >= len(imgs)
+
+    Returns:
+        Tuple of (batch_array, scale_ratios) where scale_ratios has one entry per image
+    """
+    if out is None:
+        out = np.empty((len(imgs), input_size[0], input_size[1], 3), dtype=np.uint8)
+    out.fill(114)
+
+    ratios = np.empty(len(imgs), dtype=np.float64)
+    for i, img in enumerate(imgs):
+        r = min(input_size[0] / img.shape[0], input_size[1] / img.shape[1])
+        height, width = int(img.shape[0] * r), int(img.shape[1] * r)
+        cv2.resize(img, (width, height), dst=out[i, :height, :width], interpolation=cv2.INTER_LINEAR)
+        ratios[i] = r
+
+    return out, ratios
+
+
+def batched_nms(boxes, scores, batch_inds, nms_thr):
+    """
+    Class-agnostic NMS over detections from several images in one pass.
+
+    Boxes are shifted by a per-image offset larger than any box extent, so
+    boxes of different images never overlap and a single :func:`nms` call
+    suppresses within each image only.
+
+    Returns:
+        Indices of kept boxes, in descending score order
+    """
+    if len(boxes) == 0:
+        return []
+    boxes = boxes.astype(np.float64, copy=False)
+    span = boxes.max() - boxes.min() + 2.0
+    shifted = boxes + (batch_inds.astype(np.float64) * span)[:, None]
+    return nms(shifted, scores, nms_thr)
+
+
+def postprocess_batch(outputs, ratios, img_size, nms_thr, score_thr, p6=False):
+    """
+    Decode a batch of YOLOX outputs and apply class-agnostic NMS to all images at once.
+
+    Args:
+        outputs: Raw model outputs of shape (N, anchors, 5 + num_classes)
+        ratios: Letterbox scale ratio of each image
+        img_size: Model input size (height, width)
+        nms_thr: IoU threshold for NMS
+        score_thr: Minimum class score kept
+        p6: Whether using P6 model variant
+
+    Returns:
+        List with one (num_dets, 6) array [x1, y1, x2, y2, score, class] per image,
+        or None for images without detections (same rows as :func:`multiclass_nms`)
+    """
+    predictions = demo_postprocess(outputs, img_size, p6)
+    scores = predictions[..., 4:5] * predictions[..., 5:]
+    cls_inds = scores.argmax(-1)
+    cls_scores = np.take_along_axis(scores, cls_inds[..., None], -1)[..., 0]
+
+    batch_inds, anchor_inds = np.nonzero(cls_scores > score_thr)
+    results = [None] * len(predictions)
+    if len(batch_inds) == 0:
+        return results
+
+    centers = predictions[batch_inds, anchor_inds, :4]
+    boxes = np.empty_like(centers)
+    boxes[:, :2] = centers[:, :2] - centers[:, 2:4] / 2.0
+    boxes[:, 2:] = centers[:, :2] + centers[:, 2:4] / 2.0
+    boxes /= np.asarray(ratios, dtype=boxes.dtype)[batch_inds, None]
+
+    valid_scores = cls_scores[batch_inds, anchor_inds]
+    keep = np.asarray(batched_nms(boxes, valid_scores, batch_inds, nms_thr), dtype=np.int64)
+    dets = np.concatenate(
+        [boxes[keep], valid_scores[keep, None], cls_inds[batch_inds[keep], anchor_inds[keep], None]], 1
+    )
+    kept_batch = batch_inds[keep]
+    for i in np.unique(kept_batch):
+        results[i] = dets[kept_batch == i]
+    return results
@@ -58,6 +58,7 @@ from .file_utils import (
 # Video utilities
 from .video_utils import (
     get_video_from_minio,
+    download_video_from_minio,
     get_video_fps_and_frames,
     process_video_with_frame_extraction,
     process_video_with_enhanced_detection
@@ -98,6 +99,7 @@ __all__ = [
     
     # Video functions
     'get_video_from_minio',
+    'download_video_from_minio',
     'get_video_fps_and_frames',
     'process_video_with_frame_extraction',
     'process_video_with_enhanced_detection',
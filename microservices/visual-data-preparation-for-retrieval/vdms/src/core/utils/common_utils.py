@@ -29,6 +29,7 @@ class FrameInfo(NamedTuple):
     detection_confidence: Optional[float] = None
     crop_bbox: Optional[Tuple[int, int, int, int]] = None
     detected_label: Optional[str] = None
+    tensor_index: Optional[int] = None  # Index into the frames tensor store, if used
 
 
 def sanitize_input(input: str) -> str | None:
@@ -13,6 +13,10 @@ Functions:
 - cleanup_temp_directory(): Clean up temporary directories
 - save_metadata_at_temp(): Save metadata to temporary JSON file
 
+Classes:
+- FrameTensorWriter: Pack decoded frames into a memory-mappable uint8 tensor file
+- FrameImageWriter: Encode and write frame/crop JPEGs concurrently, in batches
+
 Usage:
     from src.core.utils.file_utils import create_temp_directory, cleanup_temp_directory
     
@@ -31,7 +35,12 @@ import json
 import pathlib
 import shutil
 import uuid
-from typing import Dict, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Any, List, Tuple
+
+import numpy as np
+from PIL import Image
 
 from src.common import logger, settings
 from .config_utils import get_config
@@ -113,4 +122,131 @@ def save_metadata_at_temp(metadata_temp_path: str, metadata: dict) -> pathlib.Pa
         json.dump(metadata, f, indent=4)
 
     logger.info("Metadata saved!")
-    return metadata_file
\ No newline at end of file
+    return metadata_file
+
+class FrameTensorWriter:
+    """
+    Pack decoded RGB frames into a single uint8 tensor file with an offsets table.
+
+    The embedding service memory-maps this file when a frames manifest carries a
+    ``tensor_store`` section, so frames and crops are embedded without writing
+    or decoding one JPEG per image. Crops are not packed; manifest entries point
+    at their parent frame and select the region with ``tensor_bbox``.
+    """
+
+    FILENAME = "frames.u8"
+
+    def __init__(self, temp_dir: str):
+        self.path = pathlib.Path(temp_dir) / self.FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: List[List[int]] = []
+        self._offset = 0
+        self._file = open(self.path, "wb")
+
+    def append(self, frame: np.ndarray) -> int:
+        """
+        Append one HxWxC uint8 frame and return its index in the offsets table.
+
+        Args:
+            frame: Decoded RGB frame
+
+        Returns:
+            Index to reference from manifest entries as ``tensor_index``
+        """
+        array = np.ascontiguousarray(frame, dtype=np.uint8)
+        if array.ndim != 3:
+            raise ValueError(f"Expected HxWxC frame, got shape {array.shape}")
+        height, width, channels = array.shape
+        self._file.write(memoryview(array).cast("B"))
+        self.entries.append([self._offset, height, width, channels])
+        self._offset += array.nbytes
+        return len(self.entries) - 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def abort(self) -> None:
+        """Close the file and remove the partially written tensor store."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def manifest_section(self) -> Dict[str, Any]:
+        """Return the ``tensor_store`` section for the frames manifest."""
+        return {
+            "path": str(self.path),
+            "dtype": "uint8",
+            "layout": "HWC",
+            "entries": self.entries,
+        }
+
+
+class FrameImageWriter:
+    """
+    Encode and write frame and crop JPEGs on a small thread pool.
+
+    Images are queued in batches of ``batch_size`` and each batch is written by
+    one worker, so extraction keeps decoding while earlier frames are encoded.
+    At most two batches per worker are in flight; ``save`` blocks beyond that,
+    which bounds the images held in memory. With ``workers=0`` images are
+    written inline.
+
+    Args:
+        workers: Writer threads (defaults to ``FRAME_WRITE_WORKERS``)
+        batch_size: Images per write task
+        quality: JPEG quality
+    """
+
+    def __init__(self, workers: int = None, batch_size: int = 16, quality: int = 90):
+        workers = settings.FRAME_WRITE_WORKERS if workers is None else workers
+        self.workers = max(0, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.quality = quality
+        self.written = 0
+        self._batch: List[Tuple[Image.Image, pathlib.Path]] = []
+        self._in_flight: Deque[Future] = deque()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="frame-writer") if self.workers else None
+        )
+
+    def _write_batch(self, batch: List[Tuple[Image.Image, pathlib.Path]]) -> int:
+        for image, path in batch:
+            image.save(path, quality=self.quality, optimize=True)
+        return len(batch)
+
+    def save(self, image: Image.Image, path: str | pathlib.Path) -> str:
+        """Queue ``image`` to be written as a JPEG at ``path`` and return the path as a string."""
+        path = pathlib.Path(path)
+        if self._executor is None:
+            self.written += self._write_batch([(image, path)])
+            return str(path)
+
+        self._batch.append((image, path))
+        if len(self._batch) >= self.batch_size:
+            self._submit()
+        return str(path)
+
+    def _submit(self) -> None:
+        while len(self._in_flight) >= 2 * self.workers:
+            self.written += self._in_flight.popleft().result()
+        self._in_flight.append(self._executor.submit(self._write_batch, self._batch))
+        self._batch = []
+
+    def close(self) -> None:
+        """Write the remaining images and wait for all batches; re-raises the first write error."""
+        if self._executor is None:
+            return
+        try:
+            if self._batch:
+                self._submit()
+            while self._in_flight:
+                self.written += self._in_flight.popleft().result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def abort(self) -> None:
+        """Drop queued images and stop the workers without waiting for batches in flight."""
+        self._batch = []
+        self._in_flight.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -11,7 +11,7 @@ Classes:
 - FrameInfo: Named tuple for frame information
 
 Functions:
-- create_frames_manifest(): Create JSON manifest for extracted frames
+- create_frames_manifest(): Create JSON manifest for extracted frames (image files or tensor store)
 - create_enhanced_frame_metadata(): Create enhanced metadata for a single frame
 - store_enhanced_video_metadata(): Store enhanced video metadata with frame processing
 - extract_enhanced_video_metadata(): Generate enhanced metadata for video processing
@@ -48,7 +48,12 @@ from .common_utils import FrameInfo
 # Frame extraction data structures are now in common_utils.py to avoid circular imports
 
 
-def create_frames_manifest(frame_info_list: List[FrameInfo], temp_dir: str, video_path: str = None) -> str:
+def create_frames_manifest(
+    frame_info_list: List[FrameInfo],
+    temp_dir: str,
+    video_path: str = None,
+    tensor_store: Optional[dict] = None,
+) -> str:
     """
     Create a JSON manifest file for the extracted frames.
     This manifest will be used by the embedding service for batch processing.
@@ -57,6 +62,8 @@ def create_frames_manifest(frame_info_list: List[FrameInfo], temp_dir: str, vide
         frame_info_list: List of frame information
         temp_dir: Directory to save the manifest
         video_path: Path to the video file (for batch processing)
+        tensor_store: Optional ``tensor_store`` section (see FrameTensorWriter) when frames
+            were packed into a memory-mapped tensor file instead of individual images
         
     Returns:
         Path to the created manifest file
@@ -81,6 +88,10 @@ def create_frames_manifest(frame_info_list: List[FrameInfo], temp_dir: str, vide
                 frame_dict["crop_bbox"] = list(frame_info.crop_bbox)
             if frame_info.detected_label is not None:
                 frame_dict["detected_label"] = frame_info.detected_label
+            if frame_info.tensor_index is not None:
+                frame_dict["tensor_index"] = frame_info.tensor_index
+                if frame_info.frame_type == "detected_crop" and frame_info.crop_bbox is not None:
+                    frame_dict["tensor_bbox"] = [int(round(v)) for v in frame_info.crop_bbox]
             
             frames_data.append(frame_dict)
         
@@ -151,6 +162,8 @@ def create_frames_manifest(frame_info_list: List[FrameInfo], temp_dir: str, vide
                 "total_frames": len(frames_data),
                 "extraction_timestamp": datetime.datetime.now().isoformat()
             }
+            if tensor_store:
+                manifest["tensor_store"] = tensor_store
         
         # Save manifest file
         manifest_path = pathlib.Path(temp_dir) / "frames_manifest.json"
@@ -9,6 +9,7 @@ Supports both SDK mode (direct integration) and API mode (HTTP-based) processing
 
 Functions:
 - get_video_from_minio(): Download video from MinIO storage
+- download_video_from_minio(): Download video from MinIO straight into a local file (parallel ranged reads)
 - get_video_fps_and_frames(): Get video frame rate and total frame count
 - process_video_with_frame_extraction(): Extract frames from video with optional object detection
 - process_video_with_enhanced_detection(): Enhanced video processing with object detection
@@ -28,14 +29,15 @@ import pathlib
 from typing import List, Optional, Tuple
 
 import cv2
+import numpy as np
 import torch
 from decord import VideoReader, cpu
 from torchvision.transforms import ToPILImage
 
-from src.common import DataPrepException, Strings, logger
+from src.common import DataPrepException, Strings, logger, settings
 from .common_utils import get_minio_client, FrameInfo
 from .config_utils import get_config
-from .file_utils import create_temp_directory
+from .file_utils import FrameImageWriter, FrameTensorWriter, create_temp_directory
 
 # Initialize torchvision transform
 toPIL = ToPILImage()
@@ -91,6 +93,50 @@ def get_video_from_minio(
         raise DataPrepException(status_code=500, msg=Strings.minio_error)
 
 
+def download_video_from_minio(
+    bucket_name: str, video_id: str, video_name: Optional[str], dest_dir: pathlib.Path
+) -> pathlib.Path:
+    """Download a video from Minio storage into a local directory.
+
+    The object is fetched with concurrent ranged reads written directly to the
+    destination file, without holding the whole video in memory.
+
+    Args:
+        bucket_name (str): The bucket containing the video
+        video_id (str): The directory (video_id) containing the video
+        video_name (Optional[str]): Specific video filename. If None, first video found is used.
+        dest_dir (pathlib.Path): Directory to save the video in
+
+    Returns:
+        pathlib.Path: Path of the downloaded video file
+
+    Raises:
+        DataPrepException: If video not found or other Minio error occurs
+    """
+    try:
+        minio_client = get_minio_client()
+
+        if video_name:
+            object_name = f"{video_id}/{video_name}"
+        else:
+            object_name = minio_client.get_video_in_directory(bucket_name, video_id)
+
+        if not object_name:
+            logger.error(f"No video found in directory {video_id}")
+            raise DataPrepException(status_code=404, msg=Strings.video_id_not_found)
+
+        video_path = pathlib.Path(dest_dir) / pathlib.Path(object_name).name
+        size = minio_client.download_to_file(bucket_name, object_name, video_path)
+        logger.debug(f"Downloaded {size} bytes of {object_name} to {video_path}")
+
+        return video_path
+    except DataPrepException as ex:
+        raise ex
+    except Exception as ex:
+        logger.error(f"Error downloading video from Minio: {ex}")
+        raise DataPrepException(status_code=500, msg=Strings.minio_error)
+
+
 def get_video_fps_and_frames(video_local_path: pathlib.Path) -> tuple[float, int]:
     """
     Open the video file and get fps and total frames in video
@@ -139,6 +185,8 @@ def process_video_with_frame_extraction(
     Raises:
         Exception: If video processing fails
     """
+    image_writer = None
+    tensor_writer = None
     try:
         # Get config defaults if parameters not provided
         config = get_config()
@@ -173,6 +221,11 @@ def process_video_with_frame_extraction(
         # Extract all frames first for batch processing optimization
         extracted_frames = []
         frame_metadata = []
+
+        # Optionally pack frames into one memory-mapped tensor file instead of per-frame JPEGs
+        tensor_writer = FrameTensorWriter(temp_dir) if settings.FRAMES_TENSOR_STORE else None
+        # Frame and crop JPEGs are encoded and written in background batches
+        image_writer = FrameImageWriter() if tensor_writer is None else None
         
         logger.info(f"Extracting {len(frame_indices)} frames for processing...")
         for i, frame_idx in enumerate(frame_indices):
@@ -219,10 +272,16 @@ def process_video_with_frame_extraction(
                 logger.error(f"Frame tensor type: {type(frame_tensor)}, shape: {getattr(frame_tensor, 'shape', 'unknown')}")
                 continue
             
-            # Save full frame
-            full_frame_filename = f"frame_{frame_idx:06d}.jpg"
-            full_frame_path = pathlib.Path(temp_dir) / full_frame_filename
-            frame_pil.save(full_frame_path, quality=90, optimize=True)
+            if tensor_writer is not None:
+                # Pack the decoded frame; the embedding service maps it without JPEG decode
+                tensor_index = tensor_writer.append(np.asarray(frame_pil))
+                full_frame_filename = None
+                full_frame_path = None
+            else:
+                # Save full frame
+                tensor_index = None
+                full_frame_filename = f"frame_{frame_idx:06d}.jpg"
+                full_frame_path = image_writer.save(frame_pil, pathlib.Path(temp_dir) / full_frame_filename)
             
             # Store frame for batch processing
             extracted_frames.append(frame_pil)
@@ -230,9 +289,12 @@ def process_video_with_frame_extraction(
                 'frame_idx': frame_idx,
                 'timestamp': timestamp,
                 'full_frame_path': full_frame_path,
-                'full_frame_filename': full_frame_filename
+                'full_frame_filename': full_frame_filename,
+                'tensor_index': tensor_index,
             })
         
+        if tensor_writer is not None:
+            tensor_writer.close()
         logger.info(f"Successfully extracted {len(extracted_frames)} frames")
         
         # Process object detection in optimized batches
@@ -254,6 +316,7 @@ def process_video_with_frame_extraction(
                         frame_idx = meta['frame_idx']
                         timestamp = meta['timestamp']
                         full_frame_path = meta['full_frame_path']
+                        tensor_index = meta['tensor_index']
                         
                         try:
                             # Get detected crops
@@ -266,27 +329,31 @@ def process_video_with_frame_extraction(
                             full_frame_info = FrameInfo(
                                 frame_number=frame_idx,
                                 timestamp=timestamp,
-                                image_path=str(full_frame_path),
-                                frame_type="full_frame"
+                                image_path=full_frame_path,
+                                frame_type="full_frame",
+                                tensor_index=tensor_index
                             )
                             frame_info_list.append(full_frame_info)
                             
                             # Additionally add detected crops if any
                             if len(crops) > 0:
                                 for j, (crop, det_meta) in enumerate(zip(crops, detection_metadata)):
-                                    crop_filename = f"frame_{frame_idx:06d}_crop_{j:03d}.jpg"
-                                    crop_path = pathlib.Path(temp_dir) / crop_filename
-                                    crop.save(crop_path, quality=90, optimize=True)
+                                    crop_path = None
+                                    if tensor_index is None:
+                                        crop_filename = f"frame_{frame_idx:06d}_crop_{j:03d}.jpg"
+                                        crop_path = image_writer.save(crop, pathlib.Path(temp_dir) / crop_filename)
                                     
+                                    # With a tensor store, crops are regions of the parent frame
                                     crop_info = FrameInfo(
                                         frame_number=frame_idx,
                                         timestamp=timestamp,
-                                        image_path=str(crop_path),
+                                        image_path=crop_path,
                                         frame_type="detected_crop",
                                         crop_index=j,
                                         detection_confidence=det_meta['confidence'],
                                         crop_bbox=tuple(det_meta['bbox']),
-                                        detected_label=det_meta.get('class_name')
+                                        detected_label=det_meta.get('class_name'),
+                                        tensor_index=tensor_index
                                     )
                                     frame_info_list.append(crop_info)
                                 
@@ -296,8 +363,9 @@ def process_video_with_frame_extraction(
                             frame_info = FrameInfo(
                                 frame_number=frame_idx,
                                 timestamp=timestamp,
-                                image_path=str(full_frame_path),
-                                frame_type="full_frame"
+                                image_path=full_frame_path,
+                                frame_type="full_frame",
+                                tensor_index=tensor_index
                             )
                             frame_info_list.append(frame_info)
                             
@@ -308,8 +376,9 @@ def process_video_with_frame_extraction(
                         frame_info = FrameInfo(
                             frame_number=meta['frame_idx'],
                             timestamp=meta['timestamp'],
-                            image_path=str(meta['full_frame_path']),
-                            frame_type="full_frame"
+                            image_path=meta['full_frame_path'],
+                            frame_type="full_frame",
+                            tensor_index=meta['tensor_index']
                         )
                         frame_info_list.append(frame_info)
         else:
@@ -319,20 +388,33 @@ def process_video_with_frame_extraction(
                 frame_info = FrameInfo(
                     frame_number=meta['frame_idx'],
                     timestamp=meta['timestamp'],
-                    image_path=str(meta['full_frame_path']),
-                    frame_type="full_frame"
+                    image_path=meta['full_frame_path'],
+                    frame_type="full_frame",
+                    tensor_index=meta['tensor_index']
                 )
                 frame_info_list.append(frame_info)
             
+        if image_writer is not None:
+            image_writer.close()
+            logger.debug(f"Wrote {image_writer.written} frame/crop images")
+
         # Create frames manifest - import locally to avoid circular imports
         from .metadata_utils import create_frames_manifest
-        manifest_path = create_frames_manifest(frame_info_list, temp_dir)
+        manifest_path = create_frames_manifest(
+            frame_info_list,
+            temp_dir,
+            tensor_store=tensor_writer.manifest_section() if tensor_writer is not None else None,
+        )
         
         logger.info(f"Frame extraction complete: {len(frame_info_list)} frames extracted")
         return frame_info_list, manifest_path
         
     except Exception as e:
         logger.error(f"Error in frame extraction: {e}")
+        if image_writer is not None:
+            image_writer.abort()
+        if tensor_writer is not None:
+            tensor_writer.abort()
         raise Exception(f"Failed to extract frames from video: {e}")
 
 
@@ -13,7 +13,7 @@ from src.common import DataPrepException, Strings, logger, settings
 from src.common.schema import DataPrepResponse, VideoRequest
 from src.core.embedding import generate_video_embedding
 from src.core.utils.common_utils import get_minio_client
-from src.core.utils.video_utils import get_video_from_minio
+from src.core.utils.video_utils import download_video_from_minio
 from src.core.utils.config_utils import get_config, read_config
 from src.core.validation import sanitize_model
 
@@ -175,15 +175,9 @@ async def process_minio_video(
             logger.info(
                 f"Retrieving video from Minio at bucket: {bucket_name}, video_id: {video_id}"
             )
-            video_data, filename = get_video_from_minio(bucket_name, video_id, video_name)
-
-            # Save video to temporary location for processing
-            temp_video_path = videos_temp_dir / filename
-            with open(temp_video_path, "wb") as f:
-                f.write(video_data.read())
-
-            # Reset video_data for potential reuse
-            video_data.seek(0)
+            # Parts are fetched in parallel and written straight to the temporary file
+            temp_video_path = download_video_from_minio(bucket_name, video_id, video_name, videos_temp_dir)
+            filename = temp_video_path.name
 
             logger.info(f"Retrieved video {filename} from {bucket_name}/{video_id}")
 
@@ -0,0 +1,118 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+
+import numpy as np
+import openvino as ov
+import openvino.opset13 as ops
+import pytest
+
+from src.core.object_detection import BatchDetectionEngine, YOLOXDetector
+from src.core.object_detection.yolox_utils import (
+    demo_postprocess,
+    multiclass_nms,
+    postprocess_batch,
+    preproc,
+    preproc_batch,
+)
+
+_INPUT = 64
+# Anchors of a 64x64 YOLOX head: (8x8 + 4x4 + 2x2) grid cells
+_ANCHORS = 84
+
+
+@pytest.fixture
+def tiny_detector(tmp_path):
+    """YOLOXDetector over a constant-output model: two overlapping boxes on the first grid cells."""
+    raw = np.zeros((1, _ANCHORS, 85), dtype=np.float32)
+    raw[0, 0, :5] = [1, 1, np.log(2), np.log(2), 1]
+    raw[0, 0, 5] = 0.9
+    raw[0, 1, :5] = [0, 1, np.log(2), np.log(2), 1]
+    raw[0, 1, 5] = 0.8
+    images = ops.parameter([1, 3, _INPUT, _INPUT], np.float32, name="images")
+    mean = ops.reshape(ops.reduce_mean(images, ops.constant(np.array([1, 2, 3])), keep_dims=True), [-1, 1, 1], False)
+    output = ops.add(ops.multiply(mean, ops.constant(np.float32(0))), ops.constant(raw))
+    ov.save_model(ov.Model([output], [images], "tiny"), str(tmp_path / "tiny.xml"))
+
+    config = {
+        "object_detection": {
+            "model_dir": str(tmp_path),
+            "model_name": "tiny",
+            "input_size": [_INPUT, _INPUT],
+            "confidence_threshold": 0.5,
+        }
+    }
+    return YOLOXDetector(config)
+
+
+def test_preproc_batch_matches_single_image_letterbox():
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 255, shape, dtype=np.uint8) for shape in [(48, 85, 3), (72, 40, 3)]]
+
+    batch, ratios = preproc_batch(images, (_INPUT, _INPUT))
+
+    for image, padded, ratio in zip(images, batch, ratios):
+        expected, expected_ratio = preproc(image, (_INPUT, _INPUT))
+        np.testing.assert_array_equal(padded.transpose(2, 0, 1)[None].astype(np.float32), expected)
+        assert ratio == pytest.approx(expected_ratio)
+
+
+def test_postprocess_batch_matches_per_image_nms():
+    rng = np.random.default_rng(1)
+    outputs = rng.uniform(-1, 1, (3, _ANCHORS, 85)).astype(np.float32)
+    outputs[..., 4:] = rng.uniform(0, 1, (3, _ANCHORS, 81))
+    ratios = np.array([1.0, 0.5, 0.25])
+
+    batched = postprocess_batch(outputs.copy(), ratios, (_INPUT, _INPUT), nms_thr=0.45, score_thr=0.6)
+
+    for i in range(3):
+        predictions = demo_postprocess(outputs[i : i + 1].copy(), (_INPUT, _INPUT))[0]
+        boxes = np.empty_like(predictions[:, :4])
+        boxes[:, :2] = predictions[:, :2] - predictions[:, 2:4] / 2.0
+        boxes[:, 2:] = predictions[:, :2] + predictions[:, 2:4] / 2.0
+        boxes /= ratios[i]
+        expected = multiclass_nms(boxes, predictions[:, 4:5] * predictions[:, 5:], nms_thr=0.45, score_thr=0.6)
+        np.testing.assert_allclose(batched[i], expected, rtol=1e-5)
+
+
+def test_engine_batches_frames_from_concurrent_callers(tiny_detector):
+    engine = BatchDetectionEngine(tiny_detector, batch_size=4, max_wait=0.05)
+    results = {}
+
+    def worker(index):
+        frames = [np.full((2 * _INPUT, 2 * _INPUT, 3), index, dtype=np.uint8)] * 3
+        results[index] = engine.detect_many(frames, timeout=30)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.close()
+
+    assert engine.request_batch == 4
+    assert engine.num_requests >= 1
+    for frames in results.values():
+        for detections in frames:
+            # The lower-scored overlapping box is suppressed; boxes are scaled back to the frame size
+            assert [(d["bbox"], d["class_name"]) for d in detections] == [([0, 0, 32, 32], "person")]
+    stats = engine.stats()
+    assert stats["frames"] == stats["inferred"] == 12
+    assert stats["batches"] < 12
+
+
+def test_engine_reuses_detections_for_near_duplicate_frames(tiny_detector):
+    engine = BatchDetectionEngine(tiny_detector, batch_size=2, skip_similar_frames=True, frame_diff_threshold=3.0)
+    frames = [np.full((_INPUT, _INPUT, 3), value, dtype=np.uint8) for value in (10, 11, 12, 80, 81)]
+
+    results = engine.detect_many(frames, stream="video-1", timeout=30)
+    other_stream = engine.detect(frames[0], stream="video-2")
+    engine.close()
+
+    assert all(len(detections) == 1 for detections in results)
+    assert other_stream == results[0]
+    stats = engine.stats()
+    # 11 and 12 reuse the detections of 10; 81 reuses those of 80; video-2 has no reference yet
+    assert stats["skipped"] == 3
+    assert stats["inferred"] == 3
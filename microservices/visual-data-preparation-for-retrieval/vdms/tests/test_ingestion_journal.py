@@ -0,0 +1,91 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from src.core.embedding.ingestion_journal import IngestionJournal, content_hash, file_content_hash, params_hash
+
+_PARAMS = params_hash({"frame_interval": 15, "enable_object_detection": True})
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = IngestionJournal(tmp_path / "journal.db")
+    yield journal
+    journal.close()
+
+
+def _ingest(progress, frames, crops=0, fail_frame=None):
+    """Report every frame as expanded and stored, except ``fail_frame``'s last descriptor."""
+    for frame in frames:
+        progress.frame_expanded(frame, 1 + crops)
+        metadatas = [{"frame_number": frame}] + [{"frame_number": frame, "crop_index": i} for i in range(crops)]
+        if frame == fail_frame:
+            metadatas = metadatas[:-1]
+        ids = [progress.descriptor_id(frame, metadata.get("crop_index")) for metadata in metadatas]
+        progress.items_stored(metadatas, ids)
+
+
+def test_interrupted_ingestion_resumes_after_last_committed_range(journal):
+    digest = content_hash(b"video-bytes")
+    ranges = [[0, 15, 30], [45, 60, 75], [90, 105]]
+
+    progress = journal.begin("bucket/video/a.mp4", digest, _PARAMS)
+    assert progress.status == "new"
+    assert progress.plan(ranges) == [0, 15, 30, 45, 60, 75, 90, 105]
+    # The second range loses a crop descriptor, the third is never reached
+    _ingest(progress, [0, 15, 30, 45, 60, 75], crops=1, fail_frame=60)
+    assert progress.ranges_committed == 1
+    assert progress.finish() is False
+
+    progress = journal.begin("bucket/video/a.mp4", digest, _PARAMS)
+    assert progress.status == "resume" and progress.resumed
+    assert progress.plan(ranges) == [45, 60, 75, 90, 105]
+    assert len(progress.committed_ids()) == 6
+    _ingest(progress, [45, 60, 75, 90, 105], crops=1)
+    assert progress.finish() is True
+
+    progress = journal.begin("bucket/video/a.mp4", digest, _PARAMS)
+    assert progress.status == "complete"
+    assert progress.plan(ranges) == []
+    ids = progress.committed_ids()
+    assert len(ids) == len(set(ids)) == 16
+    assert ids[:2] == [progress.descriptor_id(0), progress.descriptor_id(0, 0)]
+
+
+def test_changed_content_or_parameters_start_over(journal):
+    progress = journal.begin("bucket/video/a.mp4", content_hash(b"v1"), _PARAMS)
+    progress.plan([[0, 15]])
+    _ingest(progress, [0, 15])
+    assert progress.finish() is True
+    first_id = progress.descriptor_id(0)
+
+    progress = journal.begin("bucket/video/a.mp4", content_hash(b"v2"), _PARAMS)
+    assert progress.status == "new"
+    assert progress.committed_ids() == []
+    assert progress.plan([[0, 15]]) == [0, 15]
+    assert progress.descriptor_id(0) != first_id
+
+    other_params = params_hash({"frame_interval": 30, "enable_object_detection": True})
+    assert journal.begin("bucket/video/a.mp4", content_hash(b"v2"), other_params).status == "new"
+
+
+def test_reset_forgets_video(journal):
+    digest = content_hash(b"video")
+    progress = journal.begin("key", digest, _PARAMS)
+    progress.plan([[0]])
+    _ingest(progress, [0])
+    progress.finish()
+
+    journal.reset("key")
+    progress = journal.begin("key", digest, _PARAMS)
+    assert progress.status == "new"
+    assert progress.plan([[0]]) == [0]
+
+
+def test_file_content_hash_matches_content_hash(tmp_path):
+    data = bytes(range(256)) * 5000
+    path = tmp_path / "video.mp4"
+    path.write_bytes(data)
+
+    assert file_content_hash(str(path), chunk_size=4096) == content_hash(data)
@@ -0,0 +1,94 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.core.minio_transfer import MinioTransferEngine, split_parts
+from src.core.utils.file_utils import FrameImageWriter
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+    def stream(self, amt):
+        for start in range(0, len(self.data), amt):
+            yield self.data[start:start + amt]
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class _FakeMinio:
+    """In-memory stand-in for the object calls the transfer engine makes."""
+
+    def __init__(self, objects, fail_offset=None):
+        self.objects = objects
+        self.fail_offset = fail_offset
+        self.ranges = []
+        self.headers = []
+        self._lock = threading.Lock()
+
+    def stat_object(self, bucket_name, object_name):
+        return SimpleNamespace(size=len(self.objects[object_name]), etag="abc123")
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0, request_headers=None):
+        with self._lock:
+            self.ranges.append((offset, length))
+            self.headers.append(request_headers)
+        if offset == self.fail_offset:
+            raise IOError("connection reset")
+        return _Response(self.objects[object_name][offset:offset + length])
+
+
+def test_split_parts_covers_object():
+    assert split_parts(10, 4) == [(0, 4), (4, 4), (8, 2)]
+    assert split_parts(8, 4) == [(0, 4), (4, 4)]
+    assert split_parts(0, 4) == []
+
+
+def test_download_to_file_fetches_ranges_in_parallel(tmp_path):
+    data = os.urandom(1000)
+    client = _FakeMinio({"video/a.mp4": data})
+    engine = MinioTransferEngine(client, max_workers=4)
+    engine.part_size = 128
+
+    size = engine.download_to_file("bucket", "video/a.mp4", tmp_path / "a.mp4")
+    engine.close()
+
+    assert size == 1000
+    assert (tmp_path / "a.mp4").read_bytes() == data
+    assert sorted(client.ranges) == split_parts(1000, 128)
+    # Every part is pinned to the ETag returned by the initial stat
+    assert all(headers == {"If-Match": '"abc123"'} for headers in client.headers)
+    assert engine.stats()["parts"] == 8
+
+
+def test_download_to_file_removes_partial_file_on_failure(tmp_path):
+    client = _FakeMinio({"video/a.mp4": os.urandom(1000)}, fail_offset=512)
+    engine = MinioTransferEngine(client, max_workers=4)
+    engine.part_size = 128
+
+    with pytest.raises(IOError):
+        engine.download_to_file("bucket", "video/a.mp4", tmp_path / "a.mp4")
+    engine.close()
+
+    assert not (tmp_path / "a.mp4").exists()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_frame_image_writer_writes_every_image(tmp_path, workers):
+    writer = FrameImageWriter(workers=workers, batch_size=3)
+    paths = [writer.save(Image.new("RGB", (8, 8), (i, 0, 0)), tmp_path / f"frame_{i}.jpg") for i in range(10)]
+    writer.close()
+
+    assert writer.written == 10
+    assert all(os.path.getsize(path) > 0 for path in paths)
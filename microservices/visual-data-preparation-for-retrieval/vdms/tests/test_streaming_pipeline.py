@@ -0,0 +1,87 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+
+import pytest
+
+from src.core.embedding.streaming_pipeline import PipelineStage, StreamingPipeline
+
+
+def test_pipeline_streams_items_through_stages():
+    """Items flow through every stage, batched where requested, with per-stage counters."""
+    batches = []
+
+    def embed(batch):
+        batches.append(len(batch))
+        return [item * 10 for item in batch]
+
+    pipeline = StreamingPipeline(
+        "decode",
+        [
+            PipelineStage("expand", lambda item: [item, item + 100], workers=2, queue_depth=2),
+            PipelineStage("embed", embed, queue_depth=8, batch_size=4),
+        ],
+    )
+    results = pipeline.run(range(10))
+
+    assert sorted(results) == sorted([i * 10 for i in range(10)] + [(i + 100) * 10 for i in range(10)])
+    assert max(batches) <= 4
+    stats = pipeline.stats()
+    assert list(stats) == ["decode", "expand", "embed"]
+    assert stats["decode"]["items_out"] == 10
+    assert stats["expand"]["items_in"] == 10
+    assert stats["expand"]["items_out"] == 20
+    assert stats["embed"]["items_in"] == 20
+    assert stats["embed"]["max_queue_depth"] <= stats["embed"]["queue_capacity"]
+
+
+def test_pipeline_applies_back_pressure_to_source():
+    """A slow stage bounds how far the source can run ahead."""
+    in_flight = []
+    produced = 0
+    consumed = 0
+    lock = threading.Lock()
+
+    def source():
+        nonlocal produced
+        for item in range(50):
+            with lock:
+                produced += 1
+                in_flight.append(produced - consumed)
+            yield item
+
+    def slow(item):
+        nonlocal consumed
+        time.sleep(0.002)
+        with lock:
+            consumed += 1
+        return [item]
+
+    pipeline = StreamingPipeline("decode", [PipelineStage("slow", slow, queue_depth=3)])
+    assert len(pipeline.run(source())) == 50
+    # queue capacity + item being processed + item blocked on put
+    assert max(in_flight) <= 5
+    assert pipeline.stats()["decode"]["blocked_s"] > 0
+
+
+def test_pipeline_continues_after_stage_errors_and_raises_source_errors():
+    """Handler failures are counted and skipped; a failing source aborts the run."""
+
+    def flaky(item):
+        if item == 3:
+            raise RuntimeError("bad frame")
+        return [item]
+
+    pipeline = StreamingPipeline("decode", [PipelineStage("flaky", flaky, workers=2)])
+    assert sorted(pipeline.run(range(6))) == [0, 1, 2, 4, 5]
+    assert pipeline.stats()["flaky"]["errors"] == 1
+
+    def broken_source():
+        yield 1
+        raise ValueError("decode failed")
+
+    pipeline = StreamingPipeline("decode", [PipelineStage("flaky", flaky)])
+    with pytest.raises(ValueError, match="decode failed"):
+        pipeline.run(broken_source())
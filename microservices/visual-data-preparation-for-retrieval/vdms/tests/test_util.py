@@ -1,11 +1,16 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import json
+
 import cv2
+import numpy as np
 import pytest
 
-from src.core.utils.common_utils import sanitize_input
-from src.core.utils.video_utils import get_video_fps_and_frames
+from src.core.utils.common_utils import FrameInfo, sanitize_input
+from src.core.utils.file_utils import FrameTensorWriter
+from src.core.utils.metadata_utils import create_frames_manifest
+from src.core.utils.video_utils import get_video_fps_and_frames, process_video_with_frame_extraction
 from src.core.utils.metadata_utils import extract_enhanced_video_metadata
 
 
@@ -58,6 +63,72 @@ def test_get_video_fps_and_frames_exception(mocker, tmp_path):
     cv2.VideoCapture.assert_called_once_with(tmp_path)
 
 
+def test_frames_tensor_store_manifest(tmp_path):
+    """
+    Test that packed frames are described by a tensor_store manifest section and
+    crops reference their parent frame region instead of separate files.
+    """
+    writer = FrameTensorWriter(str(tmp_path))
+    frame_a = np.full((4, 6, 3), 10, dtype=np.uint8)
+    frame_b = np.full((4, 6, 3), 200, dtype=np.uint8)
+    assert writer.append(frame_a) == 0
+    assert writer.append(frame_b) == 1
+    writer.close()
+
+    frame_info_list = [
+        FrameInfo(0, 0.0, None, "full_frame", tensor_index=0),
+        FrameInfo(15, 0.5, None, "full_frame", tensor_index=1),
+        FrameInfo(15, 0.5, None, "detected_crop", crop_index=0, detection_confidence=0.9,
+                  crop_bbox=(1.2, 0.0, 4.0, 3.0), tensor_index=1),
+    ]
+    manifest_path = create_frames_manifest(
+        frame_info_list, str(tmp_path), tensor_store=writer.manifest_section()
+    )
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    store = manifest["tensor_store"]
+    assert store["entries"] == [[0, 4, 6, 3], [72, 4, 6, 3]]
+    packed = np.fromfile(store["path"], dtype=np.uint8)
+    offset, height, width, channels = store["entries"][1]
+    np.testing.assert_array_equal(
+        packed[offset:offset + height * width * channels].reshape(height, width, channels), frame_b
+    )
+    assert [f["tensor_index"] for f in manifest["frames"]] == [0, 1, 1]
+    assert manifest["frames"][2]["tensor_bbox"] == [1, 0, 4, 3]
+    assert "tensor_bbox" not in manifest["frames"][1]
+
+
+def test_frame_extraction_failure_removes_tensor_store(mocker, tmp_path):
+    """
+    Test that a failure while packing frames closes the tensor store and removes
+    the partially written file.
+    """
+    mocker.patch("src.core.utils.video_utils.settings.FRAMES_TENSOR_STORE", True)
+    reader = mocker.patch("src.core.utils.video_utils.VideoReader").return_value
+    reader.get_avg_fps.return_value = 30.0
+    reader.__len__.return_value = 30
+    reader.next.side_effect = lambda: np.zeros((4, 6, 3), dtype=np.uint8)
+    writers = []
+    append = FrameTensorWriter.append
+
+    def failing_append(writer, frame):
+        writers.append(writer)
+        if len(writers) > 1:
+            raise OSError("No space left on device")
+        return append(writer, frame)
+
+    mocker.patch.object(FrameTensorWriter, "append", autospec=True, side_effect=failing_append)
+
+    with pytest.raises(Exception, match="No space left on device"):
+        process_video_with_frame_extraction(
+            "video.mp4", frame_interval=15, enable_object_detection=False, temp_dir=str(tmp_path)
+        )
+
+    assert writers[0]._file.closed
+    assert not writers[0].path.exists()
+
+
 def test_calculate_intervals():
     """
     Test whether calculate_intervals can return proper valid values.
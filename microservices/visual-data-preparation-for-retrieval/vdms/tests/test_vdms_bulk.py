@@ -0,0 +1,149 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import socketserver
+import struct
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from vdms import queryMessage_pb2
+
+from src.core.embedding.vdms_bulk import VDMSBulkWriter
+
+_HEADER = struct.Struct("@I")
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def _recv_exact(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def handle(self):
+        server = self.server
+        while True:
+            header = self._recv_exact(_HEADER.size)
+            if header is None:
+                return
+            message = queryMessage_pb2.queryMessage()
+            message.ParseFromString(self._recv_exact(_HEADER.unpack(header)[0]))
+            queries = json.loads(message.json)
+            if any("FindDescriptor" in query for query in queries):
+                server.lookups.append(len(queries))
+            responses = []
+            for query in queries:
+                (command, body), = query.items()
+                if command == "AddDescriptor":
+                    props = body.get("batch_properties") or [body["properties"]]
+                    server.transactions.append(len(props))
+                    if any(prop.get("bad") for prop in props):
+                        responses.append({command: {"status": -1}})
+                        continue
+                    server.stored.extend(prop["langchain_id"] for prop in props)
+                    if server.drop_after is not None and len(server.stored) >= server.drop_after:
+                        # Store the transaction but lose the connection before acknowledging it
+                        server.drop_after = None
+                        return
+                    responses.append({command: {"status": 0}})
+                elif command == "FindDescriptor":
+                    descriptor_id = body["constraints"]["langchain_id"][1]
+                    entities = [{"langchain_id": descriptor_id}] if descriptor_id in server.stored else []
+                    responses.append({command: {"status": 0, "returned": len(entities), "entities": entities}})
+            reply = queryMessage_pb2.queryMessage()
+            reply.json = json.dumps(responses)
+            data = reply.SerializeToString()
+            self.request.sendall(_HEADER.pack(len(data)) + data)
+
+
+@pytest.fixture
+def fake_vdms():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.stored = []
+    server.transactions = []
+    server.lookups = []
+    server.drop_after = None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _writer(server, **kwargs):
+    store = MagicMock(collection_name="test", embedding_dimension=4, collection_properties=["content"])
+    host, port = server.server_address
+    return VDMSBulkWriter(store, host, port, **kwargs), store
+
+
+def _records(count):
+    embeddings = np.ones((count, 4), dtype=np.float32)
+    texts = [f"frame_{i}" for i in range(count)]
+    metadatas = [{"frame_number": i} for i in range(count)]
+    return embeddings, texts, metadatas
+
+
+def test_bulk_writer_packs_descriptors_into_large_transactions(fake_vdms):
+    writer, store = _writer(fake_vdms, transaction_size=100, pipeline_depth=3)
+    result = writer.add(*_records(250))
+
+    assert len(result["ids"]) == 250
+    assert result["failed_ids"] == []
+    assert fake_vdms.transactions == [100, 100, 50]
+    assert fake_vdms.stored == result["ids"]
+    assert "frame_number" in store.collection_properties
+    store.push_update_properties.assert_called_once_with("test")
+
+
+def test_bulk_writer_isolates_rejected_descriptors(fake_vdms):
+    writer, _ = _writer(fake_vdms, transaction_size=8, max_retries=1)
+    embeddings, texts, metadatas = _records(8)
+    metadatas[5]["bad"] = True
+
+    result = writer.add(embeddings, texts, metadatas, ids=[f"id-{i}" for i in range(8)])
+
+    assert result["failed_ids"] == ["id-5"]
+    assert result["ids"] == [f"id-{i}" for i in range(8) if i != 5]
+    assert sorted(fake_vdms.stored) == sorted(result["ids"])
+
+
+def test_bulk_writer_does_not_duplicate_after_reconnect(fake_vdms):
+    fake_vdms.drop_after = 10
+    writer, _ = _writer(fake_vdms, transaction_size=10, pipeline_depth=1)
+
+    result = writer.add(*_records(30))
+
+    assert len(result["ids"]) == 30
+    assert sorted(fake_vdms.stored) == sorted(result["ids"])
+
+
+def test_bulk_writer_checks_in_flight_descriptors_in_transaction_size_lookups(fake_vdms):
+    fake_vdms.drop_after = 5
+    writer, _ = _writer(fake_vdms, transaction_size=5, pipeline_depth=3)
+
+    result = writer.add(*_records(30))
+
+    assert len(result["ids"]) == 30
+    assert sorted(fake_vdms.stored) == sorted(result["ids"])
+    # Three transactions were in flight when the connection dropped
+    assert sum(fake_vdms.lookups) == 15
+    assert max(fake_vdms.lookups) == 5
+
+
+def test_bulk_writer_rejects_dimension_mismatch(fake_vdms):
+    writer, _ = _writer(fake_vdms)
+    with pytest.raises(ValueError):
+        writer.add(np.ones((2, 3), dtype=np.float32), ["a", "b"], [{}, {}])
+
+
+def test_bulk_writer_reports_existing_ids(fake_vdms):
+    writer, _ = _writer(fake_vdms, transaction_size=2)
+    writer.add(*_records(3), ids=["a", "b", "c"])
+
+    assert writer.existing_ids(["a", "x", "c", "y", "b"]) == {"a", "b", "c"}
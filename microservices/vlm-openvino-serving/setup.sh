@@ -40,7 +40,7 @@ export RENDER_GROUP_ID=$(getent group render | awk -F: '{printf "%s\n", $3}')
 export VLM_SERVICE_PORT=${VLM_SERVICE_PORT:-9764}
 export VLM_SEED=${VLM_SEED:-42}
 export VLM_LOG_LEVEL=${VLM_LOG_LEVEL:-info}
-export VLM_TELEMETRY_PATH=${VLM_TELEMETRY_PATH:-/opt/vlm_telemetry.jsonl}
+export VLM_TELEMETRY_PATH=${VLM_TELEMETRY_PATH:-/opt/vlm_telemetry.db}
 
 if [ -z "$VLM_TELEMETRY_MAX_RECORDS" ]; then
     export VLM_TELEMETRY_MAX_RECORDS=100
@@ -9,10 +9,9 @@ import time
 import uuid
 import warnings
 from contextlib import asynccontextmanager
-from multiprocessing import Manager
+from functools import partial
 from pathlib import Path
-from queue import Queue
-from threading import Thread
+from queue import Empty, Queue
 from typing import Any, Callable, List, Optional, Union
 from datetime import datetime, timezone
 
@@ -42,27 +41,45 @@ from src.utils.data_models import (
     TelemetryRequestMetadata,
     TelemetryRecord as TelemetryRecordModel,
 )
+from src.utils.image_cache import image_cache
 from src.utils.utils import (
+    close_http_session,
     convert_model,
     convert_qwen_image_inputs,
     convert_qwen_video_inputs,
     convert_frame_urls_to_video_tensors,
     extract_qwen_video_frames,
-    decode_and_save_video,
+    INLINE_VIDEO_URL,
+    InMemoryVideo,
+    decode_video_in_memory,
     get_best_video_backend,
     get_device_property,
     get_devices,
     is_model_ready,
     load_images,
     load_model_config,
+    load_qwen_image_tensors,
+    run_media_task,
+    sample_video_frames,
     model_supports_video,
     setup_seed,
     validate_video_inputs,
 )
+from src.utils.prefix_cache import (
+    PrefixCacheTracker,
+    build_scheduler_config,
+    media_digest,
+)
+from src.utils.scheduler import (
+    ContinuousBatchingAdapter,
+    DeadlineExceededError,
+    GenerationControl,
+    GenerationScheduler,
+    QueueFullError,
+    RequestCancelledError,
+)
 from src.utils.telemetry import build_usage_and_telemetry
 from src.utils.telemetry_store import telemetry_store
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import StreamingResponse
 from transformers import AutoProcessor, AutoTokenizer, TextIteratorStreamer
 
@@ -70,35 +87,99 @@ from transformers import AutoProcessor, AutoTokenizer, TextIteratorStreamer
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 
-manager = Manager()
-active_requests = manager.Value("i", 0)
-queued_requests = manager.Value("i", 0)
-request_lock = manager.Lock()
-
 QWEN_FALLBACK_VIDEO_FRAME_LIMIT = int(os.getenv("QWEN_VIDEO_FRAME_LIMIT", "12"))
 
 
 class QueueStreamer:
-    """Simple queue-backed streamer compatible with ov_genai pipelines."""
+    """Simple queue-backed streamer compatible with ov_genai pipelines.
 
-    def __init__(self):
+    Chunks are produced on a generation worker thread. When created inside the event loop the
+    streamer can also be consumed with ``async for`` so that waiting for the next token does
+    not block other requests' streams. Returning ``StreamingStatus.STOP`` from the callback
+    ends generation early once ``control`` reports a cancelled or expired request.
+    """
+
+    def __init__(self, control: Optional[GenerationControl] = None):
         self._queue = Queue()
         self._sentinel = object()
         self.perf_metrics = None
+        self.prefill_tokens_saved = None
+        self.control = control
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._ready = asyncio.Event()
+        except RuntimeError:
+            self._loop = None
+            self._ready = None
+
+    def _put(self, item):
+        self._queue.put(item)
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._ready.set)
+            except RuntimeError:
+                pass  # Event loop already closed; the consumer is gone.
 
     def __call__(self, text: str):
         if text:
-            self._queue.put(text)
+            self._put(text)
+        if self.control is not None:
+            return self.control.streaming_status()
+        return ov_genai.StreamingStatus.RUNNING
+
+    def _unwrap(self, chunk):
+        if isinstance(chunk, BaseException):
+            raise chunk
+        return chunk
 
     def __iter__(self):
         while True:
             chunk = self._queue.get()
             if chunk is self._sentinel:
                 break
-            yield chunk
+            yield self._unwrap(chunk)
+
+    async def __aiter__(self):
+        if self._loop is None:
+            raise RuntimeError("QueueStreamer was not created inside an event loop")
+        while True:
+            try:
+                chunk = self._queue.get_nowait()
+            except Empty:
+                self._ready.clear()
+                if self._queue.empty():
+                    await self._ready.wait()
+                continue
+            if chunk is self._sentinel:
+                break
+            yield self._unwrap(chunk)
+
+    def fail(self, error: BaseException):
+        """Terminate the stream with ``error`` (e.g. the job was dropped from the queue)."""
+        self._put(error)
+        self._put(self._sentinel)
 
     def end(self):
-        self._queue.put(self._sentinel)
+        self._put(self._sentinel)
+
+    @property
+    def supports_async(self) -> bool:
+        return self._loop is not None
+
+
+async def iterate_streamer(streamer):
+    """Yield streamer chunks without blocking the event loop while waiting for tokens."""
+    if getattr(streamer, "supports_async", False) is True:
+        async for chunk in streamer:
+            yield chunk
+        return
+    iterator = iter(streamer)
+    sentinel = object()
+    while True:
+        chunk = await asyncio.to_thread(next, iterator, sentinel)
+        if chunk is sentinel:
+            break
+        yield chunk
 
 
 def extract_response_text(result) -> str:
@@ -112,6 +193,8 @@ def run_generation(pipe, generation_kwargs, streamer):
     """Invoke pipeline generation and ensure streamer termination."""
     result = None
     try:
+        if hasattr(streamer, "prefill_tokens_saved"):
+            streamer.prefill_tokens_saved = track_prefix_reuse(generation_kwargs)
         result = pipe.generate(**generation_kwargs)
         if hasattr(streamer, "perf_metrics") and result is not None:
             streamer.perf_metrics = getattr(result, "perf_metrics", None)
@@ -125,15 +208,62 @@ def run_generation(pipe, generation_kwargs, streamer):
             streamer.end()
 
 
-def launch_streaming_generation(pipe, generation_kwargs):
-    """Start a background thread for streaming generation."""
-    streamer = QueueStreamer()
+def track_prefix_reuse(generation_kwargs) -> Optional[int]:
+    """Estimate how many prompt tokens the next generation serves from the prefix cache."""
+    prompt = generation_kwargs.get("prompt")
+    if prefix_tracker is None or not isinstance(prompt, str):
+        return None
+    try:
+        tokenizer = getattr(pipe, "tokenizer", None) or pipe.get_tokenizer()
+        token_ids = tokenizer.encode(prompt).input_ids.data
+        media = list(generation_kwargs.get("images") or []) + list(
+            generation_kwargs.get("videos") or []
+        )
+        return prefix_tracker.observe(token_ids, media_digest(media))
+    except Exception as exc:
+        logger.debug(f"Prefix reuse estimate unavailable: {exc}")
+        return None
+
+
+def generate_tracked(pipe, generation_kwargs):
+    """Run ``pipe.generate`` and return its output with the estimated prefix reuse."""
+    prefill_tokens_saved = track_prefix_reuse(generation_kwargs)
+    return pipe.generate(**generation_kwargs), prefill_tokens_saved
+
+
+def scheduled(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a generation callable so pipeline state is reset on the worker that ran it."""
+
+    def job():
+        try:
+            return fn()
+        finally:
+            cleanup_pipeline_state()
+
+    return job
+
+
+def launch_streaming_generation(
+    pipe, generation_kwargs, *, priority: int = 0, control: Optional[GenerationControl] = None
+):
+    """Queue a streaming generation on the scheduler and return its streamer."""
+    streamer = QueueStreamer(control)
     streaming_kwargs = dict(generation_kwargs)
     streaming_kwargs["streamer"] = streamer
-    thread = Thread(target=run_generation, args=(pipe, streaming_kwargs, streamer))
-    thread.daemon = True
-    thread.start()
-    return streamer, thread
+    future = generation_scheduler.submit(
+        scheduled(partial(run_generation, pipe, streaming_kwargs, streamer)),
+        priority=priority,
+        control=control,
+        on_discard=streamer.fail,
+    )
+    # Failures reach the client through the streamer; mark the outcome as observed.
+    future.add_done_callback(_consume_future)
+    return streamer
+
+
+def _consume_future(future):
+    if not future.cancelled():
+        future.exception()
 
 
 @asynccontextmanager
@@ -150,14 +280,16 @@ async def lifespan(app: FastAPI):
 
     @repeat_every(seconds=2)
     async def log_request_counts():
-        if active_requests.value > 0 or queued_requests.value > 0:
+        status = generation_scheduler.status()
+        if status["active_requests"] > 0 or status["queued_requests"] > 0:
             logger.info(
-                f"Active requests: {active_requests.value}, Queued requests: {queued_requests.value}"
+                f"Active requests: {status['active_requests']}, Queued requests: {status['queued_requests']}"
             )
 
     log_task = asyncio.create_task(log_request_counts())
     yield
     log_task.cancel()
+    await close_http_session()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -171,91 +303,37 @@ app.add_middleware(
 )
 
 
-class RequestQueueMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to manage request queuing and active request tracking.
-    """
-
-    def __init__(self, app):
-        """
-        Initialize the middleware.
-
-        Args:
-            app: The FastAPI application instance.
-        """
-        super().__init__(app)
-        logger.info(f"RequestQueueMiddleware initialized in process: {os.getpid()}")
-
-    async def dispatch(self, request: Request, call_next):
-        """
-        Handle incoming requests and manage the request queue.
-
-        Args:
-            request (Request): The incoming HTTP request.
-            call_next: The next middleware or endpoint to call.
-
-        Returns:
-            Response: The HTTP response.
-        """
-        if request.url.path == "/v1/chat/completions":
-            method = request.method
-            url = request.url
-            headers = dict(request.headers)
-            query_params = dict(request.query_params)
-            body = await request.body()  # Read the body (if applicable)
-
-            # Log the complete request details
-            logger.debug(f"Request Method: {method}")
-            logger.debug(f"Request URL: {url}")
-            logger.debug(f"Request Headers: {headers}")
-            logger.debug(f"Request Query Params: {query_params}")
-            logger.debug(f"Request Body: {body.decode('utf-8') if body else 'No Body'}")
-            with request_lock:
-                queued_requests.value += 1
-                logger.info(
-                    f"Queued requests incremented: {queued_requests.value} (Process: {os.getpid()})"
-                )
-            try:
-                with request_lock:
-                    active_requests.value += 1
-                    queued_requests.value -= 1
-                    logger.info(
-                        f"Active requests incremented: {active_requests.value}, Queued requests decremented: {queued_requests.value} (Process: {os.getpid()})"
-                    )
-                response = await call_next(request)
-            finally:
-                with request_lock:
-                    active_requests.value -= 1
-                    logger.info(
-                        f"Active requests decremented: {active_requests.value} (Process: {os.getpid()})"
-                    )
-        else:
-            response = await call_next(request)
-        return response
-
-
-app.add_middleware(RequestQueueMiddleware)
-
-
 @app.get("/v1/queue-status")
 async def queue_status():
     """
     Get the current status of the request queue.
 
     Returns:
-        JSONResponse: A JSON response containing the number of active and queued requests.
+        JSONResponse: A JSON response containing the number of active and queued requests,
+        the scheduler mode and its admission counters.
     """
-    with request_lock:
-        active = active_requests.value
-        queued = queued_requests.value
+    status = generation_scheduler.status()
+    status["mode"] = scheduler_mode
     logger.info(
-        f"Queue status - Active requests: {active}, Queued requests: {queued} (Process: {os.getpid()})"
+        f"Queue status - Active requests: {status['active_requests']}, Queued requests: {status['queued_requests']} (Process: {os.getpid()})"
     )
+    return JSONResponse(status_code=200, content=status)
+
+
+@app.get("/v1/cache-status")
+async def cache_status():
+    """
+    Get the hit rates and occupancy of the image cache and the prompt prefix cache.
+
+    Returns:
+        JSONResponse: A JSON response with image cache entries, bytes used, hits, misses and
+        evictions, and the prompt tokens served from the prefix cache.
+    """
     return JSONResponse(
         status_code=200,
         content={
-            "active_requests": active,
-            "queued_requests": queued,
+            "image_cache": image_cache.stats(),
+            "prefix_cache": prefix_tracker.stats() if prefix_tracker else {"enabled": False},
         },
     )
 
@@ -266,6 +344,8 @@ pipe: Optional[Any] = None
 processor: Any = None
 model_dir = None
 model_config = None
+scheduler_mode = "serial"
+prefix_tracker: Optional[PrefixCacheTracker] = None
 
 
 def cleanup_pipeline_state():
@@ -292,17 +372,6 @@ def cleanup_pipeline_state():
     logger.debug("No cleanup method available on pipeline instance.")
 
 
-def wait_for_generation_thread(thread: Optional[Thread], timeout: float = 2.0):
-    """Join a generation thread to make sure resources are released."""
-    if thread is None:
-        return
-    if not thread.is_alive():
-        return
-    thread.join(timeout=timeout)
-    if thread.is_alive():
-        logger.warning("Generation thread did not terminate within timeout.")
-
-
 def restart_server():
     """
     Restart the API server.
@@ -340,11 +409,61 @@ def safe_generate(pipe, generation_kwargs, streamer):
     except Exception as exc:  # pragma: no cover - defensive guard
         logger.error(f"Exception in thread during generation: {exc}")
         setattr(streamer, "end_of_stream", True)
+        if hasattr(streamer, "end"):
+            # Release consumers blocked on the streamer; the worker is shared by all requests.
+            streamer.end()
         if ErrorMessages.GPU_OOM_ERROR_MESSAGE in str(exc):
             logger.error("Detected GPU out-of-memory error, restarting server...")
             restart_server()
 
 
+def create_continuous_batching_pipeline(model_dir, ov_config) -> Optional[ContinuousBatchingAdapter]:
+    """
+    Build a continuous batching pipeline for ``VLM_SCHEDULER_MODE=continuous``.
+
+    Returns:
+        ContinuousBatchingAdapter or None when the model cannot be served this way, in which
+        case the caller falls back to ``VLMPipeline`` and serial scheduling.
+    """
+    global scheduler_mode
+    scheduler_config = build_scheduler_config(settings.VLM_PREFIX_CACHING)
+    try:
+        cb_pipe = ov_genai.ContinuousBatchingPipeline(
+            model_dir, scheduler_config, settings.VLM_DEVICE.upper(), ov_config
+        )
+    except Exception as e:
+        logger.warning(
+            f"Continuous batching is unavailable for this model ({e}); using serial scheduling."
+        )
+        return None
+    scheduler_mode = "continuous"
+    logger.info(
+        f"Continuous batching enabled: max_batch_size={settings.VLM_MAX_BATCH_SIZE}, "
+        f"kv_cache={settings.VLM_KV_CACHE_SIZE_GB}GB"
+    )
+    return ContinuousBatchingAdapter(cb_pipe)
+
+
+def create_prefix_caching_pipeline(model_dir, ov_config) -> Optional[Any]:
+    """
+    Build a ``VLMPipeline`` on the paged-attention backend with prefix caching enabled.
+
+    Returns:
+        VLMPipeline or None when the backend rejects the configuration, in which case the
+        caller builds a plain ``VLMPipeline``.
+    """
+    try:
+        return ov_genai.VLMPipeline(
+            model_dir,
+            device=settings.VLM_DEVICE.upper(),
+            scheduler_config=build_scheduler_config(enable_prefix_caching=True),
+            **ov_config,
+        )
+    except Exception as e:
+        logger.warning(f"Prefix caching is unavailable for this model ({e}); disabling it.")
+        return None
+
+
 # Initialize the model
 def initialize_model():
     """
@@ -354,7 +473,7 @@ def initialize_model():
         RuntimeError: If there is an error during model initialization.
     """
     global model_ready
-    global pipe, processor, model_dir, model_config
+    global pipe, processor, model_dir, model_config, prefix_tracker
     model_name = settings.VLM_MODEL_NAME
     model_dir = Path(model_name.split("/")[-1])
     model_dir = Path("ov-model") / model_dir
@@ -391,11 +510,19 @@ def initialize_model():
                 model_name, trust_remote_code=True
             )
         else:
-            pipe = ov_genai.VLMPipeline(
-                model_dir,
-                device=settings.VLM_DEVICE.upper(),
-                **ov_config,
-            )
+            pipe = None
+            if settings.VLM_SCHEDULER_MODE == "continuous":
+                pipe = create_continuous_batching_pipeline(model_dir, ov_config)
+            if pipe is None and settings.VLM_PREFIX_CACHING:
+                pipe = create_prefix_caching_pipeline(model_dir, ov_config)
+            if pipe is None:
+                pipe = ov_genai.VLMPipeline(
+                    model_dir,
+                    device=settings.VLM_DEVICE.upper(),
+                    **ov_config,
+                )
+            elif settings.VLM_PREFIX_CACHING:
+                prefix_tracker = PrefixCacheTracker.from_settings(model_dir)
 
             if ModelNames.PHI in model_name.lower():
                 processor = AutoProcessor.from_pretrained(
@@ -422,6 +549,13 @@ def initialize_model():
 # Initialize the model to create global objects of processor, model, model_ready
 initialize_model()
 
+# Generation runs through the scheduler: a single worker serializes access to pipelines that
+# are not thread-safe, while continuous batching lets several requests share decode steps.
+generation_scheduler = GenerationScheduler(
+    workers=settings.VLM_MAX_BATCH_SIZE if scheduler_mode == "continuous" else 1,
+    max_queue_size=settings.VLM_MAX_QUEUE_SIZE,
+)
+
 
 def create_streaming_response(
     streamer,
@@ -429,7 +563,6 @@ def create_streaming_response(
     model_name,
     *,
     on_complete: Optional[Callable[[], None]] = None,
-    generation_thread: Optional[Thread] = None,
     telemetry_callback: Optional[
         Callable[[str, Optional[ChatUsageStats], Optional[TelemetryMetrics], Optional[str]], None]
     ] = None,
@@ -451,7 +584,7 @@ def create_streaming_response(
         completion_id = str(uuid.uuid4())
         telemetry_dispatched = False
         try:
-            for new_text in streamer:
+            async for new_text in iterate_streamer(streamer):
                 buffer += new_text
                 logger.debug(new_text)
                 yield (
@@ -472,7 +605,8 @@ def create_streaming_response(
                     ).model_dump_json()}\n\n"""
                 )
             usage, telemetry = build_usage_and_telemetry(
-                getattr(streamer, "perf_metrics", None)
+                getattr(streamer, "perf_metrics", None),
+                prefill_tokens_saved=getattr(streamer, "prefill_tokens_saved", None),
             )
             log_telemetry("stream", usage, telemetry)
             if telemetry_callback and not telemetry_dispatched:
@@ -501,7 +635,6 @@ def create_streaming_response(
                 telemetry_dispatched = True
             raise
         finally:
-            wait_for_generation_thread(generation_thread)
             if on_complete:
                 on_complete()
 
@@ -524,9 +657,13 @@ async def chat_completions(request: ChatRequest):
     Returns:
         JSONResponse or StreamingResponse: The chat completion response.
     """
-    temp_video_path = None  # Track the temporary video file path
-    cleanup_deferred = False
+    inline_video: Optional[InMemoryVideo] = None  # Base64 video decoded for this request
     telemetry_request_id = str(uuid.uuid4())
+    timeout = request.timeout or settings.VLM_REQUEST_TIMEOUT_SEC
+    control = GenerationControl(
+        deadline=time.monotonic() + timeout if timeout else None
+    )
+    priority = request.priority or 0
     telemetry_recorded = False
     try:
         image_urls: List[str] = []
@@ -647,9 +784,9 @@ async def chat_completions(request: ChatRequest):
                         logger.info("Found MessageContentVideoUrl")
                         video_url = content.video_url.get("url")
                         if video_url.startswith("data:video/mp4;base64,"):
-                            logger.info("Decoding base64-encoded video URL")
-                            temp_video_path = decode_and_save_video(video_url)
-                            video_url = temp_video_path
+                            logger.info("Decoding base64-encoded video URL in memory")
+                            inline_video = decode_video_in_memory(video_url)
+                            video_url = INLINE_VIDEO_URL
                         max_pixels = content.max_pixels
                         fps = content.fps
         logger.debug(
@@ -691,28 +828,35 @@ async def chat_completions(request: ChatRequest):
             f"config: { {k: v for k, v in config_kwargs.items() if v is not None} }"
         )
 
-        def respond_with_generation(generation_kwargs):
+        async def respond_with_generation(generation_kwargs):
             """Invoke the pipeline, handling streaming vs. non-stream flows consistently."""
-            nonlocal cleanup_deferred
             logger.debug(
                 "Invoking pipeline with kwargs: %s", list(generation_kwargs.keys())
             )
             if request.stream:
-                streamer, thread = launch_streaming_generation(pipe, generation_kwargs)
-                cleanup_deferred = True
+                streamer = launch_streaming_generation(
+                    pipe, generation_kwargs, priority=priority, control=control
+                )
                 return create_streaming_response(
                     streamer,
                     request,
                     settings.VLM_MODEL_NAME,
-                    on_complete=cleanup_pipeline_state,
-                    generation_thread=thread,
+                    on_complete=control.cancel,
                     telemetry_callback=persist_telemetry,
                 )
 
-            output = pipe.generate(**generation_kwargs)
+            if control.deadline is not None:
+                # Stop decoding once the deadline passes instead of holding the pipeline.
+                generation_kwargs = dict(generation_kwargs, streamer=control.as_streamer())
+            output, prefill_tokens_saved = await generation_scheduler.run(
+                scheduled(partial(generate_tracked, pipe, generation_kwargs)),
+                priority=priority,
+                control=control,
+            )
             response_text = extract_response_text(output)
             usage, telemetry = build_usage_and_telemetry(
-                getattr(output, "perf_metrics", None)
+                getattr(output, "perf_metrics", None),
+                prefill_tokens_saved=prefill_tokens_saved,
             )
             log_telemetry("non-stream", usage, telemetry)
             response_payload = ChatCompletionResponse(
@@ -783,7 +927,7 @@ async def chat_completions(request: ChatRequest):
                     "generation_config": config,
                 }
 
-            return respond_with_generation(generation_kwargs)
+            return await respond_with_generation(generation_kwargs)
 
         elif is_qwen_model:
             # Qwen2/2.5 VL models still rely on processor-supplied chat templates and
@@ -846,9 +990,9 @@ async def chat_completions(request: ChatRequest):
                 text = processor.apply_chat_template(
                     messages, tokenize=False, add_generation_prompt=True
                 )
-                image_inputs, video_inputs = process_vision_info(messages)
-                qwen_images = convert_qwen_image_inputs(image_inputs)
-                qwen_videos = convert_qwen_video_inputs(video_inputs)
+                qwen_images = await run_media_task(
+                    load_qwen_image_tensors, image_urls, process_vision_info
+                )
                 generation_kwargs = {
                     "prompt": text,
                     "generation_config": config,
@@ -869,8 +1013,8 @@ async def chat_completions(request: ChatRequest):
                 text = processor.apply_chat_template(
                     messages, tokenize=False, add_generation_prompt=True
                 )
-                image_inputs, video_inputs, video_kwargs = process_vision_info(
-                    messages, return_video_kwargs=True
+                image_inputs, video_inputs, video_kwargs = await run_media_task(
+                    process_vision_info, messages, return_video_kwargs=True
                 )
                 video_kwargs = _normalize_video_kwargs(video_kwargs)
                 logger.debug("Video kwargs for frame list: %s", video_kwargs)
@@ -939,7 +1083,18 @@ async def chat_completions(request: ChatRequest):
                             logger.error(f"Failed to evaluate max_pixels: {e}")
                             raise ValueError(f"Invalid max_pixels format: {max_pixels}")
                     video_content["max_pixels"] = max_pixels
-                if fps is not None:
+                if inline_video is not None:
+                    # Sample frames straight from memory instead of decoding a file
+                    frames, raw_fps, sample_fps = await run_media_task(
+                        sample_video_frames,
+                        inline_video,
+                        fps=fps,
+                        max_pixels=max_pixels,
+                    )
+                    video_content.update(
+                        video=frames, sample_fps=sample_fps, raw_fps=raw_fps
+                    )
+                elif fps is not None:
                     video_content["fps"] = fps
 
                 messages = [
@@ -954,8 +1109,8 @@ async def chat_completions(request: ChatRequest):
                 text = processor.apply_chat_template(
                     messages, tokenize=False, add_generation_prompt=True
                 )
-                image_inputs, video_inputs, video_kwargs = process_vision_info(
-                    messages, return_video_kwargs=True
+                image_inputs, video_inputs, video_kwargs = await run_media_task(
+                    process_vision_info, messages, return_video_kwargs=True
                 )
                 video_kwargs = _normalize_video_kwargs(video_kwargs)
                 logger.debug(f"Processed video kwargs for URL input: {video_kwargs}")
@@ -1043,7 +1198,7 @@ async def chat_completions(request: ChatRequest):
             if qwen_videos:
                 generation_kwargs["videos"] = qwen_videos
 
-            return respond_with_generation(generation_kwargs)
+            return await respond_with_generation(generation_kwargs)
 
         elif ModelNames.SMOLVLM in model_name_lower:
             logger.info("Using SmolVLM2 model for processing.")
@@ -1090,11 +1245,12 @@ async def chat_completions(request: ChatRequest):
                 )
             elif video_url:
                 logger.info("processing as video_url")
-                video_path = (
-                    video_url.replace("file://", "", 1)
-                    if video_url.startswith("file://")
-                    else video_url
-                )
+                if inline_video is not None:
+                    video_path = inline_video.path
+                elif video_url.startswith("file://"):
+                    video_path = video_url.replace("file://", "", 1)
+                else:
+                    video_path = video_url
                 video_content = {
                     "type": "video",
                     "path": video_path,
@@ -1169,26 +1325,28 @@ async def chat_completions(request: ChatRequest):
                 {k: v for k, v in optional_params.items() if v is not None}
             )
 
-            thread = Thread(target=safe_generate, args=(pipe, generation_kwargs, streamer))
-            thread.daemon = True
-            thread.start()
+            generation_future = generation_scheduler.submit(
+                scheduled(partial(safe_generate, pipe, generation_kwargs, streamer)),
+                priority=priority,
+                control=control,
+                on_discard=lambda _error: streamer.end(),
+            )
 
             if request.stream:
-                cleanup_deferred = True
+                generation_future.add_done_callback(_consume_future)
                 return create_streaming_response(
                     streamer,
                     request,
                     settings.VLM_MODEL_NAME,
-                    on_complete=cleanup_pipeline_state,
-                    generation_thread=thread,
+                    on_complete=control.cancel,
                     telemetry_callback=persist_telemetry,
                 )
 
             buffer = []
-            for new_text in streamer:
+            async for new_text in iterate_streamer(streamer):
                 buffer.append(new_text)
                 logger.debug(new_text)
-            wait_for_generation_thread(thread)
+            await generation_future
             response_text = "".join(buffer)
             persist_telemetry("success", None, None, None)
             return ChatCompletionResponse(
@@ -1248,9 +1406,17 @@ async def chat_completions(request: ChatRequest):
                 if video_tensors:
                     generation_kwargs["videos"] = video_tensors
 
-        response = respond_with_generation(generation_kwargs)
+        response = await respond_with_generation(generation_kwargs)
         logger.info("Chat completion request processed successfully.")
         return response
+    except QueueFullError as e:
+        logger.warning(f"Rejecting chat completion request: {e}")
+        persist_telemetry("client_error", None, None, str(e))
+        return JSONResponse(status_code=429, content={"error": str(e)})
+    except (DeadlineExceededError, RequestCancelledError) as e:
+        logger.warning(f"Chat completion request not processed: {e}")
+        persist_telemetry("client_error", None, None, str(e))
+        return JSONResponse(status_code=504, content={"error": str(e)})
     except ValueError as e:
         logger.info("ValueError encountered during chat completion request.")
         logger.error(f"{ErrorMessages.CHAT_COMPLETION_ERROR}: {e}")
@@ -1268,39 +1434,45 @@ async def chat_completions(request: ChatRequest):
             content={"error": f"{ErrorMessages.CHAT_COMPLETION_ERROR}: {e}"},
         )
     finally:
-        # Clean up the temporary video file if it was created
-        if temp_video_path:
-            try:
-                os.remove(temp_video_path.replace("file://", ""))
-                logger.info(f"Temporary video file deleted: {temp_video_path}")
-            except Exception as e:
-                logger.error(f"Failed to delete temporary video file: {e}")
-        if not cleanup_deferred:
-            cleanup_pipeline_state()
+        # Inputs are fully preprocessed by now; release the decoded video
+        if inline_video is not None:
+            inline_video.close()
 
 
 @app.get("/v1/telemetry", response_model=TelemetryListResponse)
-async def list_telemetry(
+def list_telemetry(
     limit: Optional[int] = Query(
         default=None,
         gt=0,
         le=settings.VLM_TELEMETRY_MAX_RECORDS,
         description="Maximum number of newest telemetry items to return.",
-    )
+    ),
+    cursor: Optional[int] = Query(
+        default=None,
+        description="Return items older than this cursor (``next_cursor`` of the previous page).",
+    ),
+    status: Optional[str] = Query(
+        default=None, description="Only return items with this status, e.g. ``success``."
+    ),
+    since: Optional[datetime] = Query(
+        default=None, description="Only return items recorded at or after this time."
+    ),
+    until: Optional[datetime] = Query(
+        default=None, description="Only return items recorded at or before this time."
+    ),
 ):
-    """Return the most recent telemetry entries (newest first)."""
+    """Return telemetry entries (newest first), optionally filtered and paginated."""
 
     try:
-        entries = telemetry_store.read_all()
+        entries, next_cursor = telemetry_store.query(
+            limit=limit, cursor=cursor, status=status, since=since, until=until
+        )
     except Exception as exc:  # pragma: no cover - defensive guard
         logger.error("Failed to read telemetry store: %s", exc)
         raise HTTPException(status_code=500, detail="Unable to read telemetry history")
 
-    if limit is not None:
-        entries = entries[-limit:]
-
-    records = [TelemetryRecordModel(**entry) for entry in reversed(entries)]
-    return TelemetryListResponse(count=len(records), items=records)
+    records = [TelemetryRecordModel(**entry) for entry in entries]
+    return TelemetryListResponse(count=len(records), items=records, next_cursor=next_cursor)
 
 
 @app.get("/v1/models", response_model=ModelsResponse)
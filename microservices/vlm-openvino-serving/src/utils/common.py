@@ -11,7 +11,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Union
 
 # Load environment variables from .env file if it exists
 env_path = os.path.join(os.path.dirname(__file__), "..", ".env")
@@ -65,13 +65,46 @@ class Settings(BaseSettings):
         json_schema_extra={"env": "OV_CONFIG"},
     )
     VLM_TELEMETRY_PATH: Path = Field(
-        default=Path("/opt/vlm_telemetry.jsonl"),
+        default=Path("/opt/vlm_telemetry.db"),
         json_schema_extra={"env": "VLM_TELEMETRY_PATH"},
     )
     VLM_TELEMETRY_MAX_RECORDS: int = Field(
         default=100,
         json_schema_extra={"env": "VLM_TELEMETRY_MAX_RECORDS"},
     )
+    VLM_TELEMETRY_MAX_AGE_HOURS: Optional[float] = Field(
+        default=None, json_schema_extra={"env": "VLM_TELEMETRY_MAX_AGE_HOURS"}
+    )
+    VLM_SCHEDULER_MODE: str = Field(
+        default="serial", json_schema_extra={"env": "VLM_SCHEDULER_MODE"}
+    )
+    VLM_MAX_QUEUE_SIZE: int = Field(
+        default=64, json_schema_extra={"env": "VLM_MAX_QUEUE_SIZE"}
+    )
+    VLM_MAX_BATCH_SIZE: int = Field(
+        default=8, json_schema_extra={"env": "VLM_MAX_BATCH_SIZE"}
+    )
+    VLM_KV_CACHE_SIZE_GB: int = Field(
+        default=4, json_schema_extra={"env": "VLM_KV_CACHE_SIZE_GB"}
+    )
+    VLM_REQUEST_TIMEOUT_SEC: Optional[float] = Field(
+        default=None, json_schema_extra={"env": "VLM_REQUEST_TIMEOUT_SEC"}
+    )
+    VLM_PREFIX_CACHING: bool = Field(
+        default=False, json_schema_extra={"env": "VLM_PREFIX_CACHING"}
+    )
+    VLM_IMAGE_FETCH_CONCURRENCY: int = Field(
+        default=8, json_schema_extra={"env": "VLM_IMAGE_FETCH_CONCURRENCY"}
+    )
+    VLM_IMAGE_DECODE_WORKERS: int = Field(
+        default=4, json_schema_extra={"env": "VLM_IMAGE_DECODE_WORKERS"}
+    )
+    VLM_IMAGE_CACHE_MAX_MB: int = Field(
+        default=512, json_schema_extra={"env": "VLM_IMAGE_CACHE_MAX_MB"}
+    )
+    VLM_IMAGE_CACHE_URL_TTL_SEC: float = Field(
+        default=0, json_schema_extra={"env": "VLM_IMAGE_CACHE_URL_TTL_SEC"}
+    )
 
     @field_validator("VLM_LOG_LEVEL", mode="before")
     @classmethod
@@ -128,6 +161,111 @@ class Settings(BaseSettings):
             return 100
         return value
 
+    @field_validator("VLM_TELEMETRY_MAX_AGE_HOURS", mode="before")
+    @classmethod
+    def validate_telemetry_max_age(cls, v: Any) -> Optional[float]:
+        if v in (None, ""):
+            return None
+        try:
+            value = float(v)
+        except (ValueError, TypeError):
+            _temp_logger.warning(
+                f"Invalid VLM_TELEMETRY_MAX_AGE_HOURS '{v}'. Keeping records regardless of age."
+            )
+            return None
+        return value if value > 0 else None
+
+    @field_validator("VLM_SCHEDULER_MODE", mode="before")
+    @classmethod
+    def validate_scheduler_mode(cls, v: Any) -> str:
+        if v is None or v == "":
+            return "serial"
+        if str(v).lower() in ("serial", "continuous"):
+            return str(v).lower()
+        _temp_logger.warning(f"Invalid VLM_SCHEDULER_MODE '{v}'. Using default 'serial'.")
+        return "serial"
+
+    @field_validator(
+        "VLM_MAX_QUEUE_SIZE",
+        "VLM_MAX_BATCH_SIZE",
+        "VLM_KV_CACHE_SIZE_GB",
+        "VLM_IMAGE_FETCH_CONCURRENCY",
+        "VLM_IMAGE_DECODE_WORKERS",
+        mode="before",
+    )
+    @classmethod
+    def validate_positive_limits(cls, v: Any, info) -> int:
+        defaults = {
+            "VLM_MAX_QUEUE_SIZE": 64,
+            "VLM_MAX_BATCH_SIZE": 8,
+            "VLM_KV_CACHE_SIZE_GB": 4,
+            "VLM_IMAGE_FETCH_CONCURRENCY": 8,
+            "VLM_IMAGE_DECODE_WORKERS": 4,
+        }
+        default = defaults[info.field_name]
+        if v in (None, ""):
+            return default
+        try:
+            value = int(v)
+        except (ValueError, TypeError):
+            _temp_logger.warning(
+                f"Invalid {info.field_name} '{v}'. Using default {default}."
+            )
+            return default
+        if value <= 0:
+            _temp_logger.warning(
+                f"{info.field_name} must be positive; received {value}. Using default {default}."
+            )
+            return default
+        return value
+
+    @field_validator("VLM_REQUEST_TIMEOUT_SEC", mode="before")
+    @classmethod
+    def validate_request_timeout(cls, v: Any) -> Optional[float]:
+        if v in (None, ""):
+            return None
+        try:
+            value = float(v)
+        except (ValueError, TypeError):
+            _temp_logger.warning(f"Invalid VLM_REQUEST_TIMEOUT_SEC '{v}'. Disabling deadline.")
+            return None
+        return value if value > 0 else None
+
+    @field_validator("VLM_PREFIX_CACHING", mode="before")
+    @classmethod
+    def validate_prefix_caching(cls, v: Any) -> bool:
+        if v is None or v == "":
+            return False
+        if isinstance(v, bool):
+            return v
+        if str(v).lower() in ("1", "true", "yes", "on"):
+            return True
+        if str(v).lower() in ("0", "false", "no", "off"):
+            return False
+        _temp_logger.warning(f"Invalid VLM_PREFIX_CACHING '{v}'. Using default 'false'.")
+        return False
+
+    @field_validator("VLM_IMAGE_CACHE_MAX_MB", "VLM_IMAGE_CACHE_URL_TTL_SEC", mode="before")
+    @classmethod
+    def validate_image_cache(cls, v: Any, info) -> Union[int, float]:
+        defaults = {"VLM_IMAGE_CACHE_MAX_MB": 512, "VLM_IMAGE_CACHE_URL_TTL_SEC": 0}
+        default = defaults[info.field_name]
+        if v in (None, ""):
+            return default
+        try:
+            value = float(v)
+        except (ValueError, TypeError):
+            _temp_logger.warning(
+                f"Invalid {info.field_name} '{v}'. Using default {default}."
+            )
+            return default
+        if value < 0:
+            _temp_logger.warning(
+                f"{info.field_name} must not be negative; received {value}. Using default {default}."
+            )
+            return default
+        return int(value) if info.field_name == "VLM_IMAGE_CACHE_MAX_MB" else value
+
     def get_ov_config_dict(self) -> Dict[str, Any]:
         """
         Parse OV_CONFIG JSON string into a dictionary.
@@ -106,6 +106,9 @@ class ChatRequest(BaseModel):
         top_k (Optional[int]): The top-k sampling value.
         do_sample (Optional[bool]): Whether to sample.
         seed (Optional[int]): The seed for reproducibility.
+        priority (Optional[int]): Scheduling priority; higher values are served first.
+        timeout (Optional[float]): Seconds the request may wait and run before it is
+            rejected (while queued) or stopped (while generating).
     """
 
     messages: List[Message] = Field(...)
@@ -129,6 +132,21 @@ class ChatRequest(BaseModel):
         None,
         json_schema_extra={"example": 42, "description": "Seed for reproducibility"},
     )
+    priority: Optional[int] = Field(
+        0,
+        json_schema_extra={
+            "example": 0,
+            "description": "Scheduling priority; higher values are served first",
+        },
+    )
+    timeout: Optional[float] = Field(
+        None,
+        gt=0,
+        json_schema_extra={
+            "example": 30.0,
+            "description": "Deadline in seconds covering queueing and generation",
+        },
+    )
 
 
 class ChatCompletionDelta(BaseModel):
@@ -156,6 +174,8 @@ class ChatUsageStats(BaseModel):
         time_to_first_token (Optional[float]): The time to the first token.
         latency (Optional[float]): The latency of the response.
         completion_tokens_details (Optional[dict]): Details of completion tokens.
+        prompt_tokens_details (Optional[dict]): Details of prompt tokens, such as
+            ``cached_tokens`` served from the prefix cache.
     """
 
     prompt_tokens: Optional[int] = None
@@ -165,6 +185,7 @@ class ChatUsageStats(BaseModel):
     time_to_first_token: Optional[float] = None
     latency: Optional[float] = None
     completion_tokens_details: Optional[dict] = None
+    prompt_tokens_details: Optional[dict] = None
 
 
 class TelemetryMetrics(BaseModel):
@@ -188,6 +209,7 @@ class TelemetryMetrics(BaseModel):
     tpot_std_ms: Optional[float] = None  # Std-dev for TPOT (ms/token).
     throughput_tps: Optional[float] = None  # Mean throughput in tokens per second.
     throughput_std_tps: Optional[float] = None  # Std-dev for throughput (tokens/s).
+    prefill_tokens_saved: Optional[int] = None  # Estimated prompt tokens reused from the prefix cache.
 
 
 class TelemetryRequestMetadata(BaseModel):
@@ -215,6 +237,7 @@ class TelemetryListResponse(BaseModel):
 
     count: int
     items: List[TelemetryRecord]
+    next_cursor: Optional[int] = None  # Pass as ``cursor`` to fetch the next (older) page.
 
 
 class ChatCompletionChoice(BaseModel):
@@ -0,0 +1,189 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Content-addressed LRU cache for decoded images and their OpenVINO tensors.
+
+Video summarization sends overlapping frame windows, so the same keyframes reach
+``/v1/chat/completions`` many times. Entries are keyed by a SHA-256 of the image content
+(the base64 payload for data URIs, the downloaded or file bytes otherwise), so a repeated
+frame skips base64/JPEG decoding, resizing and tensor conversion regardless of which
+request carries it.
+
+Remote URLs must be fetched before their content can be hashed. When
+``VLM_IMAGE_CACHE_URL_TTL_SEC`` is set, a URL is additionally mapped to its content hash for
+that many seconds so repeated URLs also skip the download. Qwen models fetch remote images
+inside ``qwen_vl_utils``, so their tensors are keyed by URL instead and only cached while
+that mapping is kept.
+
+``ov_genai.VLMPipeline`` does not accept precomputed vision-encoder outputs, so the cache
+stops at the preprocessed tensors handed to the pipeline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.common import logger, settings
+
+
+def content_key(data: Any, namespace: str = "") -> str:
+    """Return the cache key for image content (bytes or a base64/data URI string)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{namespace}:{digest}" if namespace else digest
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate memory held by a cached value (tensors, arrays, PIL images or tuples)."""
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(item) for item in value)
+    for attr in ("byte_size", "nbytes"):
+        size = getattr(value, attr, None)
+        if isinstance(size, int):
+            return size
+    if hasattr(value, "size") and hasattr(value, "getbands"):
+        width, height = value.size
+        return width * height * len(value.getbands())
+    return 0
+
+
+class ImageCache:
+    """Thread-safe LRU cache bounded by an approximate byte budget.
+
+    Args:
+        max_bytes: Byte budget; ``0`` disables caching.
+        url_ttl_sec: Seconds a remote URL stays mapped to its content hash; ``0`` disables
+            URL reuse so remote images are always re-fetched (but not re-decoded).
+    """
+
+    def __init__(self, max_bytes: int, url_ttl_sec: float = 0):
+        self.max_bytes = max(0, int(max_bytes))
+        self.url_ttl_sec = max(0.0, float(url_ttl_sec))
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._urls: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bytes_saved = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        """Return the cached value for ``key`` and mark it recently used."""
+        if not self.enabled or key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            self._bytes_saved += entry[1]
+            return entry[0]
+
+    def put(self, key: Optional[str], value: Any, nbytes: Optional[int] = None) -> None:
+        """Insert ``value`` and evict least recently used entries beyond the budget."""
+        if not self.enabled or key is None:
+            return
+        size = estimate_nbytes(value) if nbytes is None else nbytes
+        if size > self.max_bytes:
+            logger.debug("Image of %s bytes exceeds the cache budget; not cached", size)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def key_for_url(self, url: str, namespace: str = "") -> Optional[str]:
+        """Return the cache key remembered for a remote URL, if still fresh."""
+        if not self.enabled or not self.url_ttl_sec:
+            return None
+        with self._lock:
+            entry = self._urls.get((namespace, url))
+            if entry is None:
+                return None
+            key, expires = entry
+            if expires < time.monotonic():
+                del self._urls[(namespace, url)]
+                return None
+            return key
+
+    def remember_url(self, url: str, key: str, namespace: str = "") -> bool:
+        """Map a remote URL to the cache key of its last download.
+
+        Returns:
+            ``True`` if the mapping was recorded, ``False`` when URL reuse is disabled.
+        """
+        if not self.enabled or not self.url_ttl_sec:
+            return False
+        with self._lock:
+            self._urls[(namespace, url)] = (key, time.monotonic() + self.url_ttl_sec)
+            if len(self._urls) > 4 * max(1, len(self._entries)):
+                now = time.monotonic()
+                self._urls = {u: e for u, e in self._urls.items() if e[1] >= now}
+        return True
+
+    def source_key(self, source: str, namespace: str = "") -> Optional[str]:
+        """Compute a content key without fetching the image, where possible.
+
+        Data URIs hash their payload, local files hash path, size and modification time, and
+        remote URLs use the remembered mapping (``None`` when unknown).
+        """
+        if not self.enabled:
+            return None
+        if source.startswith("data:"):
+            return content_key(source, namespace)
+        if source.startswith(("http://", "https://")):
+            return self.key_for_url(source, namespace)
+        path = source[len("file://"):] if source.startswith("file://") else source
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return content_key(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}", namespace)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._urls.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate and occupancy metrics for ``/v1/cache-status``."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "bytes_saved": self._bytes_saved,
+                "url_ttl_sec": self.url_ttl_sec,
+            }
+
+
+image_cache = ImageCache(
+    max_bytes=settings.VLM_IMAGE_CACHE_MAX_MB * 1024 * 1024,
+    url_ttl_sec=settings.VLM_IMAGE_CACHE_URL_TTL_SEC,
+)
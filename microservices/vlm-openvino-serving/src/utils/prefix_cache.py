@@ -0,0 +1,159 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Prefix (KV-cache) reuse configuration and accounting.
+
+Clients resend long, identical system prompts and instruction templates with every request.
+OpenVINO GenAI's paged-attention scheduler can keep the KV blocks computed for a prompt in its
+KV cache after the request finishes and reuse them for any later prompt that starts with the
+same tokens (``SchedulerConfig.enable_prefix_caching``). Cached blocks are hashed per block of
+tokens, live inside the ``VLM_KV_CACHE_SIZE_GB`` budget and are evicted least recently used
+first, so the hottest prefixes stay resident.
+
+The pipeline does not report how many prompt tokens it served from cache, so
+``PrefixCacheTracker`` mirrors its block bookkeeping: it hashes each prompt into the same
+block chain, keeps an LRU of blocks sized to the KV budget and reports the length of the
+already-resident prefix as ``prefill_tokens_saved``. Blocks of prompts carrying images or
+videos are salted with a digest of the media, so the estimate never credits reuse across
+different visual inputs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import openvino_genai as ov_genai
+
+from src.utils.common import logger, settings
+
+# Fallback KV footprint per token (bytes) when the model config cannot be read
+_DEFAULT_KV_BYTES_PER_TOKEN = 128 * 1024
+
+
+def build_scheduler_config(enable_prefix_caching: bool) -> ov_genai.SchedulerConfig:
+    """Scheduler settings shared by the serial and continuous batching pipelines."""
+    scheduler_config = ov_genai.SchedulerConfig()
+    scheduler_config.cache_size = settings.VLM_KV_CACHE_SIZE_GB
+    scheduler_config.max_num_seqs = settings.VLM_MAX_BATCH_SIZE
+    scheduler_config.dynamic_split_fuse = True
+    scheduler_config.enable_prefix_caching = enable_prefix_caching
+    return scheduler_config
+
+
+def kv_block_size(device: str) -> int:
+    """KV block size used by the OpenVINO GenAI paged-attention backend for ``device``."""
+    return 16 if "GPU" in device.upper() else 32
+
+
+def estimate_kv_bytes_per_token(model_dir: Optional[Path]) -> int:
+    """Estimate the KV-cache footprint of one token from the model's ``config.json``.
+
+    Assumes 16-bit cache precision, which over-estimates the footprint (and therefore
+    under-estimates reuse) when the plugin stores the cache in 8 bits.
+    """
+    try:
+        with open(Path(model_dir) / "config.json") as f:
+            config = json.load(f)
+    except (OSError, TypeError, ValueError):
+        return _DEFAULT_KV_BYTES_PER_TOKEN
+    text_config = config.get("text_config") or config.get("llm_config") or config
+    try:
+        layers = int(text_config["num_hidden_layers"])
+        heads = int(text_config["num_attention_heads"])
+        kv_heads = int(text_config.get("num_key_value_heads") or heads)
+        head_dim = int(text_config.get("head_dim") or int(text_config["hidden_size"]) // heads)
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return _DEFAULT_KV_BYTES_PER_TOKEN
+    return max(1, 2 * layers * kv_heads * head_dim * 2)
+
+
+def media_digest(tensors: Optional[Iterable[Any]]) -> bytes:
+    """Digest of the image/video tensors attached to a prompt (empty when there are none)."""
+    if not tensors:
+        return b""
+    digest = hashlib.blake2b(digest_size=16)
+    for tensor in tensors:
+        data = getattr(tensor, "data", tensor)
+        digest.update(np.ascontiguousarray(data).data)
+    return digest.digest()
+
+
+class PrefixCacheTracker:
+    """Estimate prompt tokens served from the pipeline's prefix cache.
+
+    Args:
+        block_size: Tokens per KV block.
+        capacity_tokens: Number of prompt tokens the KV budget can retain.
+    """
+
+    def __init__(self, block_size: int, capacity_tokens: int):
+        self.block_size = max(1, block_size)
+        self.capacity_blocks = max(0, capacity_tokens // self.block_size)
+        self._blocks: "OrderedDict[bytes, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._prompt_tokens = 0
+        self._tokens_saved = 0
+
+    @classmethod
+    def from_settings(cls, model_dir: Optional[Path]) -> "PrefixCacheTracker":
+        block_size = kv_block_size(settings.VLM_DEVICE)
+        budget = settings.VLM_KV_CACHE_SIZE_GB * 1024**3
+        capacity = budget // estimate_kv_bytes_per_token(model_dir)
+        logger.info(
+            f"Prefix caching enabled: ~{capacity} tokens retained in {settings.VLM_KV_CACHE_SIZE_GB}GB "
+            f"KV cache (block size {block_size})"
+        )
+        return cls(block_size, capacity)
+
+    def observe(self, token_ids: Sequence[int], salt: bytes = b"") -> int:
+        """Record a prompt and return how many of its tokens were already cached.
+
+        The final prompt token is always recomputed to produce the first output logits.
+        """
+        tokens = np.asarray(token_ids, dtype=np.int64).reshape(-1)
+        full_blocks = len(tokens) // self.block_size
+        chain = hashlib.blake2b(salt, digest_size=16).digest()
+        hashes = []
+        for index in range(full_blocks):
+            block = tokens[index * self.block_size : (index + 1) * self.block_size]
+            chain = hashlib.blake2b(chain + block.tobytes(), digest_size=16).digest()
+            hashes.append(chain)
+
+        with self._lock:
+            matched = 0
+            for block_hash in hashes:
+                if block_hash not in self._blocks:
+                    break
+                matched += 1
+            for block_hash in hashes:
+                self._blocks[block_hash] = None
+                self._blocks.move_to_end(block_hash)
+            while len(self._blocks) > self.capacity_blocks:
+                self._blocks.popitem(last=False)
+            saved = max(0, min(matched * self.block_size, len(tokens) - 1))
+            self._requests += 1
+            self._prompt_tokens += len(tokens)
+            self._tokens_saved += saved
+        return saved
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": True,
+                "block_size": self.block_size,
+                "cached_blocks": len(self._blocks),
+                "capacity_blocks": self.capacity_blocks,
+                "requests": self._requests,
+                "prompt_tokens": self._prompt_tokens,
+                "prefill_tokens_saved": self._tokens_saved,
+                "saved_ratio": round(self._tokens_saved / self._prompt_tokens, 4)
+                if self._prompt_tokens
+                else None,
+            }
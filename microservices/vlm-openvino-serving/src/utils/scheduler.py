@@ -0,0 +1,523 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Admission control and scheduling for generation requests.
+
+``/v1/chat/completions`` used to start one thread per request against the single global
+pipeline, so concurrent requests raced for it with no bound on the backlog. This module
+puts a scheduler in front of the pipeline:
+
+* ``GenerationScheduler`` keeps a bounded priority queue of jobs (higher ``priority`` first,
+  FIFO within a priority) and runs them on a fixed set of worker threads. Jobs whose
+  deadline passes while queued are rejected instead of being run, and running jobs are
+  asked to stop through their ``GenerationControl`` once the deadline passes or the client
+  disconnects.
+* ``ContinuousBatchingAdapter`` wraps ``ov_genai.ContinuousBatchingPipeline`` behind the
+  ``VLMPipeline.generate`` interface. Requests submitted from several scheduler workers
+  are added to one step loop, so decode steps of in-flight requests are batched together
+  and every active stream receives its next tokens on each step.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import openvino_genai as ov_genai
+from openvino_genai import py_openvino_genai
+
+from src.utils.common import logger
+
+
+class SchedulerError(Exception):
+    """Base class for scheduling failures reported to API clients."""
+
+
+class QueueFullError(SchedulerError):
+    """Raised when the request queue has no room for another job."""
+
+
+class DeadlineExceededError(SchedulerError):
+    """Raised when a job's deadline passed before it could start."""
+
+
+class RequestCancelledError(SchedulerError):
+    """Raised when a job was cancelled before it could start."""
+
+
+class GenerationControl:
+    """Cancellation flag and deadline shared between a request and its generation job."""
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def should_stop(self) -> bool:
+        """Return True when generation should end early (client gone or deadline passed)."""
+        return self.cancelled or self.expired()
+
+    def streaming_status(self):
+        """Status to return from an ov_genai streamer callback."""
+        if self.should_stop():
+            return ov_genai.StreamingStatus.STOP
+        return ov_genai.StreamingStatus.RUNNING
+
+    def as_streamer(self) -> Callable[[str], Any]:
+        """Streamer callback that only enforces the deadline (for non-streaming requests)."""
+        return lambda _text: self.streaming_status()
+
+
+@dataclass(order=True)
+class _Job:
+    sort_key: tuple
+    fn: Callable[[], Any] = field(compare=False)
+    control: GenerationControl = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    on_discard: Optional[Callable[[BaseException], None]] = field(compare=False, default=None)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+class GenerationScheduler:
+    """Bounded priority queue feeding a fixed pool of generation workers.
+
+    Args:
+        workers: Number of jobs allowed to run at once. Use 1 for pipelines that are not
+            thread-safe (``VLMPipeline``, optimum models); with ``ContinuousBatchingAdapter``
+            this is the number of requests batched together.
+        max_queue_size: Maximum number of jobs waiting to start; further submissions raise
+            ``QueueFullError``.
+    """
+
+    def __init__(self, workers: int = 1, max_queue_size: int = 64):
+        self.workers = max(1, workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self._heap: List[_Job] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._active = 0
+        self._stats: Dict[str, float] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "expired": 0,
+            "cancelled": 0,
+            "queue_wait_total_s": 0.0,
+            "run_total_s": 0.0,
+        }
+
+    def submit(
+        self,
+        fn: Callable[[], Any],
+        *,
+        priority: int = 0,
+        control: Optional[GenerationControl] = None,
+        on_discard: Optional[Callable[[BaseException], None]] = None,
+    ) -> asyncio.Future:
+        """Queue ``fn`` for execution on a worker thread.
+
+        Must be called from the event loop. The returned future resolves with ``fn``'s return
+        value, or with the exception it raised.
+
+        Args:
+            fn: Zero-argument callable running the generation.
+            priority: Higher values are scheduled first.
+            control: Deadline/cancellation shared with the request.
+            on_discard: Called with the error when the job is dropped without running, so
+                streaming consumers can be released.
+
+        Raises:
+            QueueFullError: If ``max_queue_size`` jobs are already waiting.
+        """
+        loop = asyncio.get_running_loop()
+        job = _Job(
+            sort_key=(-priority, next(self._seq)),
+            fn=fn,
+            control=control or GenerationControl(),
+            future=loop.create_future(),
+            loop=loop,
+            on_discard=on_discard,
+        )
+        with self._cond:
+            if len(self._heap) >= self.max_queue_size:
+                self._stats["rejected"] += 1
+                raise QueueFullError(
+                    f"Request queue is full ({self.max_queue_size} waiting); retry later"
+                )
+            self._ensure_workers()
+            heapq.heappush(self._heap, job)
+            self._stats["submitted"] += 1
+            self._cond.notify()
+        return job.future
+
+    async def run(self, fn: Callable[[], Any], **kwargs) -> Any:
+        """Submit ``fn`` and wait for its result."""
+        return await self.submit(fn, **kwargs)
+
+    def _ensure_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"generation-worker-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._take()
+            started = time.monotonic()
+            try:
+                result = job.fn()
+            except Exception as exc:  # forwarded to the awaiting request
+                with self._cond:
+                    self._stats["failed"] += 1
+                self._resolve(job, error=exc)
+            else:
+                with self._cond:
+                    self._stats["completed"] += 1
+                self._resolve(job, result=result)
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._stats["run_total_s"] += time.monotonic() - started
+
+    def _take(self) -> _Job:
+        """Pop the next runnable job, discarding cancelled or expired ones."""
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                job = heapq.heappop(self._heap)
+                if job.control.cancelled or job.future.cancelled():
+                    self._stats["cancelled"] += 1
+                    error: Optional[SchedulerError] = RequestCancelledError(
+                        "Request was cancelled before it started"
+                    )
+                elif job.control.expired():
+                    self._stats["expired"] += 1
+                    error = DeadlineExceededError("Request deadline exceeded while queued")
+                else:
+                    self._active += 1
+                    self._stats["queue_wait_total_s"] += time.monotonic() - job.enqueued_at
+                    return job
+            self._discard(job, error)
+
+    def _discard(self, job: _Job, error: SchedulerError) -> None:
+        logger.info("Dropping queued generation job: %s", error)
+        if job.on_discard:
+            try:
+                job.on_discard(error)
+            except Exception as exc:  # pragma: no cover - defensive guard
+                logger.warning("on_discard callback failed: %s", exc)
+        self._resolve(job, error=error)
+
+    @staticmethod
+    def _resolve(job: _Job, result: Any = None, error: Optional[BaseException] = None) -> None:
+        def _set():
+            if job.future.done():
+                return
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+        try:
+            job.loop.call_soon_threadsafe(_set)
+        except RuntimeError:
+            # The event loop is closed (e.g. server shutting down); nobody is waiting.
+            pass
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and counters for ``/v1/queue-status``."""
+        with self._cond:
+            stats = dict(self._stats)
+            queued = len(self._heap)
+            active = self._active
+        started = stats["completed"] + stats["failed"]
+        return {
+            "active_requests": active,
+            "queued_requests": queued,
+            "max_queue_size": self.max_queue_size,
+            "workers": self.workers,
+            "submitted": int(stats["submitted"]),
+            "completed": int(stats["completed"]),
+            "failed": int(stats["failed"]),
+            "rejected": int(stats["rejected"]),
+            "expired": int(stats["expired"]),
+            "cancelled": int(stats["cancelled"]),
+            "avg_queue_wait_ms": round(stats["queue_wait_total_s"] / started * 1000, 2) if started else None,
+            "avg_run_ms": round(stats["run_total_s"] / started * 1000, 2) if started else None,
+        }
+
+
+class _MeanStd:
+    def __init__(self, mean: Optional[float]):
+        self.mean = mean
+        self.std = 0.0 if mean is not None else None
+
+
+class BatchedPerfMetrics:
+    """Per-request metrics for continuous batching, shaped like ``ov_genai.PerfMetrics``.
+
+    ``ContinuousBatchingPipeline`` handles do not expose ``PerfMetrics``, so timings are
+    measured by the adapter: time to first token, time per output token, throughput and
+    total duration. Unavailable values are reported as ``None``.
+    """
+
+    def __init__(self, num_input_tokens: Optional[int], num_generated_tokens: int,
+                 submitted_at: float, first_token_at: Optional[float], finished_at: float):
+        self._input = num_input_tokens
+        self._generated = num_generated_tokens
+        duration_ms = (finished_at - submitted_at) * 1000
+        self._duration = duration_ms
+        self._ttft = (first_token_at - submitted_at) * 1000 if first_token_at else None
+        decode_ms = (finished_at - first_token_at) * 1000 if first_token_at else None
+        self._tpot = decode_ms / (num_generated_tokens - 1) if decode_ms and num_generated_tokens > 1 else None
+        self._throughput = num_generated_tokens / (duration_ms / 1000) if duration_ms > 0 else None
+
+    def get_num_input_tokens(self):
+        return self._input
+
+    def get_num_generated_tokens(self):
+        return self._generated
+
+    def get_throughput(self):
+        return _MeanStd(self._throughput)
+
+    def get_ttft(self):
+        return _MeanStd(self._ttft)
+
+    def get_tpot(self):
+        return _MeanStd(self._tpot)
+
+    def get_generate_duration(self):
+        return _MeanStd(self._duration)
+
+    def get_tokenization_duration(self):
+        return None
+
+    def get_detokenization_duration(self):
+        return None
+
+    def get_prepare_embeddings_duration(self):
+        return None
+
+    def get_load_time(self):
+        return None
+
+
+class BatchedResult:
+    """Result object compatible with ``VLMDecodedResults`` (``texts`` and ``perf_metrics``)."""
+
+    def __init__(self, text: str, perf_metrics: BatchedPerfMetrics):
+        self.texts = [text]
+        self.perf_metrics = perf_metrics
+
+    def __str__(self) -> str:
+        return self.texts[0]
+
+
+class _BatchedRequest:
+    def __init__(self, prompt, images, videos, generation_config, streamer):
+        self.prompt = prompt
+        self.images = list(images or [])
+        self.videos = list(videos or [])
+        self.generation_config = generation_config
+        self.streamer = streamer
+        self.handle = None
+        self.token_ids: List[int] = []
+        # Streamed text is decoded incrementally: token_ids[prefix_offset:read_offset] is the
+        # last streamed chunk, kept as context for the tokens after read_offset.
+        self.prefix_offset = 0
+        self.read_offset = 0
+        self.submitted_at = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.stopping = False
+        self.result: Optional[BatchedResult] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+def _final_statuses():
+    status = py_openvino_genai.GenerationStatus
+    return (status.FINISHED, status.IGNORED, status.CANCEL, status.STOP)
+
+
+class ContinuousBatchingAdapter:
+    """Expose ``ContinuousBatchingPipeline`` through the ``VLMPipeline.generate`` interface.
+
+    ``generate`` may be called concurrently from several threads. Each call registers a
+    request with a single step loop thread, which owns the pipeline: between steps it admits
+    newly submitted requests (in-flight batching), then runs one ``step()`` for all active
+    requests and forwards the newly generated text of every request to its streamer.
+    """
+
+    def __init__(self, pipeline, tokenizer=None):
+        self.pipeline = pipeline
+        self.tokenizer = tokenizer or pipeline.get_tokenizer()
+        self._pending: "queue.Queue[_BatchedRequest]" = queue.Queue()
+        self._active: Dict[int, _BatchedRequest] = {}
+        self._ids = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def generate(self, prompt: str, images=None, videos=None, generation_config=None,
+                 streamer=None, **_ignored):
+        """Generate a completion; blocks until the request finishes."""
+        request = _BatchedRequest(prompt, images, videos, generation_config, streamer)
+        self._ensure_loop()
+        self._pending.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _ensure_loop(self) -> None:
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._step_loop, name="continuous-batching", daemon=True
+                )
+                self._thread.start()
+
+    def _admit(self, request: _BatchedRequest) -> None:
+        request_id = next(self._ids)
+        try:
+            config = request.generation_config or ov_genai.GenerationConfig()
+            if request.videos:
+                handle = self.pipeline.add_request(
+                    request_id, request.prompt, request.images, request.videos, config
+                )
+            elif request.images:
+                handle = self.pipeline.add_request(request_id, request.prompt, request.images, config)
+            else:
+                handle = self.pipeline.add_request(request_id, request.prompt, config)
+        except Exception as exc:
+            request.error = exc
+            request.done.set()
+            return
+        request.handle = handle
+        self._active[request_id] = request
+
+    def _step_loop(self) -> None:
+        while True:
+            if not self._active:
+                # Idle: block until the next request arrives.
+                self._admit(self._pending.get())
+            while True:
+                try:
+                    self._admit(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._active:
+                continue
+            try:
+                self.pipeline.step()
+            except Exception as exc:
+                logger.error("Continuous batching step failed: %s", exc)
+                for request in self._active.values():
+                    request.error = exc
+                    request.done.set()
+                self._active.clear()
+                continue
+            for request_id, request in list(self._active.items()):
+                try:
+                    self._collect(request)
+                    if request.handle.get_status() in _final_statuses() and not request.handle.can_read():
+                        self._finish(request)
+                        del self._active[request_id]
+                except Exception as exc:
+                    # A failing decode or streamer only ends its own request.
+                    logger.error("Continuous batching request %d failed: %s", request_id, exc)
+                    self._fail(request_id, request, exc)
+
+    def _fail(self, request_id: int, request: _BatchedRequest, exc: BaseException) -> None:
+        self._active.pop(request_id, None)
+        try:
+            request.handle.drop()
+        except Exception:
+            pass
+        request.error = exc
+        request.done.set()
+
+    def _collect(self, request: _BatchedRequest) -> None:
+        handle = request.handle
+        while handle.can_read():
+            outputs = handle.read()
+            if not outputs:
+                break
+            output = outputs.get(0) or next(iter(outputs.values()))
+            new_ids = list(output.generated_ids)
+            if not new_ids:
+                continue
+            if request.first_token_at is None:
+                request.first_token_at = time.monotonic()
+            request.token_ids.extend(new_ids)
+            self._stream(request)
+
+    def _next_text(self, request: _BatchedRequest, final: bool = False) -> str:
+        """Return the text added by the tokens not streamed yet.
+
+        Only those tokens and the previous chunk are decoded, so a step costs the same for
+        long and short sequences and does not hold up the other requests of the step loop.
+        The previous chunk gives the tokenizer the context it needs for leading spaces.
+        """
+        token_ids = request.token_ids
+        prefix_text = (
+            self.tokenizer.decode(token_ids[request.prefix_offset:request.read_offset])
+            if request.read_offset > request.prefix_offset
+            else ""
+        )
+        text = self.tokenizer.decode(token_ids[request.prefix_offset:])
+        # Hold back incomplete multi-byte sequences until the next token completes them.
+        if len(text) <= len(prefix_text) or (text.endswith("�") and not final):
+            return ""
+        request.prefix_offset, request.read_offset = request.read_offset, len(token_ids)
+        return text[len(prefix_text):]
+
+    def _stream(self, request: _BatchedRequest) -> None:
+        if request.streamer is None or request.stopping:
+            return
+        delta = self._next_text(request)
+        if not delta:
+            return
+        status = request.streamer(delta)
+        if status in (ov_genai.StreamingStatus.STOP, ov_genai.StreamingStatus.CANCEL) or status is True:
+            request.stopping = True
+            request.handle.stop()
+
+    def _finish(self, request: _BatchedRequest) -> None:
+        if request.streamer is not None and not request.stopping and request.read_offset < len(request.token_ids):
+            delta = self._next_text(request, final=True)
+            if delta:
+                request.streamer(delta)
+        text = self.tokenizer.decode(request.token_ids) if request.token_ids else ""
+        request.result = BatchedResult(
+            text,
+            BatchedPerfMetrics(
+                num_input_tokens=None,
+                num_generated_tokens=len(request.token_ids),
+                submitted_at=request.submitted_at,
+                first_token_at=request.first_token_at,
+                finished_at=time.monotonic(),
+            ),
+        )
+        request.done.set()
@@ -62,12 +62,15 @@ def _extract_mean_std(pair) -> Tuple[Optional[float], Optional[float]]:
 
 def build_usage_and_telemetry(
     perf_metrics: Optional[ov_genai.PerfMetrics],
+    prefill_tokens_saved: Optional[int] = None,
 ) -> Tuple[Optional[ChatUsageStats], Optional[TelemetryMetrics]]:
     """Convert ``ov_genai`` perf metrics into API response shapes.
 
     Args:
         perf_metrics: Optional PerfMetrics emitted by ``pipe.generate``. ``None`` indicates metrics
             were not produced (e.g., legacy pipeline or streaming errors).
+        prefill_tokens_saved: Estimated prompt tokens served from the prefix cache, or ``None``
+            when prefix caching is disabled.
 
     Returns:
         Tuple of ``(ChatUsageStats, TelemetryMetrics)``; elements are ``None`` when the pipeline
@@ -109,6 +112,11 @@ def build_usage_and_telemetry(
         tps=throughput_mean,
         time_to_first_token=ttft_mean,
         latency=generate_mean,
+        prompt_tokens_details=(
+            {"cached_tokens": prefill_tokens_saved}
+            if prefill_tokens_saved is not None
+            else None
+        ),
     )
 
     telemetry = TelemetryMetrics(
@@ -130,6 +138,7 @@ def build_usage_and_telemetry(
         tpot_std_ms=tpot_std,
         throughput_tps=throughput_mean,
         throughput_std_tps=throughput_std,
+        prefill_tokens_saved=prefill_tokens_saved,
     )
 
     return usage, telemetry
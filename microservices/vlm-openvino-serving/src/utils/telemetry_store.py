@@ -1,62 +1,216 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-"""Simple file-backed telemetry store shared across Gunicorn workers."""
+"""SQLite-backed telemetry store shared across Gunicorn workers.
 
-import fcntl
+Records are handed to a background writer thread, so ``append`` is a constant-time queue put
+and never blocks a completion on disk I/O or on another worker's lock. The writer commits
+batches to an SQLite database in WAL mode: workers append concurrently while readers query an
+indexed table without blocking writers. Retention is bounded by ``VLM_TELEMETRY_MAX_RECORDS``
+and, optionally, ``VLM_TELEMETRY_MAX_AGE_HOURS``.
+"""
+
+import atexit
 import json
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from src.utils.common import settings
+from src.utils.common import logger, settings
 
 _DEFAULT_PATH = Path(settings.VLM_TELEMETRY_PATH)
 _MAX_RECORDS = settings.VLM_TELEMETRY_MAX_RECORDS
+_MAX_AGE_HOURS = settings.VLM_TELEMETRY_MAX_AGE_HOURS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS telemetry (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS telemetry_ts ON telemetry (ts);
+CREATE INDEX IF NOT EXISTS telemetry_status_seq ON telemetry (status, seq);
+"""
+
+
+def _to_epoch(timestamp: Any) -> float:
+    """Convert an ISO-8601 timestamp (``Z`` suffix allowed) or datetime to epoch seconds."""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return time.time()
 
 
 class TelemetryStore:
-    """Append-only JSONL store with file locking and bounded history."""
+    """Append-only telemetry log with bounded retention, filtering and pagination."""
 
-    def __init__(self, path: Path | None = None, max_records: int = _MAX_RECORDS):
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_records: int = _MAX_RECORDS,
+        max_age_hours: Optional[float] = _MAX_AGE_HOURS,
+        batch_size: int = 64,
+    ):
         """Configure on-disk storage location and retention budget."""
-        self.path = path or _DEFAULT_PATH
+        path = Path(path or _DEFAULT_PATH)
+        # Deployments configured for the former JSONL file keep working with a sibling database
+        self.path = path.with_suffix(".db") if path.suffix == ".jsonl" else path
         self.max_records = max_records
+        self.max_age_hours = max_age_hours
+        self.batch_size = batch_size
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._local = threading.local()
 
-    def _ensure_parent(self) -> None:
-        """Create parent directories for the telemetry file if needed."""
-        self.path.parent.mkdir(parents=True, exist_ok=True)
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the database on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
 
     def append(self, record: Dict[str, Any]) -> None:
-        """Append a telemetry record and keep only the most recent entries."""
+        """Queue a telemetry record for the background writer."""
+        with self._idle:
+            self._pending += 1
+        self._ensure_writer()
+        self._queue.put(record)
 
-        self._ensure_parent()
-        serialized = json.dumps(record, ensure_ascii=False)
-        with open(self.path, "a+", encoding="utf-8") as handle:
-            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="telemetry-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
             try:
-                handle.seek(0)
-                lines = [line.rstrip("\n") for line in handle.readlines() if line.strip()]
-                lines.append(serialized)
-                if len(lines) > self.max_records:
-                    lines = lines[-self.max_records :]
-                handle.seek(0)
-                handle.truncate()
-                handle.write("\n".join(lines))
-                handle.write("\n")
+                if records:
+                    self._write_batch(records)
+            except Exception as exc:  # pragma: no cover - defensive guard
+                logger.warning("Failed to persist %d telemetry records: %s", len(records), exc)
             finally:
-                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                with self._idle:
+                    self._pending -= len(records)
+                    self._idle.notify_all()
+            if None in batch:
+                return
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        conn = self._connect()
+        rows = [
+            (
+                str(record.get("id", "")),
+                _to_epoch(record.get("timestamp")),
+                str(record.get("status", "")),
+                json.dumps(record, ensure_ascii=False),
+            )
+            for record in records
+        ]
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO telemetry (id, ts, status, record) VALUES (?, ?, ?, ?)", rows
+            )
+            # Sequence numbers are dense, so the cut-off is an indexed range delete
+            conn.execute(
+                "DELETE FROM telemetry WHERE seq <= (SELECT MAX(seq) FROM telemetry) - ?",
+                (self.max_records,),
+            )
+            if self.max_age_hours:
+                conn.execute(
+                    "DELETE FROM telemetry WHERE ts < ?",
+                    (time.time() - self.max_age_hours * 3600,),
+                )
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until records queued by this process are written."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def query(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return matching entries newest first and the cursor for the next page.
+
+        Args:
+            limit: Maximum number of entries to return (defaults to the retention limit).
+            cursor: Return only entries older than this cursor (from a previous page).
+            status: Only entries with this status (for example ``success``).
+            since / until: Inclusive time range on the record timestamp.
+        """
+        self.flush()
+        if not self.path.exists():
+            return [], None
+        limit = limit or self.max_records
+        clauses, params = [], []
+        if cursor is not None:
+            clauses.append("seq < ?")
+            params.append(cursor)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(_to_epoch(since))
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(_to_epoch(until))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT seq, record FROM telemetry {where} ORDER BY seq DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [json.loads(record) for _, record in rows[:limit]], next_cursor
 
     def read_all(self) -> List[Dict[str, Any]]:
         """Return stored telemetry entries (oldest first)."""
+        entries, _ = self.query()
+        return list(reversed(entries))
 
-        if not self.path.exists():
-            return []
-        with open(self.path, "r", encoding="utf-8") as handle:
-            fcntl.flock(handle.fileno(), fcntl.LOCK_SH)
-            try:
-                return [json.loads(line) for line in handle if line.strip()]
-            finally:
-                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    def close(self) -> None:
+        """Drain pending writes and stop the writer thread."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5)
 
 
 telemetry_store = TelemetryStore()
+atexit.register(telemetry_store.close)
@@ -1,13 +1,17 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import base64
 import os
 import random
+import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import aiohttp
 import numpy as np
@@ -27,6 +31,7 @@ from optimum.utils.save_utils import maybe_load_preprocessors
 from PIL import Image
 from src.utils.common import ErrorMessages, ModelNames, logger, settings
 from src.utils.data_models import MessageContentVideoUrl
+from src.utils.image_cache import content_key, image_cache
 from transformers import AutoTokenizer
 
 # Only include proxies if they are defined
@@ -169,10 +174,130 @@ def convert_model(
         raise RuntimeError(f"Error occurred during model conversion: {e}")
 
 
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_http_semaphore: Optional[asyncio.Semaphore] = None
+_decode_executor = ThreadPoolExecutor(
+    max_workers=settings.VLM_IMAGE_DECODE_WORKERS, thread_name_prefix="vlm-media-decode"
+)
+
+
+async def run_media_task(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking image/video decoding on the media worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_decode_executor, partial(fn, *args, **kwargs))
+
+
+def _get_http_session() -> Tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+    """Return the pooled HTTP session and fetch limiter bound to the running event loop."""
+    global _http_session, _http_session_loop, _http_semaphore
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        if _http_session is not None and not _http_session.closed:
+            # The loop that owned it is gone, so the session cannot be closed normally
+            _http_session.detach()
+        limit = settings.VLM_IMAGE_FETCH_CONCURRENCY
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=limit, limit_per_host=limit)
+        )
+        _http_session_loop = loop
+        _http_semaphore = asyncio.Semaphore(limit)
+    return _http_session, _http_semaphore
+
+
+async def close_http_session():
+    """Close the pooled HTTP session used for image downloads."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+def _proxy_for(url: str) -> Optional[str]:
+    """Return the configured proxy for a URL, honouring ``no_proxy``."""
+    if proxies.get("no_proxy"):
+        for no_proxy in proxies["no_proxy"].split(","):
+            if no_proxy in url:
+                return None
+    if url.startswith("https"):
+        return proxies.get("https")
+    if url.startswith("http"):
+        return proxies.get("http")
+    return None
+
+
+def _decode_image(source: Union[bytes, str]) -> Tuple[Image.Image, ov.Tensor]:
+    """Decode raw bytes, a base64 data URI or a file path into a PIL image and its tensor."""
+    if isinstance(source, str) and source.startswith("data:image/jpeg;base64,"):
+        source = base64.b64decode(source.split(",")[1])
+    image = Image.open(BytesIO(source) if isinstance(source, bytes) else source)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    else:
+        image.load()
+    return image, pil_image_to_ov_tensor(image)
+
+
+async def _load_image(image_url_or_file: str) -> Tuple[Image.Image, ov.Tensor]:
+    """Fetch (if remote), decode and cache a single image."""
+    loop = asyncio.get_running_loop()
+    try:
+        logger.info(
+            f"Loading image from: {image_url_or_file if not image_url_or_file.startswith('data:image/jpeg;base64') else 'base64 image'}"
+        )
+        cache_key = image_cache.source_key(str(image_url_or_file))
+        cached = image_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if str(image_url_or_file).startswith("http"):
+            proxy = _proxy_for(image_url_or_file)
+            logger.debug(f"Using proxy: {proxy}")
+            session, semaphore = _get_http_session()
+            async with semaphore:
+                async with session.get(
+                    image_url_or_file, proxy=proxy, allow_redirects=True
+                ) as response:
+                    response.raise_for_status()  # Raise an HTTPError for bad responses
+                    source = await response.read()
+            # Identical content behind a different URL still skips decoding
+            cache_key = content_key(source)
+            image_cache.remember_url(image_url_or_file, cache_key)
+            cached = image_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        else:
+            source = image_url_or_file
+
+        image, image_tensor = await loop.run_in_executor(
+            _decode_executor, _decode_image, source
+        )
+        image_cache.put(cache_key, (image, image_tensor))
+        return image, image_tensor
+    except aiohttp.ClientError as e:
+        logger.error(f"{ErrorMessages.REQUEST_ERROR}: {e}")
+        raise RuntimeError(f"{ErrorMessages.REQUEST_ERROR}: {e}")
+    except base64.binascii.Error as e:
+        if "Incorrect padding" in str(e):
+            logger.error(f"Invalid input: {e}")
+            raise ValueError("Invalid input: Incorrect padding in base64 data")
+        else:
+            logger.error(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
+            raise RuntimeError(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
+    except Exception as e:
+        logger.error(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
+        raise RuntimeError(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
+
+
 async def load_images(image_urls_or_files: List[str]):
     """
     Load images from URLs, base64 strings, or file paths.
 
+    Remote images are fetched concurrently over a pooled session (at most
+    ``VLM_IMAGE_FETCH_CONCURRENCY`` at a time) and decoded on a thread pool, so
+    multi-frame requests are bound by bandwidth rather than per-image latency.
+    Repeated sources within a request are loaded once.
+
     Args:
         image_urls_or_files (List[str]): A list of image sources (URLs, base64 strings, or file paths).
 
@@ -183,65 +308,21 @@ async def load_images(image_urls_or_files: List[str]):
         RuntimeError: If an error occurs while loading an image.
         ValueError: If the base64 data is invalid.
     """
-    images = []
-    image_tensors = []
-    for image_url_or_file in image_urls_or_files:
-        try:
-            logger.info(
-                f"Loading image from: {image_url_or_file if not image_url_or_file.startswith('data:image/jpeg;base64') else 'base64 image'}"
-            )
-            use_proxy = True
-            if proxies.get("no_proxy"):
-                no_proxy_list = proxies["no_proxy"].split(",")
-                for no_proxy in no_proxy_list:
-                    if no_proxy in image_url_or_file:
-                        use_proxy = False
-                        break
-
-            if str(image_url_or_file).startswith("http"):
-                proxy = proxies.get("http") if use_proxy else None
-            elif str(image_url_or_file).startswith("https"):
-                proxy = proxies.get("https") if use_proxy else None
-            else:
-                proxy = None
-
-            if str(image_url_or_file).startswith("http") or str(
-                image_url_or_file
-            ).startswith("https"):
-                logger.debug(f"Using proxy: {proxy}")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        image_url_or_file, proxy=proxy, allow_redirects=True
-                    ) as response:
-                        response.raise_for_status()  # Raise an HTTPError for bad responses
-                        image = Image.open(BytesIO(await response.read())).convert(
-                            "RGB"
-                        )
-            elif str(image_url_or_file).startswith("data:image/jpeg;base64,"):
-                decoded_image = base64.b64decode(image_url_or_file.split(",")[1])
-                image = Image.open(BytesIO(decoded_image)).convert("RGB")
-            else:
-                image = Image.open(image_url_or_file).convert("RGB")
-            image_data = (
-                np.array(image.getdata())
-                .reshape(1, image.size[1], image.size[0], 3)
-                .astype(np.byte)
-            )
-            images.append(image)
-            image_tensors.append(ov.Tensor(image_data))
-        except aiohttp.ClientError as e:
-            logger.error(f"{ErrorMessages.REQUEST_ERROR}: {e}")
-            raise RuntimeError(f"{ErrorMessages.REQUEST_ERROR}: {e}")
-        except base64.binascii.Error as e:
-            if "Incorrect padding" in str(e):
-                logger.error(f"Invalid input: {e}")
-                raise ValueError("Invalid input: Incorrect padding in base64 data")
-            else:
-                logger.error(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
-                raise RuntimeError(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
-        except Exception as e:
-            logger.error(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
-            raise RuntimeError(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
+    if not image_urls_or_files:
+        return [], []
+    tasks = {
+        source: asyncio.ensure_future(_load_image(source))
+        for source in dict.fromkeys(image_urls_or_files)
+    }
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    loaded = [tasks[source].result() for source in image_urls_or_files]
+    images = [image for image, _ in loaded]
+    image_tensors = [tensor for _, tensor in loaded]
     return images, image_tensors
 
 
@@ -457,6 +538,156 @@ def decode_and_save_video(base64_video: str, output_dir: Path = Path("/tmp")) ->
         raise RuntimeError(f"Error decoding and saving video: {e}")
 
 
+INLINE_VIDEO_URL = "data:video/mp4;base64"
+
+
+class InMemoryVideo:
+    """A base64-encoded video kept in memory for the lifetime of one request.
+
+    Frames are sampled straight from the decoded bytes (see ``sample_video_frames``). Readers
+    that need a filesystem path get one backed by an anonymous ``memfd`` (RAM, never written
+    to disk); where ``memfd_create`` is unavailable a temporary file is used instead. Either
+    way everything is released by ``close()``, which the request handler calls when done.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._fd: Optional[int] = None
+        self._temp_path: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        """Filesystem path to the video, created on first access."""
+        if self._fd is not None:
+            return f"/proc/self/fd/{self._fd}"
+        if self._temp_path is not None:
+            return self._temp_path
+        if hasattr(os, "memfd_create"):
+            self._fd = os.memfd_create("vlm-video")
+            os.write(self._fd, self.data)
+            return f"/proc/self/fd/{self._fd}"
+        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as handle:
+            handle.write(self.data)
+        self._temp_path = handle.name
+        return self._temp_path
+
+    def close(self) -> None:
+        """Release the video bytes and any memfd or temporary file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._temp_path is not None:
+            try:
+                os.remove(self._temp_path)
+            except OSError as e:
+                logger.error(f"Failed to delete temporary video file: {e}")
+            self._temp_path = None
+        self.data = b""
+
+    def __enter__(self) -> "InMemoryVideo":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def decode_video_in_memory(base64_video: str) -> InMemoryVideo:
+    """
+    Decode a base64-encoded video without writing it to disk.
+
+    Args:
+        base64_video (str): The base64-encoded video string (``data:video/mp4;base64,...``).
+
+    Returns:
+        InMemoryVideo: The decoded video; call ``close()`` (or use it as a context manager)
+        once the request no longer needs it.
+
+    Raises:
+        ValueError: If the base64 data is invalid.
+    """
+    try:
+        return InMemoryVideo(base64.b64decode(base64_video.split(",")[1]))
+    except (base64.binascii.Error, IndexError) as e:
+        logger.error(f"Invalid base64 video data: {e}")
+        raise ValueError("Invalid base64 video data")
+
+
+def sample_video_frames(
+    video: InMemoryVideo,
+    fps: Optional[float] = None,
+    max_pixels: Optional[int] = None,
+    max_frames: Optional[int] = None,
+) -> Tuple[List[Image.Image], float, float]:
+    """Decode only the frames a Qwen model samples from an in-memory video.
+
+    Frames are decoded sequentially from the byte stream; only the sampled ones are converted
+    (downscaled to ``max_pixels`` when given) and kept, so memory stays proportional to the
+    number of sampled frames instead of the video length. The frame count follows
+    ``qwen_vl_utils`` (``fps`` sampling clamped to its frame limits).
+
+    Args:
+        video (InMemoryVideo): Decoded video bytes.
+        fps (float | None): Sampling rate in frames per second (Qwen default when ``None``).
+        max_pixels (int | None): Upper bound on pixels per sampled frame.
+        max_frames (int | None): Upper bound on the number of sampled frames.
+
+    Returns:
+        Tuple[List[Image.Image], float, float]: Sampled RGB frames, the source frame rate
+        and the effective sampling rate.
+
+    Raises:
+        RuntimeError: If the video cannot be decoded.
+    """
+    import av
+    from qwen_vl_utils.vision_process import smart_nframes
+
+    try:
+        with av.open(BytesIO(video.data)) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            video_fps = float(stream.average_rate or stream.guessed_rate or 30)
+            total_frames = stream.frames
+            if not total_frames:
+                if stream.duration is not None and stream.time_base is not None:
+                    duration = float(stream.duration * stream.time_base)
+                else:
+                    duration = (container.duration or 0) / av.time_base
+                total_frames = max(1, int(round(duration * video_fps)))
+            sampling = {"fps": float(fps)} if fps else {}
+            if max_frames:
+                sampling["max_frames"] = max_frames
+            nframes = smart_nframes(sampling, total_frames=total_frames, video_fps=video_fps)
+            indices = np.linspace(0, total_frames - 1, nframes).round().astype(int)
+            wanted: Dict[int, int] = {}
+            for index in indices:
+                wanted[int(index)] = wanted.get(int(index), 0) + 1
+            last_wanted = max(wanted)
+
+            frames: List[Image.Image] = []
+            size = None
+            for index, frame in enumerate(container.decode(stream)):
+                if index in wanted:
+                    if size is None:
+                        size = (frame.width, frame.height)
+                        if max_pixels and frame.width * frame.height > max_pixels:
+                            scale = (max_pixels / (frame.width * frame.height)) ** 0.5
+                            size = (max(1, int(frame.width * scale)), max(1, int(frame.height * scale)))
+                    image = frame.to_image(width=size[0], height=size[1])
+                    frames.extend([image] * wanted[index])
+                if index >= last_wanted:
+                    break
+    except Exception as e:
+        logger.error(f"Error decoding video: {e}")
+        raise RuntimeError(f"Error decoding video: {e}")
+
+    if not frames:
+        raise RuntimeError("Error decoding video: no frames could be decoded")
+    # Container frame counts can overstate the decodable frames; repeat the last one
+    frames.extend([frames[-1]] * (nframes - len(frames)))
+    sample_fps = nframes / max(total_frames, 1e-6) * video_fps
+    return frames, video_fps, sample_fps
+
+
 def pil_image_to_ov_tensor(image: Image.Image) -> ov.Tensor:
     """Convert a PIL RGB image into an OpenVINO tensor with NHWC layout.
 
@@ -472,11 +703,13 @@ def pil_image_to_ov_tensor(image: Image.Image) -> ov.Tensor:
         ValueError: If the supplied image does not have three dimensions after
             RGB conversion.
     """
-    image_data = np.array(image.convert("RGB"))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    # One copy out of the PIL buffer; the tensor then shares that memory.
+    image_data = np.array(image, dtype=np.uint8)
     if image_data.ndim != 3:
         raise ValueError("Expected an RGB image when converting to OpenVINO tensor.")
-    tensor_data = image_data.reshape(1, image_data.shape[0], image_data.shape[1], image_data.shape[2])
-    return ov.Tensor(tensor_data.astype(np.uint8))
+    return ov.Tensor(image_data[np.newaxis], shared_memory=True)
 
 
 def convert_qwen_image_inputs(
@@ -497,6 +730,53 @@ def convert_qwen_image_inputs(
     return [pil_image_to_ov_tensor(image) for image in image_inputs]
 
 
+def load_qwen_image_tensors(
+    image_urls: Sequence[str],
+    process_vision: Callable[[List[Dict[str, Any]]], Any],
+) -> Optional[List[ov.Tensor]]:
+    """Resolve Qwen image sources to tensors, reusing cached preprocessing results.
+
+    Only the images missing from the cache are passed to ``process_vision`` (normally
+    `qwen_vl_utils.process_vision_info`) in a single call.
+
+    Args:
+        image_urls (Sequence[str]): Image sources in prompt order.
+        process_vision (Callable): Function turning Qwen chat messages into
+            `(image_inputs, video_inputs)`.
+
+    Returns:
+        list[ov.Tensor] | None: One tensor per image, or `None` if no images were given.
+    """
+    if not image_urls:
+        return None
+    namespace = "qwen"
+    keys = [image_cache.source_key(str(url), namespace) for url in image_urls]
+    tensors = [image_cache.get(key) for key in keys]
+    missing = [i for i, tensor in enumerate(tensors) if tensor is None]
+    if missing:
+        messages = [
+            {
+                "role": "user",
+                "content": [{"type": "image", "image": image_urls[i]} for i in missing],
+            }
+        ]
+        image_inputs, _ = process_vision(messages)
+        fresh = convert_qwen_image_inputs(image_inputs) or []
+        for i, tensor in zip(missing, fresh):
+            key = keys[i]
+            url = str(image_urls[i])
+            if key is None and url.startswith(("http://", "https://")):
+                # process_vision downloads remote images itself, so their content cannot
+                # be hashed here. Key them by URL, and only while the URL mapping is kept
+                # (VLM_IMAGE_CACHE_URL_TTL_SEC): otherwise the entry could never be hit.
+                key = content_key(url, "qwen-url")
+                if not image_cache.remember_url(url, key, namespace):
+                    key = None
+            image_cache.put(key, tensor)
+            tensors[i] = tensor
+    return tensors
+
+
 def _video_tensor_to_numpy(video_tensor: Union[torch.Tensor, np.ndarray]) -> np.ndarray:
     """Convert a torch or numpy video tensor to a THWC numpy array.
 
@@ -578,16 +858,18 @@ async def convert_frame_urls_to_video_tensors(
     if not video_frame_groups:
         return []
 
+    groups = [list(frame_urls) for frame_urls in video_frame_groups if frame_urls]
+    # Fetch every frame of every clip together so downloads overlap across clips.
+    _, frame_tensors = await load_images([url for group in groups for url in group])
+
     video_tensors: List[ov.Tensor] = []
-    for frame_urls in video_frame_groups:
-        if not frame_urls:
-            continue
-        images, _ = await load_images(list(frame_urls))
-        frame_arrays = [np.array(image.convert("RGB")) for image in images]
-        if not frame_arrays:
-            continue
-        stacked = np.stack(frame_arrays, axis=0).astype(np.uint8)
-        video_tensors.append(ov.Tensor(stacked))
+    offset = 0
+    for group in groups:
+        frames = frame_tensors[offset : offset + len(group)]
+        offset += len(group)
+        # Each frame tensor is (1, H, W, 3); concatenating them is the only copy.
+        stacked = np.concatenate([frame.data for frame in frames], axis=0)
+        video_tensors.append(ov.Tensor(stacked, shared_memory=True))
     return video_tensors
 
 
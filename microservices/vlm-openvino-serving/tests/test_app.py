@@ -202,9 +202,9 @@ def test_chat_completions_image_loading_error(mock_load_images):
 
 
 @mock.patch(
-    "src.app.decode_and_save_video", side_effect=RuntimeError("Video decoding error")
+    "src.app.decode_video_in_memory", side_effect=RuntimeError("Video decoding error")
 )
-def test_chat_completions_video_decoding_error(mock_decode_and_save_video):
+def test_chat_completions_video_decoding_error(mock_decode_video_in_memory):
     with mock.patch("src.app.settings.VLM_MODEL_NAME", "Qwen/Qwen2.5-VL-7B-Instruct"):
         from src.app import app  # Re-import app with updated settings
 
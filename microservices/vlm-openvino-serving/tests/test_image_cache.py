@@ -0,0 +1,113 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import base64
+import os
+from io import BytesIO
+from unittest import mock
+
+mock.patch.dict(
+    os.environ,
+    {
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_DEVICE": "CPU",
+    },
+).start()
+
+import numpy as np
+import pytest
+from PIL import Image
+from src.utils import utils
+from src.utils.image_cache import ImageCache, content_key
+from src.utils.utils import load_images, load_qwen_image_tensors
+
+
+def _jpeg_data_uri(color):
+    buffer = BytesIO()
+    Image.new("RGB", (8, 4), color).save(buffer, format="JPEG")
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+@pytest.fixture
+def fresh_cache(mocker):
+    cache = ImageCache(max_bytes=1024 * 1024)
+    mocker.patch.object(utils, "image_cache", cache)
+    return cache
+
+
+def test_image_cache_evicts_least_recently_used():
+    cache = ImageCache(max_bytes=100)
+    cache.put("a", "A", nbytes=40)
+    cache.put("b", "B", nbytes=40)
+    assert cache.get("a") == "A"  # "b" is now least recently used
+    cache.put("c", "C", nbytes=40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 80
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+
+def test_image_cache_disabled_with_zero_budget():
+    cache = ImageCache(max_bytes=0)
+    cache.put("a", np.zeros(4, dtype=np.uint8))
+    assert cache.get("a") is None
+    assert cache.stats()["enabled"] is False
+
+
+def test_image_cache_url_mapping_expires(mocker):
+    cache = ImageCache(max_bytes=1024, url_ttl_sec=10)
+    clock = mocker.patch("src.utils.image_cache.time.monotonic", return_value=100.0)
+    cache.remember_url("http://host/frame.jpg", "key")
+    assert cache.source_key("http://host/frame.jpg") == "key"
+    clock.return_value = 111.0
+    assert cache.source_key("http://host/frame.jpg") is None
+
+
+def test_load_images_reuses_cached_tensor(fresh_cache, mocker):
+    data_uri = _jpeg_data_uri("red")
+    open_spy = mocker.spy(utils.Image, "open")
+
+    first_images, first_tensors = asyncio.run(load_images([data_uri]))
+    second_images, second_tensors = asyncio.run(load_images([data_uri, data_uri]))
+
+    assert open_spy.call_count == 1
+    assert second_tensors[0] is first_tensors[0]
+    assert second_images[1] is first_images[0]
+    # Repeated sources within one request are looked up once
+    assert fresh_cache.stats()["hits"] == 1
+
+
+def test_load_qwen_image_tensors_only_processes_misses(fresh_cache):
+    cached_uri = _jpeg_data_uri("red")
+    new_uri = _jpeg_data_uri("blue")
+    cached_tensor = object()
+    fresh_cache.put(content_key(cached_uri, "qwen"), cached_tensor, nbytes=10)
+    process_vision = mock.Mock(return_value=([Image.new("RGB", (8, 4), "blue")], None))
+
+    tensors = load_qwen_image_tensors([cached_uri, new_uri], process_vision)
+
+    assert tensors[0] is cached_tensor
+    assert tuple(tensors[1].shape) == (1, 4, 8, 3)
+    messages = process_vision.call_args.args[0]
+    assert [item["image"] for item in messages[0]["content"]] == [new_uri]
+
+
+@pytest.mark.parametrize("url_ttl_sec, cached", [(0, False), (10, True)])
+def test_load_qwen_image_tensors_caches_urls_only_with_ttl(mocker, url_ttl_sec, cached):
+    cache = ImageCache(max_bytes=1024 * 1024, url_ttl_sec=url_ttl_sec)
+    mocker.patch.object(utils, "image_cache", cache)
+    url = "http://host/frame.jpg"
+    process_vision = mock.Mock(return_value=([Image.new("RGB", (8, 4), "blue")], None))
+
+    load_qwen_image_tensors([url], process_vision)
+    load_qwen_image_tensors([url], process_vision)
+
+    assert cache.stats()["entries"] == (1 if cached else 0)
+    assert process_vision.call_count == (1 if cached else 2)
@@ -0,0 +1,103 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+from unittest import mock
+
+mock.patch.dict(
+    os.environ,
+    {
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_DEVICE": "CPU",
+    },
+).start()
+
+import numpy as np
+from src.utils.prefix_cache import (
+    PrefixCacheTracker,
+    build_scheduler_config,
+    estimate_kv_bytes_per_token,
+    media_digest,
+)
+from src.utils.telemetry import build_usage_and_telemetry
+
+
+def test_tracker_reports_shared_prefix_blocks():
+    tracker = PrefixCacheTracker(block_size=4, capacity_tokens=64)
+    template = list(range(10))
+
+    assert tracker.observe(template + [100, 101]) == 0
+    # Two full blocks (8 tokens) of the template are shared; the partial block is not.
+    assert tracker.observe(template + [200, 201, 202]) == 8
+    # An identical prompt still recomputes its last token.
+    assert tracker.observe(list(range(8))) == 7
+
+    stats = tracker.stats()
+    assert stats["requests"] == 3
+    assert stats["prefill_tokens_saved"] == 15
+
+
+def test_tracker_does_not_share_blocks_across_media():
+    tracker = PrefixCacheTracker(block_size=4, capacity_tokens=64)
+    prompt = list(range(12))
+    first = media_digest([np.zeros((1, 2, 2, 3), dtype=np.uint8)])
+    second = media_digest([np.ones((1, 2, 2, 3), dtype=np.uint8)])
+
+    tracker.observe(prompt, first)
+    assert tracker.observe(prompt, second) == 0
+    assert tracker.observe(prompt, first) == 11
+
+
+def test_tracker_evicts_least_recently_used_prefixes():
+    tracker = PrefixCacheTracker(block_size=2, capacity_tokens=4)
+    tracker.observe([1, 2, 3, 4])
+    tracker.observe([5, 6, 7, 8])  # evicts both blocks of the first prompt
+
+    assert tracker.observe([1, 2, 3, 4, 9]) == 0
+
+
+def test_estimate_kv_bytes_per_token_reads_text_config(tmp_path):
+    config = {
+        "text_config": {
+            "num_hidden_layers": 28,
+            "num_attention_heads": 16,
+            "num_key_value_heads": 8,
+            "hidden_size": 2048,
+        }
+    }
+    (tmp_path / "config.json").write_text(json.dumps(config))
+
+    assert estimate_kv_bytes_per_token(tmp_path) == 2 * 28 * 8 * 128 * 2
+
+
+def test_build_scheduler_config_sets_prefix_caching():
+    assert build_scheduler_config(True).enable_prefix_caching is True
+    assert build_scheduler_config(False).enable_prefix_caching is False
+
+
+def test_build_usage_and_telemetry_reports_prefill_tokens_saved():
+    pair = mock.Mock(mean=1.0, std=0.0)
+    perf_metrics = mock.Mock(
+        **{
+            f"{getter}.return_value": pair
+            for getter in (
+                "get_throughput",
+                "get_ttft",
+                "get_tpot",
+                "get_generate_duration",
+                "get_tokenization_duration",
+                "get_detokenization_duration",
+                "get_prepare_embeddings_duration",
+            )
+        }
+    )
+    perf_metrics.get_load_time.return_value = 5.0
+    perf_metrics.get_num_input_tokens.return_value = 120
+    perf_metrics.get_num_generated_tokens.return_value = 10
+
+    usage, telemetry = build_usage_and_telemetry(perf_metrics, prefill_tokens_saved=96)
+
+    assert usage.prompt_tokens_details == {"cached_tokens": 96}
+    assert telemetry.prefill_tokens_saved == 96
+    assert build_usage_and_telemetry(perf_metrics)[0].prompt_tokens_details is None
@@ -0,0 +1,240 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import os
+import threading
+import time
+from unittest import mock
+
+mock.patch.dict(
+    os.environ,
+    {
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_DEVICE": "CPU",
+    },
+).start()
+
+import openvino_genai as ov_genai
+import pytest
+from openvino_genai import py_openvino_genai
+from src.utils.scheduler import (
+    ContinuousBatchingAdapter,
+    DeadlineExceededError,
+    GenerationControl,
+    GenerationScheduler,
+    QueueFullError,
+)
+
+
+def test_scheduler_runs_higher_priority_first():
+    async def scenario():
+        scheduler = GenerationScheduler(workers=1, max_queue_size=8)
+        gate = threading.Event()
+        order = []
+        blocker = scheduler.submit(gate.wait)
+        await asyncio.sleep(0.05)  # let the worker pick up the blocking job
+        low = scheduler.submit(lambda: order.append("low"), priority=0)
+        high = scheduler.submit(lambda: order.append("high"), priority=5)
+        gate.set()
+        await asyncio.gather(blocker, low, high)
+        return order, scheduler.status()
+
+    order, status = asyncio.run(scenario())
+    assert order == ["high", "low"]
+    assert status["completed"] == 3
+    assert status["queued_requests"] == 0
+
+
+def test_scheduler_rejects_when_queue_full():
+    async def scenario():
+        scheduler = GenerationScheduler(workers=1, max_queue_size=1)
+        gate = threading.Event()
+        running = scheduler.submit(gate.wait)
+        await asyncio.sleep(0.05)
+        queued = scheduler.submit(lambda: None)
+        with pytest.raises(QueueFullError):
+            scheduler.submit(lambda: None)
+        gate.set()
+        await asyncio.gather(running, queued)
+        return scheduler.status()
+
+    status = asyncio.run(scenario())
+    assert status["rejected"] == 1
+
+
+def test_scheduler_drops_expired_jobs():
+    async def scenario():
+        scheduler = GenerationScheduler(workers=1, max_queue_size=4)
+        gate = threading.Event()
+        running = scheduler.submit(gate.wait)
+        await asyncio.sleep(0.05)
+        discarded = []
+        expired = scheduler.submit(
+            lambda: "never runs",
+            control=GenerationControl(deadline=time.monotonic() + 0.01),
+            on_discard=discarded.append,
+        )
+        await asyncio.sleep(0.05)
+        gate.set()
+        await running
+        with pytest.raises(DeadlineExceededError):
+            await expired
+        return discarded, scheduler.status()
+
+    discarded, status = asyncio.run(scenario())
+    assert len(discarded) == 1
+    assert status["expired"] == 1
+
+
+def test_generation_control_streaming_status():
+    control = GenerationControl()
+    assert control.streaming_status() == ov_genai.StreamingStatus.RUNNING
+    control.cancel()
+    assert control.streaming_status() == ov_genai.StreamingStatus.STOP
+
+
+class _FakeHandle:
+    def __init__(self, tokens):
+        self._pending = list(tokens)
+        self._ready = []
+        self.stopped = False
+
+    def advance(self):
+        if self._pending and not self.stopped:
+            self._ready.append(self._pending.pop(0))
+
+    def can_read(self):
+        return bool(self._ready)
+
+    def read(self):
+        token, self._ready = self._ready[0], self._ready[1:]
+        return {0: mock.Mock(generated_ids=[token])}
+
+    def get_status(self):
+        status = py_openvino_genai.GenerationStatus
+        if self.stopped:
+            return status.STOP
+        return status.RUNNING if self._pending else status.FINISHED
+
+    def stop(self):
+        self.stopped = True
+
+    def drop(self):
+        self.stopped = True
+        self.dropped = True
+
+
+class _FakeContinuousBatchingPipeline:
+    """Emits one token per step for every active request."""
+
+    def __init__(self, expected_requests=1):
+        self.handles = []
+        self.steps = 0
+        self.expected_requests = expected_requests
+        self.all_added = threading.Event()
+
+    def add_request(self, request_id, prompt, *args):
+        handle = _FakeHandle([ord(c) for c in prompt])
+        self.handles.append(handle)
+        if len(self.handles) >= self.expected_requests:
+            self.all_added.set()
+        return handle
+
+    def step(self):
+        # Hold the first step until every test request is submitted.
+        self.all_added.wait(timeout=2)
+        self.steps += 1
+        for handle in self.handles:
+            handle.advance()
+
+
+def test_continuous_batching_adapter_interleaves_requests():
+    tokenizer = mock.Mock()
+    tokenizer.decode.side_effect = lambda ids: "".join(chr(i) for i in ids)
+    pipeline = _FakeContinuousBatchingPipeline(expected_requests=2)
+    adapter = ContinuousBatchingAdapter(pipeline, tokenizer=tokenizer)
+
+    streamed = {"abcd": [], "wxyz": []}
+    results = {}
+
+    def worker(prompt):
+        results[prompt] = adapter.generate(
+            prompt, generation_config=mock.Mock(), streamer=streamed[prompt].append
+        )
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in streamed]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results["abcd"].texts == ["abcd"]
+    assert results["wxyz"].texts == ["wxyz"]
+    assert "".join(streamed["abcd"]) == "abcd"
+    assert results["abcd"].perf_metrics.get_num_generated_tokens() == 4
+    # Both requests were served by shared steps rather than one after the other.
+    assert pipeline.steps < 8
+
+
+def test_continuous_batching_adapter_stops_on_streamer_request():
+    tokenizer = mock.Mock()
+    tokenizer.decode.side_effect = lambda ids: "".join(chr(i) for i in ids)
+    adapter = ContinuousBatchingAdapter(_FakeContinuousBatchingPipeline(), tokenizer=tokenizer)
+
+    result = adapter.generate(
+        "abcdef",
+        generation_config=mock.Mock(),
+        streamer=lambda text: ov_genai.StreamingStatus.STOP,
+    )
+
+    assert result.texts == ["a"]
+
+
+def test_continuous_batching_adapter_decodes_stream_incrementally():
+    tokenizer = mock.Mock()
+    tokenizer.decode.side_effect = lambda ids: "".join(chr(i) for i in ids)
+    adapter = ContinuousBatchingAdapter(_FakeContinuousBatchingPipeline(), tokenizer=tokenizer)
+    prompt = "incremental streaming " * 10
+    streamed = []
+
+    result = adapter.generate(prompt, generation_config=mock.Mock(), streamer=streamed.append)
+
+    assert "".join(streamed) == prompt
+    assert result.texts == [prompt]
+    # Streaming decodes at most the previous and the new token; only the final text is decoded whole.
+    decoded_lengths = sorted(len(call.args[0]) for call in tokenizer.decode.call_args_list)
+    assert decoded_lengths[-1] == len(prompt)
+    assert decoded_lengths[-2] <= 2
+
+
+def test_continuous_batching_adapter_survives_failing_request():
+    tokenizer = mock.Mock()
+    tokenizer.decode.side_effect = lambda ids: "".join(chr(i) for i in ids)
+    pipeline = _FakeContinuousBatchingPipeline(expected_requests=2)
+    adapter = ContinuousBatchingAdapter(pipeline, tokenizer=tokenizer)
+    results = {}
+
+    def failing_streamer(text):
+        raise RuntimeError("client went away")
+
+    def worker(prompt, streamer):
+        try:
+            results[prompt] = adapter.generate(prompt, generation_config=mock.Mock(), streamer=streamer)
+        except RuntimeError as exc:
+            results[prompt] = exc
+
+    threads = [
+        threading.Thread(target=worker, args=("abcd", failing_streamer)),
+        threading.Thread(target=worker, args=("wxyz", None)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert isinstance(results["abcd"], RuntimeError)
+    assert pipeline.handles[0].dropped
+    assert results["wxyz"].texts == ["wxyz"]
+    # The step loop keeps serving later requests.
+    assert adapter.generate("ok", generation_config=mock.Mock()).texts == ["ok"]
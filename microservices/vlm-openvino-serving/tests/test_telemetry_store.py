@@ -0,0 +1,74 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from datetime import datetime, timezone
+from unittest import mock
+
+mock.patch.dict(
+    os.environ,
+    {
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_DEVICE": "CPU",
+    },
+).start()
+
+import pytest
+from src.utils.telemetry_store import TelemetryStore
+
+
+def _record(index, status="success"):
+    timestamp = datetime(2025, 1, 1, 0, index, tzinfo=timezone.utc)
+    return {
+        "id": f"req-{index}",
+        "timestamp": timestamp.isoformat().replace("+00:00", "Z"),
+        "status": status,
+        "request": {"message_count": 1, "media": {}, "parameters": {}},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TelemetryStore(path=tmp_path / "telemetry.db", max_records=5)
+    yield store
+    store.close()
+
+
+def test_append_keeps_newest_records(store):
+    for index in range(8):
+        store.append(_record(index))
+
+    assert [entry["id"] for entry in store.read_all()] == [f"req-{i}" for i in range(3, 8)]
+
+
+def test_query_filters_by_status_and_time(store):
+    for index in range(5):
+        store.append(_record(index, status="success" if index % 2 else "server_error"))
+
+    errors, _ = store.query(status="server_error")
+    assert [entry["id"] for entry in errors] == ["req-4", "req-2", "req-0"]
+
+    window, _ = store.query(
+        since=datetime(2025, 1, 1, 0, 1, tzinfo=timezone.utc),
+        until=datetime(2025, 1, 1, 0, 3, tzinfo=timezone.utc),
+    )
+    assert [entry["id"] for entry in window] == ["req-3", "req-2", "req-1"]
+
+
+def test_query_paginates_with_cursor(store):
+    for index in range(5):
+        store.append(_record(index))
+
+    first, cursor = store.query(limit=2)
+    second, cursor = store.query(limit=2, cursor=cursor)
+    third, last_cursor = store.query(limit=2, cursor=cursor)
+
+    assert [entry["id"] for entry in first + second + third] == [
+        f"req-{i}" for i in range(4, -1, -1)
+    ]
+    assert last_cursor is None
+
+
+def test_legacy_jsonl_path_maps_to_database(tmp_path):
+    store = TelemetryStore(path=tmp_path / "telemetry.jsonl")
+    assert store.path == tmp_path / "telemetry.db"
@@ -210,6 +210,75 @@ def test_load_images_general_error(mocker):
         asyncio.run(load_images(["http://example.com/image.jpg"]))
 
 
+class _FakeImageResponse:
+    """Async context manager standing in for an aiohttp response."""
+
+    active = 0
+    peak = 0
+
+    def __init__(self, body):
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self):
+        _FakeImageResponse.active += 1
+        _FakeImageResponse.peak = max(_FakeImageResponse.peak, _FakeImageResponse.active)
+        await asyncio.sleep(0.02)
+        _FakeImageResponse.active -= 1
+        return self.body
+
+
+def _png_bytes(color, size=(6, 4)):
+    from io import BytesIO
+
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_load_images_fetches_concurrently_and_keeps_order(mocker):
+    colors = {f"http://frames/{i}.png": (i * 20, 0, 0) for i in range(6)}
+    _FakeImageResponse.peak = 0
+    mocker.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=lambda url, **kwargs: _FakeImageResponse(_png_bytes(colors[url])),
+    )
+
+    images, tensors = asyncio.run(load_images(list(colors)))
+
+    assert _FakeImageResponse.peak > 1
+    assert [image.getpixel((0, 0)) for image in images] == list(colors.values())
+    assert tuple(tensors[0].shape) == (1, 4, 6, 3)
+    assert tensors[3].data[0, 0, 0, 0] == 60
+
+
+def test_convert_frame_urls_to_video_tensors_stacks_frames(mocker):
+    urls = [f"http://clip/{i}.png" for i in range(5)]
+    mocker.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=lambda url, **kwargs: _FakeImageResponse(
+            _png_bytes((0, int(url[-5]) * 10, 0))
+        ),
+    )
+
+    videos = asyncio.run(
+        utils_module.convert_frame_urls_to_video_tensors([urls[:3], [], urls[3:]])
+    )
+
+    assert [tuple(video.shape) for video in videos] == [(3, 4, 6, 3), (2, 4, 6, 3)]
+    assert videos[1].data[1, 0, 0, 1] == 40
+
+
 def test_get_device_property_invalid_device():
     assert get_device_property("INVALID_DEVICE") == {}
 
@@ -238,3 +307,58 @@ def test_decode_and_save_video_general_error(mocker):
         RuntimeError, match="Error decoding and saving video: Mocked general error"
     ):
         decode_and_save_video("data:video/mp4;base64,valid_data")
+
+
+def _encode_test_video(num_frames=20, fps=10, size=(64, 48)):
+    import av
+    import numpy as np
+    from io import BytesIO
+
+    buffer = BytesIO()
+    with av.open(buffer, mode="w", format="mp4") as container:
+        stream = container.add_stream("mpeg4", rate=fps)
+        stream.width, stream.height = size
+        stream.pix_fmt = "yuv420p"
+        for index in range(num_frames):
+            pixels = np.full((size[1], size[0], 3), index * 10, dtype=np.uint8)
+            frame = av.VideoFrame.from_ndarray(pixels, format="rgb24")
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+def test_sample_video_frames_decodes_only_sampled_frames():
+    data = _encode_test_video()
+    video = utils_module.decode_video_in_memory(
+        "data:video/mp4;base64," + base64.b64encode(data).decode()
+    )
+
+    frames, video_fps, sample_fps = utils_module.sample_video_frames(
+        video, fps=2, max_pixels=32 * 24
+    )
+
+    # 2 seconds at 2 fps, rounded to the Qwen frame factor
+    assert len(frames) == 4
+    assert video_fps == pytest.approx(10)
+    assert sample_fps == pytest.approx(2)
+    assert frames[0].size == (32, 24)
+    assert frames[-1].getpixel((0, 0))[0] > frames[0].getpixel((0, 0))[0]
+
+
+def test_in_memory_video_path_is_released_on_close():
+    data = _encode_test_video(num_frames=4)
+    with utils_module.InMemoryVideo(data) as video:
+        path = video.path
+        with open(path, "rb") as handle:
+            assert handle.read() == data
+    assert video.data == b""
+    assert video._fd is None and video._temp_path is None
+    if not path.startswith("/proc/self/fd/"):
+        assert not os.path.exists(path)
+
+
+def test_decode_video_in_memory_invalid_base64():
+    with pytest.raises(ValueError, match="Invalid base64 video data"):
+        utils_module.decode_video_in_memory("data:video/mp4;base64,invalid_data")
@@ -1,17 +1,17 @@
 from .config import config
 from .document import load_file_document
+from .faiss_store import PersistentFAISSStore
 from .logger import logger
 from langchain.retrievers import ContextualCompressionRetriever
-from langchain_community.vectorstores import FAISS
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 import os
 import importlib
-import pandas as pd
 
 vectorstore = None
+faiss_store = None
 
 # The RUN_TEST flag is used to bypass the model download and conversion steps during pytest unit testing.
 # If RUN_TEST is set to "True", the model download and conversion steps are skipped.
@@ -34,6 +34,19 @@ if os.getenv("RUN_TEST", "").lower() != "true":
 
     prompt = ChatPromptTemplate.from_template(template)
 
+    # Load the embeddings stored before the restart, no document is embedded again
+    faiss_store = PersistentFAISSStore(
+        config.VECTORSTORE_PATH,
+        embedding,
+        index_type=config.VECTORSTORE_INDEX_TYPE,
+        snapshot_interval=config._SNAPSHOT_INTERVAL,
+        snapshot_wal_bytes=config._SNAPSHOT_WAL_BYTES,
+        hnsw_m=config._HNSW_M,
+        ivf_min_vectors=config._IVF_MIN_VECTORS,
+        ivf_nprobe=config._IVF_NPROBE,
+    )
+    vectorstore = faiss_store.load()
+
 else:
     logger.info("Bypassing to mock these functions because RUN_TEST is set to 'True' to run pytest unit test.")
 
@@ -134,9 +147,8 @@ def create_faiss_vectordb(file_path: str = "", chunk_size=1000, chunk_overlap=20
     """
     Creates a FAISS vector database from a document file.
     This function loads a document from the specified file path, splits it into chunks,
-    creates embeddings for the chunks, and stores them in a FAISS vector database. If a
-    global vectorstore already exists, it merges the new embeddings into the existing
-    vectorstore.
+    creates embeddings for the chunks, and stores them in the persistent FAISS vector
+    database, creating the global vectorstore on the first document.
 
     Args:
         file_path (str): The path to the document file. Defaults to an empty string.
@@ -160,11 +172,8 @@ def create_faiss_vectordb(file_path: str = "", chunk_size=1000, chunk_overlap=20
         logger.error("No text data from the document.")
         return False
 
-    doc_embedding = FAISS.from_documents(documents=splits, embedding=embedding)
-    if vectorstore == None:
-        vectorstore = doc_embedding
-    else:
-        vectorstore.merge_from(doc_embedding)
+    faiss_store.add_documents(splits)
+    vectorstore = faiss_store.vectorstore
 
     return True
 
@@ -172,12 +181,12 @@ def create_faiss_vectordb(file_path: str = "", chunk_size=1000, chunk_overlap=20
 def get_document_from_vectordb():
     """
     Retrieve document names from the vector database.
-    This function accesses the global `vectorstore` object, extracts document
-    metadata, and returns a list of document names.
+    This function looks up the document names in the catalog of the global
+    `faiss_store`, without scanning the stored chunks.
 
     Returns:
         []: Return empty list if the `vectorstore` is None.
-        list: A list of document names extracted from the vector database.
+        list: A list of document names stored in the vector database.
     """
 
     global vectorstore
@@ -185,11 +194,7 @@ def get_document_from_vectordb():
     if vectorstore is None:
         return []
 
-    vstore = vectorstore.docstore._dict
-
-    docs = {vstore[key].metadata["source"].split("/")[-1] for key in vstore.keys()}
-
-    return list(docs)
+    return faiss_store.catalog.documents()
 
 
 def delete_embedding_from_vectordb(document: str = "", delete_all: bool = False):
@@ -209,29 +214,23 @@ def delete_embedding_from_vectordb(document: str = "", delete_all: bool = False)
     if vectorstore is None:
         return False
 
-    vstore = vectorstore.docstore._dict
-    data_rows = []
-
-    for key in vstore.keys():
-        doc_name = vstore[key].metadata["source"].split("/")[-1]
-        content = vstore[key].page_content
-        data_rows.append(
-            {
-                "chunk_id": key,
-                "document": doc_name,
-                "content": content,
-            }
-        )
-
-    vectordf = pd.DataFrame(data_rows)
-
     if delete_all:
         # delete all the embeddings in vectorstore
-        chunk_list = vectordf["chunk_id"].tolist()
+        chunk_list = list(vectorstore.index_to_docstore_id.values())
     else:
         # delete the specified document embeddings in vectorstore
-        chunk_list = vectordf.loc[vectordf["document"] == document]["chunk_id"].tolist()
+        chunk_list = faiss_store.catalog.chunk_ids(document)
 
-    vectorstore.delete(chunk_list)
+    faiss_store.delete(chunk_list)
 
     return True
+
+
+def close_vectordb():
+    """
+    Stops the background snapshots of the vector database and writes a final
+    snapshot, so the next start does not need to replay the log.
+    """
+
+    if faiss_store is not None:
+        faiss_store.close()
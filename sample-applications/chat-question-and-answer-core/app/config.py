@@ -25,12 +25,17 @@ class Settings(BaseSettings):
         EMBEDDING_MODEL_ID (str): Identifier for the embedding model.
         RERANKER_MODEL_ID (str): Identifier for the reranker model.
         LLM_MODEL_ID (str): Identifier for the large language model.
+        EMBEDDING_MODEL_REVISION (str): Revision (branch, tag or commit) of the embedding model to download.
+        RERANKER_MODEL_REVISION (str): Revision (branch, tag or commit) of the reranker model to download.
+        LLM_MODEL_REVISION (str): Revision (branch, tag or commit) of the large language model to download.
         PROMPT_TEMPLATE (str): Prompt template string for the LLM.
         EMBEDDING_DEVICE (str): Device for embedding model ('CPU', etc.).
         RERANKER_DEVICE (str): Device for reranker model ('CPU', etc.).
         LLM_DEVICE (str): Device for LLM ('CPU', etc.).
         MAX_TOKENS (int): Maximum number of tokens for LLM responses.
         KEEP_ALIVE (Union[str, int, None]): Keep-alive setting for the application.
+        VECTORSTORE_PATH (str): Directory where the vectorstore is persisted.
+        VECTORSTORE_INDEX_TYPE (str): FAISS index type of the vectorstore ('flat', 'hnsw' or 'ivf').
 
     Private Attributes:
         _ENABLE_RERANK (bool): Whether reranking is enabled.
@@ -38,7 +43,14 @@ class Settings(BaseSettings):
         _FETCH_K (int): Number of documents to fetch during retrieval.
         _CACHE_DIR (str): Directory for model cache.
         _HF_DATASETS_CACHE (str): Directory for Hugging Face datasets cache.
+        _MODEL_PREPARE_WORKERS (int): Number of models downloaded and converted concurrently.
+        _VERIFY_MODEL_HASHES (bool): Whether to check the checksum of every converted model file on start-up.
         _TMP_FILE_PATH (str): Temporary file path for documents.
+        _SNAPSHOT_INTERVAL (int): Seconds between vectorstore snapshots while there are changes.
+        _SNAPSHOT_WAL_BYTES (int): Size of the vectorstore log that triggers a snapshot.
+        _HNSW_M (int): Number of neighbours per node of the HNSW index.
+        _IVF_MIN_VECTORS (int): Number of vectors from which the IVF index is trained.
+        _IVF_NPROBE (int): Number of IVF lists visited per query.
         _DEFAULT_MODEL_CONFIG (str): Path to the default model configuration YAML.
         _MODEL_CONFIG_PATH (str): Path to the user-provided model configuration YAML.
 
@@ -61,12 +73,17 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL_ID: str = ""
     RERANKER_MODEL_ID: str = ""
     LLM_MODEL_ID: str = ""
+    EMBEDDING_MODEL_REVISION: str = "main"
+    RERANKER_MODEL_REVISION: str = "main"
+    LLM_MODEL_REVISION: str = "main"
     PROMPT_TEMPLATE: str = ""
     EMBEDDING_DEVICE: str = "CPU"
     RERANKER_DEVICE: str = "CPU"
     LLM_DEVICE: str = "CPU"
     MAX_TOKENS: int = 1024
     KEEP_ALIVE: Union[str, int, None] = None
+    VECTORSTORE_PATH: str = "/tmp/chatqna/vectorstore"
+    VECTORSTORE_INDEX_TYPE: str = "flat"
 
     # These fields will not be affected by environment variables
     _ENABLE_RERANK: bool = PrivateAttr(True)
@@ -74,7 +91,14 @@ class Settings(BaseSettings):
     _FETCH_K: int = PrivateAttr(10)
     _CACHE_DIR: str = PrivateAttr("/tmp/model_cache")
     _HF_DATASETS_CACHE: str = PrivateAttr("/tmp/model_cache")
+    _MODEL_PREPARE_WORKERS: int = PrivateAttr(3)
+    _VERIFY_MODEL_HASHES: bool = PrivateAttr(False)
     _TMP_FILE_PATH: str = PrivateAttr("/tmp/chatqna/documents")
+    _SNAPSHOT_INTERVAL: int = PrivateAttr(300)
+    _SNAPSHOT_WAL_BYTES: int = PrivateAttr(64 * 1024 * 1024)
+    _HNSW_M: int = PrivateAttr(32)
+    _IVF_MIN_VECTORS: int = PrivateAttr(50000)
+    _IVF_NPROBE: int = PrivateAttr(16)
     _DEFAULT_MODEL_CONFIG: str = PrivateAttr("/tmp/model_config/default_model.yaml")
     _MODEL_CONFIG_PATH: str = PrivateAttr("/tmp/model_config/config.yaml")
 
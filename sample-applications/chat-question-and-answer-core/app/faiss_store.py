@@ -0,0 +1,584 @@
+import json
+import math
+import os
+import shutil
+import struct
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from .logger import logger
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+
+# Each write-ahead log record is framed as (header length, vector bytes length, crc32)
+# followed by the JSON header and the float32 vectors.
+_RECORD = struct.Struct("<III")
+_CURRENT = "CURRENT"
+_WAL = "wal.log"
+_INDEX_FILE = "index.faiss"
+_DOCSTORE_FILE = "docstore.arrow"
+_MANIFEST_FILE = "manifest.json"
+_DOCSTORE_SCHEMA = pa.schema(
+    [("label", pa.int64()), ("id", pa.string()), ("text", pa.string()), ("metadata", pa.string())]
+)
+
+# Read the index as a view of the mapped file rather than copying it into memory.
+# Older faiss releases have no such flag and read the whole file instead.
+_MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def document_name(metadata: dict) -> str:
+    """Returns the name of the document a chunk belongs to: the file name of its source."""
+    return metadata.get("source", "").split("/")[-1]
+
+
+class DocumentCatalog:
+    """
+    Side index of the stored documents, mapping each document name to the ids of
+    its chunks and the metadata of its first chunk. It is updated with every add
+    and delete, so listing the documents and finding the chunks of one take time
+    proportional to the result rather than to the number of stored chunks.
+    """
+
+    def __init__(self):
+        # Dicts keep the insertion order of the documents and chunks
+        self._chunks: Dict[str, Dict[str, None]] = {}
+        self._metadata: Dict[str, dict] = {}
+        self._document_of: Dict[str, str] = {}
+
+    def add(self, ids: List[str], metadatas: List[dict]) -> None:
+        for id_, metadata in zip(ids, metadatas):
+            name = document_name(metadata)
+            chunks = self._chunks.get(name)
+            if chunks is None:
+                chunks = self._chunks[name] = {}
+                self._metadata[name] = metadata
+            chunks[id_] = None
+            self._document_of[id_] = name
+
+    def remove(self, ids: List[str]) -> None:
+        for id_ in ids:
+            name = self._document_of.pop(id_, None)
+            if name is None:
+                continue
+            chunks = self._chunks[name]
+            del chunks[id_]
+            if not chunks:
+                del self._chunks[name]
+                del self._metadata[name]
+
+    def documents(self) -> List[str]:
+        """Returns the names of the stored documents."""
+        return list(self._chunks)
+
+    def chunk_ids(self, document: str) -> List[str]:
+        """Returns the ids of the chunks of a document, or an empty list if it is not stored."""
+        return list(self._chunks.get(document, ()))
+
+    def metadata(self, document: str) -> Optional[dict]:
+        """Returns the metadata of the first chunk of a document, or None if it is not stored."""
+        return self._metadata.get(document)
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, document: str) -> bool:
+        return document in self._chunks
+
+
+class PersistentFAISSStore:
+    """
+    Keeps the FAISS vectorstore on disk, so a restart loads the stored vectors
+    instead of embedding every document again.
+
+    Every change is appended to a write-ahead log before it is applied in memory.
+    The log is folded into a snapshot (faiss index, Arrow docstore and manifest)
+    every `snapshot_interval` seconds while there are changes, and as soon as the
+    log grows past `snapshot_wal_bytes`. On start-up the latest snapshot is
+    memory mapped and the log records written after it are replayed.
+
+    The index type is one of:
+        flat: exact search (IndexFlatL2).
+        hnsw: approximate search with a HNSW graph; deletes rebuild the graph.
+        ivf: exact search until the store holds `ivf_min_vectors` vectors, then an
+            inverted file index trained on the stored vectors at the next snapshot.
+
+    `catalog` indexes the stored chunks by document, see `DocumentCatalog`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embedding: Embeddings,
+        index_type: str = "flat",
+        snapshot_interval: float = 300,
+        snapshot_wal_bytes: int = 64 * 1024 * 1024,
+        hnsw_m: int = 32,
+        ivf_min_vectors: int = 50000,
+        ivf_nprobe: int = 16,
+    ):
+        """
+        Args:
+            path (str): Directory holding the snapshots and the write-ahead log.
+            embedding (Embeddings): Embedding model used for new documents and queries.
+            index_type (str): One of `INDEX_TYPES`.
+            snapshot_interval (float): Seconds between snapshots while there are changes. 0 disables them.
+            snapshot_wal_bytes (int): Size of the write-ahead log that triggers a snapshot.
+            hnsw_m (int): Number of neighbours per node of the HNSW graph.
+            ivf_min_vectors (int): Number of vectors from which the IVF index is trained.
+            ivf_nprobe (int): Number of IVF lists visited per query.
+
+        Raises:
+            ValueError: If the index type is not supported.
+        """
+
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported vectorstore index type: {index_type}. Supported types are: {', '.join(INDEX_TYPES)}")
+
+        self.path = Path(path)
+        self.embedding = embedding
+        self.index_type = index_type
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_wal_bytes = snapshot_wal_bytes
+        self.hnsw_m = hnsw_m
+        self.ivf_min_vectors = ivf_min_vectors
+        self.ivf_nprobe = ivf_nprobe
+
+        self.vectorstore: Optional[FAISS] = None
+        self.catalog = DocumentCatalog()
+        # Chunk id -> label of its vector in the index
+        self._labels: Dict[str, int] = {}
+        self._next_label = 0
+        self._lock = threading.RLock()
+        self._wal = None
+        self._wal_bytes = 0
+        self._seq = 0
+        self._dirty = False
+        # Set while the index is a read-only view of the snapshot file
+        self._mapped_index_path: Optional[Path] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._snapshotter: Optional[threading.Thread] = None
+
+    def load(self) -> Optional[FAISS]:
+        """
+        Loads the latest snapshot and replays the write-ahead log written after it,
+        then starts taking snapshots in the background.
+
+        Returns:
+            Optional[FAISS]: The vectorstore, or None if nothing was stored yet.
+        """
+
+        with self._lock:
+            start = time.perf_counter()
+            self.path.mkdir(parents=True, exist_ok=True)
+            snapshot_seq = self._load_snapshot()
+            self._seq = snapshot_seq
+
+            replayed = 0
+            for header, vectors in self._read_wal():
+                if header["seq"] <= snapshot_seq:
+                    continue
+                self._apply(header, vectors)
+                self._seq = header["seq"]
+                replayed += 1
+
+            self._wal = open(self.path / _WAL, "ab")
+            self._wal_bytes = self._wal.tell()
+            self._dirty = replayed > 0
+
+            if self.vectorstore is not None:
+                stored_type = self._index_type_of(self.vectorstore.index)
+                if stored_type == "flat" and self.index_type == "ivf":
+                    # Stays exact until it holds ivf_min_vectors vectors
+                    self._train_ivf()
+                elif stored_type != self.index_type:
+                    logger.info(f"Converting the vectorstore index to {self.index_type}.")
+                    self._convert_index()
+
+            size = self.vectorstore.index.ntotal if self.vectorstore is not None else 0
+            logger.info(
+                f"Loaded vectorstore with {size} vectors from {self.path} "
+                f"({replayed} log records replayed) in {time.perf_counter() - start:.2f}s"
+            )
+
+        if self.snapshot_interval > 0 and self._snapshotter is None:
+            self._snapshotter = threading.Thread(target=self._run_snapshots, name="faiss-snapshot", daemon=True)
+            self._snapshotter.start()
+
+        return self.vectorstore
+
+    def add_documents(self, documents: List[Document]) -> List[str]:
+        """
+        Embeds the documents and stores them.
+
+        Args:
+            documents (List[Document]): The chunks to store.
+
+        Returns:
+            List[str]: The ids of the stored chunks.
+        """
+
+        if not documents:
+            return []
+
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        # Embedding is the slow part and does not need the lock
+        vectors = np.asarray(self.embedding.embed_documents(texts), dtype=np.float32)
+        ids = [str(uuid.uuid4()) for _ in texts]
+
+        with self._lock:
+            self._log_and_apply({"op": "add", "ids": ids, "texts": texts, "metadatas": metadatas}, vectors)
+
+        return ids
+
+    def delete(self, ids: List[str]) -> None:
+        """
+        Deletes the chunks with the given ids.
+
+        Args:
+            ids (List[str]): Ids of the chunks to delete.
+        """
+
+        with self._lock:
+            if self.vectorstore is None or not ids:
+                return
+            self._log_and_apply({"op": "delete", "ids": list(ids)}, None)
+
+    def snapshot(self) -> bool:
+        """
+        Writes a snapshot of the vectorstore and truncates the write-ahead log.
+
+        The snapshot is written to a new directory and published by replacing the
+        CURRENT file, so a crash leaves either the previous or the new snapshot.
+
+        Returns:
+            bool: True if a snapshot was written, False if there were no changes.
+        """
+
+        with self._lock:
+            if not self._dirty:
+                return False
+
+            start = time.perf_counter()
+            if self.index_type == "ivf" and self.vectorstore is not None:
+                self._train_ivf()
+
+            name = f"snapshot-{self._seq:016d}-{time.time_ns()}"
+            tmp_dir = self.path / f".{name}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+
+            manifest = {
+                "seq": self._seq,
+                "index_type": self.index_type,
+                "ntotal": 0,
+                "dim": None,
+                "created_at": time.time(),
+            }
+            if self.vectorstore is not None:
+                index = self.vectorstore.index
+                faiss.write_index(index, str(tmp_dir / _INDEX_FILE))
+                self._write_docstore(tmp_dir / _DOCSTORE_FILE)
+                manifest.update(index_type=self._index_type_of(index), ntotal=index.ntotal, dim=index.d)
+
+            with open(tmp_dir / _MANIFEST_FILE, "w") as f:
+                json.dump(manifest, f)
+            for file in tmp_dir.iterdir():
+                with open(file, "rb") as f:
+                    os.fsync(f.fileno())
+
+            os.replace(tmp_dir, self.path / name)
+            current_tmp = self.path / f"{_CURRENT}.tmp"
+            with open(current_tmp, "w") as f:
+                f.write(name)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(current_tmp, self.path / _CURRENT)
+            _fsync_dir(self.path)
+
+            # Every logged change is now part of the snapshot
+            self._wal.truncate(0)
+            self._wal.seek(0)
+            os.fsync(self._wal.fileno())
+            self._wal_bytes = 0
+            self._dirty = False
+
+            if self._mapped_index_path is not None:
+                self._mapped_index_path = self.path / name / _INDEX_FILE
+            for old in self.path.glob("snapshot-*"):
+                if old.name != name:
+                    shutil.rmtree(old, ignore_errors=True)
+
+            logger.info(f"Vectorstore snapshot {name} written in {time.perf_counter() - start:.2f}s")
+            return True
+
+    def close(self) -> None:
+        """Stops the background snapshots and writes a final snapshot."""
+
+        self._stop.set()
+        self._wake.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+            self._snapshotter = None
+
+        with self._lock:
+            if self._wal is not None:
+                self.snapshot()
+                self._wal.close()
+                self._wal = None
+
+    def _run_snapshots(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.snapshot_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.snapshot()
+            except Exception:
+                logger.exception("Error writing vectorstore snapshot.")
+
+    def _log_and_apply(self, header: dict, vectors: Optional[np.ndarray]) -> None:
+        """Appends the change to the write-ahead log, then applies it in memory. Called with the lock held."""
+
+        header = {**header, "seq": self._seq + 1, "dim": int(vectors.shape[1]) if vectors is not None else 0}
+        payload = json.dumps(header, default=str).encode("utf-8")
+        vector_bytes = vectors.astype("<f4").tobytes() if vectors is not None else b""
+        crc = zlib.crc32(vector_bytes, zlib.crc32(payload))
+
+        self._wal.write(_RECORD.pack(len(payload), len(vector_bytes), crc) + payload + vector_bytes)
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        self._wal_bytes += _RECORD.size + len(payload) + len(vector_bytes)
+        self._seq = header["seq"]
+        self._dirty = True
+
+        self._apply(header, vectors)
+
+        if self._wal_bytes >= self.snapshot_wal_bytes:
+            self._wake.set()
+
+    def _read_wal(self):
+        """Yields the (header, vectors) records of the log and drops a torn or corrupt tail."""
+
+        wal_path = self.path / _WAL
+        if not wal_path.exists():
+            return
+
+        valid = 0
+        with open(wal_path, "rb") as f:
+            while True:
+                prefix = f.read(_RECORD.size)
+                if len(prefix) < _RECORD.size:
+                    break
+                header_len, vector_len, crc = _RECORD.unpack(prefix)
+                payload = f.read(header_len)
+                vector_bytes = f.read(vector_len)
+                if (
+                    len(payload) < header_len
+                    or len(vector_bytes) < vector_len
+                    or zlib.crc32(vector_bytes, zlib.crc32(payload)) != crc
+                ):
+                    break
+
+                header = json.loads(payload)
+                vectors = None
+                if header["op"] == "add":
+                    vectors = np.frombuffer(vector_bytes, dtype="<f4").reshape(len(header["ids"]), header["dim"])
+                valid = f.tell()
+                yield header, vectors
+
+        if valid < wal_path.stat().st_size:
+            logger.warning(f"Ignoring {wal_path.stat().st_size - valid} bytes of incomplete vectorstore log records.")
+            os.truncate(wal_path, valid)
+
+    def _apply(self, header: dict, vectors: Optional[np.ndarray]) -> None:
+        if header["op"] == "add":
+            if self.vectorstore is None:
+                self.vectorstore = FAISS(
+                    embedding_function=self.embedding,
+                    index=self._build_index(np.empty((0, vectors.shape[1]), dtype=np.float32), np.empty(0, dtype=np.int64)),
+                    docstore=InMemoryDocstore(),
+                    index_to_docstore_id={},
+                )
+            self._own_index()
+
+            ids, metadatas = header["ids"], header["metadatas"]
+            labels = np.arange(self._next_label, self._next_label + len(ids), dtype=np.int64)
+            self._next_label += len(ids)
+            self.vectorstore.index.add_with_ids(vectors, labels)
+            self.vectorstore.docstore.add(
+                {id_: Document(id=id_, page_content=text, metadata=metadata) for id_, text, metadata in zip(ids, header["texts"], metadatas)}
+            )
+            self.vectorstore.index_to_docstore_id.update(zip(labels.tolist(), ids))
+            self._labels.update(zip(ids, labels.tolist()))
+            self.catalog.add(ids, metadatas)
+
+        elif header["op"] == "delete" and self.vectorstore is not None:
+            ids = [id_ for id_ in header["ids"] if id_ in self._labels]
+            if not ids:
+                return
+            self._own_index()
+
+            labels = [self._labels.pop(id_) for id_ in ids]
+            if self._index_type_of(self.vectorstore.index) == "hnsw":
+                self._rebuild_without(labels)
+            else:
+                self.vectorstore.index.remove_ids(np.asarray(labels, dtype=np.int64))
+            for label in labels:
+                del self.vectorstore.index_to_docstore_id[label]
+            self.vectorstore.docstore.delete(ids)
+            self.catalog.remove(ids)
+
+    def _own_index(self) -> None:
+        """Replaces a memory-mapped index, which is read-only, with an in-memory copy before it is changed."""
+
+        if self._mapped_index_path is not None:
+            self.vectorstore.index = self._read_index(self._mapped_index_path, flags=0)
+            self._mapped_index_path = None
+
+    def _read_index(self, path: Path, flags: int) -> faiss.Index:
+        index = faiss.read_index(str(path), flags)
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = self.ivf_nprobe
+        return index
+
+    def _index_type_of(self, index: faiss.Index) -> str:
+        if isinstance(index, faiss.IndexIDMap):
+            index = faiss.downcast_index(index.index)
+        if isinstance(index, faiss.IndexHNSW):
+            return "hnsw"
+        if isinstance(index, faiss.IndexIVF):
+            return "ivf"
+        return "flat"
+
+    def _build_index(self, vectors: np.ndarray, labels: np.ndarray) -> faiss.Index:
+        """
+        Builds an index of the configured type holding the given vectors. Vectors
+        are identified by stable labels rather than by position, so removing some
+        does not renumber the others.
+        """
+
+        dim = vectors.shape[1]
+        if self.index_type == "ivf" and len(vectors) >= self.ivf_min_vectors:
+            # Rule of thumb of 4 * sqrt(n) lists, keeping about 40 training vectors per list
+            nlist = max(1, min(int(4 * math.sqrt(len(vectors))), len(vectors) // 39))
+            index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+            index.train(vectors)
+            # Maximal marginal relevance search reconstructs the vectors by label
+            index.set_direct_map_type(faiss.DirectMap.Hashtable)
+            index.nprobe = self.ivf_nprobe
+        elif self.index_type == "hnsw":
+            index = faiss.IndexIDMap2(faiss.IndexHNSWFlat(dim, self.hnsw_m))
+        else:
+            index = faiss.IndexIDMap2(faiss.IndexFlatL2(dim))
+
+        if len(vectors):
+            index.add_with_ids(vectors, labels)
+        return index
+
+    def _stored_vectors(self, labels: np.ndarray) -> np.ndarray:
+        index = self.vectorstore.index
+        if not len(labels):
+            return np.empty((0, index.d), dtype=np.float32)
+        return index.reconstruct_batch(labels)
+
+    def _convert_index(self) -> None:
+        self._own_index()
+        labels = np.fromiter(self.vectorstore.index_to_docstore_id, dtype=np.int64)
+        self.vectorstore.index = self._build_index(self._stored_vectors(labels), labels)
+        self._dirty = True
+
+    def _train_ivf(self) -> None:
+        index = self.vectorstore.index
+        if not isinstance(index, faiss.IndexIVF) and index.ntotal >= self.ivf_min_vectors:
+            logger.info(f"Training IVF index on {index.ntotal} vectors.")
+            self._convert_index()
+
+    def _rebuild_without(self, labels: List[int]) -> None:
+        """Deletes vectors from a HNSW graph, which has no support for removal, by adding the remaining ones to a new graph."""
+
+        removed = set(labels)
+        kept = np.fromiter(
+            (label for label in self.vectorstore.index_to_docstore_id if label not in removed), dtype=np.int64
+        )
+        self.vectorstore.index = self._build_index(self._stored_vectors(kept), kept)
+
+    def _write_docstore(self, path: Path) -> None:
+        labels = list(self.vectorstore.index_to_docstore_id)
+        ids = [self.vectorstore.index_to_docstore_id[label] for label in labels]
+        docs = [self.vectorstore.docstore.search(id_) for id_ in ids]
+        table = pa.table(
+            {
+                "label": labels,
+                "id": ids,
+                "text": [doc.page_content for doc in docs],
+                "metadata": [json.dumps(doc.metadata, default=str) for doc in docs],
+            },
+            schema=_DOCSTORE_SCHEMA,
+        )
+        with pa.OSFile(str(path), "wb") as sink, ipc.new_file(sink, _DOCSTORE_SCHEMA) as writer:
+            writer.write_table(table)
+
+    def _load_snapshot(self) -> int:
+        """Loads the snapshot named in the CURRENT file and returns its log sequence number."""
+
+        current = self.path / _CURRENT
+        if not current.exists():
+            return 0
+
+        snapshot_dir = self.path / current.read_text().strip()
+        with open(snapshot_dir / _MANIFEST_FILE) as f:
+            manifest = json.load(f)
+
+        index_path = snapshot_dir / _INDEX_FILE
+        if manifest["ntotal"] and index_path.exists():
+            index = self._read_index(index_path, flags=_MMAP_FLAGS)
+            with pa.memory_map(str(snapshot_dir / _DOCSTORE_FILE)) as source:
+                table = ipc.open_file(source).read_all()
+
+            labels = table.column("label").to_pylist()
+            ids = table.column("id").to_pylist()
+            if index.ntotal != len(ids) or index.ntotal != manifest["ntotal"]:
+                raise ValueError(f"Vectorstore snapshot {snapshot_dir} is inconsistent: {index.ntotal} vectors, {len(ids)} chunks.")
+
+            metadatas = [json.loads(metadata) for metadata in table.column("metadata").to_pylist()]
+            docs = {
+                id_: Document(id=id_, page_content=text, metadata=metadata)
+                for id_, text, metadata in zip(ids, table.column("text").to_pylist(), metadatas)
+            }
+            self.vectorstore = FAISS(
+                embedding_function=self.embedding,
+                index=index,
+                docstore=InMemoryDocstore(docs),
+                index_to_docstore_id=dict(zip(labels, ids)),
+            )
+            self._labels = dict(zip(ids, labels))
+            self._next_label = max(labels) + 1
+            self.catalog.add(ids, metadatas)
+            if _MMAP_FLAGS:
+                self._mapped_index_path = index_path
+
+        return manifest["seq"]
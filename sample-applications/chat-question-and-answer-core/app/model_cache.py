@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from .logger import logger
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """
+    Identifies a prepared (downloaded and converted) model. Two specs with the same
+    fields produce the same converted model, so they share one cache entry.
+
+    Attributes:
+        model_id (str): Hugging Face model id, or path of a local model directory.
+        model_type (str): Type of the model: "embedding", "reranker" or "llm".
+        revision (str): Model revision (branch, tag or commit) to download.
+        weight_format (Optional[str]): Precision of the converted weights, e.g. "int8". None keeps the default.
+        export_options (Tuple[Tuple[str, str], ...]): Other options of the export, as sorted (name, value) pairs.
+    """
+
+    model_id: str
+    model_type: str
+    revision: str = "main"
+    weight_format: Optional[str] = None
+    export_options: Tuple[Tuple[str, str], ...] = field(default_factory=tuple)
+
+    def to_dict(self) -> dict:
+        """Returns the spec as stored in the manifest, with lists in place of tuples."""
+        return json.loads(json.dumps(asdict(self)))
+
+    def key(self) -> str:
+        """Returns a short digest of the spec, used as the name of its cache entry."""
+        payload = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """
+    Cache of prepared models, keyed by `ModelSpec`.
+
+    Each entry is a directory `<root>/<model id>/<spec key>` holding the converted
+    model and a manifest listing the spec and the size and sha256 of every file.
+    An entry is written to a temporary directory and renamed into place once
+    complete, so an interrupted preparation never looks like a valid entry. Entries
+    whose files are missing or changed are prepared again.
+    """
+
+    def __init__(self, root: str, verify_hashes: bool = False):
+        """
+        Args:
+            root (str): Directory holding the cache entries.
+            verify_hashes (bool): Check the sha256 of every file when looking up an entry,
+                rather than only its size. Slower for large models.
+        """
+
+        self.root = Path(root)
+        self.verify_hashes = verify_hashes
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def path_for(self, spec: ModelSpec) -> Path:
+        """Returns the directory of the cache entry for a spec."""
+        return self.root / spec.model_id.strip("/") / spec.key()
+
+    def read_manifest(self, spec: ModelSpec) -> Optional[dict]:
+        """Returns the manifest of the cache entry for a spec, or None if there is no such entry."""
+
+        try:
+            with open(self.path_for(spec) / MANIFEST_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self, spec: ModelSpec) -> Optional[Path]:
+        """
+        Returns the directory of the cache entry for a spec if it is complete and intact.
+
+        Args:
+            spec (ModelSpec): The model to look up.
+
+        Returns:
+            Optional[Path]: The model directory, or None if the model has to be prepared.
+        """
+
+        path = self.path_for(spec)
+        manifest = self.read_manifest(spec)
+        if manifest is None:
+            return None
+
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("spec") != spec.to_dict():
+            logger.warning(f"Cached {spec.model_id} in {path} was prepared with different settings.")
+            return None
+
+        for name, expected in manifest["files"].items():
+            file = path / name
+            try:
+                if file.stat().st_size != expected["size"]:
+                    raise ValueError("size mismatch")
+                if self.verify_hashes and _sha256(file) != expected["sha256"]:
+                    raise ValueError("checksum mismatch")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cached {spec.model_id} in {path} is corrupted ({name}: {e}).")
+                return None
+
+        return path
+
+    def _lock_for(self, spec: ModelSpec) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(spec.key(), threading.Lock())
+
+    def prepare(self, spec: ModelSpec, export: Callable[[ModelSpec, Path], Optional[dict]]) -> Path:
+        """
+        Returns the cached model for a spec, preparing it first if it is not cached.
+
+        Args:
+            spec (ModelSpec): The model to prepare.
+            export (Callable[[ModelSpec, Path], Optional[dict]]): Downloads and converts the
+                model into the given directory. May return details to store in the manifest,
+                such as the resolved source revision.
+
+        Returns:
+            Path: The directory of the prepared model.
+
+        Raises:
+            Exception: Any error raised by `export`. The partial output is removed.
+        """
+
+        with self._lock_for(spec):
+            path = self.lookup(spec)
+            if path is not None:
+                logger.info(f"Prepared {spec.model_id} ({spec.model_type}) found in {path}. Skipping conversion...")
+                return path
+
+            path = self.path_for(spec)
+            tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            tmp_path.mkdir(parents=True)
+
+            start = time.perf_counter()
+            try:
+                details = export(spec, tmp_path) or {}
+                files = {
+                    file.relative_to(tmp_path).as_posix(): {"size": file.stat().st_size, "sha256": _sha256(file)}
+                    for file in sorted(tmp_path.rglob("*"))
+                    if file.is_file()
+                }
+                manifest = {
+                    "version": MANIFEST_VERSION,
+                    "spec": spec.to_dict(),
+                    "files": files,
+                    "created_at": time.time(),
+                    **details,
+                }
+                with open(tmp_path / MANIFEST_FILE, "w") as f:
+                    json.dump(manifest, f, indent=2)
+
+                shutil.rmtree(path, ignore_errors=True)
+                os.replace(tmp_path, path)
+
+            except Exception:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+
+            logger.info(f"Prepared {spec.model_id} ({spec.model_type}) in {time.perf_counter() - start:.1f}s")
+            return path
+
+    def prepare_all(
+        self,
+        specs: List[ModelSpec],
+        export: Callable[[ModelSpec, Path], Optional[dict]],
+        max_workers: int = 3,
+    ) -> List[Path]:
+        """
+        Prepares independent models concurrently.
+
+        Args:
+            specs (List[ModelSpec]): The models to prepare.
+            export (Callable[[ModelSpec, Path], Optional[dict]]): See `prepare`.
+            max_workers (int): Maximum number of models prepared at the same time.
+
+        Returns:
+            List[Path]: The directory of each prepared model, in the order of `specs`.
+        """
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="model-prepare") as executor:
+            futures = [executor.submit(self.prepare, spec, export) for spec in specs]
+            return [future.result() for future in futures]
@@ -1,5 +1,6 @@
 from .config import config
 from .logger import logger
+from .model_cache import ModelCache, ModelSpec
 from huggingface_hub import login, whoami, snapshot_download
 from huggingface_hub.utils import HfHubHTTPError, RepositoryNotFoundError
 from optimum.intel import (
@@ -12,6 +13,7 @@ from openvino_tokenizers import convert_tokenizer
 from langchain_community.embeddings import OpenVINOBgeEmbeddings
 from langchain_community.document_compressors.openvino_rerank import OpenVINOReranker
 from langchain_huggingface import HuggingFacePipeline
+from pathlib import Path
 import os
 import openvino as ov
 
@@ -23,10 +25,17 @@ class OpenVINOBackend:
         self.embedding_model_id = config.EMBEDDING_MODEL_ID
         self.llm_model_id = config.LLM_MODEL_ID
         self.reranker_model_id = config.RERANKER_MODEL_ID
+        self.embedding_model_revision = config.EMBEDDING_MODEL_REVISION
+        self.llm_model_revision = config.LLM_MODEL_REVISION
+        self.reranker_model_revision = config.RERANKER_MODEL_REVISION
         self.embedding_device = config.EMBEDDING_DEVICE
         self.reranker_device = config.RERANKER_DEVICE
         self.llm_device = config.LLM_DEVICE
         self.max_tokens = config.MAX_TOKENS
+        self.model_cache = ModelCache(
+            os.path.join(self.cache_dir, "openvino_models"),
+            verify_hashes=config._VERIFY_MODEL_HASHES,
+        )
 
     def login_to_huggingface(self, token: str):
         """
@@ -58,13 +67,18 @@ class OpenVINOBackend:
             logger.error(f"Unexpected error during Hugging Face login: {e}")
             raise
 
-    def download_huggingface_model(self, model_id: str, cache_dir: str):
+    def download_huggingface_model(self, model_id: str, cache_dir: str, revision: str = "main") -> str:
         """
         Downloads a model from the Hugging Face Hub and caches it locally.
 
         Args:
             model_id (str): The identifier of the model repository on Hugging Face Hub.
+                A path to a local model directory is used as is.
             cache_dir (str): The directory path where the model should be cached.
+            revision (str): The revision of the model to download. Defaults to "main".
+
+        Returns:
+            str: The directory holding the downloaded model files.
 
         Raises:
             RepositoryNotFoundError: If the specified model repository does not exist.
@@ -75,13 +89,17 @@ class OpenVINOBackend:
             Information about the download process, including start, completion, and any errors encountered.
         """
 
+        if os.path.isdir(model_id):
+            logger.info(f"Using local model {model_id}")
+            return model_id
+
         try:
             logger.info(f"Downloading model {model_id} from HuggingFace Hub...")
 
-            # 'main' is the only available revision and already handled in snapshot_download module
-            model_path = snapshot_download(repo_id=model_id, cache_dir=cache_dir)  # nosec B615
+            model_path = snapshot_download(repo_id=model_id, revision=revision, cache_dir=cache_dir)  # nosec B615
 
             logger.info(f"Model downloaded successfully to {model_path}")
+            return model_path
 
         except RepositoryNotFoundError as e:
             logger.error(f"Model repository not found: {model_id}")
@@ -95,14 +113,15 @@ class OpenVINOBackend:
             logger.error(f"Unexpected error downloading model '{model_id}': {e}")
             raise
 
-    def convert_model(self, model_id: str, cache_dir: str, model_type: str):
+    def convert_model(self, source_path: str, model_path: str, model_type: str, weight_format: str = None):
         """
-        Converts a specified model to OpenVINO™ toolkit format and saves it to the cache directory.
+        Converts a downloaded model to OpenVINO™ toolkit format and saves it to the given directory.
 
         Args:
-            model_id (str): The identifier of the model to be converted.
-            cache_dir (str): The directory where the converted model will be saved.
+            source_path (str): The directory holding the downloaded model.
+            model_path (str): The directory where the converted model will be saved.
             model_type (str): The type of the model. It can be "embedding", "reranker", or "llm".
+            weight_format (str, optional): The precision of the converted weights, e.g. "int8".
 
         Returns:
             None
@@ -111,53 +130,89 @@ class OpenVINOBackend:
             ValueError: If the model_type is not one of "embedding", "reranker", or "llm".
 
         Notes:
-            - If the model has already been converted and exists in the cache directory, the conversion process is skipped.
             - The function uses the Hugging Face `AutoTokenizer` to load and save the tokenizer.
             - The function uses OpenVINO toolkit's `convert_tokenizer` and `save_model` to convert and save the tokenizer.
             - Depending on the model_type, the function uses different OpenVINO model classes to convert and save the model.
         """
 
-        model_path = os.path.join(cache_dir, model_id)
-
-        if os.path.isdir(model_path):
-            logger.info(f"Optimized {model_id} exists in {cache_dir}. Skipping conversion...")
-            return
+        model_classes = {
+            "embedding": OVModelForFeatureExtraction,
+            "reranker": OVModelForSequenceClassification,
+            "llm": OVModelForCausalLM,
+        }
+        if model_type not in model_classes:
+            raise ValueError(
+                f"Unsupported model type: {model_type}. Supported types are 'embedding', 'reranker', and 'llm'."
+            )
 
-        logger.info(f"Converting {model_id} model to OpenVINO™ toolkit format...")
-        # 'main' is the only available revision and already handled in huggingfacehub module
-        hf_tokenizer = AutoTokenizer.from_pretrained(model_id)  # nosec B615
+        logger.info(f"Converting {source_path} model to OpenVINO™ toolkit format...")
+        hf_tokenizer = AutoTokenizer.from_pretrained(source_path)  # nosec B615
         hf_tokenizer.save_pretrained(model_path)
         ov_tokenizer = convert_tokenizer(hf_tokenizer, add_special_tokens=False)
         ov.save_model(ov_tokenizer, f"{model_path}/openvino_tokenizer.xml")
 
-        if model_type == "embedding":
-            model = OVModelForFeatureExtraction.from_pretrained(
-                model_id,
-                export=True,
-                trust_remote_code=True
-            )
+        export_kwargs = {"weight_format": weight_format} if weight_format else {}
+        model = model_classes[model_type].from_pretrained(
+            source_path,
+            export=True,
+            trust_remote_code=True,
+            **export_kwargs
+        )
 
-        elif model_type == "reranker":
-            model = OVModelForSequenceClassification.from_pretrained(
-                model_id,
-                export=True,
-                trust_remote_code=True
-            )
+        model.save_pretrained(model_path)
 
-        elif model_type == "llm":
-            model = OVModelForCausalLM.from_pretrained(
-                model_id,
-                export=True,
+    def model_specs(self):
+        """
+        Returns the cache specs of the embedding, reranker and LLM models. Any setting
+        that changes the converted model is part of the spec, so changing it prepares
+        the model again instead of reusing a stale conversion.
+
+        Returns:
+            list[ModelSpec]: The specs of the embedding, reranker and LLM models.
+        """
+
+        export_options = (("add_special_tokens", "False"), ("trust_remote_code", "True"))
+        return [
+            ModelSpec(
+                self.embedding_model_id,
+                "embedding",
+                revision=self.embedding_model_revision,
+                export_options=export_options,
+            ),
+            ModelSpec(
+                self.reranker_model_id,
+                "reranker",
+                revision=self.reranker_model_revision,
+                export_options=export_options,
+            ),
+            ModelSpec(
+                self.llm_model_id,
+                "llm",
+                revision=self.llm_model_revision,
                 weight_format="int8",
-                trust_remote_code=True
-            )
+                export_options=export_options,
+            ),
+        ]
 
-        else:
-            raise ValueError(
-                f"Unsupported model type: {model_type}. Supported types are 'embedding', 'reranker', and 'llm'."
-            )
+    def prepare_model(self, spec: ModelSpec, model_path: Path) -> dict:
+        """
+        Downloads and converts a model into the given directory. Used by the model cache
+        for models that are not prepared yet.
 
-        model.save_pretrained(model_path)
+        Args:
+            spec (ModelSpec): The model to prepare.
+            model_path (Path): The directory where the converted model is saved.
+
+        Returns:
+            dict: The resolved source of the model, recorded in the cache manifest.
+        """
+
+        source_path = self.download_huggingface_model(spec.model_id, self.cache_dir, spec.revision)
+        self.convert_model(source_path, str(model_path), spec.model_type, spec.weight_format)
+
+        # Downloaded snapshots are stored under their commit hash
+        source_revision = Path(source_path).name if not os.path.isdir(spec.model_id) else None
+        return {"source_revision": source_revision}
 
     def init_models(self):
         """
@@ -167,36 +222,36 @@ class OpenVINOBackend:
             tuple: A tuple containing the initialized embedding model, LLM model, and reranker model.
         """
 
-        # Login to HuggingFace
-        self.login_to_huggingface(self.huggingface_token)
+        specs = self.model_specs()
 
-        # Download embedding, LLM, and reranker models from HuggingFace
-        self.download_huggingface_model(self.embedding_model_id, self.cache_dir)
-        self.download_huggingface_model(self.reranker_model_id, self.cache_dir)
-        self.download_huggingface_model(self.llm_model_id, self.cache_dir)
+        # Only the models without an intact cache entry are downloaded and converted,
+        # concurrently as they do not depend on each other
+        missing = [spec for spec in specs if self.model_cache.lookup(spec) is None]
+        if missing:
+            self.login_to_huggingface(self.huggingface_token)
+            self.model_cache.prepare_all(missing, self.prepare_model, max_workers=config._MODEL_PREPARE_WORKERS)
+        else:
+            logger.info("All models are prepared. Skipping download and conversion...")
 
-        # Convert models
-        self.convert_model(self.embedding_model_id, self.cache_dir, "embedding")
-        self.convert_model(self.reranker_model_id, self.cache_dir, "reranker")
-        self.convert_model(self.llm_model_id, self.cache_dir, "llm")
+        embedding_path, reranker_path, llm_path = (str(self.model_cache.path_for(spec)) for spec in specs)
 
         # Initialize embedding model
         embedding = OpenVINOBgeEmbeddings(
-            model_name_or_path = os.path.join(self.cache_dir, self.embedding_model_id),
+            model_name_or_path = embedding_path,
             model_kwargs = {"device": self.embedding_device, "compile": False},
         )
         embedding.ov_model.compile()
 
         # Initialize reranker model
         reranker = OpenVINOReranker(
-            model_name_or_path = os.path.join(self.cache_dir, self.reranker_model_id),
+            model_name_or_path = reranker_path,
             model_kwargs = {"device": self.reranker_device},
             top_n = 2,
         )
 
         # Initialize LLM
         llm = HuggingFacePipeline.from_model_id(
-            model_id = os.path.join(self.cache_dir, self.llm_model_id),
+            model_id = llm_path,
             task = "text-generation",
             backend = "openvino",
             model_kwargs = {
@@ -204,7 +259,7 @@ class OpenVINOBackend:
                 "ov_config": {
                     "PERFORMANCE_HINT": "LATENCY",
                     "NUM_STREAMS": "1",
-                    "CACHE_DIR": os.path.join(self.cache_dir, self.llm_model_id, "model_cache"),
+                    "CACHE_DIR": os.path.join(self.cache_dir, "ov_compile_cache", self.llm_model_id.strip("/")),
                 },
                 "trust_remote_code": True,
             },
@@ -1,6 +1,7 @@
 import os
 import time
 import uvicorn
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,13 +15,21 @@ from .chain import (
     create_faiss_vectordb,
     get_document_from_vectordb,
     delete_embedding_from_vectordb,
+    close_vectordb,
     get_retriever,
     build_chain,
     process_query
 )
 from .document import validate_document, save_document
 
-app = FastAPI(title="Chat Question and Answer Core", root_path="/v1/chatqna")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Snapshot the vectorstore on shutdown so the next start does not replay its log
+    close_vectordb()
+
+
+app = FastAPI(title="Chat Question and Answer Core", root_path="/v1/chatqna", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Document listing and deletion benchmark for the vectorstore.
+
+Fills a scratch vectorstore with synthetic chunks (random vectors, no embedding
+model) and times listing the documents and deleting one document, once with the
+previous full scans of the docstore (set comprehension and pandas DataFrame,
+then `FAISS.delete`) and once with the document catalog of the persistent store.
+
+Usage (from the chat-question-and-answer-core directory, with the application
+dependencies installed and a model configuration in /tmp/model_config, e.g.
+inside the application container):
+python scripts/benchmark_document_catalog.py
+python scripts/benchmark_document_catalog.py --chunks 10000 100000 1000000 --chunks-per-document 100 --dim 64
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pandas as pd
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Skip the model set-up of the application, only the store is needed
+os.environ.setdefault("RUN_TEST", "True")
+
+from app.faiss_store import PersistentFAISSStore  # noqa: E402
+
+
+class ArrayEmbeddings(Embeddings):
+    """Returns the next rows of a pre-generated array of vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.offset = 0
+
+    def embed_documents(self, texts):
+        rows = self.vectors[self.offset : self.offset + len(texts)]
+        self.offset += len(texts)
+        return rows
+
+    def embed_query(self, text):
+        return self.vectors[0]
+
+
+def legacy_list(vectorstore):
+    vstore = vectorstore.docstore._dict
+    return list({vstore[key].metadata["source"].split("/")[-1] for key in vstore.keys()})
+
+
+def legacy_delete(vectorstore, document):
+    vstore = vectorstore.docstore._dict
+    data_rows = [
+        {"chunk_id": key, "document": vstore[key].metadata["source"].split("/")[-1], "content": vstore[key].page_content}
+        for key in vstore.keys()
+    ]
+    vectordf = pd.DataFrame(data_rows)
+    chunk_list = vectordf.loc[vectordf["document"] == document]["chunk_id"].tolist()
+    vectorstore.delete(chunk_list)
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(chunks, chunks_per_document, dim, batch):
+    vectors = np.random.default_rng(0).random((chunks, dim), dtype=np.float32)
+    documents = [
+        Document(page_content=f"chunk {i}", metadata={"source": f"/tmp/chatqna/documents/doc{i // chunks_per_document}.pdf"})
+        for i in range(chunks)
+    ]
+
+    with tempfile.TemporaryDirectory() as path:
+        store = PersistentFAISSStore(path, ArrayEmbeddings(vectors), snapshot_interval=0)
+        store.load()
+        for i in range(0, chunks, batch):
+            store.add_documents(documents[i : i + batch])
+
+        # The previous in-memory layout: positional IndexFlatL2 sharing the same chunks
+        index = faiss.IndexFlatL2(dim)
+        index.add(vectors)
+        ids = [store.vectorstore.index_to_docstore_id[label] for label in range(chunks)]
+        legacy = FAISS(
+            embedding_function=store.embedding,
+            index=index,
+            docstore=InMemoryDocstore(dict(store.vectorstore.docstore._dict)),
+            index_to_docstore_id=dict(enumerate(ids)),
+        )
+
+        documents_count = chunks // chunks_per_document
+        results = {
+            "list (scan)": timed(lambda: legacy_list(legacy), repeat=3),
+            "list (catalog)": timed(lambda: store.catalog.documents(), repeat=3),
+            "delete (scan)": timed(lambda: legacy_delete(legacy, f"doc{documents_count // 2}.pdf")),
+            "delete (catalog)": timed(
+                lambda: store.delete(store.catalog.chunk_ids(f"doc{documents_count // 2 + 1}.pdf"))
+            ),
+        }
+        store._wal.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark listing and deleting documents in the vectorstore")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--chunks-per-document", type=int, default=100)
+    parser.add_argument("--dim", type=int, default=64, help="Vector dimension")
+    parser.add_argument("--batch", type=int, default=10_000, help="Chunks per add")
+    args = parser.parse_args()
+
+    print(f"{'chunks':>10} {'operation':<18} {'ms':>10}")
+    for chunks in args.chunks:
+        for operation, ms in run(chunks, args.chunks_per_document, args.dim, args.batch).items():
+            print(f"{chunks:>10} {operation:<18} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
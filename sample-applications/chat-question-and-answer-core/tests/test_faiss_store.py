@@ -0,0 +1,197 @@
+import hashlib
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic vectors derived from the text, counting the texts embedded."""
+
+    def __init__(self, dim=16):
+        self.dim = dim
+        self.embedded = 0
+
+    def _vector(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+        return np.random.default_rng(seed).random(self.dim).tolist()
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+def make_docs(source, count):
+    return [Document(page_content=f"{source} chunk {i}", metadata={"source": f"/tmp/{source}", "page": i}) for i in range(count)]
+
+
+@pytest.fixture
+def open_store(tmp_path):
+    from app.faiss_store import PersistentFAISSStore
+
+    stores = []
+
+    def _open(embedding=None, **kwargs):
+        store = PersistentFAISSStore(str(tmp_path / "vectorstore"), embedding or CountingEmbeddings(), snapshot_interval=0, **kwargs)
+        store.load()
+        stores.append(store)
+        return store
+
+    yield _open
+
+    for store in stores:
+        if store._wal is not None:
+            store._wal.close()
+
+
+def stored_texts(store):
+    return sorted(doc.page_content for doc in store.vectorstore.docstore._dict.values())
+
+
+def test_restart_replays_log_without_embedding(open_store):
+    """Chunks added before a crash are restored from the log; nothing is embedded again."""
+
+    store = open_store()
+    store.add_documents(make_docs("a.txt", 5))
+    store.add_documents(make_docs("b.txt", 3))
+
+    # No snapshot and no close, as after a crash
+    embedding = CountingEmbeddings()
+    restarted = open_store(embedding)
+
+    assert embedding.embedded == 0
+    assert restarted.vectorstore.index.ntotal == 8
+    assert stored_texts(restarted) == stored_texts(store)
+    result = restarted.vectorstore.similarity_search("b.txt chunk 1", k=1)[0]
+    assert result.page_content == "b.txt chunk 1"
+    assert result.metadata == {"source": "/tmp/b.txt", "page": 1}
+
+
+def test_restart_loads_snapshot_and_later_changes(open_store):
+    """The snapshot is memory mapped on start-up and the changes logged after it are replayed."""
+
+    store = open_store()
+    ids = store.add_documents(make_docs("a.txt", 4))
+    assert store.snapshot()
+    assert store._wal_bytes == 0
+    store.add_documents(make_docs("b.txt", 2))
+    store.delete(ids[:2])
+
+    restarted = open_store()
+
+    assert stored_texts(restarted) == stored_texts(store)
+    assert restarted.vectorstore.index.ntotal == 4
+    restarted.snapshot()
+
+    snapshotted = open_store()
+    assert snapshotted._mapped_index_path is not None
+    assert stored_texts(snapshotted) == stored_texts(store)
+    # The first change replaces the mapped index with an in-memory copy
+    snapshotted.add_documents(make_docs("c.txt", 1))
+    assert snapshotted._mapped_index_path is None
+    assert snapshotted.vectorstore.index.ntotal == 5
+
+
+def test_torn_log_tail_is_ignored(open_store, tmp_path):
+    """An incomplete record at the end of the log, from a crash while appending, is dropped."""
+
+    store = open_store()
+    store.add_documents(make_docs("a.txt", 3))
+    with open(tmp_path / "vectorstore" / "wal.log", "ab") as f:
+        f.write(b"\x10\x00\x00\x00\x00\x00partial")
+
+    restarted = open_store()
+
+    assert restarted.vectorstore.index.ntotal == 3
+    restarted.add_documents(make_docs("b.txt", 1))
+    assert open_store().vectorstore.index.ntotal == 4
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf"])
+def test_index_types(open_store, index_type):
+    """Every index type supports adds, deletes, MMR search and restarts."""
+
+    store = open_store(index_type=index_type, ivf_min_vectors=200, ivf_nprobe=4)
+    a_ids = store.add_documents(make_docs("a.txt", 150))
+    store.add_documents(make_docs("b.txt", 150))
+    # The IVF index is trained at the next snapshot, searches are exact until then
+    assert store._index_type_of(store.vectorstore.index) == ("flat" if index_type == "ivf" else index_type)
+    store.snapshot()
+    assert store._index_type_of(store.vectorstore.index) == index_type
+    store.delete(a_ids)
+    store.add_documents(make_docs("c.txt", 10))
+    store.snapshot()
+
+    restarted = open_store(index_type=index_type, ivf_min_vectors=200, ivf_nprobe=4)
+    index = restarted.vectorstore.index
+
+    assert index.ntotal == 160
+    assert restarted._index_type_of(index) == index_type
+    assert {doc.metadata["source"] for doc in restarted.vectorstore.docstore._dict.values()} == {"/tmp/b.txt", "/tmp/c.txt"}
+    results = restarted.vectorstore.max_marginal_relevance_search("b.txt chunk 7", k=3, fetch_k=10)
+    assert results[0].page_content == "b.txt chunk 7"
+    assert restarted.vectorstore.similarity_search("c.txt chunk 3", k=1)[0].page_content == "c.txt chunk 3"
+
+
+def test_small_ivf_store_is_not_converted_on_restart(open_store, mocker):
+    """An IVF store below ivf_min_vectors is kept as an exact index, not rebuilt at every start."""
+
+    from app.faiss_store import PersistentFAISSStore
+
+    store = open_store(index_type="ivf", ivf_min_vectors=200)
+    store.add_documents(make_docs("a.txt", 20))
+    store.snapshot()
+
+    convert_index = mocker.patch.object(PersistentFAISSStore, "_convert_index")
+    restarted = open_store(index_type="ivf", ivf_min_vectors=200)
+
+    convert_index.assert_not_called()
+    assert restarted._index_type_of(restarted.vectorstore.index) == "flat"
+    assert restarted.vectorstore.index.ntotal == 20
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_catalog_follows_adds_and_deletes(open_store, index_type):
+    """
+    The catalog maps each document to its chunks through adds, deletes and
+    restarts, and the remaining chunks are still found after a document in
+    the middle of the index is deleted.
+    """
+
+    store = open_store(index_type=index_type)
+    a_ids = store.add_documents(make_docs("a.txt", 3))
+    b_ids = store.add_documents(make_docs("b.txt", 4))
+    store.snapshot()
+    c_ids = store.add_documents(make_docs("c.txt", 2))
+
+    assert store.catalog.documents() == ["a.txt", "b.txt", "c.txt"]
+    assert store.catalog.chunk_ids("b.txt") == b_ids
+    assert store.catalog.metadata("c.txt") == {"source": "/tmp/c.txt", "page": 0}
+
+    store.delete(store.catalog.chunk_ids("b.txt"))
+
+    assert store.catalog.documents() == ["a.txt", "c.txt"]
+    assert store.catalog.chunk_ids("b.txt") == []
+    assert "b.txt" not in store.catalog
+    assert store.vectorstore.similarity_search("c.txt chunk 1", k=1)[0].page_content == "c.txt chunk 1"
+
+    restarted = open_store(index_type=index_type)
+
+    assert restarted.catalog.documents() == ["a.txt", "c.txt"]
+    assert restarted.catalog.chunk_ids("a.txt") == a_ids
+    assert restarted.catalog.chunk_ids("c.txt") == c_ids
+    # New chunks do not reuse the labels of deleted ones
+    d_ids = restarted.add_documents(make_docs("d.txt", 2))
+    assert restarted.vectorstore.index.ntotal == 7
+    assert restarted.vectorstore.similarity_search("a.txt chunk 2", k=1)[0].page_content == "a.txt chunk 2"
+    assert restarted.vectorstore.similarity_search("d.txt chunk 1", k=1)[0].id == d_ids[1]
+
+
+def test_unsupported_index_type(tmp_path):
+    from app.faiss_store import PersistentFAISSStore
+
+    with pytest.raises(ValueError):
+        PersistentFAISSStore(str(tmp_path), CountingEmbeddings(), index_type="lsh")
@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from pathlib import Path
+import pytest
+
+
+@pytest.fixture
+def tiny_models(tmp_path):
+    """Tiny local model directories standing in for the embedding, reranker and LLM repositories."""
+
+    models = {}
+    for name in ("embedding", "reranker", "llm"):
+        source = tmp_path / "hub" / f"tiny-{name}"
+        source.mkdir(parents=True)
+        (source / "config.json").write_text(json.dumps({"model_type": name, "hidden_size": 8}))
+        (source / "model.bin").write_bytes(name.encode() * 64)
+        models[name] = str(source)
+    return models
+
+
+class FakeExporter:
+    """Copies the local model files into the cache entry, recording the calls and the peak concurrency."""
+
+    def __init__(self, delay=0.05, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, spec, model_path):
+        with self.lock:
+            self.calls.append(spec)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if spec.model_type == self.fail_on:
+                (model_path / "partial.xml").write_text("<net/>")
+                raise RuntimeError("conversion failed")
+            for file in sorted(Path(spec.model_id).iterdir()):
+                (model_path / file.name).write_bytes(file.read_bytes())
+            (model_path / "openvino_model.xml").write_text(f"<net precision='{spec.weight_format}'/>")
+            return {"source_revision": "local"}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def make_specs(tiny_models, llm_weight_format="int8"):
+    from app.model_cache import ModelSpec
+
+    return [
+        ModelSpec(tiny_models["embedding"], "embedding"),
+        ModelSpec(tiny_models["reranker"], "reranker"),
+        ModelSpec(tiny_models["llm"], "llm", weight_format=llm_weight_format),
+    ]
+
+
+def test_warm_start_skips_conversion(tmp_path, tiny_models):
+    """
+    A cold start converts the independent models concurrently; a warm start finds
+    every model in the cache and converts nothing.
+    """
+
+    from app.model_cache import MANIFEST_FILE, ModelCache
+
+    specs = make_specs(tiny_models)
+    cold = FakeExporter()
+    paths = ModelCache(str(tmp_path / "cache")).prepare_all(specs, cold, max_workers=3)
+
+    assert len(cold.calls) == 3
+    assert cold.max_in_flight > 1
+    manifest = json.loads((paths[2] / MANIFEST_FILE).read_text())
+    assert manifest["spec"]["weight_format"] == "int8"
+    assert manifest["source_revision"] == "local"
+    assert set(manifest["files"]) == {"config.json", "model.bin", "openvino_model.xml"}
+
+    warm = FakeExporter()
+    cache = ModelCache(str(tmp_path / "cache"), verify_hashes=True)
+
+    assert all(cache.lookup(spec) is not None for spec in specs)
+    assert cache.prepare_all(specs, warm) == paths
+    assert warm.calls == []
+
+
+def test_changed_export_options_prepare_new_entry(tmp_path, tiny_models):
+    """A different precision is a different cache entry; the other models are reused."""
+
+    from app.model_cache import ModelCache
+
+    cache = ModelCache(str(tmp_path / "cache"))
+    first = cache.prepare_all(make_specs(tiny_models), FakeExporter())
+
+    exporter = FakeExporter()
+    second = cache.prepare_all(make_specs(tiny_models, llm_weight_format="int4"), exporter)
+
+    assert [spec.model_type for spec in exporter.calls] == ["llm"]
+    assert second[:2] == first[:2]
+    assert second[2] != first[2]
+
+
+def test_corrupted_entry_is_prepared_again(tmp_path, tiny_models):
+    """Entries with truncated or modified files fail the integrity check and are converted again."""
+
+    from app.model_cache import ModelCache
+
+    specs = make_specs(tiny_models)
+    paths = ModelCache(str(tmp_path / "cache")).prepare_all(specs, FakeExporter())
+
+    # Truncated file: caught by the size check
+    (paths[0] / "model.bin").write_bytes(b"x")
+    # Same size, different content: caught by the checksum check only
+    xml = paths[2] / "openvino_model.xml"
+    xml.write_text(xml.read_text().replace("int8", "fp16"))
+
+    assert ModelCache(str(tmp_path / "cache")).lookup(specs[2]) is not None
+    cache = ModelCache(str(tmp_path / "cache"), verify_hashes=True)
+    assert cache.lookup(specs[0]) is None
+    assert cache.lookup(specs[2]) is None
+
+    exporter = FakeExporter()
+    cache.prepare_all(specs, exporter)
+
+    assert sorted(spec.model_type for spec in exporter.calls) == ["embedding", "llm"]
+    assert (paths[0] / "model.bin").read_bytes() == b"embedding" * 64
+    assert cache.lookup(specs[2]) is not None
+
+
+def test_failed_conversion_leaves_no_entry(tmp_path, tiny_models):
+    """An interrupted preparation leaves neither a cache entry nor partial files behind."""
+
+    from app.model_cache import ModelCache
+
+    specs = make_specs(tiny_models)
+    cache = ModelCache(str(tmp_path / "cache"))
+
+    with pytest.raises(RuntimeError):
+        cache.prepare_all(specs, FakeExporter(fail_on="llm"))
+
+    assert cache.lookup(specs[0]) is not None
+    assert cache.lookup(specs[2]) is None
+    assert not cache.path_for(specs[2]).exists()
+    assert not list(cache.path_for(specs[2]).parent.glob(".*.tmp-*"))
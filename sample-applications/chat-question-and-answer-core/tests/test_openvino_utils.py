@@ -97,4 +97,43 @@ def test_invalid_device(test_client, mocker, skip_if_not_openvino):
     assert response.status_code == 404
     assert response.json() == {
         "detail": "Device invalid_device not found. Available devices: ['CPU', 'GPU']"
-    }
\ No newline at end of file
+    }
+
+def test_init_models_skips_preparation_when_cached(mocker, tmp_path, skip_if_not_openvino):
+    """
+    Tests that `OpenVINOBackend.init_models` loads the models from the cache without logging in
+    to Hugging Face or preparing any model when every model is already prepared.
+    Args:
+        mocker: The pytest-mock fixture used to patch methods or objects.
+        tmp_path: Temporary directory holding the model cache.
+        skip_if_not_openvino: Fixture to skip the test if OpenVINO is not available.
+    Asserts:
+        - Neither `login_to_huggingface` nor `prepare_model` is called.
+        - The models are loaded from their cache entries.
+    """
+
+    from app.model_cache import ModelCache
+    from app.openvino_backend import OpenVINOBackend
+
+    backend = OpenVINOBackend()
+    backend.model_cache = ModelCache(str(tmp_path / "openvino_models"))
+    specs = backend.model_specs()
+
+    def export(spec, model_path):
+        (model_path / "openvino_model.xml").write_text("<net/>")
+
+    paths = backend.model_cache.prepare_all(specs, export)
+
+    login = mocker.patch.object(OpenVINOBackend, "login_to_huggingface")
+    prepare_model = mocker.patch.object(OpenVINOBackend, "prepare_model")
+    embeddings = mocker.patch("app.openvino_backend.OpenVINOBgeEmbeddings")
+    reranker = mocker.patch("app.openvino_backend.OpenVINOReranker")
+    pipeline = mocker.patch("app.openvino_backend.HuggingFacePipeline")
+
+    backend.init_models()
+
+    login.assert_not_called()
+    prepare_model.assert_not_called()
+    assert embeddings.call_args.kwargs["model_name_or_path"] == str(paths[0])
+    assert reranker.call_args.kwargs["model_name_or_path"] == str(paths[1])
+    assert pipeline.from_model_id.call_args.kwargs["model_id"] == str(paths[2])
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for frame-to-video aggregation.
+
+Generates synthetic frame hits (video id, timestamp, relevance score and the
+metadata fields the response uses), aggregates them with the reference Python
+implementation and with the vectorized engine, checks that both return the
+same results and prints the per-query latency of each.
+
+Usage:
+python scripts/benchmark_aggregation.py
+python scripts/benchmark_aggregation.py --sizes 1000 10000 100000 --videos 50 --repeat 5
+
+Aggregation knobs are read from the environment like in the service, e.g.
+export AGGREGATION_MIN_GAP=8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import Mock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+with patch("langchain_vdms.vectorstores.VDMS_Client") as mock_vdms_client:
+    mock_vdms_client.return_value = Mock()
+    from src.utils.common import settings
+    from src.vdms_retriever.retriever import aggregate_frame_results_to_videos
+
+TIMING_KEYS = {
+    "processing_time_ms",
+    "segmentation_time_ms",
+    "scoring_time_ms",
+    "filtering_time_ms",
+    "formatting_time_ms",
+}
+
+
+def generate_hits(count: int, videos: int, seed: int) -> List[Dict[str, Any]]:
+    """Synthetic frame hits sampled every 0.5 s from videos of 5-20 minutes."""
+    rng = random.Random(seed)
+    catalog = []
+    for index in range(videos):
+        video_id = f"{index:08d}-0000-4000-8000-{rng.getrandbits(48):012x}"
+        catalog.append(
+            {
+                "video_id": video_id,
+                "video_url": f"http://vdms-dataprep:8000/v1/dataprep/videos/download?video_id={video_id}",
+                "video_rel_url": f"/v1/dataprep/videos/download?video_id={video_id}",
+                "fps": 30.0,
+                "total_frames": rng.randint(300, 1200) * 30,
+                "bucket_name": "video-summary",
+                "tags": "",
+            }
+        )
+
+    hits = []
+    for _ in range(count):
+        video = rng.choice(catalog)
+        duration = video["total_frames"] / video["fps"]
+        timestamp = rng.randrange(int(duration * 2)) / 2
+        hits.append(
+            {
+                **video,
+                "timestamp": timestamp,
+                "frame_number": int(timestamp * video["fps"]),
+                "relevance_score": rng.uniform(0.05, 0.35),
+            }
+        )
+    # VDMS returns hits best first
+    hits.sort(key=lambda hit: hit["relevance_score"], reverse=True)
+    return hits
+
+
+def run_engine(engine: str, hits: List[Dict[str, Any]], max_results: int, repeat: int):
+    settings.AGGREGATION_ENGINE = engine
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results, stats = aggregate_frame_results_to_videos(hits, max_results=max_results)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, stats, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark frame-to-video aggregation engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--videos", type=int, default=20, help="Distinct videos in the hits")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per engine and size")
+    parser.add_argument("--max-results", type=int, default=settings.AGGREGATION_MAX_RESULTS)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Per-frame debug logging would dominate the measurement
+    logging.getLogger("video_search").setLevel(logging.WARNING)
+
+    print(f"{'hits':>8} {'segments':>9} {'python ms':>10} {'vectorized ms':>14} {'speedup':>8}  match")
+    for size in args.sizes:
+        hits = generate_hits(size, args.videos, args.seed)
+        reference, reference_stats, python_ms = run_engine("python", hits, args.max_results, args.repeat)
+        results, stats, vectorized_ms = run_engine("vectorized", hits, args.max_results, args.repeat)
+
+        match = results == reference and {
+            key: value for key, value in stats.items() if key not in TIMING_KEYS
+        } == {key: value for key, value in reference_stats.items() if key not in TIMING_KEYS}
+        python_median = statistics.median(python_ms)
+        vectorized_median = statistics.median(vectorized_ms)
+        print(
+            f"{size:>8} {stats['segments_created']:>9} {python_median:>10.2f} "
+            f"{vectorized_median:>14.2f} {python_median / vectorized_median:>7.1f}x  {'yes' if match else 'NO'}"
+        )
+        if not match:
+            raise SystemExit(f"Vectorized aggregation differs from the reference for {size} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ python scripts/recompute_affregate_scores.py score.json --top 20
 
 
 Scenario 2 - Validating code changes:
-# After modifying calculate_segment_score, quickly verify the new rankings match expectations
+# After modifying the scoring (aggregation_engine.score_segments), quickly verify the new rankings match expectations
 python scripts/recompute_affregate_scores.py score.json
 
 
@@ -152,16 +152,16 @@ from pathlib import Path
 from typing import Any, Dict, List
 from unittest.mock import Mock, patch
 
+import numpy as np
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-with patch("langchain_community.vectorstores.vdms.VDMS_Client") as mock_vdms_client:
+with patch("langchain_vdms.vectorstores.VDMS_Client") as mock_vdms_client:
     mock_vdms_client.return_value = Mock()
-    from src.vdms_retriever.retriever import (
-        calculate_segment_score,
-        get_aggregation_config,
-    )
+    from src.vdms_retriever import aggregation_engine
+    from src.vdms_retriever.retriever import get_aggregation_config
 
 
 def load_segments(path: Path) -> List[Dict[str, Any]]:
@@ -233,13 +233,25 @@ def recompute_scores(segments: List[Dict[str, Any]], config: Dict[str, Any]):
                     "relevance_score": score,
                 }
 
+    # Score all segments at once on columnar frames labelled with their segment
+    frames = [frame for segment in segments for frame in segment.get("frames", [])]
+    labels = np.repeat(
+        np.arange(len(segments)), [len(segment.get("frames", [])) for segment in segments]
+    )
+    peak_timestamp = global_best_frame.get("timestamp") if global_best_frame else None
+    scored = aggregation_engine.score_segments(
+        aggregation_engine.frame_columns(frames),
+        labels,
+        len(segments),
+        config,
+        peak_timestamp,
+    )
+
     scored_segments: List[Dict[str, Any]] = []
-    for segment in segments:
-        score_data = calculate_segment_score(
-            segment,
-            global_max_score,
-            global_best_frame,
-            config,
+    for index, segment in enumerate(segments):
+        best_frame = frames[int(scored["best_frame"][index])]
+        score_data = aggregation_engine.score_breakdown(
+            scored, index, best_frame.get("timestamp"), peak_timestamp
         )
         scored_segments.append({"segment": segment, "score_data": score_data})
 
@@ -1,17 +1,20 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 import asyncio
 import json
 import time
-from typing import Optional, List, Tuple, Any
+from typing import Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from langchain_community.vectorstores.vdms import VDMS
 
 from src.utils.common import logger, settings
+from src.utils.query_cache import content_generation, result_cache
 from src.utils.directory_watcher import (
     get_initial_upload_status,
     get_last_updated,
@@ -28,6 +31,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# VDMS and embedding calls are blocking; they run here instead of on the event loop
+query_executor = ThreadPoolExecutor(
+    max_workers=settings.QUERY_EXECUTOR_WORKERS, thread_name_prefix="search-query"
+)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -42,6 +50,9 @@ class QueryRequest(BaseModel):
     query_id: str
     query: str
     tags: Optional[list[str]] = None
+    # Time range within the videos, in seconds
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
 
 
 def format_aggregated_results(aggregated_videos: list[dict]) -> list[dict]:
@@ -110,6 +121,8 @@ async def query_endpoint(request: list[QueryRequest]):
         from src.vdms_retriever.retriever import (
             get_vectordb,
             aggregate_frame_results_to_videos,
+            embed_queries,
+            search_frames,
         )
 
         api_start = time.perf_counter()
@@ -118,7 +131,8 @@ async def query_endpoint(request: list[QueryRequest]):
             f"Received request: {json.dumps([req.dict() for req in request], indent=2)}"
         )
 
-        db: VDMS = get_vectordb()
+        loop = asyncio.get_running_loop()
+        db: VDMS = await loop.run_in_executor(query_executor, get_vectordb)
         if not db:
             logger.error(
                 "VectorDB could not be initialized. Please verify the connection."
@@ -127,8 +141,37 @@ async def query_endpoint(request: list[QueryRequest]):
                 status_code=500, detail="Some error ocurred at the DataPrep Service."
             )
 
-        async def process_query(query_request):
-            """Process a single query request with frame-to-video aggregation."""
+        def result_cache_key(query_request):
+            return (
+                query_request.query,
+                tuple(sorted(query_request.tags or [])),
+                query_request.start_time,
+                query_request.end_time,
+            )
+
+        # Look up each cached response once, then embed all uncached queries in one batched call
+        cached_responses = [result_cache.get(result_cache_key(req)) for req in request]
+        uncached_queries = list(
+            dict.fromkeys(
+                req.query for req, cached in zip(request, cached_responses) if cached is None
+            )
+        )
+        query_embeddings = {}
+        if uncached_queries:
+            embedding_start = time.perf_counter()
+            embeddings = await loop.run_in_executor(
+                query_executor, embed_queries, db, uncached_queries
+            )
+            query_embeddings = dict(zip(uncached_queries, embeddings))
+            logger.info(
+                f"Embedded {len(uncached_queries)} distinct queries in {(time.perf_counter() - embedding_start) * 1000:.2f} ms"
+            )
+
+        async def process_query(query_request, cached):
+            """Process a single query request with frame-to-video aggregation.
+
+            ``cached`` is the response found in the result cache for this request, if any.
+            """
 
             query_start = time.perf_counter()
             logger.info(
@@ -136,6 +179,16 @@ async def query_endpoint(request: list[QueryRequest]):
             )
             logger.debug(f"Query tags: {query_request.tags}")
 
+            cache_key = result_cache_key(query_request)
+            if cached is not None:
+                logger.info(f"Returning cached results for query {query_request.query_id}")
+                return {
+                    "query_id": query_request.query_id,
+                    "results": cached["results"],
+                    "aggregation_stats": {**cached["aggregation_stats"], "cache_hit": True},
+                }
+            generation = content_generation()
+
             # Get more initial results for aggregation (before filtering)
             initial_k = getattr(
                 settings, "AGGREGATION_INITIAL_K", 1000
@@ -143,61 +196,38 @@ async def query_endpoint(request: list[QueryRequest]):
             logger.debug(f"Searching with initial_k={initial_k}")
 
             vdms_start = time.perf_counter()
-            docs_with_score: List[Tuple[Any, float]] = db.similarity_search_with_score(
-                query_request.query,
-                k=initial_k,
-                fetch_k=initial_k + 1,  # ensure fetch_k > k for langchain_vdms
-                # normalize_distance=True
+            frame_results, search_stats = await loop.run_in_executor(
+                query_executor,
+                partial(
+                    search_frames,
+                    db,
+                    query_request.query,
+                    tags=query_request.tags,
+                    start_time=query_request.start_time,
+                    end_time=query_request.end_time,
+                    target_k=initial_k,
+                    embedding=query_embeddings.get(query_request.query),
+                ),
             )
             vdms_duration_ms = (time.perf_counter() - vdms_start) * 1000
             logger.info(
-                f"VDMS similarity search (embedding + retrieval) completed in {vdms_duration_ms:.2f} ms with {len(docs_with_score)} results"
+                f"VDMS similarity search (embedding + retrieval + filtering) completed in {vdms_duration_ms:.2f} ms: "
+                f"fetched {search_stats['records_fetched']} records, {len(frame_results)} results after filtering"
             )
 
-            logger.info(f"Raw search returned {len(docs_with_score)} results")
-
-            # Add relevance scores to metadata
-            filter_start = time.perf_counter()
-            frame_results = []
-            for res, score in docs_with_score:
-                res.metadata["relevance_score"] = score
-
-                # Filter by tags if specified
-                if query_request.tags:
-                    result_tags: list = []
-                    if res.metadata.get("tags"):
-                        # construct a list of tags from the tag string in results metadata
-                        if isinstance(res.metadata["tags"], str):
-                            result_tags = res.metadata["tags"].split(",")
-                        else:
-                            result_tags = res.metadata["tags"]
-
-                    # check if any of the query tags are in the result tags
-                    if not set(query_request.tags).intersection(set(result_tags)):
-                        logger.debug(
-                            f"Filtering out result due to tags: query_tags={query_request.tags}, result_tags={result_tags}"
-                        )
-                        continue
-
-                frame_results.append(res)
-
-            filtering_duration_ms = (time.perf_counter() - filter_start) * 1000
-            logger.info(
-                f"Filtering and metadata enrichment finished in {filtering_duration_ms:.2f} ms. Remaining results: {len(frame_results)}"
-            )
-
-            logger.info(f"After tag filtering: {len(frame_results)} results")
-
             # Apply frame-to-video aggregation if enabled
             if getattr(settings, "AGGREGATION_ENABLED", True) and frame_results:
                 try:
                     logger.debug("Starting aggregation process")
                     max_results = getattr(settings, "AGGREGATION_MAX_RESULTS", 20)
                     aggregation_start = time.perf_counter()
-                    aggregated_videos, aggregation_stats = (
-                        aggregate_frame_results_to_videos(
-                            frame_results, max_results=max_results
-                        )
+                    aggregated_videos, aggregation_stats = await loop.run_in_executor(
+                        query_executor,
+                        partial(
+                            aggregate_frame_results_to_videos,
+                            frame_results,
+                            max_results=max_results,
+                        ),
                     )
                     aggregation_duration_ms = (
                         time.perf_counter() - aggregation_start
@@ -217,8 +247,13 @@ async def query_endpoint(request: list[QueryRequest]):
                     result = {
                         "query_id": query_request.query_id,
                         "results": converted_results,
-                        "aggregation_stats": aggregation_stats,
+                        "aggregation_stats": {**aggregation_stats, "search": search_stats},
                     }
+                    result_cache.put(
+                        cache_key,
+                        {"results": converted_results, "aggregation_stats": result["aggregation_stats"]},
+                        generation=generation,
+                    )
 
                     logger.info(
                         f"Returning {len(converted_results)} aggregated results for query {query_request.query_id}"
@@ -261,6 +296,7 @@ async def query_endpoint(request: list[QueryRequest]):
                             "aggregation_failed": True,
                             "error": str(e),
                             "fallback_frame_count": len(fallback_results),
+                            "search": search_stats,
                         },
                     }
                     logger.info(
@@ -289,6 +325,7 @@ async def query_endpoint(request: list[QueryRequest]):
                     "aggregation_stats": {
                         "aggregation_enabled": False,
                         "frame_count": len(converted_results),
+                        "search": search_stats,
                     },
                 }
                 logger.info(
@@ -301,7 +338,7 @@ async def query_endpoint(request: list[QueryRequest]):
                 return result
 
         async def process_batch(batch):
-            tasks = [process_query(query_request) for query_request in batch]
+            tasks = [process_query(query_request, cached) for query_request, cached in batch]
             return await asyncio.gather(*tasks)
 
         async def process_requests(requests):
@@ -313,7 +350,7 @@ async def query_endpoint(request: list[QueryRequest]):
                 results.extend(batch_results)
             return results
 
-        results = await process_requests(request)
+        results = await process_requests(list(zip(request, cached_responses)))
 
         logger.info(f"=== FINAL API RESPONSE ===")
         logger.info(f"Total result groups: {len(results)}")
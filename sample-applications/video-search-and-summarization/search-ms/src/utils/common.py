@@ -60,6 +60,10 @@ class Settings(BaseSettings):
     VS_INITIAL_DUMP: bool = Field(default=False, env="VS_INITIAL_DUMP")
     DELETE_PROCESSED_FILES: bool = Field(default=False, env="DELETE_PROCESSED_FILES")
     WATCH_DIRECTORY_RECURSIVE: bool = Field(default=False, env="WATCH_DIRECTORY_RECURSIVE")
+    WATCH_STATE_DB_PATH: str = Field(
+        default="/tmp/video-search/watcher_state.db", env="WATCH_STATE_DB_PATH"
+    )
+    WATCH_INGEST_WORKERS: int = Field(default=4, env="WATCH_INGEST_WORKERS")
     EMBEDDING_LENGTH: int = 0
 
     # Frame-to-Video Aggregation Settings
@@ -92,6 +96,34 @@ class Settings(BaseSettings):
     AGGREGATION_CONTEXT_BOOST_STRENGTH: float = Field(
         default=0.5, env="AGGREGATION_CONTEXT_BOOST_STRENGTH"
     )
+    AGGREGATION_ENGINE: str = Field(default="vectorized", env="AGGREGATION_ENGINE")
+    AGGREGATION_QUAL_TOP_REDUCER: str = Field(
+        default="top_n_mean", env="AGGREGATION_QUAL_TOP_REDUCER"
+    )
+    AGGREGATION_SOFTMAX_TEMPERATURE: float = Field(
+        default=0.05, env="AGGREGATION_SOFTMAX_TEMPERATURE"
+    )
+
+    # Filtered Search Settings
+    SEARCH_FILTER_PUSHDOWN: bool = Field(default=True, env="SEARCH_FILTER_PUSHDOWN")
+    SEARCH_FILTER_OVERSAMPLE: float = Field(
+        default=2.0, env="SEARCH_FILTER_OVERSAMPLE"
+    )
+    SEARCH_MAX_FETCH_K: int = Field(default=16000, env="SEARCH_MAX_FETCH_K")
+    SEARCH_TAG_CACHE_TTL: float = Field(default=60.0, env="SEARCH_TAG_CACHE_TTL")
+    SEARCH_TAG_SCAN_LIMIT: int = Field(default=100000, env="SEARCH_TAG_SCAN_LIMIT")
+    SEARCH_MAX_TAG_VALUES: int = Field(default=16, env="SEARCH_MAX_TAG_VALUES")
+
+    # Query Execution Settings
+    QUERY_EXECUTOR_WORKERS: int = Field(default=8, env="QUERY_EXECUTOR_WORKERS")
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(
+        default=1024, env="QUERY_EMBEDDING_CACHE_SIZE"
+    )
+    QUERY_EMBEDDING_CACHE_TTL: float = Field(
+        default=3600.0, env="QUERY_EMBEDDING_CACHE_TTL"
+    )
+    QUERY_RESULT_CACHE_SIZE: int = Field(default=256, env="QUERY_RESULT_CACHE_SIZE")
+    QUERY_RESULT_CACHE_TTL: float = Field(default=300.0, env="QUERY_RESULT_CACHE_TTL")
 
 
 settings = Settings()
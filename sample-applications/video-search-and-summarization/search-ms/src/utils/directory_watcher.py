@@ -3,122 +3,239 @@
 
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from threading import Timer, Thread, Lock
+from threading import Event, Thread, Lock
 from src.utils.common import settings, logger
-from src.utils.utils import upload_videos_to_dataprep
+from src.utils.utils import ingest_video
+from src.utils.watch_state import (
+    STATUS_FAILED,
+    STATUS_INGESTED,
+    file_content_hash,
+    open_watch_state,
+)
+
+# Smaller files are incomplete or not worth indexing
+MIN_VIDEO_SIZE = 524288
 
 initial_upload_status = {"total": 0, "completed": 0, "pending": 0}
+status_lock = Lock()
+
+
+def is_candidate(path):
+    return path.endswith(".mp4")
+
+
+class IngestionQueue:
+    """
+    Ingests settled video files on a bounded pool of workers.
+
+    Files whose size and mtime match the state database are skipped without
+    being read; others are hashed first, so unchanged content (a touched or
+    renamed file) is not ingested again. Only the files of the initial scan
+    count towards ``initial_upload_status``.
+    """
+
+    def __init__(self, state, workers):
+        self.state = state
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="watcher-ingest")
+        self._in_flight = set()
+        self._lock = Lock()
+
+    def submit(self, path, stat=None, initial=False):
+        """Queue a file for ingestion; returns False if it is skipped or already queued."""
+        try:
+            stat = stat or os.stat(path)
+        except FileNotFoundError:
+            return False
+        # Processed files are deleted, so with DELETE_PROCESSED_FILES a file at an ingested path is new
+        if (
+            self.state is not None
+            and not settings.DELETE_PROCESSED_FILES
+            and self.state.is_unchanged(path, stat)
+        ):
+            logger.debug(f"Skipping unchanged file {path}")
+            return False
+        with self._lock:
+            if path in self._in_flight:
+                return False
+            self._in_flight.add(path)
+        if initial:
+            with status_lock:
+                initial_upload_status["total"] += 1
+                initial_upload_status["pending"] += 1
+        self.executor.submit(self._ingest, path, initial)
+        return True
+
+    def _ingested_copy(self, path, content_hash):
+        """Path under which this content was already ingested, if any; a missing path means a rename."""
+        if self.state is None:
+            return None
+        renamed_from = None
+        for previous_path in self.state.ingested_as(content_hash):
+            if previous_path == path:
+                # Processed files are deleted, so a file back at its path was dropped again
+                if not settings.DELETE_PROCESSED_FILES:
+                    return previous_path
+            elif os.path.exists(previous_path):
+                return previous_path
+            elif not settings.DELETE_PROCESSED_FILES and renamed_from is None:
+                renamed_from = previous_path
+        return renamed_from
+
+    def _ingest(self, path, initial=False):
+        success = False
+        try:
+            stat = os.stat(path)
+            content_hash = file_content_hash(path)
+            previous_path = self._ingested_copy(path, content_hash)
+            if previous_path is not None:
+                if os.path.exists(previous_path):
+                    logger.info(f"Skipping {path}: same content already ingested as {previous_path}")
+                else:
+                    logger.info(f"Skipping {path}: renamed from {previous_path}")
+                    self.state.forget(previous_path)
+                self.state.record(path, stat, content_hash, STATUS_INGESTED)
+                success = True
+                return
+
+            success = ingest_video(path)
+            if self.state is not None:
+                self.state.record(path, stat, content_hash, STATUS_INGESTED if success else STATUS_FAILED)
+            if not success:
+                logger.error(f"Ingestion failed for {path}")
+        except Exception as e:
+            logger.error(f"Error ingesting {path}: {str(e)}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(path)
+            if initial:
+                with status_lock:
+                    initial_upload_status["pending"] -= 1
+                    if success:
+                        initial_upload_status["completed"] += 1
+            DebouncedHandler.last_updated = datetime.now()
+            logger.info(f"Last updated time set to {DebouncedHandler.last_updated}")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
 
 
 class DebouncedHandler(FileSystemEventHandler):
+    """
+    Collects file events and hands over files once they stopped changing.
+
+    A file is ready when no event arrived for ``debounce_time`` seconds and its
+    size and mtime did not change between two checks, so files that are still
+    being copied are not ingested half written.
+    """
+
     last_updated = None  # Class-level attribute
     lock = Lock()  # Lock for thread safety
 
-    def __init__(self, debounce_time, action):
+    def __init__(self, debounce_time, queue, check_interval=1.0):
         self.debounce_time = debounce_time
-        self.action = action
-        self.timer = None
-        self.file_paths = set()
-        self.first_event_time = None
+        self.queue = queue
+        self.check_interval = check_interval
+        # path -> [time of the last event, (size, mtime) seen at the last check]
+        self.pending = {}
+        self._stopped = Event()
+        self._settle_thread = Thread(target=self._settle_loop, daemon=True)
 
-    def on_created(self, event):
-        if event.src_path.endswith(".mp4") and os.path.getsize(event.src_path) > 524288:
+    def start(self):
+        self._settle_thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _touch(self, path):
+        if is_candidate(path):
             with self.lock:
-                self.file_paths.add(event.src_path)
-            self._debounce()
+                entry = self.pending.setdefault(path, [0.0, None])
+                entry[0] = time.monotonic()
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._touch(event.src_path)
 
     def on_modified(self, event):
-        if event.src_path.endswith(".mp4") and os.path.getsize(event.src_path) > 524288:
-            with self.lock:
-                self.file_paths.add(event.src_path)
-            self._debounce()
-
-    def _debounce(self):
-        if self.first_event_time is None:
-            self.first_event_time = datetime.now()
-            self.timer = Timer(self.debounce_time, self._process_files)
-            self.timer.start()
-        else:
-            elapsed_time = (datetime.now() - self.first_event_time).total_seconds()
-            if elapsed_time >= self.debounce_time:
-                self._process_files()
-
-    def _process_files(self):
-        def run_action():
-            global initial_upload_status
+        if not event.is_directory:
+            self._touch(event.src_path)
+
+    def on_closed(self, event):
+        if not event.is_directory:
+            self._touch(event.src_path)
+
+    def on_moved(self, event):
+        # Files written elsewhere and renamed into place arrive as moves
+        if not event.is_directory:
+            self._touch(event.dest_path)
+
+    def _settle_loop(self):
+        while not self._stopped.wait(self.check_interval):
             try:
-                with self.lock:
-                    initial_upload_status["total"] += len(self.file_paths)
-                    initial_upload_status["pending"] += len(self.file_paths)
-                    self.action(self.file_paths)
-                    initial_upload_status["completed"] += len(self.file_paths)
-                    initial_upload_status["pending"] -= len(self.file_paths)
-                    self.file_paths.clear()
-                    self.first_event_time = None
+                self.flush()
             except Exception as e:
-                logger.error(f"Error in _process_files: {str(e)}")
-            finally:
-                DebouncedHandler.last_updated = datetime.now()
-                logger.info(f"Last updated time set to {DebouncedHandler.last_updated}")
+                logger.error(f"Error in directory watcher: {str(e)}")
 
-        action_thread = Thread(target=run_action)
-        action_thread.start()
+    def flush(self, now=None):
+        """Submit every pending file that has settled; returns the submitted paths."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            due = [path for path, (last_event, _) in self.pending.items() if now - last_event >= self.debounce_time]
 
+        ready = []
+        for path in due:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                with self.lock:
+                    self.pending.pop(path, None)
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            with self.lock:
+                entry = self.pending.get(path)
+                if entry is None or now - entry[0] < self.debounce_time:
+                    continue
+                if entry[1] != signature:
+                    # Still changing (or first check): look again on the next tick
+                    entry[1] = signature
+                    continue
+                del self.pending[path]
+            if stat.st_size > MIN_VIDEO_SIZE:
+                ready.append((path, stat))
 
-def upload_initial_videos(path):
-    global initial_upload_status
-    logger.debug(f"Starting initial upload of videos from {path}")
-    
-    video_files = []
-    if settings.WATCH_DIRECTORY_RECURSIVE:
-        # Recursively find all MP4 files in subdirectories
-        for root, dirs, files in os.walk(path):
-            for f in files:
-                if f.endswith(".mp4"):
-                    file_path = os.path.join(root, f)
-                    if os.path.getsize(file_path) > 524288:
-                        video_files.append(file_path)
-        logger.debug(f"Recursive scan found {len(video_files)} video files for initial upload")
-    else:
-        # Only scan the top-level directory
-        video_files = [
-            os.path.join(path, f)
-            for f in os.listdir(path)
-            if f.endswith(".mp4") and os.path.getsize(os.path.join(path, f)) > 524288
-        ]
-        logger.debug(f"Top-level scan found {len(video_files)} video files for initial upload")
-    
-    initial_upload_status["total"] = len(video_files)
-    initial_upload_status["pending"] = len(video_files)
-
-    def upload_batch(batch):
-        global initial_upload_status
-        try:
-            logger.debug(f"Uploading batch of {len(batch)} videos: {batch}")
-            success = upload_videos_to_dataprep(batch)
-            if success:
-                initial_upload_status["completed"] += len(batch)
-                initial_upload_status["pending"] -= len(batch)
-                logger.debug(
-                    f"Batch upload complete. Completed: {initial_upload_status['completed']}, Pending: {initial_upload_status['pending']}"
-                )
-                if settings.DELETE_PROCESSED_FILES:
-                    for file_path in batch:
-                        os.remove(file_path)
-                        logger.info(f"Deleted processed file {file_path}")
-            else:
-                logger.error(f"Batch upload failed for batch: {batch}")
-        except Exception as e:
-            logger.error(f"Error in upload_batch: {str(e)}")
+        submitted = [path for path, stat in ready if self.queue.submit(path, stat)]
+        if submitted:
+            logger.info(f"Queued {len(submitted)} settled file(s) for ingestion")
+        return submitted
 
-    for i in range(0, len(video_files), 10):
-        batch = video_files[i : i + 10]
-        batch_thread = Thread(target=upload_batch, args=(batch,))
-        batch_thread.start()
-        logger.debug(f"Started thread for batch {i//10 + 1}")
+
+def iter_video_files(path, recursive):
+    """Yield (path, stat) of the candidate videos in ``path``."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from iter_video_files(entry.path, recursive)
+            elif is_candidate(entry.name):
+                stat = entry.stat()
+                if stat.st_size > MIN_VIDEO_SIZE:
+                    yield entry.path, stat
+
+
+def upload_initial_videos(path, queue):
+    """Queue the videos already in ``path`` that are not ingested yet (one scan at startup)."""
+    logger.debug(f"Starting initial upload of videos from {path}")
+    scanned = 0
+    queued = 0
+    for file_path, stat in iter_video_files(path, settings.WATCH_DIRECTORY_RECURSIVE):
+        scanned += 1
+        if queue.submit(file_path, stat, initial=True):
+            queued += 1
+    logger.info(f"Initial scan of {path}: {scanned} video files, {queued} queued for ingestion")
 
 
 def start_watcher():
@@ -130,12 +247,10 @@ def start_watcher():
         os.makedirs(path)
     debounce_time = settings.DEBOUNCE_TIME
 
-    if settings.VS_INITIAL_DUMP:
-        initial_upload_thread = Thread(target=upload_initial_videos, args=(path,))
-        initial_upload_thread.start()
-        logger.debug("Started initial upload thread")
+    queue = IngestionQueue(open_watch_state(settings.WATCH_STATE_DB_PATH), settings.WATCH_INGEST_WORKERS)
 
-    event_handler = DebouncedHandler(debounce_time, upload_videos_to_dataprep)
+    event_handler = DebouncedHandler(debounce_time, queue)
+    event_handler.start()
     observer = Observer()
     recursive = settings.WATCH_DIRECTORY_RECURSIVE
     observer.schedule(event_handler, path, recursive=recursive)
@@ -144,12 +259,19 @@ def start_watcher():
         f"Started directory watcher on {path} with debounce time of {debounce_time} seconds. Recursive: {recursive}"
     )
 
+    if settings.VS_INITIAL_DUMP:
+        initial_upload_thread = Thread(target=upload_initial_videos, args=(path, queue), daemon=True)
+        initial_upload_thread.start()
+        logger.debug("Started initial upload thread")
+
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         observer.stop()
+        event_handler.stop()
     observer.join()
+    queue.shutdown()
 
 
 def get_initial_upload_status():
@@ -0,0 +1,83 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from src.utils.common import logger, settings
+
+# Bumped whenever new content is ingested; results computed before are stale
+_content_generation = 0
+_generation_lock = threading.Lock()
+
+
+def content_generation() -> int:
+    """Return the current content generation of the collection."""
+    return _content_generation
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+
+    Entries can be tied to a content generation: ``put`` drops a value computed
+    under an older generation, so a query that raced with an ingestion does not
+    cache results that miss the new content.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        if self.max_size <= 0 or (generation is not None and generation != _content_generation):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Query text -> embedding; embeddings depend only on the model, not on the collection
+embedding_cache = TTLCache(
+    max_size=settings.QUERY_EMBEDDING_CACHE_SIZE, ttl=settings.QUERY_EMBEDDING_CACHE_TTL
+)
+# (query, filters) -> query response, valid until new content is ingested
+result_cache = TTLCache(
+    max_size=settings.QUERY_RESULT_CACHE_SIZE, ttl=settings.QUERY_RESULT_CACHE_TTL
+)
+
+
+def invalidate_query_caches() -> None:
+    """Drop cached query results after new content was ingested."""
+    global _content_generation
+    with _generation_lock:
+        _content_generation += 1
+    result_cache.clear()
+    logger.debug(f"Query result cache invalidated (content generation {_content_generation})")
@@ -8,8 +8,7 @@ from urllib.parse import urlparse
 
 import requests
 from src.utils.common import logger, settings
-
-uploaded_files = set()
+from src.utils.query_cache import invalidate_query_caches
 
 
 def sanitize_file_path(file_path):
@@ -124,20 +123,13 @@ def upload_single_video_with_retry(file_path, max_retries=3):
     return False
 
 
-def upload_videos_to_dataprep(file_paths):
-    all_success = True
-    for file_path in file_paths:
-        if file_path in uploaded_files:
-            continue
-
-        success = upload_single_video_with_retry(file_path)
-
-        if success:
-            uploaded_files.add(file_path)
-            if settings.DELETE_PROCESSED_FILES:
-                os.remove(file_path)
-                logger.info(f"Deleted processed file {file_path}")
-        else:
-            all_success = False
-
-    return all_success
+def ingest_video(file_path):
+    """Upload a video and create its search embeddings; returns whether it succeeded."""
+    success = upload_single_video_with_retry(file_path)
+    if success:
+        # The new video's frames are now searchable
+        invalidate_query_caches()
+        if settings.DELETE_PROCESSED_FILES:
+            os.remove(file_path)
+            logger.info(f"Deleted processed file {file_path}")
+    return success
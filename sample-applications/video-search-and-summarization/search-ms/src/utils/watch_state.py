@@ -0,0 +1,109 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.utils.common import logger
+
+STATUS_INGESTED = "ingested"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_by_hash ON files (content_hash);
+"""
+
+
+def file_content_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WatchStateDB:
+    """
+    Persistent record of the files the directory watcher has ingested.
+
+    Every ingested file is stored with its size, modification time and content
+    hash. After a restart, a file whose size and mtime are unchanged is skipped
+    without being read; a touched file is hashed and skipped if its content is
+    unchanged, and content already ingested under another path is not ingested
+    again. A rename, where the old path is gone, moves the record to the new
+    path.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def is_unchanged(self, path: str, stat: os.stat_result) -> bool:
+        """Whether ``path`` was ingested with the same size and mtime (no read needed)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, status FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        return row is not None and row[2] == STATUS_INGESTED and (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns)
+
+    def ingested_as(self, content_hash: str) -> List[str]:
+        """Paths under which this content was ingested."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM files WHERE content_hash = ? AND status = ?",
+                (content_hash, STATUS_INGESTED),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def record(self, path: str, stat: os.stat_result, content_hash: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, content_hash, status, time.time()),
+            )
+
+    def forget(self, path: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def counts(self) -> Tuple[int, int]:
+        """Number of ingested and failed files."""
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT status, COUNT(*) FROM files GROUP BY status").fetchall())
+        return rows.get(STATUS_INGESTED, 0), rows.get(STATUS_FAILED, 0)
+
+
+def open_watch_state(path: str) -> Optional[WatchStateDB]:
+    """Open the state database; without it the watcher still runs but cannot skip files after a restart."""
+    try:
+        state = WatchStateDB(path)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Watcher state database unavailable at {path} ({e}); files will be re-ingested after restarts")
+        return None
+    ingested, failed = state.counts()
+    logger.info(f"Watcher state database at {path}: {ingested} ingested files, {failed} failed")
+    return state
@@ -0,0 +1,366 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Columnar frame-to-video aggregation.
+
+Frame hits are converted once into NumPy columns (video code, timestamp,
+score). Segmentation is a sorted group-by on (video, time window), and every
+per-segment statistic is computed over the grouped columns instead of per-item
+Python loops. The scores reproduce ``calculate_segment_score`` exactly: sums
+are accumulated in the same order and with the same rounding as Python's
+``sum``, so the ranking of tied or nearly tied segments does not change.
+"""
+
+import bisect
+import math
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Score used for frames without a relevance score, as in calculate_segment_score
+DEFAULT_FRAME_SCORE = 0.1
+
+# Python 3.12 and later add floats in ``sum`` with Neumaier compensation
+COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+@dataclass
+class FrameColumns:
+    """Columnar view of frame hits, in the order they were returned."""
+
+    video_ids: List[Any]
+    video_codes: np.ndarray
+    timestamps: np.ndarray
+    scores: np.ndarray
+    has_scores: np.ndarray
+    metadata: List[Dict[str, Any]]
+
+    def __len__(self) -> int:
+        return len(self.metadata)
+
+
+@dataclass
+class SegmentTable:
+    """
+    Segments of a set of frames, numbered by the first frame that falls in them.
+
+    ``labels`` holds the segment of every frame; the other arrays are indexed
+    by segment.
+    """
+
+    labels: np.ndarray
+    video_codes: np.ndarray
+    window_ids: np.ndarray
+    first_frames: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.first_frames)
+
+
+def frame_columns(frame_results: List[Any]) -> FrameColumns:
+    """Extract video, timestamp and score columns from frame documents or metadata dicts."""
+    metadata_list = [frame.metadata if hasattr(frame, "metadata") else frame for frame in frame_results]
+    codes: Dict[Any, int] = {}
+    video_codes = [codes.setdefault(metadata.get("video_id", "unknown"), len(codes)) for metadata in metadata_list]
+    count = len(metadata_list)
+    return FrameColumns(
+        video_ids=list(codes),
+        video_codes=np.fromiter(video_codes, dtype=np.int64, count=count),
+        timestamps=np.fromiter(
+            (metadata.get("timestamp", 0) for metadata in metadata_list), dtype=np.float64, count=count
+        ),
+        scores=np.fromiter(
+            (metadata.get("relevance_score", DEFAULT_FRAME_SCORE) for metadata in metadata_list),
+            dtype=np.float64,
+            count=count,
+        ),
+        has_scores=np.fromiter(
+            ("relevance_score" in metadata for metadata in metadata_list), dtype=bool, count=count
+        ),
+        metadata=metadata_list,
+    )
+
+
+def segment_frames(columns: FrameColumns, segment_duration: float) -> SegmentTable:
+    """
+    Group frames into fixed windows of ``segment_duration`` seconds per video.
+
+    Segments are numbered in order of their first frame, the order in which
+    ``create_temporal_segments`` creates them.
+    """
+    count = len(columns)
+    if count == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return SegmentTable(labels=empty, video_codes=empty, window_ids=empty, first_frames=empty)
+
+    windows = np.floor_divide(columns.timestamps, segment_duration).astype(np.int64)
+    # Stable sort: inside a segment, frames keep their original order
+    order = np.lexsort((windows, columns.video_codes))
+    sorted_videos = columns.video_codes[order]
+    sorted_windows = windows[order]
+
+    boundary = np.empty(count, dtype=bool)
+    boundary[0] = True
+    boundary[1:] = (sorted_videos[1:] != sorted_videos[:-1]) | (sorted_windows[1:] != sorted_windows[:-1])
+    group = np.cumsum(boundary) - 1
+    firsts = order[boundary]
+
+    # Renumber groups by first appearance
+    rank = np.empty(len(firsts), dtype=np.int64)
+    rank[np.argsort(firsts, kind="stable")] = np.arange(len(firsts))
+    labels = np.empty(count, dtype=np.int64)
+    labels[order] = rank[group]
+
+    segment_videos = np.empty(len(firsts), dtype=np.int64)
+    segment_windows = np.empty(len(firsts), dtype=np.int64)
+    segment_firsts = np.empty(len(firsts), dtype=np.int64)
+    segment_videos[rank] = sorted_videos[boundary]
+    segment_windows[rank] = sorted_windows[boundary]
+    segment_firsts[rank] = firsts
+    return SegmentTable(
+        labels=labels, video_codes=segment_videos, window_ids=segment_windows, first_frames=segment_firsts
+    )
+
+
+def sequential_sums(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Sum ``values[start:start + length]`` for every group, adding left to right.
+
+    Unlike ``np.add.reduceat`` (pairwise summation) this rounds exactly like
+    Python's ``sum`` over the same values, including its compensated summation
+    on Python 3.12 and later, at O(total length) cost.
+    """
+    sums = np.zeros(len(starts), dtype=np.float64)
+    if len(starts) == 0:
+        return sums
+    compensation = np.zeros(len(starts), dtype=np.float64)
+    by_length = np.argsort(-lengths, kind="stable")
+    sorted_lengths = lengths[by_length]
+    for position in range(int(sorted_lengths[0])):
+        # Groups longer than ``position`` form a prefix of ``by_length``
+        active = by_length[: np.searchsorted(-sorted_lengths, -position, side="left")]
+        partial = sums[active]
+        value = values[starts[active] + position]
+        total = partial + value
+        if COMPENSATED_SUM:
+            compensation[active] += np.where(
+                np.abs(partial) >= np.abs(value), (partial - total) + value, (value - total) + partial
+            )
+        sums[active] = total
+    if COMPENSATED_SUM:
+        # As in ``sum``: keep the sign of zero sums and leave overflowed sums alone
+        corrected = (compensation != 0) & np.isfinite(compensation)
+        sums[corrected] += compensation[corrected]
+    return sums
+
+
+@dataclass
+class GroupedScores:
+    """Frame scores grouped by segment, best first inside each segment."""
+
+    values: np.ndarray
+    starts: np.ndarray
+    counts: np.ndarray
+    top_counts: np.ndarray
+    params: Dict[str, Any]
+
+
+def reduce_max(scores: GroupedScores) -> np.ndarray:
+    return scores.values[scores.starts]
+
+
+def reduce_mean(scores: GroupedScores) -> np.ndarray:
+    return sequential_sums(scores.values, scores.starts, scores.counts) / scores.counts
+
+
+def reduce_top_n_mean(scores: GroupedScores) -> np.ndarray:
+    return sequential_sums(scores.values, scores.starts, scores.top_counts) / scores.top_counts
+
+
+def reduce_top_n_softmax(scores: GroupedScores) -> np.ndarray:
+    """Softmax-weighted mean of the top-N scores (``softmax_temperature``, default 0.05)."""
+    temperature = float(scores.params.get("softmax_temperature", 0.05) or 0.05)
+    labels = np.repeat(np.arange(len(scores.starts)), scores.counts)
+    positions = np.arange(len(scores.values)) - np.repeat(scores.starts, scores.counts)
+    in_top = positions < np.repeat(scores.top_counts, scores.counts)
+    # Scores are sorted, so the segment maximum is at its start
+    weights = np.exp((scores.values - np.repeat(scores.values[scores.starts], scores.counts)) / temperature)
+    weights[~in_top] = 0.0
+    total = np.bincount(labels, weights=weights, minlength=len(scores.starts))
+    weighted = np.bincount(labels, weights=weights * scores.values, minlength=len(scores.starts))
+    return weighted / total
+
+
+# Per-segment score reducers, selectable through AGGREGATION_QUAL_TOP_REDUCER
+SCORE_REDUCERS: Dict[str, Callable[[GroupedScores], np.ndarray]] = {
+    "max": reduce_max,
+    "mean": reduce_mean,
+    "top_n_mean": reduce_top_n_mean,
+    "top_n_softmax": reduce_top_n_softmax,
+}
+
+
+def score_segments(
+    columns: FrameColumns,
+    labels: np.ndarray,
+    num_segments: int,
+    config: Dict[str, Any],
+    peak_timestamp: Optional[float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Score every segment like ``calculate_segment_score``.
+
+    Args:
+        columns: Frame columns
+        labels: Segment of every frame (every segment has at least one frame)
+        num_segments: Number of segments
+        config: Aggregation configuration (``get_aggregation_config``)
+        peak_timestamp: Timestamp of the globally best frame, for the contextual boost
+
+    Returns:
+        Per-segment arrays: ``score``, ``max_frame_score``, ``top_n_avg_score``,
+        ``top_n_frame_count``, ``avg_frame_score``, ``quality_score``,
+        ``frame_count``, ``contextual_weight`` and ``best_frame`` (frame index)
+    """
+    scoring_config = config.get("scoring", {})
+    qualitative_cfg = scoring_config.get("qualitative_weights", {})
+    top_ratio = float(qualitative_cfg.get("top_ratio", 0.35) or 0.35)
+    top_min_count = int(qualitative_cfg.get("top_min_count", 2) or 2)
+    top_max_count = int(qualitative_cfg.get("top_max_count", 6) or 6)
+    max_weight = float(qualitative_cfg.get("max_component", 0.65))
+    top_weight = float(qualitative_cfg.get("top_component", 0.35))
+    weight_total = max(max_weight + top_weight, 1e-6)
+    max_weight /= weight_total
+    top_weight /= weight_total
+    top_reducer = SCORE_REDUCERS[qualitative_cfg.get("top_reducer", "top_n_mean")]
+
+    indices = np.arange(len(columns))
+    counts = np.bincount(labels, minlength=num_segments)
+    starts = np.zeros(num_segments, dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+
+    # Best first; ties keep frame order, so the first best frame wins as in the reference
+    by_score = np.lexsort((indices, -columns.scores, labels))
+    # The reference picks the best frame with a score of 0.0, not 0.1, for unscored frames
+    best_frames = np.lexsort((indices, -np.where(columns.has_scores, columns.scores, 0.0), labels))[starts]
+
+    top_counts = np.maximum(top_min_count, np.ceil(counts * top_ratio).astype(np.int64))
+    if top_max_count > 0:
+        top_counts = np.minimum(top_counts, top_max_count)
+    top_counts = np.minimum(top_counts, counts)
+
+    grouped = GroupedScores(
+        values=columns.scores[by_score],
+        starts=starts,
+        counts=counts,
+        top_counts=top_counts,
+        params=qualitative_cfg,
+    )
+    max_scores = reduce_max(grouped)
+    top_scores = top_reducer(grouped)
+    # The average is summed in frame order, like the reference
+    in_frame_order = columns.scores[np.argsort(labels, kind="stable")]
+    avg_scores = sequential_sums(in_frame_order, starts, counts) / counts
+    quality = (max_scores * max_weight) + (top_scores * top_weight)
+
+    contextual_cfg = scoring_config.get("contextual", {})
+    sigma_seconds = float(contextual_cfg.get("sigma_seconds", 40.0) or 40.0)
+    boost_strength = float(contextual_cfg.get("boost_strength", 0.5))
+    if peak_timestamp is not None and sigma_seconds > 0:
+        distances = np.abs(columns.timestamps[best_frames] - float(peak_timestamp))
+        # math.exp keeps the boost bit-identical to the reference
+        context = np.array(
+            [math.exp(-((distance / sigma_seconds) ** 2)) for distance in distances.tolist()],
+            dtype=np.float64,
+        )
+    else:
+        context = np.zeros(num_segments, dtype=np.float64)
+
+    return {
+        "score": quality * (1.0 + boost_strength * context),
+        "max_frame_score": max_scores,
+        "top_n_avg_score": top_scores,
+        "top_n_frame_count": top_counts,
+        "avg_frame_score": avg_scores,
+        "quality_score": quality,
+        "frame_count": counts,
+        "contextual_weight": context,
+        "contextual_boost_factor": boost_strength,
+        "contextual_sigma_seconds": sigma_seconds,
+        "best_frame": best_frames,
+    }
+
+
+def normalize_scores(scores: np.ndarray) -> np.ndarray:
+    """Min-max normalize segment scores to [0, 1]; all-equal scores become 1.0."""
+    if len(scores) == 0:
+        return scores
+    low = scores.min()
+    score_range = scores.max() - low
+    if score_range > 0:
+        return (scores - low) / score_range
+    return np.ones_like(scores)
+
+
+def rank_segments(scores: np.ndarray) -> np.ndarray:
+    """Segment indices by descending score; ties keep segment (first appearance) order."""
+    return np.lexsort((np.arange(len(scores)), -scores))
+
+
+def filter_overlapping_segments(
+    ranked: np.ndarray,
+    video_codes: np.ndarray,
+    segment_starts: np.ndarray,
+    segment_duration: float,
+    min_gap_seconds: float,
+) -> np.ndarray:
+    """
+    Greedily drop segments too close to a better segment of the same video.
+
+    Segments are windows of equal length, so a segment can only clash with its
+    nearest kept neighbours. With no positive gap, distinct windows never clash.
+    """
+    if min_gap_seconds <= 0:
+        return ranked
+
+    kept: List[int] = []
+    kept_starts: Dict[int, List[float]] = {}
+    for segment in ranked.tolist():
+        starts = kept_starts.setdefault(int(video_codes[segment]), [])
+        start = float(segment_starts[segment])
+        end = start + segment_duration
+        position = bisect.bisect_left(starts, start)
+        neighbours = starts[max(position - 1, 0): position + 1]
+        if all(
+            end + min_gap_seconds <= other or other + segment_duration + min_gap_seconds <= start
+            for other in neighbours
+        ):
+            starts.insert(position, start)
+            kept.append(segment)
+    return np.asarray(kept, dtype=np.int64)
+
+
+def score_breakdown(
+    scored: Dict[str, np.ndarray],
+    segment: int,
+    best_timestamp: Optional[float] = None,
+    peak_timestamp: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Score details of one segment, shaped like the result of ``calculate_segment_score``."""
+    return {
+        "score": float(scored["score"][segment]),
+        "max_frame_score": float(scored["max_frame_score"][segment]),
+        "top_n_avg_score": float(scored["top_n_avg_score"][segment]),
+        "top_n_frame_count": int(scored["top_n_frame_count"][segment]),
+        "avg_frame_score": float(scored["avg_frame_score"][segment]),
+        "quality_score": float(scored["quality_score"][segment]),
+        "frame_count": int(scored["frame_count"][segment]),
+        "contextual_weight": float(scored["contextual_weight"][segment]),
+        "contextual_boost_factor": scored["contextual_boost_factor"],
+        "contextual_sigma_seconds": scored["contextual_sigma_seconds"],
+        "segment_best_timestamp": best_timestamp,
+        "global_peak_timestamp": peak_timestamp,
+    }
@@ -2,11 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import math
+import threading
 import time
 from typing import List, Dict, Any, Tuple, Optional
+import numpy as np
 from langchain_vdms.vectorstores import VDMS, VDMS_Client
 
 from src.utils.common import settings, logger
+from src.utils.query_cache import content_generation, embedding_cache
+from src.vdms_retriever import aggregation_engine
 from src.vdms_retriever.embedding_wrapper import EmbeddingAPI
 
 DEBUG = False
@@ -18,6 +22,8 @@ def get_aggregation_config():
     """Get aggregation configuration from settings with fallback defaults."""
     return {
         "strategy": "temporal_segment_clustering",
+        # "vectorized" (columnar NumPy engine) or "python" (reference implementation)
+        "engine": getattr(settings, 'AGGREGATION_ENGINE', "vectorized"),
         "segment_duration_seconds": getattr(settings, 'AGGREGATION_SEGMENT_DURATION', 8),
         "min_temporal_gap_seconds": getattr(settings, 'AGGREGATION_MIN_GAP', 0),
         "final_max_results": getattr(settings, 'AGGREGATION_MAX_RESULTS', 20),
@@ -32,6 +38,9 @@ def get_aggregation_config():
                 "top_ratio": getattr(settings, 'AGGREGATION_QUAL_TOP_RATIO', 0.35),
                 "top_min_count": getattr(settings, 'AGGREGATION_QUAL_TOP_MIN_COUNT', 2),
                 "top_max_count": getattr(settings, 'AGGREGATION_QUAL_TOP_MAX_COUNT', 6),
+                # Reducer for the sustained component (vectorized engine only)
+                "top_reducer": getattr(settings, 'AGGREGATION_QUAL_TOP_REDUCER', "top_n_mean"),
+                "softmax_temperature": getattr(settings, 'AGGREGATION_SOFTMAX_TEMPERATURE', 0.05),
             },
             "contextual": {
                 "sigma_seconds": getattr(settings, 'AGGREGATION_CONTEXT_SIGMA_SECONDS', 40.0),
@@ -48,6 +57,27 @@ def get_aggregation_config():
     }
 
 
+def _frame_video_duration(metadata: Dict[str, Any], baseline_duration: float) -> float:
+    """Video duration from frame metadata, falling back to ``baseline_duration``."""
+    raw_duration = metadata.get("video_duration") or metadata.get("video_duration_seconds")
+    if raw_duration is not None:
+        try:
+            raw_duration = float(raw_duration)
+        except (TypeError, ValueError):
+            raw_duration = None
+    if raw_duration is None:
+        fps_value = metadata.get("fps")
+        total_frames_value = metadata.get("total_frames")
+        try:
+            if fps_value and total_frames_value:
+                raw_duration = float(total_frames_value) / float(fps_value)
+        except (TypeError, ValueError, ZeroDivisionError):
+            raw_duration = None
+    if raw_duration is None or raw_duration <= 0:
+        raw_duration = baseline_duration
+    return raw_duration
+
+
 def create_temporal_segments(
     frame_matches: List[Dict],
     segment_duration: int = 8,
@@ -81,22 +111,7 @@ def create_temporal_segments(
         timestamp = metadata.get("timestamp", 0)
         relevance_score = metadata.get("relevance_score", 0)
 
-        raw_duration = metadata.get("video_duration") or metadata.get("video_duration_seconds")
-        if raw_duration is not None:
-            try:
-                raw_duration = float(raw_duration)
-            except (TypeError, ValueError):
-                raw_duration = None
-        if raw_duration is None:
-            fps_value = metadata.get("fps")
-            total_frames_value = metadata.get("total_frames")
-            try:
-                if fps_value and total_frames_value:
-                    raw_duration = float(total_frames_value) / float(fps_value)
-            except (TypeError, ValueError, ZeroDivisionError):
-                raw_duration = None
-        if raw_duration is None or raw_duration <= 0:
-            raw_duration = baseline_duration
+        raw_duration = _frame_video_duration(metadata, baseline_duration)
         
         segment_id = int(timestamp // segment_duration)
         key = f"{video_id}_seg_{segment_id}"
@@ -337,6 +352,57 @@ def apply_temporal_overlap_filtering(segments: List[Dict], min_gap_seconds: int
     return filtered_segments
 
 
+def _format_segment_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a ranked segment for the API response."""
+    best_frame_meta = result.get("best_frame_metadata", {})
+
+    # Extract video URLs from any frame metadata (all frames in same video have same URLs)
+    video_url = ""
+    video_rel_url = ""
+
+    # Try to get URLs from best frame first
+    if best_frame_meta.get("video_url"):
+        video_url = best_frame_meta.get("video_url", "")
+        video_rel_url = best_frame_meta.get("video_rel_url", "")
+    else:
+        # Fallback: get URLs from any frame in the segment
+        frames = result.get("frames", [])
+        for frame in frames:
+            frame_metadata = frame.metadata if hasattr(frame, 'metadata') else frame
+            if frame_metadata.get("video_url"):
+                video_url = frame_metadata.get("video_url", "")
+                video_rel_url = frame_metadata.get("video_rel_url", "")
+                break
+
+    formatted_result = {
+        "video_id": result["video_id"],
+        "video_url": video_url,
+        "video_rel_url": video_rel_url,
+        "video_duration": result.get("video_duration"),
+        "seek_timestamp": result["seek_info"]["seek_timestamp"],
+        "segment_start": result["segment_start"],
+        "segment_end": result["segment_end"],
+        "relevance_score": result["final_score"],
+        "score_breakdown": result["score_breakdown"],
+        "best_frame_info": {
+            "timestamp": result["seek_info"]["best_frame_timestamp"],
+            "frame_number": best_frame_meta.get("frame_number", 0),
+            "frame_type": best_frame_meta.get("frame_type", "full_frame"),
+            "detection_confidence": best_frame_meta.get("detection_confidence"),
+            "detected_label": best_frame_meta.get("detected_label")
+        },
+        "video_metadata": {
+            "duration": result["video_duration"],
+            "fps": best_frame_meta.get("fps", 30),
+            "tags": best_frame_meta.get("tags", "").split(",") if best_frame_meta.get("tags") else [],
+            "upload_timestamp": best_frame_meta.get("date_time", {}).get("_date", ""),
+            "bucket_name": best_frame_meta.get("bucket_name", "")
+        },
+        "frame_scores": result.get("frame_scores", [])
+    }
+    return formatted_result
+
+
 def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int = 20) -> Tuple[List[Dict], Dict[str, float]]:
     """
     Complete aggregation pipeline for frame-to-video conversion.
@@ -369,6 +435,9 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
     
     logger.debug(f"Starting aggregation of {len(frame_results)} frame results")
 
+    if config.get("engine") == "vectorized":
+        return _aggregate_frames_vectorized(frame_results, max_results, config, start_time)
+
     # Calculate global maximum relevance score across all frames for contextual comparisons
     global_scores: List[float] = []
     frame_info_for_debug = []
@@ -547,55 +616,7 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
     
     # Step 5: Format results for API response
     formatting_start = time.perf_counter()
-    formatted_results = []
-    for result in final_results:
-        best_frame_meta = result.get("best_frame_metadata", {})
-        
-        # Extract video URLs from any frame metadata (all frames in same video have same URLs)
-        video_url = ""
-        video_rel_url = ""
-        
-        # Try to get URLs from best frame first
-        if best_frame_meta.get("video_url"):
-            video_url = best_frame_meta.get("video_url", "")
-            video_rel_url = best_frame_meta.get("video_rel_url", "")
-        else:
-            # Fallback: get URLs from any frame in the segment
-            frames = result.get("frames", [])
-            for frame in frames:
-                frame_metadata = frame.metadata if hasattr(frame, 'metadata') else frame
-                if frame_metadata.get("video_url"):
-                    video_url = frame_metadata.get("video_url", "")
-                    video_rel_url = frame_metadata.get("video_rel_url", "")
-                    break
-        
-        formatted_result = {
-            "video_id": result["video_id"],
-            "video_url": video_url,
-            "video_rel_url": video_rel_url,
-            "video_duration": result.get("video_duration"),
-            "seek_timestamp": result["seek_info"]["seek_timestamp"],
-            "segment_start": result["segment_start"],
-            "segment_end": result["segment_end"],
-            "relevance_score": result["final_score"],
-            "score_breakdown": result["score_breakdown"],
-            "best_frame_info": {
-                "timestamp": result["seek_info"]["best_frame_timestamp"],
-                "frame_number": best_frame_meta.get("frame_number", 0),
-                "frame_type": best_frame_meta.get("frame_type", "full_frame"),
-                "detection_confidence": best_frame_meta.get("detection_confidence"),
-                "detected_label": best_frame_meta.get("detected_label")
-            },
-            "video_metadata": {
-                "duration": result["video_duration"],
-                "fps": best_frame_meta.get("fps", 30),
-                "tags": best_frame_meta.get("tags", "").split(",") if best_frame_meta.get("tags") else [],
-                "upload_timestamp": best_frame_meta.get("date_time", {}).get("_date", ""),
-                "bucket_name": best_frame_meta.get("bucket_name", "")
-            },
-            "frame_scores": result.get("frame_scores", [])
-        }
-        formatted_results.append(formatted_result)
+    formatted_results = [_format_segment_result(result) for result in final_results]
     
     formatting_time_ms = (time.perf_counter() - formatting_start) * 1000
     processing_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
@@ -624,6 +645,399 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
     }
 
 
+def _aggregate_frames_vectorized(
+    frame_results: List[Any],
+    max_results: int,
+    config: Dict[str, Any],
+    start_time: float,
+) -> Tuple[List[Dict], Dict[str, float]]:
+    """
+    Columnar implementation of ``aggregate_frame_results_to_videos``.
+
+    Segmentation, scoring, normalization and ranking run over NumPy columns
+    (see ``aggregation_engine``); only the returned segments are turned back
+    into dictionaries. Results match the reference implementation.
+    """
+    segment_duration = config["segment_duration_seconds"]
+    baseline_duration = float(
+        config.get("length_normalization", {}).get("baseline_duration_seconds", 30) or 30
+    )
+    seek_offset = float(config["scoring"].get("context_seek_offset_seconds", 0.0))
+
+    segmentation_start = time.perf_counter()
+    columns = aggregation_engine.frame_columns(frame_results)
+    segments = aggregation_engine.segment_frames(columns, segment_duration)
+    segmentation_time_ms = (time.perf_counter() - segmentation_start) * 1000
+
+    scoring_start = time.perf_counter()
+    # As in the reference, only frames with a relevance score can be the global peak
+    scored_frames = np.flatnonzero(columns.has_scores)
+    peak_timestamp = None
+    if len(scored_frames):
+        peak_frame = int(scored_frames[np.argmax(columns.scores[scored_frames])])
+        peak_timestamp = columns.metadata[peak_frame].get("timestamp", 0)
+    scored = aggregation_engine.score_segments(
+        columns, segments.labels, len(segments), config, peak_timestamp
+    )
+    raw_scores = scored["score"]
+    final_scores = aggregation_engine.normalize_scores(raw_scores)
+    scoring_time_ms = (time.perf_counter() - scoring_start) * 1000
+    logger.debug(
+        f"Scored {len(segments)} segments from {len(columns)} frames "
+        f"(raw score range [{raw_scores.min():.4f}, {raw_scores.max():.4f}])"
+    )
+
+    filtering_start = time.perf_counter()
+    ranked = aggregation_engine.rank_segments(final_scores)
+    if config["filtering"]["overlap_filter_enabled"]:
+        ranked = aggregation_engine.filter_overlapping_segments(
+            ranked,
+            segments.video_codes,
+            segments.window_ids * segment_duration,
+            segment_duration,
+            config["min_temporal_gap_seconds"],
+        )
+    segments_after_filtering = len(ranked)
+    final_segments = ranked[:max_results].tolist()
+    filtering_time_ms = (time.perf_counter() - filtering_start) * 1000
+
+    formatting_start = time.perf_counter()
+    frame_order = np.argsort(segments.labels, kind="stable")
+    frame_starts = np.zeros(len(segments), dtype=np.int64)
+    np.cumsum(scored["frame_count"][:-1], out=frame_starts[1:])
+    formatted_results = []
+    for segment in final_segments:
+        start = int(frame_starts[segment])
+        frames = [
+            frame_results[index]
+            for index in frame_order[start:start + int(scored["frame_count"][segment])].tolist()
+        ]
+        window_id = int(segments.window_ids[segment])
+        best_frame_metadata = columns.metadata[int(scored["best_frame"][segment])]
+        segment_data = {
+            "video_id": columns.video_ids[int(segments.video_codes[segment])],
+            "segment_start": window_id * segment_duration,
+            "segment_end": (window_id + 1) * segment_duration,
+            "frames": frames,
+            "video_duration": _frame_video_duration(
+                columns.metadata[int(segments.first_frames[segment])], baseline_duration
+            ),
+        }
+        breakdown = aggregation_engine.score_breakdown(
+            scored, segment, best_frame_metadata.get("timestamp"), peak_timestamp
+        )
+        breakdown["raw_score"] = breakdown["score"]
+        breakdown["score"] = float(final_scores[segment])
+        frame_scores = []
+        for frame in frames:
+            frame_metadata = frame.metadata if hasattr(frame, 'metadata') else frame
+            frame_scores.append((frame_metadata.get("timestamp", 0), frame_metadata.get('relevance_score', 0)))
+        formatted_results.append(
+            _format_segment_result(
+                {
+                    **segment_data,
+                    "score_breakdown": breakdown,
+                    "seek_info": determine_seek_point(segment_data, context_offset=seek_offset),
+                    "final_score": breakdown["score"],
+                    "best_frame_metadata": best_frame_metadata,
+                    "frame_scores": [(f'{ts}s', f'{sc:.4f}') for ts, sc in sorted(frame_scores)],
+                }
+            )
+        )
+    formatting_time_ms = (time.perf_counter() - formatting_start) * 1000
+    processing_time = (time.perf_counter() - start_time) * 1000
+
+    logger.info(
+        "Aggregation complete (vectorized): %d frames -> %d video segments in %.1fms (segmentation=%.2fms, scoring=%.2fms, filtering=%.2fms, formatting=%.2fms)",
+        len(frame_results),
+        len(formatted_results),
+        processing_time,
+        segmentation_time_ms,
+        scoring_time_ms,
+        filtering_time_ms,
+        formatting_time_ms,
+    )
+
+    return formatted_results, {
+        "total_frame_matches": len(frame_results),
+        "segments_created": len(segments),
+        "segments_after_filtering": segments_after_filtering,
+        "final_results": len(formatted_results),
+        "processing_time_ms": processing_time,
+        "segmentation_time_ms": segmentation_time_ms,
+        "scoring_time_ms": scoring_time_ms,
+        "filtering_time_ms": filtering_time_ms,
+        "formatting_time_ms": formatting_time_ms,
+    }
+
+
+# Filtered frame search
+def split_tags(value: Any) -> List[str]:
+    """Return the tags of a frame; dataprep stores them as one comma-separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [tag.strip() for tag in value.split(",") if tag.strip()]
+    return [str(tag).strip() for tag in value if str(tag).strip()]
+
+
+def frame_matches_tags(metadata: Dict[str, Any], tags: List[str]) -> bool:
+    """Check whether a frame carries any of the query tags."""
+    return bool(set(tags).intersection(split_tags(metadata.get("tags"))))
+
+
+class TagValueCache:
+    """
+    Distinct values of the ``tags`` property in the collection.
+
+    VDMS constraints only compare whole property values, so a tag filter is
+    pushed down as one ``tags == value`` query per stored tag string that
+    contains a query tag. The distinct strings are read with a projection-only
+    FindDescriptor (no vectors) and refreshed at most every ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float, scan_limit: int):
+        self.ttl = ttl
+        self.scan_limit = scan_limit
+        self._values: Optional[List[str]] = None
+        self._complete = False
+        self._loaded_at = 0.0
+        self._generation = -1
+        self._lock = threading.Lock()
+
+    def _load(self, db: VDMS) -> None:
+        query = db.utils.add_descriptor(
+            "FindDescriptor",
+            db.collection_name,
+            results={"list": ["tags"], "limit": self.scan_limit},
+        )
+        response, _ = db.utils.run_vdms_query([query])
+        entities = response[0].get("FindDescriptor", {}).get("entities", []) if response else []
+        self._values = sorted({entity["tags"] for entity in entities if entity.get("tags")})
+        # A scan that hit the limit may have missed tag strings
+        self._complete = len(entities) < self.scan_limit
+        self._loaded_at = time.monotonic()
+        self._generation = content_generation()
+        logger.debug(
+            f"Tag value cache: {len(self._values)} distinct tag strings over {len(entities)} descriptors"
+        )
+
+    def matching(self, db: VDMS, tags: List[str], refresh: bool = False) -> Optional[List[str]]:
+        """
+        Stored tag strings containing any of ``tags``.
+
+        Returns None when the distinct values are unknown or incomplete.
+        """
+        with self._lock:
+            stale = (
+                self._values is None
+                or self._generation != content_generation()
+                or time.monotonic() - self._loaded_at > self.ttl
+            )
+            if refresh or stale:
+                try:
+                    self._load(db)
+                except Exception as e:
+                    logger.warning(f"Could not read distinct tag values: {e}")
+                    self._values = None
+            if self._values is None or not self._complete:
+                return None
+            values = self._values
+        wanted = set(tags)
+        return [value for value in values if wanted.intersection(split_tags(value))]
+
+
+_tag_value_cache = TagValueCache(
+    ttl=settings.SEARCH_TAG_CACHE_TTL, scan_limit=settings.SEARCH_TAG_SCAN_LIMIT
+)
+
+
+def plan_search_filters(
+    db: VDMS,
+    tags: Optional[List[str]] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+) -> Tuple[Optional[List[Optional[Dict[str, List]]]], bool]:
+    """
+    Translate query predicates into VDMS constraints.
+
+    The time range (seconds into the video) always maps onto the numeric
+    ``timestamp`` property. Tags are pushed down when their stored values are
+    known and few enough to query one by one.
+
+    Returns:
+        (constraint sets to query and merge, whether tags still need filtering in
+        Python). Constraint sets are None when no stored frame can match.
+    """
+    time_constraint: Dict[str, List] = {}
+    if start_time is not None and end_time is not None:
+        time_constraint["timestamp"] = [">=", float(start_time), "<=", float(end_time)]
+    elif start_time is not None:
+        time_constraint["timestamp"] = [">=", float(start_time)]
+    elif end_time is not None:
+        time_constraint["timestamp"] = ["<=", float(end_time)]
+
+    if not tags:
+        return [time_constraint or None], False
+
+    values = _tag_value_cache.matching(db, tags)
+    if values == []:
+        # Tags may have been ingested since the last refresh
+        values = _tag_value_cache.matching(db, tags, refresh=True)
+    if values == []:
+        return None, False
+    if values is None or len(values) > settings.SEARCH_MAX_TAG_VALUES:
+        return [time_constraint or None], True
+    return [{"tags": ["==", value], **time_constraint} for value in values], False
+
+
+def search_frames(
+    db: VDMS,
+    query: str,
+    tags: Optional[List[str]] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+    target_k: Optional[int] = None,
+    embedding: Optional[List[float]] = None,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Similarity search for frames matching the query predicates.
+
+    Predicates are pushed into VDMS where possible (``plan_search_filters``).
+    VDMS applies constraints to the ``fetch_k`` nearest neighbours, so when
+    filters leave fewer than ``target_k`` frames the candidate pool grows,
+    sized from the observed match rate, up to ``SEARCH_MAX_FETCH_K``. Without
+    filters a single round fetches ``target_k`` frames, as before.
+
+    Pass ``embedding`` when the query was already embedded (``embed_queries``).
+
+    Returns:
+        (frame documents with ``relevance_score`` metadata, search statistics)
+    """
+    target_k = int(target_k or settings.AGGREGATION_INITIAL_K)
+    max_fetch_k = max(target_k + 1, settings.SEARCH_MAX_FETCH_K)
+    higher_is_better = settings.DISTANCE_STRATEGY.upper() == "IP"
+    stats: Dict[str, Any] = {
+        "target_k": target_k,
+        "rounds": 0,
+        "fetch_k": 0,
+        "records_fetched": 0,
+        "records_after_filter": 0,
+        "returned": 0,
+        "pushdown": False,
+        "tag_values_queried": 0,
+    }
+
+    filter_time_locally = False
+    if settings.SEARCH_FILTER_PUSHDOWN:
+        constraint_sets, filter_tags_locally = plan_search_filters(db, tags, start_time, end_time)
+    else:
+        constraint_sets, filter_tags_locally = [None], bool(tags)
+        filter_time_locally = start_time is not None or end_time is not None
+    if constraint_sets is None:
+        logger.info(f"No stored frames carry any of the tags {tags}; skipping the vector search")
+        return [], stats
+
+    filter_locally = filter_tags_locally or filter_time_locally
+    filtered = filter_locally or any(constraint_sets)
+    stats["pushdown"] = any(constraint_sets)
+    stats["tag_values_queried"] = sum(1 for constraints in constraint_sets if constraints and "tags" in constraints)
+
+    if embedding is None:
+        embedding = embed_queries(db, [query])[0]
+    fetch_k = target_k + 1
+    if filtered:
+        fetch_k = min(max_fetch_k, max(fetch_k, int(target_k * settings.SEARCH_FILTER_OVERSAMPLE)))
+
+    while True:
+        stats["rounds"] += 1
+        # With Python-side filtering every candidate has to come back; otherwise VDMS returns the matches only
+        k = fetch_k - 1 if filter_locally else target_k
+        docs_with_score: List[Tuple[Any, float]] = []
+        for constraints in constraint_sets:
+            docs_with_score.extend(
+                db.similarity_search_with_score_by_vector(
+                    embedding, k=k, fetch_k=fetch_k, filter=constraints
+                )
+            )
+        fetched = len(docs_with_score)
+
+        frames = []
+        for doc, score in docs_with_score:
+            if filter_time_locally and not _within_time_range(doc.metadata, start_time, end_time):
+                continue
+            if filter_tags_locally and not frame_matches_tags(doc.metadata, tags):
+                continue
+            doc.metadata["relevance_score"] = score
+            frames.append(doc)
+
+        stats["fetch_k"] = fetch_k
+        stats["records_fetched"] += fetched
+        stats["records_after_filter"] = len(frames)
+        candidates = fetch_k * len(constraint_sets)
+        if not filtered or len(frames) >= target_k or fetch_k >= max_fetch_k:
+            break
+        # Grow the candidate pool to what the observed match rate needs, at least doubling it
+        match_rate = max(len(frames), 1) / candidates
+        needed = int(math.ceil(target_k / match_rate / len(constraint_sets) * 1.2))
+        fetch_k = min(max_fetch_k, max(fetch_k * 2, needed))
+        logger.debug(f"Filters kept {len(frames)}/{fetched} frames; retrying with fetch_k={fetch_k}")
+
+    if len(constraint_sets) > 1:
+        frames.sort(key=lambda doc: doc.metadata["relevance_score"], reverse=higher_is_better)
+    frames = frames[:target_k]
+    stats["returned"] = len(frames)
+    logger.info(
+        f"Frame search: fetched {stats['records_fetched']} records in {stats['rounds']} round(s) "
+        f"(fetch_k={stats['fetch_k']}, pushdown={stats['pushdown']}), returned {stats['returned']}"
+    )
+    return frames, stats
+
+
+def embed_queries(db: VDMS, queries: List[str]) -> List[List[float]]:
+    """
+    Embed query texts, reusing cached embeddings.
+
+    Texts missing from the cache are embedded together in one batched call to
+    the embedding service.
+    """
+    embeddings: Dict[str, List[float]] = {}
+    missing: List[str] = []
+    for query in queries:
+        if query in embeddings or query in missing:
+            continue
+        cached = embedding_cache.get(query)
+        if cached is None:
+            missing.append(query)
+        else:
+            embeddings[query] = cached
+
+    if missing:
+        if len(missing) == 1:
+            computed = [db.embed_query(missing[0])]
+        else:
+            computed = db.embedding.embed_documents(missing)
+        if len(computed) != len(missing):
+            raise ValueError(
+                f"Embedding service returned {len(computed)} embeddings for {len(missing)} queries"
+            )
+        for query, embedding in zip(missing, computed):
+            embedding_cache.put(query, embedding)
+            embeddings[query] = embedding
+    logger.debug(f"Query embeddings: {len(missing)} computed, {len(embeddings) - len(missing)} cached")
+    return [embeddings[query] for query in queries]
+
+
+def _within_time_range(metadata: Dict[str, Any], start_time: Optional[float], end_time: Optional[float]) -> bool:
+    if start_time is None and end_time is None:
+        return True
+    try:
+        timestamp = float(metadata.get("timestamp"))
+    except (TypeError, ValueError):
+        return False
+    return (start_time is None or timestamp >= start_time) and (end_time is None or timestamp <= end_time)
+
+
 def get_vectordb() -> VDMS:
     """
     Initializes and returns a vector database based on the specified configuration.